@@ -1,5 +1,5 @@
-from flask import Flask, request, jsonify
-import asyncio
+from flask import Flask, Response, request, jsonify, stream_with_context
+import json
 import sys
 import os
 from pathlib import Path
@@ -13,9 +13,13 @@ import importlib.util
 _followup_path = _parent_dir / "followup_gmail.py"
 spec = importlib.util.spec_from_file_location("followup_gmail", _followup_path)
 followup_module = importlib.util.module_from_spec(spec)
+# Registered so job_runner imports this same module instead of loading a second copy
+sys.modules["followup_gmail"] = followup_module
 spec.loader.exec_module(followup_module)
 GmailFollowUp = followup_module.GmailFollowUp
 
+from job_runner import JobRunner
+
 app = Flask(__name__)
 
 def load_templates():
@@ -44,30 +48,102 @@ also, your audience looks to you for guidance—{app_name} makes that guidance t
     
     return templates if templates else None
 
+# Check if we're in cloud (no Arc available) or local (Arc available)
+# In cloud, we need to launch a browser. Locally, we can use Arc.
+USE_ARC = os.environ.get("USE_ARC", "false").lower() == "true"
+ARC_DEBUG_PORT = int(os.environ.get("ARC_DEBUG_PORT", "9222"))
+# Seconds between progress events on GET /followup/<id>?stream=1
+STREAM_INTERVAL = float(os.environ.get("FOLLOWUP_STREAM_INTERVAL", "2"))
+
+
+def make_tool(params):
+    """Build a GmailFollowUp for a job from its request parameters."""
+    return GmailFollowUp(
+        use_arc=USE_ARC,
+        arc_debug_port=ARC_DEBUG_PORT,
+        profile=params.get("profile"),
+        config_path=params.get("config_path"),
+        headless=not USE_ARC,  # Headless in cloud
+        backend=params.get("backend", "browser"),
+        full_scan=bool(params.get("full_scan", False)),
+        send_interval=float(params.get("send_interval", 1.0)),
+        plan_queries=bool(params.get("plan_queries", True)),
+    )
+
+
+async def execute(tool, params):
+    """Run one follow-up job with the options from its request."""
+    workers = int(params.get("workers") or 0)
+    if workers > 0:
+        await tool.run_workers(
+            followup_templates=params["templates"],
+            workers=workers,
+            dry_run=params.get("dry_run", False),
+            max_emails=params.get("max_emails")
+        )
+    else:
+        await tool.run(
+            followup_templates=params["templates"],
+            dry_run=params.get("dry_run", False),
+            max_emails=params.get("max_emails")
+        )
+
+
+runner = JobRunner(make_tool, execute)
+
+# Pre-launch browsers/contexts so the first job doesn't pay for a cold start
+_warm_profiles = os.environ.get("FOLLOWUP_WARM_PROFILES", "").strip()
+if _warm_profiles:
+    if _warm_profiles.lower() == "all":
+        _names = followup_module.load_profile_names()
+    else:
+        _names = [name.strip() for name in _warm_profiles.split(",") if name.strip()]
+    runner.warm([{"profile": name} for name in _names])
+
+
 @app.route("/health", methods=["GET"])
 def health():
     """Health check endpoint."""
-    return jsonify({"ok": True, "service": "followup-tool-api"})
+    return jsonify({
+        "ok": True,
+        "service": "followup-tool-api",
+        "jobs_running": sum(1 for job in runner.jobs.values() if not job.finished),
+        "browser_pool": runner.pool.stats,
+    })
 
 @app.route("/followup", methods=["POST"])
 def followup():
     """
-    Run the Gmail follow-up process.
+    Start a Gmail follow-up job. Returns a job id right away; poll or stream
+    GET /followup/<job_id> for progress.
     
     Expected JSON body:
     {
         "profile": "pretti" (optional, defaults to config default),
         "max_emails": 100 (optional, None = all emails),
-        "dry_run": false (optional, default false)
+        "dry_run": false (optional, default false),
+        "backend": "browser" (optional, "browser" or "api"),
+        "full_scan": false (optional, re-check threads the state store would skip),
+        "workers": 0 (optional, parallel tabs; 0 = one thread at a time),
+        "send_interval": 1.0 (optional, minimum seconds between sends),
+        "plan_queries": true (optional, false = plain Sent search without date windows),
+        "wait": false (optional, block until the job finishes like the old synchronous API)
     }
     """
     try:
         data = request.get_json() or {}
         
-        profile = data.get("profile")
-        max_emails = data.get("max_emails")
-        dry_run = data.get("dry_run", False)
-        config_path = data.get("config_path")
+        params = {
+            "profile": data.get("profile"),
+            "max_emails": data.get("max_emails"),
+            "dry_run": data.get("dry_run", False),
+            "config_path": data.get("config_path"),
+            "backend": data.get("backend", "browser"),
+            "full_scan": bool(data.get("full_scan", False)),
+            "workers": int(data.get("workers") or 0),
+            "send_interval": float(data.get("send_interval", 1.0)),
+            "plan_queries": bool(data.get("plan_queries", True)),
+        }
         
         # Load templates
         templates = load_templates()
@@ -76,36 +152,31 @@ def followup():
                 "ok": False,
                 "error": "Follow-up templates not found"
             }), 500
+        params["templates"] = templates
         
-        # Check if we're in cloud (no Arc available) or local (Arc available)
-        # In cloud, we need to launch a browser. Locally, we can use Arc.
-        use_arc = os.environ.get("USE_ARC", "false").lower() == "true"
-        arc_debug_port = int(os.environ.get("ARC_DEBUG_PORT", "9222"))
+        job, created = runner.submit(params)
+        if not created:
+            return jsonify({
+                "ok": False,
+                "error": f"A follow-up job for profile '{job.profile}' is already {job.status}",
+                "job_id": job.id,
+                "status_url": f"/followup/{job.id}",
+            }), 409
         
-        # Run the follow-up process
-        async def run_followup():
-            tool = GmailFollowUp(
-                use_arc=use_arc,
-                arc_debug_port=arc_debug_port,
-                profile=profile,
-                config_path=config_path,
-                headless=True if not use_arc else False,  # Headless in cloud
-            )
-            
-            await tool.run(
-                followup_templates=templates,
-                dry_run=dry_run,
-                max_emails=max_emails
-            )
-            
-            return {
-                "ok": True,
-                "message": f"Follow-up process completed (dry_run={dry_run})"
-            }
+        if data.get("wait"):
+            job.done.wait()
+            return jsonify({
+                "ok": job.status == "completed",
+                "message": f"Follow-up process completed (dry_run={params['dry_run']})",
+                "job": job.to_dict(),
+            }), 200 if job.status == "completed" else 500
         
-        # Run async function
-        result = asyncio.run(run_followup())
-        return jsonify(result)
+        return jsonify({
+            "ok": True,
+            "message": f"Follow-up job queued (dry_run={params['dry_run']})",
+            "job_id": job.id,
+            "status_url": f"/followup/{job.id}",
+        }), 202
         
     except Exception as e:
         return jsonify({
@@ -113,8 +184,44 @@ def followup():
             "error": str(e)
         }), 500
 
+@app.route("/followup", methods=["GET"])
+def list_followups():
+    """List recent follow-up jobs (newest first)."""
+    jobs = sorted(runner.jobs.values(), key=lambda job: job.created_at, reverse=True)
+    return jsonify({"ok": True, "jobs": [job.to_dict() for job in jobs]})
+
+@app.route("/followup/<job_id>", methods=["GET"])
+def followup_status(job_id):
+    """
+    Progress of a follow-up job.
+    
+    Query params:
+        log_since: Include log lines from this index on (use next_log_index from the last response)
+        stream: 1 to stream newline-delimited JSON events (progress, counts, new log lines) until the job ends
+    """
+    job = runner.get(job_id)
+    if not job:
+        return jsonify({"ok": False, "error": f"Unknown job '{job_id}'"}), 404
+    
+    log_since = request.args.get("log_since", type=int)
+    if request.args.get("stream", "").lower() not in ("1", "true"):
+        return jsonify({"ok": True, "job": job.to_dict(log_since=log_since)})
+    
+    def events():
+        index = log_since or 0
+        while True:
+            finished = job.finished
+            event = job.to_dict(log_since=index)
+            index = event["next_log_index"]
+            yield json.dumps(event) + "\n"
+            if finished:
+                return
+            job.done.wait(STREAM_INTERVAL)
+    
+    return Response(stream_with_context(events()), mimetype="application/x-ndjson")
+
 if __name__ == "__main__":
     import os
     port = int(os.environ.get("PORT", 8001))
-    app.run(host="0.0.0.0", port=port, debug=True)
-
+    # No reloader: it would start a second job runner and browser pool
+    app.run(host="0.0.0.0", port=port, debug=True, use_reloader=False)
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Follow-up Extraction Benchmark
+Replays Gmail Sent-list and thread HTML in headless Chromium (page.set_content,
+no Gmail login) through the tool's own extraction code:
+
+  - Sent list: gmail_rows.js + GmailFollowUp._extract_page_rows
+  - Threads:   GmailFollowUp.detect_followup_level, then the username cascade
+               and template rendering in GmailFollowUp._plan_followup
+
+and reports rows/sec, per-stage latency and extraction accuracy against the
+expected values. Fixtures are synthetic (generated from a seed, using the
+profile's real follow-up wording) or loaded from a directory of saved HTML.
+
+Usage:
+    python3 bench_extraction.py                       # 5000 rows, 1000 threads
+    python3 bench_extraction.py --rows 500 --threads 100 --json report.json
+    python3 bench_extraction.py --save fixtures/      # write the generated fixtures
+    python3 bench_extraction.py --fixtures fixtures/  # replay saved fixtures
+    python3 bench_extraction.py --min-accuracy 0.98   # exit 1 below this (CI)
+"""
+
+import argparse
+import asyncio
+import html
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from playwright.async_api import async_playwright
+
+from followup_gmail import GmailFollowUp, RESPONSES_LABEL
+
+ROWS_PER_PAGE = 50
+# Fields whose accuracy --min-accuracy applies to; recipient is reported only, since
+# Gmail shows the address in the row only for contacts without a name
+GATED_FIELDS = ("thread_id", "kept", "username_hint", "level", "username")
+
+FIRST_NAMES = ["jenny", "bella", "maya", "sofia", "lily", "ava", "chloe", "zoe", "nina", "emma", "ruby", "isla"]
+HANDLE_SUFFIXES = ["_beauty", "_makeup", "skincare", "_glow", "xo", "_daily", "_vlogs", "_style", "_official", ""]
+LAST_NAMES = ["Smith", "Lee", "Garcia", "Nguyen", "Brown", "Martin", "Lopez", "Clark"]
+GREETINGS = ["hey {handle},", "hi @{handle},", "Hey {handle} -", "hello {handle},", "hiya @{handle}!"]
+SENT_SUBJECT = "PAID PROMO OPPORTUNITY - Pretti App"
+
+
+def _handle(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)}{rng.choice(HANDLE_SUFFIXES)}{rng.randint(1, 999)}"
+
+
+def _title_date(when: datetime) -> str:
+    """The full date Gmail puts in the date cell's title attribute."""
+    return f"{when:%a}, {when:%b} {when.day}, {when.year}, {when.hour % 12 or 12}:{when:%M} {when:%p}"
+
+
+def _cell_date(when: datetime, now: datetime) -> str:
+    """The short date Gmail shows in the list: time today, "Nov 8" this year, "11/8/24" before."""
+    if when.date() == now.date():
+        return f"{when.hour % 12 or 12}:{when:%M} {when:%p}"
+    if when.year == now.year:
+        return f"{when:%b} {when.day}"
+    return f"{when.month}/{when.day}/{when:%y}"
+
+
+class FixtureGenerator:
+    """Deterministic Gmail-like Sent pages and threads with known answers."""
+
+    def __init__(self, tool: GmailFollowUp, seed: int = 7, now: Optional[datetime] = None):
+        self.tool = tool
+        self.rng = random.Random(seed)
+        self.now = now or datetime.now()
+        self.sender = tool.profile_config.get("gmail_sender", "me@example.com")
+        self.from_name = tool.profile_config.get("from_name", "Me")
+        self.markers = tool.followup_markers
+
+    def _row(self, i: int) -> Tuple[str, Dict]:
+        rng = self.rng
+        thread_id = f"18{i:014x}"
+        handle = _handle(rng)
+        email = f"{handle.replace('_', '.')}@{rng.choice(['gmail.com', 'icloud.com', 'creators.co'])}"
+        if rng.random() < 0.3:
+            shown = email  # no contact name: Gmail shows the address
+        else:
+            shown = f"{handle.split('_')[0].capitalize()} {rng.choice(LAST_NAMES)}"
+        # Keep clear of the followup_days cutoff so a timezone hour can't flip the answer
+        days_old = rng.choice([0, 1, 2, 3]) if rng.random() < 0.2 else rng.randint(self.tool.followup_days + 2, 400)
+        when = (self.now - timedelta(days=days_old)).replace(hour=rng.randint(8, 20), minute=rng.randint(0, 59))
+        if days_old == 0:
+            when = self.now.replace(hour=min(self.now.hour, 8), minute=0)
+        tagged = rng.random() < 0.1
+        final = rng.random() < 0.1
+        body = self.markers[3][0] if final else "wanted to reach out about a paid promo with pretti"
+        snippet = f"{rng.choice(GREETINGS).format(handle=handle)} {body}"
+        labels = [RESPONSES_LABEL] if tagged else ([rng.choice(["creators", "batch-3"])] if rng.random() < 0.2 else [])
+        label_html = "".join(
+            f'<div class="ar as"><div class="at" title="{html.escape(label)}"><div class="au"><div class="av">{html.escape(label)}</div></div></div></div>'
+            for label in labels
+        )
+        row_html = (
+            f'<tr role="row" class="zA yO" data-legacy-thread-id="{thread_id}">'
+            f'<td class="oZ-x3 xY"><div role="checkbox"></div></td>'
+            f'<td class="apU xY"><span class="T-KT">☆</span></td>'
+            f'<td class="yX xY"><div class="yW"><span class="bA4"><span email="{email}" name="{html.escape(shown)}">To: {html.escape(shown)}</span></span></div></td>'
+            f'<td class="xY a4W"><div class="xS"><div class="xT">{label_html}<div class="y6"><span class="bog">{SENT_SUBJECT}</span></div>'
+            f'<span class="y2"> - {html.escape(snippet)}</span></div></div></td>'
+            f'<td class="xW xY"><span title="{_title_date(when)}">{_cell_date(when, self.now)}</span></td>'
+            f'</tr>'
+        )
+        expected = {
+            "thread_id": thread_id,
+            "recipient": email,
+            "username_hint": handle,
+            "kept": not tagged and days_old >= self.tool.followup_days and not final,
+        }
+        return row_html, expected
+
+    def sent_pages(self, rows: int) -> List[Tuple[str, List[Dict]]]:
+        pages = []
+        for start in range(0, rows, ROWS_PER_PAGE):
+            built = [self._row(i) for i in range(start, min(start + ROWS_PER_PAGE, rows))]
+            page_html = (
+                '<html><body><div role="main"><table class="F cf zt"><tbody>'
+                + "".join(row for row, _ in built)
+                + "</tbody></table></div></body></html>"
+            )
+            pages.append((page_html, [expected for _, expected in built]))
+        return pages
+
+    def _message(self, msg_id: int, from_me: bool, who: str, text: str, quote: str = "") -> str:
+        email = self.sender if from_me else who
+        name = self.from_name if from_me else who.split("@")[0]
+        quote_html = f'<div class="gmail_quote">On Mon, {html.escape(name)} wrote:<blockquote>{html.escape(quote)}</blockquote></div>' if quote else ""
+        return (
+            f'<div role="listitem"><div class="adn ads" data-message-id="#msg-f:{msg_id}">'
+            f'<h3 class="iw"><span class="gD" email="{email}" name="{html.escape(name)}">{html.escape(name)}</span></h3>'
+            f'<div class="a3s aiL">{html.escape(text).replace(chr(10), "<br>")}{quote_html}</div>'
+            f'</div></div>'
+        )
+
+    def thread(self, i: int) -> Tuple[str, Dict]:
+        rng = self.rng
+        thread_id = f"19{i:014x}"
+        handle = _handle(rng)
+        creator = f"{handle.replace('_', '.')}@gmail.com"
+        followups_sent = rng.choice([0, 0, 1, 1, 2, 3])
+        greeting = rng.choice(GREETINGS).format(handle=handle)
+        texts = [f"{greeting}\n\nwanted to reach out about a paid promo with pretti"]
+        for level in range(1, followups_sent + 1):
+            texts.append(f"{greeting}\n\n{self.markers[level][0]}. {self.markers[level][-1]}")
+        messages = []
+        for n, text in enumerate(texts):
+            # Each follow-up quotes the previous one, as Gmail replies do
+            messages.append(self._message(n, True, creator, text, quote=texts[n - 1] if n else ""))
+            if rng.random() < 0.1:
+                messages.append(self._message(100 + n, False, creator, "sounds interesting, what's the rate?"))
+        thread_html = (
+            f'<html><body><div role="main"><div role="list" aria-label="Conversation" data-legacy-thread-id="{thread_id}">'
+            + "".join(messages)
+            + "</div></div></body></html>"
+        )
+        expected = {
+            "thread_id": thread_id,
+            "level": min(followups_sent + 1, 3),
+            "followups_sent": followups_sent,
+            "username": handle,
+            "email": {"thread_id": thread_id, "recipient": creator, "display_name": "", "username_hint": None, "labels": []},
+        }
+        return thread_html, expected
+
+    def threads(self, count: int) -> List[Tuple[str, Dict]]:
+        return [self.thread(i) for i in range(count)]
+
+
+def save_fixtures(directory: Path, sent_pages: List[Tuple[str, List[Dict]]], threads: List[Tuple[str, Dict]]):
+    """Write fixtures as sent/page_NNN.html, threads/<id>.html and expected.json."""
+    (directory / "sent").mkdir(parents=True, exist_ok=True)
+    (directory / "threads").mkdir(parents=True, exist_ok=True)
+    manifest = {"sent": [], "threads": []}
+    for n, (page_html, expected) in enumerate(sent_pages, 1):
+        name = f"sent/page_{n:03d}.html"
+        (directory / name).write_text(page_html)
+        manifest["sent"].append({"file": name, "rows": expected})
+    for thread_html, expected in threads:
+        name = f"threads/{expected['thread_id']}.html"
+        (directory / name).write_text(thread_html)
+        manifest["threads"].append({"file": name, **expected})
+    (directory / "expected.json").write_text(json.dumps(manifest, indent=1))
+
+
+def load_fixtures(directory: Path) -> Tuple[List[Tuple[str, List[Dict]]], List[Tuple[str, Dict]]]:
+    """
+    Load saved fixtures (e.g. page.content() captured from a real Gmail session).
+    expected.json lists {"file", "rows": [...]} per Sent page and {"file", ...} per thread;
+    expected keys that are missing aren't scored.
+    """
+    manifest = json.loads((directory / "expected.json").read_text())
+    sent_pages = [((directory / entry["file"]).read_text(), entry.get("rows", [])) for entry in manifest.get("sent", [])]
+    threads = []
+    for entry in manifest.get("threads", []):
+        expected = {k: v for k, v in entry.items() if k != "file"}
+        expected.setdefault("email", {"thread_id": expected.get("thread_id", "")})
+        threads.append(((directory / entry["file"]).read_text(), expected))
+    return sent_pages, threads
+
+
+class Scorer:
+    """Per-field hit/total counts plus a few sample misses for debugging."""
+
+    def __init__(self):
+        self.hits: Dict[str, int] = {}
+        self.totals: Dict[str, int] = {}
+        self.misses: Dict[str, List[str]] = {}
+
+    def check(self, field: str, expected, actual, key: str = ""):
+        if expected is None:
+            return
+        ok = (str(actual or "").lower() == str(expected).lower()) if isinstance(expected, str) else actual == expected
+        self.totals[field] = self.totals.get(field, 0) + 1
+        if ok:
+            self.hits[field] = self.hits.get(field, 0) + 1
+        elif len(self.misses.setdefault(field, [])) < 5:
+            self.misses[field].append(f"{key}: expected {expected!r}, got {actual!r}")
+
+    def accuracy(self) -> Dict[str, float]:
+        return {field: round(self.hits.get(field, 0) / total, 4) for field, total in self.totals.items()}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _stage_summary(timings: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    return {
+        stage: {
+            "count": len(values),
+            "total_s": round(sum(values), 3),
+            "p50_ms": round(_percentile(values, 50) * 1000, 2),
+            "p95_ms": round(_percentile(values, 95) * 1000, 2),
+            "max_ms": round(max(values) * 1000, 2),
+        }
+        for stage, values in timings.items()
+        if values
+    }
+
+
+async def run_benchmark(
+    tool: GmailFollowUp,
+    sent_pages: List[Tuple[str, List[Dict]]],
+    threads: List[Tuple[str, Dict]],
+    followup_templates: Dict[int, str],
+) -> Dict:
+    timings: Dict[str, List[float]] = {
+        "sent.set_content": [], "sent.extract_rows": [],
+        "thread.set_content": [], "thread.detect_level": [], "thread.plan": [],
+    }
+    scorer = Scorer()
+    rows_seen = 0
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        tool.page = page
+        try:
+            for page_num, (page_html, expected_rows) in enumerate(sent_pages, 1):
+                start = time.perf_counter()
+                await page.set_content(page_html)
+                timings["sent.set_content"].append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                emails, info = await tool._extract_page_rows(page_num, page=page)
+                timings["sent.extract_rows"].append(time.perf_counter() - start)
+                rows_seen += info["total"]
+
+                by_id = {email["thread_id"]: email for email in emails}
+                for expected in expected_rows:
+                    thread_id = expected.get("thread_id", "")
+                    email = by_id.get(thread_id)
+                    scorer.check("kept", expected.get("kept"), email is not None, thread_id)
+                    if email is None or not expected.get("kept", True):
+                        continue
+                    scorer.check("thread_id", thread_id, email["thread_id"], thread_id)
+                    scorer.check("username_hint", expected.get("username_hint"), email["username_hint"], thread_id)
+                    scorer.check("recipient", expected.get("recipient"), email["recipient"], thread_id)
+
+            for thread_html, expected in threads:
+                thread_id = expected.get("thread_id", "")
+                start = time.perf_counter()
+                await page.set_content(thread_html)
+                timings["thread.set_content"].append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                level, followups_sent, detected_name = await tool.detect_followup_level(thread_id, page)
+                timings["thread.detect_level"].append(time.perf_counter() - start)
+                scorer.check("level", expected.get("level"), level, thread_id)
+                scorer.check("followups_sent", expected.get("followups_sent"), followups_sent, thread_id)
+
+                email = dict(expected["email"], followup_level=level, followups_sent=followups_sent, detected_name=detected_name)
+                start = time.perf_counter()
+                plan = await tool._plan_followup(email, followup_templates, page)
+                timings["thread.plan"].append(time.perf_counter() - start)
+                if plan["message"]:
+                    scorer.check("username", expected.get("username"), plan["username"], thread_id)
+        finally:
+            await browser.close()
+
+    extract_s = sum(timings["sent.extract_rows"]) or 1e-9
+    thread_s = sum(timings["thread.detect_level"]) + sum(timings["thread.plan"]) or 1e-9
+    return {
+        "rows": rows_seen,
+        "threads": len(threads),
+        "rows_per_s": round(rows_seen / extract_s, 1),
+        "threads_per_s": round(len(threads) / thread_s, 1),
+        "stages": _stage_summary(timings),
+        "accuracy": scorer.accuracy(),
+        "misses": scorer.misses,
+    }
+
+
+def print_report(report: Dict):
+    print(f"\n📊 Extraction benchmark ({report['rows']} rows, {report['threads']} threads)")
+    print(f"   Sent rows:  {report['rows_per_s']:>9.1f} rows/s")
+    print(f"   Threads:    {report['threads_per_s']:>9.1f} threads/s (level + username + render)")
+    print(f"\n   {'stage':<22}{'count':>7}{'total':>10}{'p50':>10}{'p95':>10}{'max':>10}")
+    for stage, s in report["stages"].items():
+        print(f"   {stage:<22}{s['count']:>7}{s['total_s']:>9.2f}s{s['p50_ms']:>8.2f}ms{s['p95_ms']:>8.2f}ms{s['max_ms']:>8.2f}ms")
+    print(f"\n   {'field':<22}{'accuracy':>10}")
+    for field, value in sorted(report["accuracy"].items()):
+        gated = "" if field in GATED_FIELDS else "  (not gated)"
+        print(f"   {field:<22}{value * 100:>9.1f}%{gated}")
+    for field, samples in report["misses"].items():
+        if samples:
+            print(f"   ✗ {field} misses, e.g.:")
+            for sample in samples[:3]:
+                print(f"      {sample}")
+
+
+def load_templates() -> Dict[int, str]:
+    base_path = Path(__file__).parent
+    templates = {}
+    for level in [1, 2, 3]:
+        path = base_path / f"followup_template_level{level}.txt"
+        templates[level] = path.read_text().strip() if path.exists() else "hey {username}, following up!"
+    return templates
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for Gmail row extraction and level detection")
+    parser.add_argument("--rows", type=int, default=5000, help="Synthetic Sent rows (default: 5000)")
+    parser.add_argument("--threads", type=int, default=1000, help="Synthetic threads (default: 1000)")
+    parser.add_argument("--seed", type=int, default=7, help="Fixture generator seed (default: 7)")
+    parser.add_argument("--profile", type=str, help="Sender profile whose wording/sender the fixtures use")
+    parser.add_argument("--days", type=int, default=5, help="Follow-up age in days (default: 5)")
+    parser.add_argument("--fixtures", type=str, help="Replay saved fixtures from this directory instead of generating")
+    parser.add_argument("--save", type=str, help="Write the generated fixtures to this directory")
+    parser.add_argument("--json", type=str, help="Also write the report as JSON to this path")
+    parser.add_argument("--min-accuracy", type=float, default=None, help="Exit 1 if a gated field's accuracy is below this (0-1)")
+    args = parser.parse_args()
+
+    tool = GmailFollowUp(followup_days=args.days, headless=True, profile=args.profile, use_state=False)
+    if args.fixtures:
+        sent_pages, threads = load_fixtures(Path(args.fixtures))
+    else:
+        generator = FixtureGenerator(tool, seed=args.seed)
+        sent_pages = generator.sent_pages(args.rows)
+        threads = generator.threads(args.threads)
+    if args.save:
+        save_fixtures(Path(args.save), sent_pages, threads)
+        print(f"✓ Fixtures written to {args.save}")
+
+    # The tool prints per-thread progress; keep the benchmark output to the report
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        report = await run_benchmark(tool, sent_pages, threads, load_templates())
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+    if args.min_accuracy is not None:
+        failing = {f: v for f, v in report["accuracy"].items() if f in GATED_FIELDS and v < args.min_accuracy}
+        if failing:
+            print(f"\n✗ Accuracy below {args.min_accuracy}: {failing}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -8,12 +8,31 @@ import asyncio
 import os
 import re
 import sys
+import time
+import weakref
+from collections import defaultdict
+from contextvars import ContextVar
 from datetime import datetime, timedelta
+from email.utils import parseaddr
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 
+from followup_plan import (
+    STATUS_FAILED,
+    STATUS_SENDING,
+    STATUS_SENT,
+    STATUS_STALE,
+    PlanCheckpoint,
+    read_plan,
+    write_plan,
+)
+from gmail_api import GmailApiBackend, message_header, thread_messages
+from query_planner import DateWindow, QueryPlanner
+from thread_state import ThreadStateStore
+from wait_budget import WaitBudget
+
 # Try to import yaml
 try:
     import yaml
@@ -56,6 +75,140 @@ USERNAME_REGEXES = [
     re.compile(r"^([a-z0-9_.'’-]{2,})\s*[,–—-]", re.IGNORECASE),
 ]
 
+# Page conditions used instead of fixed sleeps
+LIST_READY_JS = """
+() => {
+    const main = document.querySelector('div[role="main"]');
+    if (!main) return false;
+    if (main.querySelector('tr[role="row"] td')) return true;
+    return /no (sent )?messages|no messages matched/i.test(main.innerText || '');
+}
+"""
+
+GMAIL_READY_JS = """
+() => location.host.includes('accounts.google.com') || !!document.querySelector('div[role="main"]')
+"""
+
+FIRST_ROW_SIGNATURE_JS = """
+() => {
+    const row = document.querySelector('div[role="main"] tr[role="row"]:has(td)');
+    if (!row) return '';
+    return row.getAttribute('data-legacy-thread-id') || (row.innerText || '').slice(0, 120);
+}
+"""
+
+LIST_CHANGED_JS = """
+(previous) => {
+    const row = document.querySelector('div[role="main"] tr[role="row"]:has(td)');
+    if (!row) return false;
+    const signature = row.getAttribute('data-legacy-thread-id') || (row.innerText || '').slice(0, 120);
+    return signature !== previous;
+}
+"""
+
+ROW_COUNT_ABOVE_JS = """
+(previous) => document.querySelectorAll('tr[role="row"]:has(td), tbody tr[role="row"]').length > previous
+"""
+
+SEARCH_RESULTS_JS = """
+() => location.hash.toLowerCase().startsWith('#search') && (
+    !!document.querySelector('div[role="main"] tr[role="row"] td')
+    || /no messages matched/i.test(document.querySelector('div[role="main"]')?.innerText || '')
+)
+"""
+
+MESSAGE_BODY_SELECTOR = ", ".join([
+    'div[aria-label="Message Body"][contenteditable="true"]',
+    'div[role="textbox"][aria-label*="Message"]',
+    'div[contenteditable="true"][aria-label*="Message"]',
+    'div[role="textbox"][g_editable="true"]',
+])
+
+# Sent-list row extractor, injected once per page (see gmail_rows.js)
+ROW_EXTRACTOR_JS = (Path(__file__).parent / "gmail_rows.js").read_text()
+ROW_EXTRACTOR_VERSION = int(re.search(r"const VERSION = (\d+);", ROW_EXTRACTOR_JS).group(1))
+ROW_EXTRACT_CALL_JS = "(options) => window.__followupRows ? window.__followupRows.extract(options) : null"
+RESPONSES_LABEL = "pretti responses"
+# Cap on planner searches per run; past it, windows are paged through instead of split
+MAX_PLAN_SEARCHES = 40
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+class SendPacer:
+    """Spaces out sends from one Gmail account, shared by every tab and profile sending as it."""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._last_send_at = 0.0
+
+    async def wait(self, interval: float):
+        async with self._lock:
+            wait = self._last_send_at + interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_send_at = time.monotonic()
+
+
+# Pacers per event loop (the API's job runner keeps one long-lived loop; each CLI run has its own), then per account
+_send_pacers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, SendPacer]]" = weakref.WeakKeyDictionary()
+
+
+def send_pacer(account: str) -> SendPacer:
+    pacers = _send_pacers.setdefault(asyncio.get_running_loop(), {})
+    return pacers.setdefault((account or "").lower(), SendPacer())
+
+
+class ThreadClaims:
+    """Which profile has taken each thread of one Gmail account during a multi-profile run.
+
+    Profiles sending as the same account see the same Sent threads; the first to
+    reach a thread claims it and the others skip it (see run_profiles).
+    """
+
+    def __init__(self):
+        self._owners: Dict[str, str] = {}
+
+    def claim(self, thread_id: str, profile: str) -> Optional[str]:
+        """Claim a thread for profile; returns the other profile holding it, or None if profile may proceed."""
+        owner = self._owners.setdefault(thread_id, profile)
+        return owner if owner != profile else None
+
+
+# Profile name of the task currently printing, set while running several profiles at once
+_log_prefix: ContextVar[str] = ContextVar("log_prefix", default="")
+
+
+class _ProfileLogStream:
+    """Stdout wrapper that tags each line with the profile that printed it."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._at_line_start = True
+
+    def write(self, text: str) -> int:
+        prefix = _log_prefix.get()
+        if prefix:
+            out = []
+            for chunk in text.splitlines(keepends=True):
+                if self._at_line_start:
+                    out.append(f"[{prefix}] ")
+                out.append(chunk)
+                self._at_line_start = chunk.endswith("\n")
+            self.stream.write("".join(out))
+        else:
+            self.stream.write(text)
+            if text:
+                self._at_line_start = text.endswith("\n")
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
 class GmailFollowUp:
     def __init__(
         self,
@@ -65,6 +218,13 @@ class GmailFollowUp:
         arc_debug_port: int = 9222,
         profile: Optional[str] = None,
         config_path: Optional[str] = None,
+        backend: str = "browser",
+        api_backend: Optional[GmailApiBackend] = None,
+        state_path: Optional[str] = None,
+        use_state: bool = True,
+        full_scan: bool = False,
+        send_interval: float = 1.0,
+        plan_queries: bool = True,
     ):
         """
         Initialize the Gmail Follow-up tool.
@@ -76,6 +236,14 @@ class GmailFollowUp:
             arc_debug_port: Remote debugging port for Arc browser
             profile: Sender profile to use (e.g., "pretti")
             config_path: Path to config.yaml file
+            backend: How candidates are found: "browser" (scrape Sent pages) or "api" (Gmail API)
+            api_backend: Gmail API client to use with backend="api" (default: built from GMAIL_* env vars)
+            state_path: Path to the thread state database (default: followup_state.sqlite3)
+            use_state: Keep per-thread state between sweeps (default: True)
+            full_scan: Re-check every thread even if the state store says it can be skipped
+            send_interval: Minimum seconds between two sends from this account (shared by all worker tabs)
+            plan_queries: Let Gmail filter candidates (age, label, final follow-up) and split
+                large result sets into date windows that each fit one page
         """
         self.followup_days = followup_days
         self.headless = headless
@@ -93,13 +261,61 @@ class GmailFollowUp:
         self._in_thread_view = False
         self._is_paginating = False  # Flag to prevent re-search during pagination
         self.followup_markers: Dict[int, List[str]] = {}
+        self.backend = backend
+        self.api_backend = api_backend
+        self.send_interval = send_interval
+        self.wait_budget = WaitBudget()
+        self.stats: Dict[str, float] = {}
+        # Set by run_profiles / a browser pool so runs share one Playwright driver/browser
+        self.shared_browser: Optional[Browser] = None
+        self.shared_context: Optional[BrowserContext] = None
+        # Pool (job_runner.BrowserPool) to take a warm browser/context from when one is needed
+        self.browser_pool = None
+        # Shared with the other profiles on this account by run_profiles
+        self.thread_claims: Optional[ThreadClaims] = None
+        self._row_extractor_pages: "weakref.WeakSet[Page]" = weakref.WeakSet()
+        # Live counts for callers polling a run in progress
+        self.progress: Dict[str, int] = {"processed": 0, "sent": 0, "failed": 0}
+        # Set when a run stops on an exception it caught (lost login, browser gone, ...)
+        self.error: Optional[str] = None
+        # Threads the API backend returned that could not be turned into an email (never followed up)
+        self.unreadable_threads: List[str] = []
+        self._owns_context = True
+        if self.backend == "api" and self.api_backend is None:
+            self.api_backend = GmailApiBackend.from_env()
         
         # Load profile config
+        self.profile_key = (profile or "default").lower()
         self._load_profile_config()
         self._refresh_followup_markers()
+        # A profile can point at its own browser (e.g. a separate Arc/Chrome instance per account)
+        if self.profile_config.get("arc_debug_port"):
+            self.arc_debug_port = int(self.profile_config["arc_debug_port"])
+        
+        self.query_planner = QueryPlanner(
+            self.sent_search_query,
+            followup_days,
+            exclude_phrases=[self.followup_markers[3][0]],
+        )
+        self.plan_queries = plan_queries
+        self._plan_windows: Optional[List[DateWindow]] = None
+        self._plan_searches = 0
+        
+        self.full_scan = full_scan
+        self.state_store: Optional[ThreadStateStore] = None
+        if use_state:
+            self.state_store = ThreadStateStore(
+                state_path, account=self.profile_config.get("gmail_sender", "")
+            )
         
     async def start_browser(self):
         """Start or connect to browser."""
+        if self.browser_pool is not None:
+            await self.browser_pool.acquire(self)
+        if self.shared_browser is not None:
+            await self._attach_to_shared_browser()
+            return
+        
         playwright = await async_playwright().start()
         
         if self.use_arc:
@@ -131,7 +347,7 @@ class GmailFollowUp:
                 self.browser = await playwright.chromium.launch(headless=self.headless)
                 self.context = await self.browser.new_context(
                     viewport={"width": 1920, "height": 1080},
-                    user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+                    user_agent=USER_AGENT
                 )
         else:
             # Launch new browser
@@ -142,7 +358,8 @@ class GmailFollowUp:
             # Create a new context with realistic settings
             self.context = await self.browser.new_context(
                 viewport={"width": 1920, "height": 1080},
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+                user_agent=USER_AGENT,
+                storage_state=self.profile_config.get("storage_state"),
             )
         
         # Get or create a page
@@ -154,6 +371,33 @@ class GmailFollowUp:
             # Create a new page
             self.page = await self.context.new_page()
     
+    async def _attach_to_shared_browser(self):
+        """
+        Open this profile's tab in a browser shared with other profiles.
+        Arc/CDP browsers keep their logged-in context (each profile gets its own tab);
+        launched browsers give each profile an isolated context.
+        """
+        self.browser = self.shared_browser
+        if self.shared_context is not None:
+            # Warm context handed over by a browser pool; it outlives this run
+            self.context = self.shared_context
+            self._owns_context = False
+        elif self.use_arc and self.browser.contexts:
+            self.context = self.browser.contexts[0]
+            self._owns_context = False
+        else:
+            self.context = await self.create_context(self.browser)
+            self._owns_context = True
+        self.page = await self.context.new_page()
+    
+    async def create_context(self, browser: Browser) -> BrowserContext:
+        """Create an isolated context for this profile (logged in if the profile has a storage_state)."""
+        return await browser.new_context(
+            viewport={"width": 1920, "height": 1080},
+            user_agent=USER_AGENT,
+            storage_state=self.profile_config.get("storage_state"),
+        )
+    
     def _load_profile_config(self):
         """Load sender profile configuration from config.yaml"""
         if not yaml:
@@ -190,6 +434,7 @@ class GmailFollowUp:
                 profile_key = default_profile
             
             self.profile_config = profiles.get(profile_key, {})
+            self.profile_key = profile_key
             print(f"✓ Using sender profile: {profile_key}")
             print(f"   From: {self.profile_config.get('from_name', 'Unknown')}")
             print(f"   App: {self.profile_config.get('app_name', 'Unknown')}")
@@ -228,12 +473,13 @@ class GmailFollowUp:
             ],
         }
     
-    async def _fast_message_area_lookup(self):
+    async def _fast_message_area_lookup(self, page: Optional[Page] = None):
         """
         Quickly locate Gmail's message body by targeting its standard selectors first.
         Returns the locator if found, otherwise None.
         """
-        if not self.page:
+        page = page or self.page
+        if not page:
             return None
         
         fast_selectors = [
@@ -245,7 +491,7 @@ class GmailFollowUp:
         ]
         
         for selector in fast_selectors:
-            locator = self.page.locator(selector)
+            locator = page.locator(selector)
             try:
                 count = await locator.count()
             except Exception:
@@ -287,6 +533,49 @@ class GmailFollowUp:
             return "/" not in fragment_base[len("search/"):]
         return False
     
+    async def _wait_for_condition(
+        self,
+        step: str,
+        expression: str,
+        arg=None,
+        timeout: int = 10000,
+        page: Optional[Page] = None,
+    ) -> bool:
+        """
+        Wait until a JS condition holds on the page, charging the time to the wait budget.
+        Returns False on timeout instead of raising.
+        """
+        page = page or self.page
+        with self.wait_budget.step(step):
+            try:
+                await page.wait_for_function(expression, arg=arg, timeout=timeout)
+                return True
+            except Exception:
+                self.wait_budget.record_timeout(step)
+                return False
+    
+    async def _wait_for_selector(
+        self,
+        step: str,
+        selector: str,
+        timeout: int = 10000,
+        state: str = "visible",
+        page: Optional[Page] = None,
+    ) -> bool:
+        """Wait for a selector to reach a state, charging the time to the wait budget."""
+        page = page or self.page
+        with self.wait_budget.step(step):
+            try:
+                await page.wait_for_selector(selector, state=state, timeout=timeout)
+                return True
+            except Exception:
+                self.wait_budget.record_timeout(step)
+                return False
+    
+    async def _wait_for_list(self, step: str = "list_ready", timeout: int = 10000, page: Optional[Page] = None) -> bool:
+        """Wait until the Sent/search list shows rows (or says it is empty)."""
+        return await self._wait_for_condition(step, LIST_READY_JS, timeout=timeout, page=page)
+    
     async def _return_to_sent_list(self):
         """Return to the Sent/search list view using Gmail's back controls if a thread is open."""
         if not self._in_thread_view:
@@ -314,14 +603,14 @@ class GmailFollowUp:
                 })();
             """)
             if back_clicked:
-                await asyncio.sleep(2)
+                await self._wait_for_list("back_to_list")
         except Exception:
             back_clicked = False
         
         if not back_clicked:
             try:
                 await self.page.go_back()
-                await asyncio.sleep(2)
+                await self._wait_for_list("back_to_list")
                 back_clicked = True
             except Exception:
                 back_clicked = False
@@ -341,7 +630,7 @@ class GmailFollowUp:
             await self.page.goto("https://mail.google.com", wait_until="domcontentloaded", timeout=30000)
         except Exception as e:
             print(f"⚠ Navigation warning: {e}, continuing anyway...")
-        await asyncio.sleep(2)
+        await self._wait_for_condition("gmail_load", GMAIL_READY_JS, timeout=20000)
         
         # Check if we need to log in
         if "accounts.google.com" in self.page.url:
@@ -353,7 +642,7 @@ class GmailFollowUp:
         else:
             print("✓ Already logged in to Gmail")
         
-        await asyncio.sleep(2)
+        await self._wait_for_selector("gmail_load", 'div[role="main"]', timeout=20000)
         
     async def go_to_sent_folder(self, force_search: bool = False):
         """Navigate to the Sent folder and verify we're there."""
@@ -363,17 +652,16 @@ class GmailFollowUp:
             print("Going to Sent folder...")
             
             # First, try direct URL navigation (most reliable)
+            navigated = False
             try:
                 await self.page.goto("https://mail.google.com/mail/u/0/#sent", wait_until="domcontentloaded", timeout=30000)
-                await asyncio.sleep(4)  # Give Gmail time to load emails
+                await self._wait_for_list("sent_folder_load")  # Give Gmail time to load emails
                 
                 # Verify we're actually in sent folder
                 current_url = self.page.url
                 if "#sent" in current_url.lower():
                     print("✓ Navigated to Sent folder (via URL)")
-                    
-                    # Wait a bit more and verify the page shows sent emails
-                    await asyncio.sleep(2)
+                    navigated = True
                     
                     # Check if we can see sent email rows
                     sent_rows = await self.page.evaluate("""
@@ -398,15 +686,19 @@ class GmailFollowUp:
             ]
             
             for selector in sent_selectors:
+                if navigated:
+                    break
                 try:
                     sent_link = self.page.locator(selector).first
                     if await sent_link.is_visible(timeout=5000):
                         await sent_link.click()
-                        await asyncio.sleep(3)
+                        await self._wait_for_condition(
+                            "sent_folder_load", "() => location.hash.toLowerCase().startsWith('#sent')", timeout=5000
+                        )
                         current_url = self.page.url
                         if "#sent" in current_url.lower():
                             print("✓ Navigated to Sent folder (via click)")
-                            await asyncio.sleep(2)
+                            await self._wait_for_list("sent_folder_load")
                             break
                 except Exception as e:
                     continue
@@ -419,10 +711,54 @@ class GmailFollowUp:
         )
         
         if should_search:
-            await self.search_emails(self.sent_search_query)
+            if self.plan_queries and self._plan_windows is None:
+                await self._open_next_search_window()
+            else:
+                await self.search_emails(self.sent_search_query)
         
         self._in_thread_view = False
     
+    async def _open_next_search_window(self) -> bool:
+        """
+        Search the next date window from the query planner. A window whose results
+        spill past one page is split into older/newer halves and searched again, so
+        each search normally fits on a single page.
+        
+        Returns: False once every window has been searched
+        """
+        if self._plan_windows is None:
+            self._plan_windows = self.query_planner.initial_windows()
+        while self._plan_windows:
+            window = self._plan_windows.pop()
+            self.sent_search_query = self.query_planner.query_for(window)
+            await self.search_emails(self.sent_search_query)
+            self._plan_searches += 1
+            
+            pagination = await self.get_pagination_info()
+            rows = await self.page.evaluate("() => document.querySelectorAll('div[role=\"main\"] tr[role=\"row\"]:has(td)').length")
+            total = pagination['total'] if pagination else None
+            label = window.terms() or "all dates"
+            if self.query_planner.overflows(total, rows) and self._plan_searches < MAX_PLAN_SEARCHES:
+                halves = self.query_planner.split(window)
+                if halves:
+                    print(f"   ✂ {total or 'More than a page of'} results for {label}, splitting into "
+                          f"[{halves[0].terms()}] and [{halves[1].terms()}]")
+                    # Newer half is popped first, matching Gmail's newest-first order
+                    self._plan_windows.extend(halves)
+                    continue
+            print(f"   🔎 Window {label}: {total if total is not None else rows} threads")
+            return True
+        return False
+    
+    async def _next_results_page(self, pagination: Optional[Dict[str, int]]) -> bool:
+        """Go to the next page of the current search, or on to the next planned search window."""
+        if not (pagination and pagination['current_end'] >= pagination['total']):
+            if await self.go_to_next_page():
+                return True
+        if not self.plan_queries:
+            return False
+        return await self._open_next_search_window()
+    
     async def search_emails(self, search_query: str):
         """Search for emails using Gmail's search bar."""
         print(f"Searching for: {search_query}...")
@@ -450,7 +786,7 @@ class GmailFollowUp:
             if not search_box:
                 # Try using keyboard shortcut to focus search (Cmd+K or /)
                 await self.page.keyboard.press("Meta+k")
-                await asyncio.sleep(1)
+                await self._wait_for_selector("search_box", ", ".join(search_selectors), timeout=2000)
                 # Try to find the search box again after keyboard shortcut
                 for selector in search_selectors:
                     try:
@@ -463,14 +799,12 @@ class GmailFollowUp:
             if search_box:
                 # Clear any existing text and type the search query
                 await search_box.click()
-                await asyncio.sleep(0.5)
                 await search_box.fill("")  # Clear first
                 await search_box.fill(search_query)
-                await asyncio.sleep(0.5)
                 
                 # Press Enter to search
                 await search_box.press("Enter")
-                await asyncio.sleep(3)  # Wait for search results to load
+                await self._wait_for_condition("search_results", SEARCH_RESULTS_JS)  # Wait for search results to load
                 
                 print(f"✓ Search completed: {search_query}")
                 
@@ -504,7 +838,7 @@ class GmailFollowUp:
                 """)
                 
                 if search_done:
-                    await asyncio.sleep(3)
+                    await self._wait_for_condition("search_results", SEARCH_RESULTS_JS)
                     print(f"✓ Search completed via JavaScript: {search_query}")
                     self._sent_search_initialized = True
                     self._last_search_query = search_query.lower()
@@ -564,7 +898,7 @@ class GmailFollowUp:
                     
                     if clicked:
                         print(f"   Clicked 'Load more' button")
-                        await asyncio.sleep(2)
+                        await self._wait_for_condition("load_more", ROW_COUNT_ABOVE_JS, arg=current_count, timeout=5000)
                         stable_count = 0
                     elif stable_count >= 3:
                         print(f"   Reached end at {current_count} emails")
@@ -585,7 +919,7 @@ class GmailFollowUp:
                         window.scrollTo(0, document.body.scrollHeight);
                     })();
                 """)
-                await asyncio.sleep(1.5)
+                await self._wait_for_condition("load_more", ROW_COUNT_ABOVE_JS, arg=current_count, timeout=1500)
             
             attempts += 1
             
@@ -597,7 +931,6 @@ class GmailFollowUp:
             () => document.querySelectorAll('tr[role="row"]:has(td), tbody tr[role="row"]').length
         """)
         print(f"   Final: {final_count} emails loaded")
-        await asyncio.sleep(1)
     
     async def go_to_next_page(self) -> bool:
         """
@@ -605,6 +938,8 @@ class GmailFollowUp:
         Returns: True if successfully clicked next, False if no next button or on last page
         """
         try:
+            previous_first_row = await self.page.evaluate(FIRST_ROW_SIGNATURE_JS)
+            
             # Find the next arrow button - Gmail uses various selectors
             selectors = [
                 '[aria-label="Older"]',
@@ -640,7 +975,8 @@ class GmailFollowUp:
             
             if next_clicked:
                 print("   → Clicked 'Next' arrow")
-                await asyncio.sleep(3)  # Wait for next page to load
+                # Wait for next page to load (first row changes)
+                await self._wait_for_condition("next_page", LIST_CHANGED_JS, arg=previous_first_row)
                 return True
             else:
                 return False
@@ -709,10 +1045,9 @@ class GmailFollowUp:
             print("Scanning ALL sent emails (no limit)...")
         
         emails = []
-        cutoff_date = datetime.now() - timedelta(days=self.followup_days)
         
         # Wait for initial emails to load
-        await asyncio.sleep(2)
+        await self._wait_for_list()
         
         # Process emails page by page
         page_num = 1
@@ -728,197 +1063,25 @@ class GmailFollowUp:
                 print(f"   Showing {pagination['current_start']}-{pagination['current_end']} of {pagination['total']}")
             
             # Wait for emails to load on current page
-            await asyncio.sleep(2)
-            
-            # Get emails from current page
-            limit_val = limit if limit else 999999
-            sender_email = (self.profile_config.get("gmail_sender") or "").lower()
-            email_data = await self.page.evaluate(
-                r"""
-                (args) => {
-                    const mainArea = document.querySelector('div[role=\"main\"]') || document.body;
-                    const rows = mainArea.querySelectorAll('tbody tr[role=\"row\"], tr[role=\"row\"]:has(td[role=\"gridcell\"])');
-                    const emails = [];
-                    const limit = args?.limit ?? 999999;
-                    const maxRows = Math.min(rows.length, limit);
-                    
-                    for (let i = 0; i < maxRows; i++) {
-                        const row = rows[i];
-                        if (!row.querySelector('td')) continue;
-                        
-                        const text = row.innerText || row.textContent || '';
-                        const cells = row.querySelectorAll('td');
-                        if (cells.length < 2 || text.trim().length < 10) continue;
-                        
-                        let subject = '';
-                        let maxLength = 0;
-                        for (let cell of cells) {
-                            const cellText = cell.innerText || '';
-                            if (cellText.length > maxLength && 
-                                !cellText.match(/^\d+[:]\d+\s*(AM|PM)$/i) &&
-                                !cellText.match(/^\s*[★☆✓]\s*$/)) {
-                                subject = cellText.trim();
-                                maxLength = cellText.length;
-                            }
-                        }
-                        if (!subject || subject.length < 5) {
-                            for (let cell of cells) {
-                                const cellText = cell.innerText || '';
-                                if (cellText.trim().length > subject.length) {
-                                    subject = cellText.trim();
-                                }
-                            }
-                        }
-                        
-                        let dateText = '';
-                        for (let cell of Array.from(cells).reverse()) {
-                            const cellText = cell.innerText || '';
-                            if (cellText.match(/\\d+[:]\\d+|AM|PM|ago|day|week|month|Nov|Dec|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct/i)) {
-                                dateText = cellText.trim();
-                                break;
-                            }
-                        }
-                        
-                        let recipient = '';
-                        const emailMatch = text.match(/\[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Z|a-z]{2,}\/);
-                        if (emailMatch) {
-                            recipient = emailMatch[0];
-                        }
-                        
-                        const threadId = row.getAttribute('data-legacy-thread-id') || row.dataset?.legacyThreadId || '';
-                        
-                        let displayName = '';
-                        const displaySelectors = [
-                            '.yW span[email]',
-                            '.yW span',
-                            'span[email]',
-                            '.bA4 span',
-                            '.y2'
-                        ];
-                        for (const sel of displaySelectors) {
-                            const el = row.querySelector(sel);
-                            if (el && el.innerText && el.innerText.trim().length > 0) {
-                                displayName = el.innerText.trim();
-                                break;
-                            }
-                        }
-                        
-                        // Extract Gmail labels/tags
-                        let labels = [];
-                        const labelSelectors = [
-                            '.ar', // Label chip class
-                            '.at', // Another label class
-                            '.aZ', // Label badge class
-                            'span[aria-label*="Label:"]',
-                            'div[aria-label*="Label:"]',
-                            '.aZo', // Label container
-                            '[data-label-name]'
-                        ];
-                        
-                        for (const sel of labelSelectors) {
-                            const labelEls = row.querySelectorAll(sel);
-                            labelEls.forEach(el => {
-                                const labelText = el.innerText || el.textContent || el.getAttribute('aria-label') || el.getAttribute('data-label-name') || '';
-                                if (labelText && labelText.trim()) {
-                                    // Clean up label text (remove "Label:" prefix if present)
-                                    let cleanLabel = labelText.trim().replace(/^Label:\s*/i, '');
-                                    if (cleanLabel && !labels.includes(cleanLabel)) {
-                                        labels.push(cleanLabel);
-                                    }
-                                }
-                            });
-                        }
-                        
-                        // Also check for labels in the row text directly
-                        const labelPattern = /\[([^\]]+)\]/g;
-                        let match;
-                        while ((match = labelPattern.exec(text)) !== null) {
-                            const labelText = match[1].trim();
-                            if (labelText && !labels.includes(labelText)) {
-                                labels.push(labelText);
-                            }
-                        }
-                        
-                        if (subject || text.trim().length > 10) {
-                            emails.push({
-                                index: i,
-                                subject: subject.substring(0, 150) || '(no subject)',
-                                recipient: recipient,
-                                date_text: dateText,
-                                row_text: text.substring(0, 300),
-                                thread_id: threadId,
-                                display_name: displayName,
-                                labels: labels
-                            });
-                        }
-                    }
-                    return emails;
-                }
-                """,
-                {"limit": limit_val},
-            )
-            # Process emails from current page
-            page_emails_count = 0
-            for email_info in email_data:
-                try:
-                    subject = email_info.get('subject', '').strip()
-                    recipient = email_info.get('recipient', '').strip()
-                    date_text = email_info.get('date_text', '').strip()
-                    row_text = email_info.get('row_text', '').strip()
-                    display_name = email_info.get('display_name', '').strip()
-                    username_hint = (
-                        self._extract_username_from_text(row_text)
-                        or self._extract_username_from_text(subject)
-                        or self._extract_username_from_text(display_name)
-                    )
-                    if not username_hint and recipient:
-                        username_hint = self._sanitize_username(recipient.split("@")[0])
-                    
-                    email_date = self._parse_email_date(date_text)
-                    if not email_date:
-                        email_date = datetime.now() - timedelta(days=1)
-                    
-                    days_old = (datetime.now() - email_date).days if email_date else 0
-                    
-                    emails.append({
-                        "recipient": recipient or "unknown",
-                        "subject": subject or "(no subject)",
-                        "date": email_date,
-                        "date_text": date_text or "unknown",
-                        "index": email_info['index'],
-                        "days_old": days_old,
-                        "page": page_num,  # Track which page this email came from
-                        "username_hint": username_hint,
-                        "thread_id": email_info.get('thread_id', '').strip(),
-                        "display_name": display_name,
-                        "labels": email_info.get('labels', []),  # Include labels/tags
-                    })
-                    processed_count += 1
-                    page_emails_count += 1
-                    
-                    # Check if we've reached the limit
-                    if limit and processed_count >= limit:
-                        print(f"   ✓ Reached limit of {limit} emails")
-                        break
-                        
-                except Exception as e:
-                    continue
+            await self._wait_for_list()
+            
+            # Get emails from current page (tagged / not-due / finished rows are dropped in the page)
+            remaining = limit - processed_count if limit else None
+            page_emails, row_info = await self._extract_page_rows(page_num, limit=remaining)
+            emails.extend(page_emails)
+            processed_count += len(page_emails)
+            self._print_row_drops(row_info)
+            if limit and processed_count >= limit:
+                print(f"   ✓ Reached limit of {limit} emails")
             
-            print(f"   ✓ Found {page_emails_count} emails on page {page_num} (total: {processed_count})")
+            print(f"   ✓ Found {len(page_emails)} emails on page {page_num} (total: {processed_count})")
             
             # Check if we've reached the limit
             if limit and processed_count >= limit:
                 break
             
-            # Check if there's a next page
-            if pagination:
-                # If we're on the last page (current_end >= total), stop
-                if pagination['current_end'] >= pagination['total']:
-                    print(f"   ✓ Reached last page ({pagination['current_end']} of {pagination['total']})")
-                    break
-            
-            # Try to go to next page
-            has_next = await self.go_to_next_page()
+            # Next page of this search, or the next planned search window
+            has_next = await self._next_results_page(pagination)
             if not has_next:
                 print(f"   ✓ No more pages available")
                 break
@@ -928,67 +1091,247 @@ class GmailFollowUp:
         print(f"\n✓ Found {len(emails)} emails total across {page_num} page(s)")
         return emails
     
-    def _parse_email_date(self, date_text: str) -> Optional[datetime]:
-        """Parse Gmail date text into datetime object."""
-        if not date_text:
-            return None
-            
-        try:
-            date_text = date_text.strip()
-            date_lower = date_text.lower()
-            
-            # Handle relative dates FIRST
-            if "minute" in date_lower or "hour" in date_lower or "just now" in date_lower:
-                return datetime.now()
-            
-            if "day" in date_lower:
-                days_match = re.search(r'(\d+)\s*days?', date_lower)
-                if days_match:
-                    days_ago = int(days_match.group(1))
-                    return datetime.now() - timedelta(days=days_ago)
-                if "yesterday" in date_lower:
-                    return datetime.now() - timedelta(days=1)
-                if "today" in date_lower:
-                    return datetime.now()
-            
-            if "week" in date_lower:
-                weeks_match = re.search(r'(\d+)\s*weeks?', date_lower)
-                if weeks_match:
-                    weeks_ago = int(weeks_match.group(1))
-                    return datetime.now() - timedelta(weeks=weeks_ago)
-            
-            if "month" in date_lower:
-                months_match = re.search(r'(\d+)\s*months?', date_lower)
-                if months_match:
-                    months_ago = int(months_match.group(1))
-                    return datetime.now() - timedelta(days=months_ago * 30)
-            
-            # Try parsing absolute dates
-            formats = [
-                "%a, %b %d, %Y, %I:%M %p",  # "Sat, Nov 8, 2025, 6:27 PM"
-                "%a, %b %d, %Y",            # "Mon, Dec 15, 2024"
-                "%b %d, %Y, %I:%M %p",      # "Nov 8, 2025, 6:27 PM"
-                "%b %d, %Y",                # "Dec 15, 2024"
-                "%m/%d/%Y",                 # "12/15/2024"
-                "%Y-%m-%d",                 # "2024-12-15"
-                "%d %b %Y",                 # "15 Dec 2024"
-                "%d %B %Y",                 # "15 December 2024"
-            ]
-            
-            for fmt in formats:
-                try:
-                    parsed = datetime.strptime(date_text, fmt)
-                    if parsed.year == 1900:
-                        parsed = parsed.replace(year=datetime.now().year)
-                    return parsed
-                except:
-                    continue
+    async def _extract_page_rows(
+        self,
+        page_num: int,
+        limit: Optional[int] = None,
+        page: Optional[Page] = None,
+    ) -> Tuple[List[Dict], Dict[str, int]]:
+        """
+        Read the current Sent list page with the injected row extractor (gmail_rows.js).
+        Rows tagged 'pretti responses', newer than followup_days, or showing our final
+        follow-up are filtered out in the page; tagged ones are still recorded in the
+        thread state store.
+        
+        Returns:
+            (email dicts for rows that need a look, {"total", "tagged", "recent", "final"} row counts)
+        """
+        page = page or self.page
+        if page not in self._row_extractor_pages:
+            # Survives Gmail reloads; the evaluate fallback below covers the already-loaded document
+            await page.add_init_script(script=ROW_EXTRACTOR_JS)
+            self._row_extractor_pages.add(page)
+        options = {
+            "limit": limit,
+            "followupDays": self.followup_days,
+            "skipLabel": RESPONSES_LABEL,
+            "finalMarkers": self.followup_markers.get(3, []),
+            "genericNames": sorted(GENERIC_NAME_TOKENS),
+        }
+        result = await page.evaluate(ROW_EXTRACT_CALL_JS, options)
+        if not result or result.get("version") != ROW_EXTRACTOR_VERSION:
+            await page.evaluate(ROW_EXTRACTOR_JS)
+            result = await page.evaluate(ROW_EXTRACT_CALL_JS, options)
+        
+        for thread_id, date_text, epoch in result["tagged"]:
+            self._remember_seen({
+                "thread_id": thread_id,
+                "date_text": date_text,
+                "date": datetime.fromtimestamp(epoch / 1000) if epoch else None,
+                "labels": [RESPONSES_LABEL],
+            })
+        
+        now = datetime.now()
+        emails = []
+        for index, thread_id, epoch, date_text, recipient, username_hint, flags, subject, display_name, labels in result["rows"]:
+            if epoch is not None:
+                email_date = datetime.fromtimestamp(epoch / 1000)
+            else:
+                # Unparseable date: assume it's old enough
+                email_date = now - timedelta(days=self.followup_days + 10)
+            emails.append({
+                "recipient": recipient or "unknown",
+                "subject": subject or "(no subject)",
+                "date": email_date,
+                "date_text": date_text or "unknown",
+                "index": index,
+                "days_old": (now - email_date).days,
+                "page": page_num,
+                "username_hint": username_hint or None,
+                "thread_id": thread_id,
+                "display_name": display_name,
+                "labels": labels or [],  # Include labels/tags
+            })
+        info = {"total": result["total"], **result["dropped"]}
+        return emails, info
+    
+    def _print_row_drops(self, info: Dict[str, int]):
+        dropped = info["tagged"] + info["recent"] + info["final"]
+        if dropped:
+            print(f"   ⏭ Filtered in page: {info['tagged']} tagged, {info['recent']} not due "
+                  f"(< {self.followup_days} days), {info['final']} final follow-up sent")
+    
+    def _api_candidate_query(self) -> str:
+        """Gmail search query used to list candidate threads through the API (no paging limits, so no windows)."""
+        return self.query_planner.base_query()
+    
+    async def get_sent_emails_api(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Get sent threads that might need follow-ups via the Gmail API.
+        Thread bodies are fetched in batches and the follow-up level is worked out
+        here, so threads never have to be opened in the browser just to be read.
+        
+        Args:
+            limit: Maximum number of threads to list
             
-            # If we can't parse, assume it's old enough
-            return datetime.now() - timedelta(days=self.followup_days + 10)
-                
-        except Exception as e:
-            return datetime.now() - timedelta(days=self.followup_days + 10)
+        Returns:
+            List of email dictionaries in the same shape as get_sent_emails, plus
+            precomputed followup_level / followups_sent / detected_name
+        """
+        self.unreadable_threads = []
+        query = self._api_candidate_query()
+        print(f"Listing sent threads via Gmail API: {query}")
+        summaries = await asyncio.to_thread(self.api_backend.list_thread_ids, query, limit)
+        print(f"✓ Found {len(summaries)} threads matching search")
+        if not summaries:
+            return []
+        
+        unchanged = 0
+        if self.state_store and not self.full_scan:
+            changed = []
+            for summary in summaries:
+                if self.state_store.skip_reason(summary["id"], summary.get("historyId", ""), self.followup_days):
+                    unchanged += 1
+                else:
+                    changed.append(summary)
+            summaries = changed
+            if unchanged:
+                print(f"   ⏭ {unchanged} threads unchanged since last sweep and not due (thread state)")
+        
+        label_names = await asyncio.to_thread(self.api_backend.list_label_names)
+        threads = await asyncio.to_thread(self.api_backend.get_threads, [t["id"] for t in summaries])
+        print(f"✓ Fetched {len(threads)} thread bodies")
+        
+        emails = []
+        not_due = 0
+        for index, summary in enumerate(summaries):
+            thread = threads.get(summary["id"])
+            if not thread or not thread.get("messages"):
+                continue
+            try:
+                email = self._email_from_api_thread(thread, index, label_names)
+            except Exception as e:
+                self.unreadable_threads.append(summary["id"])
+                print(f"   ⚠ Could not read thread {summary['id']} from its API payload: {type(e).__name__}: {e}")
+                continue
+            self._remember_seen(
+                email,
+                level_sent=email["followups_sent"],
+                username=email["detected_name"],
+            )
+            if email["days_old"] < self.followup_days:
+                not_due += 1
+                continue
+            emails.append(email)
+        
+        if not_due:
+            print(f"   ⏭ {not_due} threads had activity in the last {self.followup_days} days (not due yet)")
+        if self.unreadable_threads:
+            print(f"   ⚠ {len(self.unreadable_threads)} threads could not be read and won't be followed up")
+        print(f"✓ {len(emails)} threads ready for follow-up checks")
+        return emails
+    
+    def _email_from_api_thread(self, thread: Dict, index: int, label_names: Dict[str, str]) -> Dict:
+        """Build an email dictionary (see get_sent_emails) from a threads.get payload."""
+        sender_email = (self.profile_config.get("gmail_sender") or "").lower()
+        sender_name = (self.profile_config.get("from_name") or "").lower()
+        messages = thread["messages"]
+        first, last = messages[0], messages[-1]
+        
+        subject = message_header(first, "Subject").strip()
+        display_name, recipient = parseaddr(message_header(first, "To"))
+        snippet = (last.get("snippet") or thread.get("snippet") or "").strip()
+        username_hint = (
+            self._extract_username_from_text(snippet)
+            or self._extract_username_from_text(subject)
+            or self._extract_username_from_text(display_name)
+        )
+        if not username_hint and recipient:
+            username_hint = self._sanitize_username(recipient.split("@")[0])
+        
+        email_date = datetime.fromtimestamp(int(last.get("internalDate", 0)) / 1000)
+        
+        labels = []
+        for message in messages:
+            for label_id in message.get("labelIds") or []:
+                name = label_names.get(label_id)
+                if name and name not in labels:
+                    labels.append(name)
+        
+        followup_level, followups_sent, detected_name = self._level_from_messages(
+            thread_messages(thread, sender_email, sender_name)
+        )
+        
+        return {
+            "recipient": recipient or "unknown",
+            "subject": subject or "(no subject)",
+            "date": email_date,
+            "date_text": email_date.strftime("%b %d, %Y"),
+            "index": index,
+            "days_old": (datetime.now() - email_date).days,
+            "page": 1,
+            "username_hint": username_hint,
+            "thread_id": thread["id"],
+            "display_name": display_name,
+            "labels": labels,
+            "source": "api",
+            "message_count": len(messages),
+            "history_id": thread.get("historyId", ""),
+            "followup_level": followup_level,
+            "followups_sent": followups_sent,
+            "detected_name": detected_name,
+        }
+    
+    def _seen_marker(self, email: Dict) -> str:
+        """Value that changes whenever a thread gets a new message (Gmail historyId or the row's date text)."""
+        return str(email.get("history_id") or email.get("date_text") or "")
+    
+    def _state_skip_reason(self, email: Dict) -> Optional[str]:
+        """Reason to skip a thread based on the thread state store, or None if it needs a look."""
+        if not self.state_store or self.full_scan:
+            return None
+        return self.state_store.skip_reason(
+            (email.get("thread_id") or "").strip(), self._seen_marker(email), self.followup_days
+        )
+    
+    def _remember_seen(self, email: Dict, level_sent: Optional[int] = None, username: Optional[str] = None):
+        """Record what we learned about a thread in the state store."""
+        if not self.state_store:
+            return
+        labels = [l.lower() for l in email.get("labels", [])]
+        self.state_store.record_seen(
+            (email.get("thread_id") or "").strip(),
+            self._seen_marker(email),
+            level_sent=level_sent,
+            username=username,
+            responded="pretti responses" in labels,
+            message_count=email.get("message_count"),
+            last_activity_at=email.get("date"),
+        )
+    
+    def _claimed_by(self, thread_id: str) -> Optional[str]:
+        """Profile on the same account that already took this thread in this run, if any."""
+        if self.thread_claims is None or not thread_id:
+            return None
+        return self.thread_claims.claim(thread_id, self.profile_key)
+    
+    def _queue_skip_reason(self, email: Dict) -> Optional[str]:
+        """
+        Why a collected candidate shouldn't be opened by thread id, or None if it should.
+        
+        Returns: "tagged", "finished", "no_thread_id", "unchanged" or None
+        """
+        labels = [l.lower() for l in email.get('labels', [])]
+        if 'pretti responses' in labels:
+            self._remember_seen(email)
+            return "tagged"
+        if email.get('followups_sent', 0) >= 3:
+            return "finished"
+        if not email.get('thread_id'):
+            return "no_thread_id"
+        if self._state_skip_reason(email):
+            return "unchanged"
+        return None
     
     def _sanitize_username(self, username: Optional[str]) -> Optional[str]:
         """Clean up extracted username/handle to avoid garbage values."""
@@ -1041,14 +1384,14 @@ class GmailFollowUp:
                     return candidate
         return None
     
-    async def detect_followup_level(self, thread_id: str = "") -> Tuple[int, int, Optional[str]]:
+    async def detect_followup_level(self, thread_id: str = "", page: Optional[Page] = None) -> Tuple[int, int, Optional[str]]:
         """Determine next follow-up level by scanning our prior messages in the thread."""
+        page = page or self.page
         sender_email = (self.profile_config.get("gmail_sender") or "").lower()
         sender_name = (self.profile_config.get("from_name") or "").lower()
-        markers = {int(k): v for k, v in self.followup_markers.items()}
         
         try:
-            messages = await self.page.evaluate(
+            messages = await page.evaluate(
                 """
                 (args) => {
                     const senderEmail = (args?.senderEmail || "").toLowerCase();
@@ -1131,578 +1474,682 @@ class GmailFollowUp:
             if not isinstance(messages, list) or not messages:
                 messages = []
             
-            if messages and not any(m.get("fromMe") for m in messages):
-                messages[0]["fromMe"] = True
-            
-            # Count messages from us for debugging
-            my_messages = [m for m in messages if m.get("fromMe")]
-            
-            highest_level = 0
-            detected_name: Optional[str] = None
-            # Process messages in reverse order (most recent first) to get name from latest follow-up
-            for msg in reversed(messages):
-                if not msg.get("fromMe"):
-                    continue
-                text = (msg.get("text") or "")
-                text_lower = text.lower()
-                # Extract name from this message (prioritize most recent)
-                if not detected_name:
-                    name_candidate = self._extract_username_from_text(text)
-                    if name_candidate:
-                        detected_name = name_candidate
-                # Check for follow-up level markers
-                for level in sorted(markers.keys(), reverse=True):
-                    phrases = markers[level]
-                    if any((phrase or "").lower() in text_lower for phrase in phrases):
-                        highest_level = max(highest_level, level)
-                        break
-            
-            if highest_level <= 0:
-                next_level = 1
-            elif highest_level == 1:
-                next_level = 2
-            elif highest_level == 2:
-                next_level = 3
-            else:
-                next_level = 3
-            
-            return next_level, highest_level, detected_name
+            return self._level_from_messages(messages)
         
         except Exception as e:
             print(f"   ⚠ Could not detect follow-up level: {str(e)[:50]}, defaulting to level 1")
             return 1, 0, None
+    
+    def _level_from_messages(self, messages: List[Dict]) -> Tuple[int, int, Optional[str]]:
+        """
+        Work out the follow-up level from a thread's messages.
+        
+        Args:
+            messages: List of {"fromMe": bool, "text": str} dicts in thread order
+            
+        Returns:
+            (next_level, highest_level_already_sent, detected_name)
+        """
+        markers = {int(k): v for k, v in self.followup_markers.items()}
+        
+        if messages and not any(m.get("fromMe") for m in messages):
+            messages[0]["fromMe"] = True
+        
+        highest_level = 0
+        detected_name: Optional[str] = None
+        # Process messages in reverse order (most recent first) to get name from latest follow-up
+        for msg in reversed(messages):
+            if not msg.get("fromMe"):
+                continue
+            text = (msg.get("text") or "")
+            text_lower = text.lower()
+            # Extract name from this message (prioritize most recent)
+            if not detected_name:
+                name_candidate = self._extract_username_from_text(text)
+                if name_candidate:
+                    detected_name = name_candidate
+            # Check for follow-up level markers
+            for level in sorted(markers.keys(), reverse=True):
+                phrases = markers[level]
+                if any((phrase or "").lower() in text_lower for phrase in phrases):
+                    highest_level = max(highest_level, level)
+                    break
+        
+        if highest_level <= 0:
+            next_level = 1
+        elif highest_level == 1:
+            next_level = 2
+        elif highest_level == 2:
+            next_level = 3
+        else:
+            next_level = 3
+        
+        return next_level, highest_level, detected_name
 
-    async def process_email_fast(self, email: Dict, followup_templates: Dict[int, str]) -> Tuple[bool, Optional[str], int]:
+    async def process_email_fast(
+        self,
+        email: Dict,
+        followup_templates: Dict[int, str],
+        page: Optional[Page] = None,
+    ) -> Tuple[bool, Optional[str], int]:
         """
         Process one email: detect level, extract username, send follow-up.
+        
+        Args:
+            email: Email dictionary from get_sent_emails / get_sent_emails_api
+            followup_templates: Templates by follow-up level
+            page: Worker tab to use instead of self.page; the thread is opened by id
+        
         Returns: (success: bool, username: str or None, level: int)
         """
-        email_index = email["index"]
-        sender_email = (self.profile_config.get("gmail_sender") or "").lower()
-        sender_name = (self.profile_config.get("from_name") or "").lower()
+        with self.wait_budget.email(email.get("thread_id") or email.get("subject") or ""):
+            result = await self._process_email(email, followup_templates, page)
+        self.progress["processed"] += 1
+        self.progress["sent" if result[0] else "failed"] += 1
+        return result
+    
+    async def _process_email(
+        self,
+        email: Dict,
+        followup_templates: Dict[int, str],
+        page: Optional[Page] = None,
+    ) -> Tuple[bool, Optional[str], int]:
+        """Body of process_email_fast (see there)."""
+        worker_page = page is not None
+        page = page or self.page
         result: Tuple[bool, Optional[str], int] = (False, None, 1)
         
         thread_id = (email.get("thread_id") or "").strip()
+        # API candidates and worker tabs have no Sent list to click in, so open them by thread id instead
+        open_directly = (worker_page or email.get("source") == "api") and bool(thread_id)
 
         try:
             # Verify we're still in sent folder before clicking
             # Skip this check during pagination as we're already in the right place
-            if not self._is_paginating and not self._is_in_sent_list_view():
+            if not open_directly and not self._is_paginating and not self._is_in_sent_list_view():
                 print("   ⚠ Not in sent folder, navigating...")
                 await self.go_to_sent_folder()
-                await asyncio.sleep(2)
-            
-            # Step 1: Click on email - use JavaScript to ensure we're clicking sent emails from main area
-            clicked = False
-            if thread_id:
-                clicked = await self.page.evaluate(
-                    """
-                    (threadId) => {
-                        const selector = `tr[data-legacy-thread-id="${threadId}"]`;
-                        const row = document.querySelector(selector);
-                        if (row) {
-                            row.scrollIntoView({block: 'center', behavior: 'auto'});
-                            row.click();
-                            return true;
-                        }
-                        return false;
-                    }
-                    """,
-                    thread_id,
-                )
             
-            if not clicked:
-                clicked = await self.page.evaluate(f"""
-                    (() => {{
-                        const mainArea = document.querySelector('div[role="main"]');
-                        if (!mainArea) {{
-                            return false;
-                        }}
-                        const rows = mainArea.querySelectorAll('tbody tr[role="row"]');
-                        if (rows.length <= {email_index}) {{
-                            return false;
-                        }}
-                        const row = rows[{email_index}];
-                        if (!row || !row.querySelector('td')) {{
-                            return false;
-                        }}
-                        row.scrollIntoView({{block: 'center', behavior: 'auto'}});
-                        row.click();
-                        return true;
-                    }})();
-                """)
+            if not await self._open_email_thread(email, page, open_directly):
+                return False, None, 1
             
-            # Wait for email to open
-            await asyncio.sleep(1)
+            plan = await self._plan_followup(email, followup_templates, page)
+            if not plan["message"]:
+                return False, None, plan["level"]
             
-            if not clicked:
-                print("   ⚠ Could not click email row")
-                return False, None, 1
+            result = await self._send_planned_reply(plan, page)
+            return result
             
-            await asyncio.sleep(3)  # Wait longer for email thread to open
-            self._in_thread_view = True
+        except Exception as e:
+            print(f"   ✗ Error: {str(e)[:50]}")
             try:
-                await self.page.wait_for_selector('div[data-message-id], div[jsmodel][data-message-id]', timeout=7000)
+                await page.keyboard.press("Escape")
             except:
                 pass
-            try:
-                await self.page.wait_for_function(
-                    """
-                    () => {
-                        const main = document.querySelector('div[role="main"]');
-                        if (!main) return false;
-                        const tableRows = main.querySelectorAll('tbody tr[role="row"]');
-                        return tableRows.length === 0;
-                    }
-                    """,
-                    timeout=7000,
-                )
-            except Exception:
-                pass
-            
-            # Expand all collapsed messages in the thread before detecting level
-            try:
-                expanded = await self.page.evaluate(
-                    """
-                    () => {
-                        let count = 0;
-                        // Expand any collapsed messages
-                        const expanders = document.querySelectorAll('.ajT .ajV, .ajT span[role="link"], .ajT span[role="button"], span[role="button"][aria-label*="Show trimmed"]');
-                        expanders.forEach(btn => {
-                            try { 
-                                btn.click(); 
-                                count++;
-                            } catch (e) {}
-                        });
-                        return count;
+            result = (False, None, 1)
+            return result
+        
+        finally:
+            # Threads opened by URL have no list to go back to - the next one is opened by URL too
+            if not open_directly and self._in_thread_view:
+                await self._return_to_sent_list()
+        return result
+    
+    async def _open_email_thread(self, email: Dict, page: Page, open_directly: bool) -> bool:
+        """Open an email's thread (by URL or by clicking its Sent row) and expand collapsed messages."""
+        thread_id = (email.get("thread_id") or "").strip()
+        email_index = email.get("index", 0)
+        # Step 1: Click on email - use JavaScript to ensure we're clicking sent emails from main area
+        clicked = False
+        if open_directly:
+            clicked = await self._open_thread_by_id(thread_id, page)
+        elif thread_id:
+            clicked = await page.evaluate(
+                """
+                (threadId) => {
+                    const selector = `tr[data-legacy-thread-id="${threadId}"]`;
+                    const row = document.querySelector(selector);
+                    if (row) {
+                        row.scrollIntoView({block: 'center', behavior: 'auto'});
+                        row.click();
+                        return true;
                     }
-                    """
+                    return false;
+                }
+                """,
+                thread_id,
+            )
+        
+        if not clicked and not open_directly:
+            clicked = await page.evaluate(f"""
+                (() => {{
+                    const mainArea = document.querySelector('div[role="main"]');
+                    if (!mainArea) {{
+                        return false;
+                    }}
+                    const rows = mainArea.querySelectorAll('tbody tr[role="row"]');
+                    if (rows.length <= {email_index}) {{
+                        return false;
+                    }}
+                    const row = rows[{email_index}];
+                    if (!row || !row.querySelector('td')) {{
+                        return false;
+                    }}
+                    row.scrollIntoView({{block: 'center', behavior: 'auto'}});
+                    row.click();
+                    return true;
+                }})();
+            """)
+        
+        if not clicked:
+            print("   ⚠ Could not click email row")
+            return False
+        
+        if not open_directly:
+            self._in_thread_view = True
+        # Wait for email thread to open
+        await self._wait_for_selector(
+            "thread_open", 'div[data-message-id], div[jsmodel][data-message-id]', timeout=7000, page=page
+        )
+        await self._wait_for_condition(
+            "thread_open",
+            """
+            () => {
+                const main = document.querySelector('div[role="main"]');
+                if (!main) return false;
+                const tableRows = main.querySelectorAll('tbody tr[role="row"]');
+                return tableRows.length === 0;
+            }
+            """,
+            timeout=7000,
+            page=page,
+        )
+        
+        # Expand all collapsed messages in the thread before detecting level
+        try:
+            bodies_before = await page.evaluate("() => document.querySelectorAll('div[data-message-id] .a3s').length")
+            expanded = await page.evaluate(
+                """
+                () => {
+                    let count = 0;
+                    // Expand any collapsed messages
+                    const expanders = document.querySelectorAll('.ajT .ajV, .ajT span[role="link"], .ajT span[role="button"], span[role="button"][aria-label*="Show trimmed"]');
+                    expanders.forEach(btn => {
+                        try { 
+                            btn.click(); 
+                            count++;
+                        } catch (e) {}
+                    });
+                    return count;
+                }
+                """
+            )
+            if expanded > 0:
+                # Wait for expansion to complete (more message bodies rendered)
+                await self._wait_for_condition(
+                    "thread_expand",
+                    "(before) => document.querySelectorAll('div[data-message-id] .a3s').length > before",
+                    arg=bodies_before,
+                    timeout=1500,
+                    page=page,
                 )
-                if expanded > 0:
-                    await asyncio.sleep(1.5)  # Wait for expansion to complete
-            except:
-                pass
-            
-            # Step 2: Detect follow-up level
-            followup_level, followups_sent, detected_name = await self.detect_followup_level(thread_id)
-            if followups_sent >= 3:
-                print("   📊 Detected follow-up level: 3 (already sent final follow-up) — skipping thread")
-                return False, None, followup_level
-            print(f"   📊 Detected follow-up level: {followup_level}")
-            
-            # Step 3: Extract username intelligently - PRIORITIZE current email's subject/row text FIRST
-            # This prevents reusing old usernames from previous follow-ups in the thread
-            username = None
-            
-            # FIRST: Try to extract from the current email's subject/row text (most reliable)
-            username_hint = email.get("username_hint")
-            if username_hint:
-                username = self._sanitize_username(username_hint)
-            
-            # SECOND: Try display name from the email row
-            if not username:
-                display_name = email.get("display_name", "")
-                if display_name:
-                    username = self._sanitize_username(display_name)
-                    if not username:
-                        username = self._extract_username_from_text(display_name)
-                        username = self._sanitize_username(username)
-            # THIRD: Try detected_name from detect_followup_level (might have old username)
-            if not username:
-                username = detected_name
-                if username:
+        except:
+            pass
+        return True
+    
+    async def _plan_followup(self, email: Dict, followup_templates: Dict[int, str], page: Optional[Page]) -> Dict:
+        """
+        Work out the next follow-up for an open thread: level, username and rendered message.
+        With page=None (Gmail API candidates) the thread DOM isn't consulted for the username.
+        
+        Returns: {"thread_id", "level", "followups_sent", "username", "message"}; message is None
+                 when the final follow-up was already sent
+        """
+        thread_id = (email.get("thread_id") or "").strip()
+        sender_email = (self.profile_config.get("gmail_sender") or "").lower()
+        sender_name = (self.profile_config.get("from_name") or "").lower()
+        
+        # Step 2: Detect follow-up level (API candidates already carry it)
+        if email.get("followup_level"):
+            followup_level = email["followup_level"]
+            followups_sent = email.get("followups_sent", 0)
+            detected_name = email.get("detected_name")
+        else:
+            followup_level, followups_sent, detected_name = await self.detect_followup_level(thread_id, page)
+        self._remember_seen(email, level_sent=followups_sent, username=detected_name)
+        plan = {
+            "thread_id": thread_id,
+            "level": followup_level,
+            "followups_sent": followups_sent,
+            "username": None,
+            "message": None,
+        }
+        if followups_sent >= 3:
+            print("   📊 Detected follow-up level: 3 (already sent final follow-up) — skipping thread")
+            return plan
+        print(f"   📊 Detected follow-up level: {followup_level}")
+        
+        # Step 3: Extract username intelligently - PRIORITIZE current email's subject/row text FIRST
+        # This prevents reusing old usernames from previous follow-ups in the thread
+        username = None
+        
+        # FIRST: Try to extract from the current email's subject/row text (most reliable)
+        username_hint = email.get("username_hint")
+        if username_hint:
+            username = self._sanitize_username(username_hint)
+        
+        # SECOND: Try display name from the email row
+        if not username:
+            display_name = email.get("display_name", "")
+            if display_name:
+                username = self._sanitize_username(display_name)
+                if not username:
+                    username = self._extract_username_from_text(display_name)
                     username = self._sanitize_username(username)
-            
-            # FOURTH: Try extracting from thread messages (last resort - might have old usernames)
-            if not username:
-                username = await self.page.evaluate(
-            r"""
-            (args) => {
-                const senderEmail = (args?.senderEmail || "").toLowerCase();
-                const senderName = (args?.senderName || "").toLowerCase();
-                    const normalize = (value) => (value || "").trim().toLowerCase();
-                    
-                    const stripQuotes = (element) => {
-                        if (!element) return "";
-                        const clone = element.cloneNode(true);
-                        clone.querySelectorAll('.gmail_quote, blockquote, .yj6qo, .adL').forEach(node => node.remove());
-                        return clone.innerText || clone.textContent || "";
-                    };
+        # THIRD: Try detected_name from detect_followup_level (might have old username)
+        if not username:
+            username = detected_name
+            if username:
+                username = self._sanitize_username(username)
+        
+        # FOURTH: Try extracting from thread messages (last resort - might have old usernames)
+        if not username and page is not None:
+            username = await page.evaluate(
+        r"""
+        (args) => {
+            const senderEmail = (args?.senderEmail || "").toLowerCase();
+            const senderName = (args?.senderName || "").toLowerCase();
+                const normalize = (value) => (value || "").trim().toLowerCase();
+                
+                const stripQuotes = (element) => {
+                    if (!element) return "";
+                    const clone = element.cloneNode(true);
+                    clone.querySelectorAll('.gmail_quote, blockquote, .yj6qo, .adL').forEach(node => node.remove());
+                    return clone.innerText || clone.textContent || "";
+                };
+                
+                const determineFromMe = (msg) => {
+                    const senderEl = msg.querySelector('[email], span[email], .gD, .gB, .go, .gF');
+                    const emailAttr = normalize(senderEl?.getAttribute('email')) || normalize(senderEl?.getAttribute('data-hovercard-id'));
+                    const label = normalize(senderEl?.getAttribute('aria-label'));
+                    const senderText = normalize(senderEl?.innerText);
                     
-                    const determineFromMe = (msg) => {
-                        const senderEl = msg.querySelector('[email], span[email], .gD, .gB, .go, .gF');
-                        const emailAttr = normalize(senderEl?.getAttribute('email')) || normalize(senderEl?.getAttribute('data-hovercard-id'));
-                        const label = normalize(senderEl?.getAttribute('aria-label'));
-                        const senderText = normalize(senderEl?.innerText);
-                        
-                        let fromMe = false;
-                        if (senderEmail) {
-                            if (emailAttr) {
-                                fromMe = emailAttr === senderEmail;
-                            } else if (label && label.includes(senderEmail)) {
-                                fromMe = true;
-                            } else if (senderText && senderText.includes(senderEmail)) {
-                                fromMe = true;
-                            }
+                    let fromMe = false;
+                    if (senderEmail) {
+                        if (emailAttr) {
+                            fromMe = emailAttr === senderEmail;
+                        } else if (label && label.includes(senderEmail)) {
+                            fromMe = true;
+                        } else if (senderText && senderText.includes(senderEmail)) {
+                            fromMe = true;
                         }
-                        if (!fromMe && senderName) {
-                            if (senderText && (senderText.includes(senderName) || senderText === "me")) {
-                                fromMe = true;
-                            } else if (label && label.includes(senderName)) {
-                                fromMe = true;
-                            }
+                    }
+                    if (!fromMe && senderName) {
+                        if (senderText && (senderText.includes(senderName) || senderText === "me")) {
+                            fromMe = true;
+                        } else if (label && label.includes(senderName)) {
+                            fromMe = true;
                         }
-                        return fromMe;
-                    };
+                    }
+                    return fromMe;
+                };
+                
+                const scanTexts = (texts) => {
+                    // Try multiple patterns to catch usernames
+                    const patterns = [
+                        /(?:hey|hi|hello|heyyy|hiya|yo|sup)\s+@?([a-z0-9_.''-]{2,})/i,
+                        /^([a-z0-9_.''-]{2,})\s*[,–—-]/i,
+                        /@([a-z0-9_.''-]{2,})/i,
+                    ];
                     
-                    const scanTexts = (texts) => {
-                        // Try multiple patterns to catch usernames
-                        const patterns = [
-                            /(?:hey|hi|hello|heyyy|hiya|yo|sup)\s+@?([a-z0-9_.''-]{2,})/i,
-                            /^([a-z0-9_.''-]{2,})\s*[,–—-]/i,
-                            /@([a-z0-9_.''-]{2,})/i,
-                        ];
-                        
-                        // Helper to check if candidate looks like a domain
-                        const isDomainLike = (candidate) => {
-                            const lower = candidate.toLowerCase();
-                            // Reject if it contains a dot and ends with common TLD
-                            const commonTlds = ['.com', '.net', '.org', '.io', '.so', '.co', '.app', '.dev', '.ai', '.me'];
-                            for (const tld of commonTlds) {
-                                if (lower.endsWith(tld)) return true;
-                            }
-                            // Reject short strings with dots (likely domains like "a17.so")
-                            if (candidate.includes('.') && candidate.length <= 10) return true;
-                            // Reject domain patterns
-                            if (/^[a-z0-9]+\.(com|net|org|io|so|co|app|dev|ai|me)$/i.test(candidate)) return true;
-                            return false;
-                        };
-                        
-                        for (const text of texts) {
-                            if (!text) continue;
-                            for (const pattern of patterns) {
-                                const match = text.match(pattern);
-                                if (match && match[1]) {
-                                    const candidate = match[1].trim();
-                                    // Filter out generic words and domain-like patterns
-                                    const generic = ['me', 'there', 'you', 'friend', 'friends', 'everyone', 'everybody', 'a17', 'a17.so'];
-                                    if (candidate && candidate.length >= 2 && 
-                                        !generic.includes(candidate.toLowerCase()) &&
-                                        !isDomainLike(candidate)) {
-                                        return candidate;
-                                    }
-                                }
-                            }
+                    // Helper to check if candidate looks like a domain
+                    const isDomainLike = (candidate) => {
+                        const lower = candidate.toLowerCase();
+                        // Reject if it contains a dot and ends with common TLD
+                        const commonTlds = ['.com', '.net', '.org', '.io', '.so', '.co', '.app', '.dev', '.ai', '.me'];
+                        for (const tld of commonTlds) {
+                            if (lower.endsWith(tld)) return true;
                         }
-                        return null;
+                        // Reject short strings with dots (likely domains like "a17.so")
+                        if (candidate.includes('.') && candidate.length <= 10) return true;
+                        // Reject domain patterns
+                        if (/^[a-z0-9]+\.(com|net|org|io|so|co|app|dev|ai|me)$/i.test(candidate)) return true;
+                        return false;
                     };
                     
-                    const messages = Array.from(document.querySelectorAll('div[role="listitem"], div[data-message-id], div[jsmodel]'));
-                    if (!messages.length) return null;
-                    
-                    const fromMeTexts = [];
-                    const otherTexts = [];
-                    
-                    // Process messages in reverse order (most recent first)
-                    for (let i = messages.length - 1; i >= 0; i--) {
-                        const msg = messages[i];
-                        const text = stripQuotes(msg);
+                    for (const text of texts) {
                         if (!text) continue;
-                        if (determineFromMe(msg)) {
-                            fromMeTexts.push(text);
-                        } else {
-                            otherTexts.push(text);
+                        for (const pattern of patterns) {
+                            const match = text.match(pattern);
+                            if (match && match[1]) {
+                                const candidate = match[1].trim();
+                                // Filter out generic words and domain-like patterns
+                                const generic = ['me', 'there', 'you', 'friend', 'friends', 'everyone', 'everybody', 'a17', 'a17.so'];
+                                if (candidate && candidate.length >= 2 && 
+                                    !generic.includes(candidate.toLowerCase()) &&
+                                    !isDomainLike(candidate)) {
+                                    return candidate;
+                                }
+                            }
                         }
                     }
-                    
-                    // Prioritize most recent follow-up (first in fromMeTexts since we reversed)
-                    const name = scanTexts(fromMeTexts) || scanTexts(otherTexts);
-                    return name ? name.trim() : null;
+                    return null;
+                };
+                
+                const messages = Array.from(document.querySelectorAll('div[role="listitem"], div[data-message-id], div[jsmodel]'));
+                if (!messages.length) return null;
+                
+                const fromMeTexts = [];
+                const otherTexts = [];
+                
+                // Process messages in reverse order (most recent first)
+                for (let i = messages.length - 1; i >= 0; i--) {
+                    const msg = messages[i];
+                    const text = stripQuotes(msg);
+                    if (!text) continue;
+                    if (determineFromMe(msg)) {
+                        fromMeTexts.push(text);
+                    } else {
+                        otherTexts.push(text);
+                    }
                 }
-                """,
-                {"senderEmail": sender_email, "senderName": sender_name},
-            )
-                username = self._sanitize_username(username)
-            
-            # LAST RESORT: Try extracting from recipient email (but be careful - only if it looks like a real username)
-            if not username:
-                recipient = (email.get("recipient") or "").strip()
-                if recipient:
-                    email_local = recipient.split("@")[0]
-                    # Only use email local part if it doesn't look like a domain/company name
-                    # and is reasonable length (not too short, not too long)
-                    if email_local and len(email_local) >= 3 and len(email_local) <= 25:
-                        # Check if it's not obviously a domain-like pattern
-                        if not re.match(r'^[a-z0-9]+\.(com|net|org|io|so|co|app|dev|ai|me)$', email_local.lower()):
-                            username = self._sanitize_username(email_local)
-                            # Double-check it's not a domain-like pattern after sanitization
-                            if username and "." in username and len(username) <= 10:
-                                username = None  # Reject short domain-like patterns
-            
-            if not username:
-                username = "there"
-                print("   ⚠ Could not determine username – defaulting to 'there'")
-            else:
-                print(f"   📝 Using username: {username}")
-            
-            # Get the appropriate template for this level
-            followup_template = followup_templates.get(followup_level, followup_templates.get(1))
-            
-            # Step 3: Verify email thread opened and trigger reply
-            # Wait for email thread to be visible (check for message content)
-            try:
-                # Wait for email content to appear
-                await self.page.wait_for_selector('div[role="listitem"], div[data-message-id]', timeout=5000)
-                print("   ✓ Email thread opened")
-            except:
-                print("   ⚠ Email thread may not have opened properly")
-            
-            # Wait a bit for thread to fully load
-            await asyncio.sleep(0.7)
-            
-            # Step 4: Try to trigger reply - use multiple methods
-            print("   Triggering reply...")
-            reply_triggered = False
-            
-            # Method 1: Use JavaScript to find and click Reply button (more reliable)
-            reply_clicked = await self.page.evaluate("""
-                (() => {
-                    // Look for reply button in multiple ways
-                    const buttons = document.querySelectorAll('div[role="button"], button, span[role="button"]');
-                    for (let btn of buttons) {
-                        const ariaLabel = btn.getAttribute('aria-label') || '';
-                        const text = btn.innerText || btn.textContent || '';
-                        if (ariaLabel.toLowerCase().includes('reply') || 
-                            text.toLowerCase().includes('reply')) {
-                            btn.click();
-                            return true;
-                        }
+                
+                // Prioritize most recent follow-up (first in fromMeTexts since we reversed)
+                const name = scanTexts(fromMeTexts) || scanTexts(otherTexts);
+                return name ? name.trim() : null;
+            }
+            """,
+            {"senderEmail": sender_email, "senderName": sender_name},
+        )
+            username = self._sanitize_username(username)
+        
+        # LAST RESORT: Try extracting from recipient email (but be careful - only if it looks like a real username)
+        if not username:
+            recipient = (email.get("recipient") or "").strip()
+            if recipient:
+                email_local = recipient.split("@")[0]
+                # Only use email local part if it doesn't look like a domain/company name
+                # and is reasonable length (not too short, not too long)
+                if email_local and len(email_local) >= 3 and len(email_local) <= 25:
+                    # Check if it's not obviously a domain-like pattern
+                    if not re.match(r'^[a-z0-9]+\.(com|net|org|io|so|co|app|dev|ai|me)$', email_local.lower()):
+                        username = self._sanitize_username(email_local)
+                        # Double-check it's not a domain-like pattern after sanitization
+                        if username and "." in username and len(username) <= 10:
+                            username = None  # Reject short domain-like patterns
+        
+        if not username:
+            username = "there"
+            print("   ⚠ Could not determine username – defaulting to 'there'")
+        else:
+            print(f"   📝 Using username: {username}")
+        
+        # Get the appropriate template for this level
+        followup_template = followup_templates.get(followup_level, followup_templates.get(1))
+        plan["username"] = username
+        plan["message"] = self._format_template(followup_template, username, followup_level)
+        return plan
+    
+    async def _send_planned_reply(self, plan: Dict, page: Page) -> Tuple[bool, Optional[str], int]:
+        """Reply in the open thread with a planned message and record the send."""
+        claimed_by = self._claimed_by(plan["thread_id"])
+        if claimed_by:
+            print(f"   ⏭ Thread already taken by profile {claimed_by} on this account - not sending")
+            return False, None, plan["level"]
+        
+        # Step 3: Verify email thread opened and trigger reply
+        # Wait for email thread to be visible (check for message content)
+        if await self._wait_for_selector(
+            "thread_open", 'div[role="listitem"], div[data-message-id]', timeout=5000, page=page
+        ):
+            print("   ✓ Email thread opened")
+        else:
+            print("   ⚠ Email thread may not have opened properly")
+        
+        # Step 4: Try to trigger reply - use multiple methods
+        print("   Triggering reply...")
+        reply_triggered = False
+        
+        # Method 1: Use JavaScript to find and click Reply button (more reliable)
+        reply_clicked = await page.evaluate("""
+            (() => {
+                // Look for reply button in multiple ways
+                const buttons = document.querySelectorAll('div[role="button"], button, span[role="button"]');
+                for (let btn of buttons) {
+                    const ariaLabel = btn.getAttribute('aria-label') || '';
+                    const text = btn.innerText || btn.textContent || '';
+                    if (ariaLabel.toLowerCase().includes('reply') || 
+                        text.toLowerCase().includes('reply')) {
+                        btn.click();
+                        return true;
                     }
-                    return false;
-                })();
-            """)
-            
-            if reply_clicked:
-                print("   ✓ Clicked Reply button (JS)")
+                }
+                return false;
+            })();
+        """)
+        
+        if reply_clicked:
+            print("   ✓ Clicked Reply button (JS)")
+            reply_triggered = True
+        else:
+            # Method 2: Try Playwright locators
+            try:
+                reply_buttons = [
+                    'div[role="button"][aria-label*="Reply" i]',
+                    'div[aria-label*="Reply" i]',
+                    'button[aria-label*="Reply" i]',
+                ]
+                
+                for selector in reply_buttons:
+                    try:
+                        reply_btn = page.locator(selector).first
+                        if await reply_btn.is_visible(timeout=3000):
+                            await reply_btn.click()
+                            print(f"   ✓ Clicked Reply button ({selector})")
+                            reply_triggered = True
+                            break
+                    except:
+                        continue
+            except Exception as e:
+                pass
+        
+        # Method 3: If button click didn't work, try keyboard shortcut
+        if not reply_triggered:
+            try:
+                # Click on the email thread area to ensure focus
+                await page.click('div[role="main"]')
+                await page.keyboard.press("r")
+                print("   ✓ Pressed 'r' key")
                 reply_triggered = True
-                await asyncio.sleep(0.8)
-            else:
-                # Method 2: Try Playwright locators
-                try:
-                    reply_buttons = [
-                        'div[role="button"][aria-label*="Reply" i]',
-                        'div[aria-label*="Reply" i]',
-                        'button[aria-label*="Reply" i]',
-                    ]
-                    
-                    for selector in reply_buttons:
-                        try:
-                            reply_btn = self.page.locator(selector).first
-                            if await reply_btn.is_visible(timeout=3000):
-                                await reply_btn.click()
-                                print(f"   ✓ Clicked Reply button ({selector})")
-                                reply_triggered = True
-                                await asyncio.sleep(0.8)
-                                break
-                        except:
-                            continue
-                except Exception as e:
-                    pass
-            
-            # Method 3: If button click didn't work, try keyboard shortcut
-            if not reply_triggered:
-                try:
-                    # Click on the email thread area to ensure focus
-                    await self.page.click('div[role="main"]')
-                    await asyncio.sleep(0.3)
-                    await self.page.keyboard.press("r")
-                    print("   ✓ Pressed 'r' key")
-                    reply_triggered = True
-                    await asyncio.sleep(1)
-                except Exception as e:
-                    print(f"   ⚠ Keyboard shortcut failed: {str(e)[:30]}")
-            
-            if not reply_triggered:
-                print("   ⚠ Could not trigger reply - trying to continue anyway")
-                await asyncio.sleep(1)
-            
-            # Wait a bit for compose window to appear
-            await asyncio.sleep(0.8)
+            except Exception as e:
+                print(f"   ⚠ Keyboard shortcut failed: {str(e)[:30]}")
+        
+        if not reply_triggered:
+            print("   ⚠ Could not trigger reply - trying to continue anyway")
+        
+        # Wait for compose window to appear
+        await self._wait_for_selector("compose_open", MESSAGE_BODY_SELECTOR, timeout=5000, page=page)
+        
+        # Step 5: Find and fill compose window
+        try:
+            compose_window = None
+            inline_reply = False
+            message_area = await self._fast_message_area_lookup(page)
             
-            # Step 5: Find and fill compose window
-            try:
-                compose_window = None
-                inline_reply = False
-                message_area = await self._fast_message_area_lookup()
+            if message_area:
+                print("   ✓ Found message area (fast lookup)")
+            else:
+                # First, try to find compose window using JavaScript (faster)
+                dialog_found = await page.evaluate("""
+                    (() => {
+                        const dialogs = document.querySelectorAll('div[role="dialog"]');
+                        return dialogs.length > 0;
+                    })();
+                """)
                 
-                if message_area:
-                    print("   ✓ Found message area (fast lookup)")
-                else:
-                    # First, try to find compose window using JavaScript (faster)
-                    dialog_found = await self.page.evaluate("""
-                        (() => {
-                            const dialogs = document.querySelectorAll('div[role="dialog"]');
-                            return dialogs.length > 0;
-                        })();
-                    """)
-                    
-                    if dialog_found:
-                        print("   ✓ Dialog found, waiting for it...")
-                    
-                    # Try multiple selectors for compose window - wait longer
-                    compose_selectors = [
-                        'div[role="dialog"]',
-                        'div[aria-label*="Compose"]',
-                        'div[aria-label*="Reply"]',
-                        'div[aria-label*="New Message"]',
-                    ]
-                    
-                    for selector in compose_selectors:
-                        try:
-                            compose_window = self.page.locator(selector).first
-                            # Check if it's visible
-                            if await compose_window.is_visible(timeout=5000):
-                                print(f"   ✓ Found compose window with: {selector}")
-                                break
-                            # Or wait for it to become visible
-                            await compose_window.wait_for(state="visible", timeout=5000)
-                            print(f"   ✓ Compose window appeared with: {selector}")
+                if dialog_found:
+                    print("   ✓ Dialog found, waiting for it...")
+                
+                # Try multiple selectors for compose window - wait longer
+                compose_selectors = [
+                    'div[role="dialog"]',
+                    'div[aria-label*="Compose"]',
+                    'div[aria-label*="Reply"]',
+                    'div[aria-label*="New Message"]',
+                ]
+                
+                for selector in compose_selectors:
+                    try:
+                        compose_window = page.locator(selector).first
+                        # Check if it's visible
+                        if await compose_window.is_visible(timeout=5000):
+                            print(f"   ✓ Found compose window with: {selector}")
                             break
-                        except:
-                            continue
-                    
-                    if not compose_window:
-                        # Last resort: look for any dialog that might be compose
+                        # Or wait for it to become visible
+                        await compose_window.wait_for(state="visible", timeout=5000)
+                        print(f"   ✓ Compose window appeared with: {selector}")
+                        break
+                    except:
+                        continue
+                
+                if not compose_window:
+                    # Last resort: look for any dialog that might be compose
+                    try:
+                        dialogs = await page.locator('div[role="dialog"]').all()
+                        if dialogs:
+                            compose_window = dialogs[0]
+                            if await compose_window.is_visible(timeout=3000):
+                                print("   ✓ Found compose window (fallback - first dialog)")
+                    except:
+                        pass
+                
+                if not compose_window:
+                    # Try to find inline reply box (might be in the thread view)
+                    try:
+                        inline_areas = page.locator('div[role="main"] div[contenteditable="true"]').all()
+                        if inline_areas:
+                            # The last contenteditable in main area might be the reply box
+                            for area in reversed(inline_areas):
+                                if await area.is_visible(timeout=2000):
+                                    message_area = area
+                                    inline_reply = True
+                                    print("   ✓ Found inline reply box")
+                                    break
+                    except:
+                        pass
+                
+                if not message_area and compose_window:
+                    # Find message area in compose window/dialog
+                    try:
+                        # Try getting all contenteditable areas in compose window
+                        areas = await compose_window.locator('div[contenteditable="true"]').all()
+                        if areas:
+                            # The message body is usually the last contenteditable
+                            message_area = areas[-1]
+                            await message_area.wait_for(state="visible", timeout=5000)
+                            print("   ✓ Found message area in compose window")
+                    except:
+                        # Fallback: try direct selector
                         try:
-                            dialogs = await self.page.locator('div[role="dialog"]').all()
-                            if dialogs:
-                                compose_window = dialogs[0]
-                                if await compose_window.is_visible(timeout=3000):
-                                    print("   ✓ Found compose window (fallback - first dialog)")
+                            message_area = compose_window.locator('div[contenteditable="true"]').last
+                            await message_area.wait_for(state="visible", timeout=5000)
+                            print("   ✓ Found message area (fallback)")
                         except:
                             pass
-                    
-                    if not compose_window:
-                        # Try to find inline reply box (might be in the thread view)
-                        try:
-                            inline_areas = self.page.locator('div[role="main"] div[contenteditable="true"]').all()
-                            if inline_areas:
-                                # The last contenteditable in main area might be the reply box
-                                for area in reversed(inline_areas):
-                                    if await area.is_visible(timeout=2000):
+                
+                if not message_area:
+                    # Last resort: look for any visible contenteditable on the page that's large enough to be a message area
+                    try:
+                        all_areas = await page.locator('div[contenteditable="true"]').all()
+                        for area in all_areas:
+                            try:
+                                if await area.is_visible(timeout=1000):
+                                    # Check if it's large enough to be a message area (not just a small input)
+                                    box = await area.bounding_box()
+                                    if box and box['height'] > 50:  # Message areas are usually taller
                                         message_area = area
-                                        inline_reply = True
-                                        print("   ✓ Found inline reply box")
+                                        print("   ✓ Found message area (last resort - by size)")
                                         break
-                        except:
-                            pass
-                    
-                    if not message_area and compose_window:
-                        # Find message area in compose window/dialog
-                        try:
-                            # Try getting all contenteditable areas in compose window
-                            areas = await compose_window.locator('div[contenteditable="true"]').all()
-                            if areas:
-                                # The message body is usually the last contenteditable
-                                message_area = areas[-1]
-                                await message_area.wait_for(state="visible", timeout=5000)
-                                print("   ✓ Found message area in compose window")
-                        except:
-                            # Fallback: try direct selector
-                            try:
-                                message_area = compose_window.locator('div[contenteditable="true"]').last
-                                await message_area.wait_for(state="visible", timeout=5000)
-                                print("   ✓ Found message area (fallback)")
                             except:
-                                pass
-                    
-                    if not message_area:
-                        # Last resort: look for any visible contenteditable on the page that's large enough to be a message area
-                        try:
-                            all_areas = await self.page.locator('div[contenteditable="true"]').all()
-                            for area in all_areas:
-                                try:
-                                    if await area.is_visible(timeout=1000):
-                                        # Check if it's large enough to be a message area (not just a small input)
-                                        box = await area.bounding_box()
-                                        if box and box['height'] > 50:  # Message areas are usually taller
-                                            message_area = area
-                                            print("   ✓ Found message area (last resort - by size)")
-                                            break
-                                except:
-                                    continue
-                        except:
-                            pass
-                
-                if not message_area:
-                    # Debug: see what's on the page
-                    page_info = await self.page.evaluate("""
-                        () => {
-                            const dialogs = document.querySelectorAll('div[role="dialog"]');
-                            const contenteditables = document.querySelectorAll('div[contenteditable="true"]');
-                            const visibleCEs = Array.from(contenteditables).filter(el => {
-                                const rect = el.getBoundingClientRect();
-                                return rect.width > 0 && rect.height > 0;
-                            });
-                            return {
-                                dialogCount: dialogs.length,
-                                ceCount: contenteditables.length,
-                                visibleCECount: visibleCEs.length,
-                                hasCompose: document.querySelector('[aria-label*="Compose"]') !== null,
-                                hasReply: document.querySelector('[aria-label*="Reply"]') !== null,
-                            };
-                        }
-                    """)
-                    print(f"   ⚠ Debug info: {page_info}")
-                    raise Exception(f"Message area not found. Dialogs: {page_info.get('dialogCount', 0)}, ContentEditables: {page_info.get('visibleCECount', 0)}")
-                
-                # Wait a bit for message area to be ready
-                await asyncio.sleep(0.5)
-                
-                # Format template with username
-                formatted_message = self._format_template(followup_template, username, followup_level)
-                
-                # Fill message
-                await message_area.fill(formatted_message)
-                await asyncio.sleep(0.2)
-                
-                # Step 5: Send email
-                await self.page.keyboard.press("Meta+Enter")
-                await asyncio.sleep(0.4)
-                
-                # Step 6: Close compose/reply area
+                                continue
+                    except:
+                        pass
+            
+            if not message_area:
+                # Debug: see what's on the page
+                page_info = await page.evaluate("""
+                    () => {
+                        const dialogs = document.querySelectorAll('div[role="dialog"]');
+                        const contenteditables = document.querySelectorAll('div[contenteditable="true"]');
+                        const visibleCEs = Array.from(contenteditables).filter(el => {
+                            const rect = el.getBoundingClientRect();
+                            return rect.width > 0 && rect.height > 0;
+                        });
+                        return {
+                            dialogCount: dialogs.length,
+                            ceCount: contenteditables.length,
+                            visibleCECount: visibleCEs.length,
+                            hasCompose: document.querySelector('[aria-label*="Compose"]') !== null,
+                            hasReply: document.querySelector('[aria-label*="Reply"]') !== null,
+                        };
+                    }
+                """)
+                print(f"   ⚠ Debug info: {page_info}")
+                raise Exception(f"Message area not found. Dialogs: {page_info.get('dialogCount', 0)}, ContentEditables: {page_info.get('visibleCECount', 0)}")
+            
+            # Fill message
+            await message_area.fill(plan["message"])
+            
+            # Step 5: Send email
+            await self._pace_send()
+            await page.keyboard.press("Meta+Enter")
+            # Gmail removes the reply box once the message is on its way
+            with self.wait_budget.step("send_confirm"):
                 try:
-                    await self.page.keyboard.press("Escape")
+                    await message_area.wait_for(state="hidden", timeout=5000)
                 except Exception:
-                    pass
-                await asyncio.sleep(0.2)
-                
-                result = (True, username, followup_level)
-                return result
-                
-            except Exception as e:
-                print(f"   ⚠ Compose error: {str(e)[:50]}")
-                # Try to close anyway
-                try:
-                    await self.page.keyboard.press("Escape")
-                except:
-                    pass
-                result = (False, None, followup_level)
-                return result
+                    self.wait_budget.record_timeout("send_confirm")
+            
+            # Step 6: Close compose/reply area
+            try:
+                await page.keyboard.press("Escape")
+            except Exception:
+                pass
+            
+            if self.state_store:
+                self.state_store.record_sent(plan["thread_id"], plan["level"], plan["username"])
+            
+            return True, plan["username"], plan["level"]
             
         except Exception as e:
-            print(f"   ✗ Error: {str(e)[:50]}")
+            print(f"   ⚠ Compose error: {str(e)[:50]}")
+            # Try to close anyway
             try:
-                await self.page.keyboard.press("Escape")
+                await page.keyboard.press("Escape")
             except:
                 pass
-            result = (False, None, 1)
-            return result
-        
-        finally:
-            if self._in_thread_view:
-                await self._return_to_sent_list()
-        return result
+            return False, None, plan["level"]
+    
+    async def _pace_send(self):
+        """Keep sends from this account at least send_interval seconds apart, across all tabs and profiles."""
+        if self.send_interval <= 0:
+            return
+        with self.wait_budget.step("send_pacing"):
+            await send_pacer(self.profile_config.get("gmail_sender", "")).wait(self.send_interval)
+    
+    async def _open_thread_by_id(self, thread_id: str, page: Optional[Page] = None) -> bool:
+        """Open a thread straight from its id instead of clicking its row in the Sent list."""
+        page = page or self.page
+        try:
+            await page.goto(
+                f"https://mail.google.com/mail/u/0/#sent/{thread_id}",
+                wait_until="domcontentloaded",
+                timeout=30000,
+            )
+            return True
+        except Exception as e:
+            print(f"   ⚠ Could not open thread {thread_id}: {str(e)[:50]}")
+            return False
     
     def _format_template(self, template: str, username: str, level: int = 1) -> str:
         """Format the follow-up template with variables."""
@@ -1719,6 +2166,10 @@ class GmailFollowUp:
     
     async def run(self, followup_templates: Dict[int, str], dry_run: bool = False, max_emails: Optional[int] = None):
         """Run the follow-up process page by page."""
+        if self.backend == "api":
+            await self.run_api(followup_templates, dry_run=dry_run, max_emails=max_emails)
+            return
+        
         try:
             await self.start_browser()
             await self.navigate_to_gmail()
@@ -1733,6 +2184,7 @@ class GmailFollowUp:
             sent_count = 0
             failed_count = 0
             skipped_count = 0  # Emails skipped due to tags
+            unchanged_count = 0  # Emails skipped because the thread state says nothing is due
             total_processed = 0  # Total emails examined (including skipped)
             total_attempted = 0  # Emails actually attempted (excluding skipped)
             page_num = 1
@@ -1752,161 +2204,22 @@ class GmailFollowUp:
                     print(f"   Gmail showing: {pagination['current_start']}-{pagination['current_end']} of {pagination['total']}")
                 
                 # Wait for emails to load on current page
-                await asyncio.sleep(2)
-                
-                # Get emails from current page only
-                sender_email = (self.profile_config.get("gmail_sender") or "").lower()
-                email_data = await self.page.evaluate(
-                    r"""
-                    (args) => {
-                        const mainArea = document.querySelector('div[role=\"main\"]') || document.body;
-                        const rows = mainArea.querySelectorAll('tbody tr[role=\"row\"], tr[role=\"row\"]:has(td[role=\"gridcell\"])');
-                        const emails = [];
-                        
-                        for (let i = 0; i < rows.length; i++) {
-                            const row = rows[i];
-                            if (!row.querySelector('td')) continue;
-                            
-                            const text = row.innerText || row.textContent || '';
-                            const cells = row.querySelectorAll('td');
-                            if (cells.length < 2 || text.trim().length < 10) continue;
-                            
-                            let subject = '';
-                            let maxLength = 0;
-                            for (let cell of cells) {
-                                const cellText = cell.innerText || '';
-                                if (cellText.length > maxLength && 
-                                    !cellText.match(/^\\d+[:]\\d+\\s*(AM|PM)$/i) &&
-                                    !cellText.match(/^\\s*[★☆✓]\\s*$/)) {
-                                    subject = cellText.trim();
-                                    maxLength = cellText.length;
-                                }
-                            }
-                            
-                            let dateText = '';
-                            for (let cell of Array.from(cells).reverse()) {
-                                const cellText = cell.innerText || '';
-                                if (cellText.match(/\\d+[:]\\d+|AM|PM|ago|day|week|month|Nov|Dec|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct/i)) {
-                                    dateText = cellText.trim();
-                                    break;
-                                }
-                            }
-                            
-                            let recipient = '';
-                            const emailMatch = text.match(/[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Z|a-z]{2,}/);
-                            if (emailMatch) {
-                                recipient = emailMatch[0];
-                            }
-                            
-                            const threadId = row.getAttribute('data-legacy-thread-id') || row.dataset?.legacyThreadId || '';
-                            
-                            let displayName = '';
-                            const displaySelectors = ['.yW span[email]', '.yW span', 'span[email]', '.bA4 span', '.y2'];
-                            for (const sel of displaySelectors) {
-                                const el = row.querySelector(sel);
-                                if (el && el.innerText && el.innerText.trim().length > 0) {
-                                    displayName = el.innerText.trim();
-                                    break;
-                                }
-                            }
-                            
-                            // Extract Gmail labels/tags
-                            let labels = [];
-                            const labelSelectors = [
-                                '.ar', // Label chip class
-                                '.at', // Another label class
-                                '.aZ', // Label badge class
-                                'span[aria-label*="Label:"]',
-                                'div[aria-label*="Label:"]',
-                                '.aZo', // Label container
-                                '[data-label-name]'
-                            ];
-                            
-                            for (const sel of labelSelectors) {
-                                const labelEls = row.querySelectorAll(sel);
-                                labelEls.forEach(el => {
-                                    const labelText = el.innerText || el.textContent || el.getAttribute('aria-label') || el.getAttribute('data-label-name') || '';
-                                    if (labelText && labelText.trim()) {
-                                        // Clean up label text (remove "Label:" prefix if present)
-                                        let cleanLabel = labelText.trim().replace(/^Label:\s*/i, '');
-                                        if (cleanLabel && !labels.includes(cleanLabel)) {
-                                            labels.push(cleanLabel);
-                                        }
-                                    }
-                                });
-                            }
-                            
-                            // Also check for labels in the row text directly
-                            const labelPattern = /\[([^\]]+)\]/g;
-                            let match;
-                            while ((match = labelPattern.exec(text)) !== null) {
-                                const labelText = match[1].trim();
-                                if (labelText && !labels.includes(labelText)) {
-                                    labels.push(labelText);
-                                }
-                            }
-                            
-                            if (subject || text.trim().length > 10) {
-                                emails.push({
-                                    index: i,
-                                    subject: subject.substring(0, 150) || '(no subject)',
-                                    recipient: recipient,
-                                    date_text: dateText,
-                                    row_text: text.substring(0, 300),
-                                    thread_id: threadId,
-                                    display_name: displayName,
-                                    labels: labels
-                                });
-                            }
-                        }
-                        return emails;
-                    }
-                    """,
-                    {},
-                )
+                await self._wait_for_list()
                 
-                # Process emails from JavaScript data
-                page_emails = []
-                for email_info in email_data:
-                    try:
-                        subject = email_info.get('subject', '').strip()
-                        recipient = email_info.get('recipient', '').strip()
-                        date_text = email_info.get('date_text', '').strip()
-                        row_text = email_info.get('row_text', '').strip()
-                        display_name = email_info.get('display_name', '').strip()
-                        username_hint = (
-                            self._extract_username_from_text(row_text)
-                            or self._extract_username_from_text(subject)
-                            or self._extract_username_from_text(display_name)
-                        )
-                        if not username_hint and recipient:
-                            username_hint = self._sanitize_username(recipient.split("@")[0])
-                        
-                        email_date = self._parse_email_date(date_text)
-                        if not email_date:
-                            email_date = datetime.now() - timedelta(days=1)
-                        
-                        days_old = (datetime.now() - email_date).days if email_date else 0
-                        
-                        page_emails.append({
-                            "recipient": recipient or "unknown",
-                            "subject": subject or "(no subject)",
-                            "date": email_date,
-                            "date_text": date_text or "unknown",
-                            "index": email_info['index'],
-                            "days_old": days_old,
-                            "page": page_num,
-                            "username_hint": username_hint,
-                            "thread_id": email_info.get('thread_id', '').strip(),
-                            "display_name": display_name,
-                            "labels": email_info.get('labels', []),  # Include labels/tags
-                        })
-                    except Exception as e:
-                        continue
+                # Get emails from current page only (tagged / not-due / finished rows are dropped in the page)
+                page_emails, row_info = await self._extract_page_rows(page_num)
+                dropped = row_info["tagged"] + row_info["recent"] + row_info["final"]
+                skipped_count += dropped
+                total_processed += dropped
                 
-                print(f"   Found {len(page_emails)} emails on this page")
+                print(f"   Found {len(page_emails)} emails needing a look on this page ({row_info['total']} rows)")
+                self._print_row_drops(row_info)
                 
-                if not page_emails:
+                if not row_info["total"]:
+                    if self.plan_queries and await self._open_next_search_window():
+                        print(f"   No emails found on page {page_num}, moving to the next search window.")
+                        page_num += 1
+                        continue
                     print(f"   No emails found on page {page_num}, stopping.")
                     break
                 
@@ -1926,23 +2239,28 @@ class GmailFollowUp:
                         if labels and 'pretti responses' in [l.lower() for l in labels]:
                             skip_marker = " ⏭ SKIP"
                             page_skipped_dry += 1
+                        else:
+                            state_reason = self._state_skip_reason(email)
+                            claimed_by = None if state_reason else self._claimed_by((email.get('thread_id') or '').strip())
+                            if state_reason:
+                                skip_marker = f" ⏭ UNCHANGED ({state_reason})"
+                                page_skipped_dry += 1
+                            elif claimed_by:
+                                skip_marker = f" ⏭ CLAIMED by {claimed_by}"
+                                page_skipped_dry += 1
                         print(f"      {i}. {email['recipient']}: {email['subject'][:50]} ({date_str}){label_str}{skip_marker}")
                     total_processed += len(page_emails)
                     skipped_count += page_skipped_dry
                     print(f"\n   📊 DRY RUN Page {page_num} Summary:")
-                    print(f"      Would attempt: {len(page_emails) - page_skipped_dry} | Would skip (tagged): {page_skipped_dry} | Total on page: {len(page_emails)}")
+                    print(f"      Would attempt: {len(page_emails) - page_skipped_dry} | Would skip (tagged/not due/finished/unchanged): {page_skipped_dry + dropped} | Total on page: {row_info['total']}")
                     
                     # Check if we should continue to next page
                     if max_emails and total_processed >= max_emails:
                         print(f"\n   ✓ Reached limit of {max_emails} emails")
                         break
                     
-                    # Try to go to next page
-                    if pagination and pagination['current_end'] >= pagination['total']:
-                        print(f"\n   ✓ Reached last page")
-                        break
-                    
-                    has_next = await self.go_to_next_page()
+                    # Next page of this search, or the next planned search window
+                    has_next = await self._next_results_page(pagination)
                     if not has_next:
                         print(f"\n   ✓ No more pages")
                         break
@@ -1965,11 +2283,20 @@ class GmailFollowUp:
                         print(f"   🏷️  Found labels: {', '.join(labels)}")
                         if 'pretti responses' in [l.lower() for l in labels]:
                             print(f"   ⏭ Skipping email - has 'pretti responses' tag")
+                            self._remember_seen(email)
                             skipped_count += 1
                             page_skipped += 1
                             total_processed += 1
                             continue
                     
+                    state_reason = self._state_skip_reason(email)
+                    if state_reason:
+                        print(f"   ⏭ Skipping email - unchanged since last sweep ({state_reason})")
+                        unchanged_count += 1
+                        page_skipped += 1
+                        total_processed += 1
+                        continue
+                    
                     # If we get here, we're actually attempting to process this email
                     total_attempted += 1
                     page_attempted += 1
@@ -1979,7 +2306,6 @@ class GmailFollowUp:
                     if not self._is_paginating and not self._is_in_sent_list_view():
                         print("   ⚠ Not in sent list view, navigating back...")
                         await self.go_to_sent_folder()
-                        await asyncio.sleep(2)
                     
                     # Process email (detect level, extract username, send follow-up)
                     success, username, level = await self.process_email_fast(email, followup_templates)
@@ -1992,28 +2318,19 @@ class GmailFollowUp:
                         print(f"   ⏭ Failed to send (error or skipped)")
                     
                     total_processed += 1
-                    
-                    # Small delay between emails to avoid rate limiting
-                    await asyncio.sleep(1)
                 
                 # Print page statistics
                 print(f"\n   📊 Page {page_num} Summary:")
-                print(f"      Attempted: {page_attempted} | Skipped (tagged): {page_skipped} | Total on page: {len(page_emails)}")
+                print(f"      Attempted: {page_attempted} | Skipped (tagged/not due/finished/unchanged): {page_skipped + dropped} | Total on page: {row_info['total']}")
                 
                 # Check if we've hit the max_emails limit
                 if max_emails and total_processed >= max_emails:
                     print(f"\n✓ Reached limit of {max_emails} emails")
                     break
                 
-                # Check if there's a next page
-                if pagination:
-                    if pagination['current_end'] >= pagination['total']:
-                        print(f"\n✓ Reached last page ({pagination['current_end']} of {pagination['total']})")
-                        break
-                
-                # Try to go to next page
+                # Next page of this search, or the next planned search window
                 print(f"\n   Moving to next page...")
-                has_next = await self.go_to_next_page()
+                has_next = await self._next_results_page(pagination)
                 if not has_next:
                     print(f"   ✓ No more pages available")
                     break
@@ -2024,29 +2341,681 @@ class GmailFollowUp:
             print(f"✓ Follow-up process complete!")
             print(f"   Sent: {sent_count} follow-up emails")
             print(f"   Failed: {failed_count} emails")
-            print(f"   Skipped (tagged): {skipped_count} emails")
+            print(f"   Skipped (tagged, not due or finished): {skipped_count} emails")
+            print(f"   Skipped (unchanged since last sweep): {unchanged_count} emails")
             print(f"   Attempted: {total_attempted} emails (excluding skipped)")
             print(f"   Total examined: {total_processed} emails across {page_num} page(s)")
             print(f"{'='*60}\n")
+            self.stats = {
+                "sent": sent_count,
+                "failed": failed_count,
+                "skipped": skipped_count + unchanged_count,
+                "examined": total_processed,
+            }
+            self.wait_budget.print_summary()
             
         except Exception as e:
+            self.error = str(e) or type(e).__name__
             print(f"✗ Error: {e}")
             import traceback
             traceback.print_exc()
         finally:
             # Reset pagination flag
             self._is_paginating = False
+            await self.close_browser()
+    
+    async def run_api(self, followup_templates: Dict[int, str], dry_run: bool = False, max_emails: Optional[int] = None):
+        """
+        Run the follow-up process with candidates from the Gmail API.
+        Levels are already known, so the browser is only used to send replies
+        (and isn't started at all for a dry run).
+        """
+        sent_count = 0
+        failed_count = 0
+        skipped_count = 0
+        total_attempted = 0
+        try:
+            emails = await self.get_sent_emails_api(limit=max_emails)
+            
+            if dry_run:
+                print("\n   🔍 DRY RUN - Threads found via Gmail API:\n")
+            else:
+                if emails:
+                    await self.start_browser()
+                    await self.navigate_to_gmail()
+            
+            for i, email in enumerate(emails, 1):
+                labels = email.get('labels', [])
+                tagged = 'pretti responses' in [l.lower() for l in labels]
+                finished = email.get('followups_sent', 0) >= 3
+                
+                if dry_run:
+                    label_str = f" [Labels: {', '.join(labels)}]" if labels else ""
+                    claimed_by = None if (tagged or finished) else self._claimed_by(email['thread_id'])
+                    if tagged:
+                        skip_marker = " ⏭ SKIP"
+                    elif finished:
+                        skip_marker = " ⏭ DONE (level 3 sent)"
+                    elif claimed_by:
+                        skip_marker = f" ⏭ CLAIMED by {claimed_by}"
+                    else:
+                        skip_marker = f" → level {email['followup_level']}"
+                    if tagged or finished or claimed_by:
+                        skipped_count += 1
+                    print(f"      {i}. {email['recipient']}: {email['subject'][:50]} ({email['date_text']}){label_str}{skip_marker}")
+                    continue
+                
+                print(f"\n[Email {i}/{len(emails)}] Processing: {email['subject'][:50]}...")
+                if tagged:
+                    print(f"   ⏭ Skipping email - has 'pretti responses' tag")
+                    skipped_count += 1
+                    continue
+                if finished:
+                    print("   📊 Detected follow-up level: 3 (already sent final follow-up) — skipping thread")
+                    skipped_count += 1
+                    continue
+                
+                total_attempted += 1
+                success, username, level = await self.process_email_fast(email, followup_templates)
+                if success:
+                    sent_count += 1
+                    print(f"   ✓ Follow-up sent! (username: {username or 'unknown'}, level: {level})")
+                else:
+                    failed_count += 1
+                    print(f"   ⏭ Failed to send (error or skipped)")
+                            
+            print(f"\n{'='*60}")
+            print(f"✓ Follow-up process complete! (Gmail API backend{', dry run' if dry_run else ''})")
+            print(f"   Sent: {sent_count} follow-up emails")
+            print(f"   Failed: {failed_count} emails")
+            print(f"   Skipped (tagged, finished or claimed by another profile): {skipped_count} emails")
+            if self.unreadable_threads:
+                print(f"   Unreadable (API payload could not be converted): {len(self.unreadable_threads)} threads")
+            print(f"   Attempted: {total_attempted} emails (excluding skipped)")
+            print(f"   Total examined: {len(emails)} threads")
+            print(f"{'='*60}\n")
+            self.stats = {
+                "sent": sent_count,
+                "failed": failed_count,
+                "skipped": skipped_count,
+                "examined": len(emails),
+                "unreadable": len(self.unreadable_threads),
+            }
+            self.wait_budget.print_summary()
+        
+        except Exception as e:
+            self.error = str(e) or type(e).__name__
+            print(f"✗ Error: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            await self.close_browser()
+    
+    async def run_workers(
+        self,
+        followup_templates: Dict[int, str],
+        workers: int = 3,
+        dry_run: bool = False,
+        max_emails: Optional[int] = None,
+    ):
+        """
+        Run the follow-up process with a pool of tabs in one browser context.
+        The candidate list is collected once, then each worker tab opens threads
+        directly by thread id. Sends are paced per account (send_interval).
+        
+        Args:
+            followup_templates: Templates by follow-up level
+            workers: Number of tabs processing threads in parallel
+            dry_run: Only list the candidates that would be processed
+            max_emails: Maximum number of emails to collect
+        """
+        sent_count = 0
+        failed_count = 0
+        skipped_count = 0
+        unchanged_count = 0
+        try:
+            if self.backend == "api":
+                emails = await self.get_sent_emails_api(limit=max_emails)
+                if emails and not dry_run:
+                    await self.start_browser()
+                    await self.navigate_to_gmail()
+            else:
+                await self.start_browser()
+                await self.navigate_to_gmail()
+                await self.go_to_sent_folder()
+                emails = await self.get_sent_emails(limit=max_emails)
+            
+            queue: asyncio.Queue = asyncio.Queue()
+            for email in emails:
+                reason = self._queue_skip_reason(email)
+                if reason in ("tagged", "finished"):
+                    skipped_count += 1
+                    continue
+                if reason == "no_thread_id":
+                    print(f"   ⚠ No thread id for '{email['subject'][:40]}' - can't open it from a worker tab")
+                    failed_count += 1
+                    continue
+                if reason == "unchanged":
+                    unchanged_count += 1
+                    continue
+                queue.put_nowait(email)
+            
+            total = queue.qsize()
+            print(f"\n✓ {total} threads queued for {workers} worker tab(s) "
+                  f"(skipped {skipped_count} tagged/finished, {unchanged_count} unchanged)")
+            
+            if dry_run:
+                print("\n   🔍 DRY RUN - Threads that would be processed:\n")
+                i = 0
+                while not queue.empty():
+                    i += 1
+                    email = queue.get_nowait()
+                    level = email.get('followup_level')
+                    level_str = f" → level {level}" if level else ""
+                    claimed_by = self._claimed_by(email['thread_id'])
+                    if claimed_by:
+                        level_str = f" ⏭ CLAIMED by {claimed_by}"
+                        skipped_count += 1
+                    print(f"      {i}. {email['recipient']}: {email['subject'][:50]} ({email['date_text']}){level_str}")
+                self.stats = {
+                    "sent": 0,
+                    "failed": failed_count,
+                    "skipped": skipped_count + unchanged_count,
+                    "examined": len(emails),
+                    "unreadable": len(self.unreadable_threads),
+                }
+                return
+            
+            async def worker(worker_num: int):
+                nonlocal sent_count, failed_count
+                page = await self.context.new_page()
+                try:
+                    while True:
+                        try:
+                            email = queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            return
+                        done = sent_count + failed_count + 1
+                        print(f"\n[Worker {worker_num}] ({done}/{total}) Processing: {email['subject'][:50]}...")
+                        success, username, level = await self.process_email_fast(email, followup_templates, page=page)
+                        if success:
+                            sent_count += 1
+                            print(f"   ✓ [Worker {worker_num}] Follow-up sent! (username: {username or 'unknown'}, level: {level})")
+                        else:
+                            failed_count += 1
+                            print(f"   ⏭ [Worker {worker_num}] Failed to send (error or skipped)")
+                finally:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+            
+            await asyncio.gather(*(worker(n) for n in range(1, max(1, min(workers, total)) + 1)))
+            
+            print(f"\n{'='*60}")
+            print(f"✓ Follow-up process complete! ({workers} worker tabs)")
+            print(f"   Sent: {sent_count} follow-up emails")
+            print(f"   Failed: {failed_count} emails")
+            print(f"   Skipped (tagged, finished or claimed by another profile): {skipped_count} emails")
+            print(f"   Skipped (unchanged, not due): {unchanged_count} emails")
+            if self.unreadable_threads:
+                print(f"   Unreadable (API payload could not be converted): {len(self.unreadable_threads)} threads")
+            print(f"   Total examined: {len(emails)} threads")
+            print(f"{'='*60}\n")
+            self.stats = {
+                "sent": sent_count,
+                "failed": failed_count,
+                "skipped": skipped_count + unchanged_count,
+                "examined": len(emails),
+                "unreadable": len(self.unreadable_threads),
+            }
+            self.wait_budget.print_summary()
+        
+        except Exception as e:
+            self.error = str(e) or type(e).__name__
+            print(f"✗ Error: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            await self.close_browser()
+    
+    async def plan_followups(
+        self,
+        followup_templates: Dict[int, str],
+        plan_path: str,
+        workers: int = 1,
+        max_emails: Optional[int] = None,
+    ):
+        """
+        Phase one of a two-phase run: work out every follow-up without sending anything.
+        Writes one JSONL row per candidate thread with its level, username and rendered
+        message (or why it is skipped) to plan_path, for review and `execute_plan`.
+        
+        Args:
+            followup_templates: Templates by follow-up level
+            plan_path: Where to write the plan
+            workers: Tabs opening threads in parallel (browser backend only)
+            max_emails: Maximum number of emails to collect
+        """
+        try:
+            if self.backend == "api":
+                # Levels come with the API candidates, so planning needs no browser
+                emails = await self.get_sent_emails_api(limit=max_emails)
+            else:
+                await self.start_browser()
+                await self.navigate_to_gmail()
+                await self.go_to_sent_folder()
+                emails = await self.get_sent_emails(limit=max_emails)
+            
+            rows: List[Optional[Dict]] = [None] * len(emails)
+            queue: asyncio.Queue = asyncio.Queue()
+            for i, email in enumerate(emails):
+                reason = self._queue_skip_reason(email)
+                if reason:
+                    rows[i] = self._plan_row(email, None, reason)
+                else:
+                    queue.put_nowait(i)
+            total = queue.qsize()
+            print(f"\n✓ Planning {total} of {len(emails)} threads")
+            
+            async def planner(page: Optional[Page]):
+                while True:
+                    try:
+                        i = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    email = emails[i]
+                    print(f"\n[Plan {total - queue.qsize()}/{total}] {email['subject'][:50]}...")
+                    with self.wait_budget.email(email["thread_id"]):
+                        try:
+                            if page is not None and not await self._open_email_thread(email, page, open_directly=True):
+                                rows[i] = self._plan_row(email, None, "open_failed")
+                                continue
+                            plan = await self._plan_followup(email, followup_templates, page)
+                            rows[i] = self._plan_row(email, plan, None if plan["message"] else "finished")
+                        except Exception as e:
+                            print(f"   ✗ Error: {str(e)[:50]}")
+                            rows[i] = self._plan_row(email, None, "error")
+            
+            if self.backend == "api":
+                await planner(None)
+            else:
+                pages = [await self.context.new_page() for _ in range(max(1, min(workers, total)))]
+                try:
+                    await asyncio.gather(*(planner(page) for page in pages))
+                finally:
+                    for page in pages:
+                        try:
+                            await page.close()
+                        except Exception:
+                            pass
+            
+            count = write_plan(plan_path, [row for row in rows if row is not None])
+            to_send = sum(1 for row in rows if row and row["action"] == "send")
+            levels = defaultdict(int)
+            for row in rows:
+                if row and row["action"] == "send":
+                    levels[row["level"]] += 1
+            level_str = ", ".join(f"level {level}: {n}" for level, n in sorted(levels.items()))
+            print(f"\n{'='*60}")
+            print(f"✓ Plan written to {plan_path}")
+            print(f"   To send: {to_send} follow-ups{f' ({level_str})' if level_str else ''}")
+            print(f"   Skipped: {count - to_send} threads")
+            if self.unreadable_threads:
+                print(f"   Unreadable (API payload could not be converted): {len(self.unreadable_threads)} threads")
+            print(f"   Apply it with: --execute {plan_path}")
+            print(f"{'='*60}\n")
+            self.stats = {
+                "sent": 0,
+                "failed": 0,
+                "skipped": count - to_send,
+                "examined": len(emails),
+                "planned": to_send,
+                "unreadable": len(self.unreadable_threads),
+            }
+        
+        except Exception as e:
+            self.error = str(e) or type(e).__name__
+            print(f"✗ Error: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            await self.close_browser()
+    
+    def _plan_row(self, email: Dict, plan: Optional[Dict], skip_reason: Optional[str]) -> Dict:
+        """One plan file line for a candidate thread."""
+        return {
+            "thread_id": (email.get("thread_id") or "").strip(),
+            "profile": self.profile_key,
+            "sender": self.profile_config.get("gmail_sender", ""),
+            "recipient": email.get("recipient", ""),
+            "subject": email.get("subject", ""),
+            "date_text": email.get("date_text", ""),
+            "action": "skip" if skip_reason else "send",
+            "reason": skip_reason,
+            "level": plan["level"] if plan else email.get("followup_level"),
+            "followups_sent": plan["followups_sent"] if plan else email.get("followups_sent"),
+            "username": plan["username"] if plan else None,
+            "message": plan["message"] if plan and not skip_reason else None,
+            "planned_at": datetime.now().isoformat(timespec="seconds"),
+        }
+    
+    async def execute_plan(self, plan_path: str, workers: int = 1):
+        """
+        Phase two: send the follow-ups in a plan written by `plan_followups`.
+        Progress is checkpointed per row in <plan>.progress; rerunning the same plan
+        skips rows already sent. Each thread's level is re-checked right before the
+        reply, and rows whose thread moved on since planning are marked stale - this is
+        also what stops a resumed run from re-sending a reply that went out just
+        before a crash.
+        
+        Args:
+            plan_path: Plan file to apply
+            workers: Number of tabs sending in parallel (sends stay paced per account)
+        """
+        checkpoint = None
+        counts = defaultdict(int)
+        try:
+            rows = [row for row in read_plan(plan_path) if row.get("action") == "send"]
+            checkpoint = PlanCheckpoint(plan_path)
+            queue: asyncio.Queue = asyncio.Queue()
+            for row in rows:
+                if (row.get("profile") or self.profile_key) != self.profile_key:
+                    print(f"   ⚠ Row for profile '{row.get('profile')}' in plan - run --execute with --profile {row.get('profile')}")
+                    counts["other_profile"] += 1
+                elif checkpoint.is_done(row["thread_id"]):
+                    counts["already_done"] += 1
+                else:
+                    if checkpoint.status(row["thread_id"]) == STATUS_SENDING:
+                        counts["interrupted"] += 1
+                    queue.put_nowait(row)
+            total = queue.qsize()
+            print(f"\n✓ Executing {total} of {len(rows)} planned follow-ups from {plan_path} "
+                  f"({counts['already_done']} already done, {counts['interrupted']} interrupted mid-send)")
+            if not total:
+                return
+            
+            await self.start_browser()
+            await self.navigate_to_gmail()
+            
+            async def executor(worker_num: int):
+                page = await self.context.new_page()
+                try:
+                    while True:
+                        try:
+                            row = queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            return
+                        print(f"\n[Worker {worker_num}] ({total - queue.qsize()}/{total}) Level {row['level']} → {row['subject'][:50]}...")
+                        checkpoint.mark(row["thread_id"], STATUS_SENDING)
+                        status = await self._execute_plan_row(row, page)
+                        checkpoint.mark(row["thread_id"], status)
+                        counts[status] += 1
+                        self.progress["processed"] += 1
+                        if status == STATUS_SENT:
+                            self.progress["sent"] += 1
+                            print(f"   ✓ [Worker {worker_num}] Follow-up sent! (username: {row['username']}, level: {row['level']})")
+                        elif status == STATUS_FAILED:
+                            self.progress["failed"] += 1
+                finally:
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+            
+            await asyncio.gather(*(executor(n) for n in range(1, max(1, min(workers, total)) + 1)))
             
-            # Only close browser/context if we launched it ourselves
-            # Don't close when connected to Arc browser
-            if not self.use_arc:
-                if self.browser:
-                    await self.browser.close()
+            print(f"\n{'='*60}")
+            print(f"✓ Plan executed! ({workers} worker tab(s))")
+            print(f"   Sent: {counts[STATUS_SENT]} follow-up emails")
+            print(f"   Failed: {counts[STATUS_FAILED]} emails (retried on the next --execute)")
+            print(f"   Stale (thread changed since planning): {counts[STATUS_STALE]} emails")
+            print(f"   Already done before this run: {counts['already_done']} emails")
+            print(f"{'='*60}\n")
+            self.stats = {
+                "sent": counts[STATUS_SENT],
+                "failed": counts[STATUS_FAILED],
+                "skipped": counts[STATUS_STALE] + counts["already_done"] + counts["other_profile"],
+                "examined": len(rows),
+            }
+            self.wait_budget.print_summary()
+        
+        except Exception as e:
+            self.error = str(e) or type(e).__name__
+            print(f"✗ Error: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+            await self.close_browser()
+    
+    async def _execute_plan_row(self, row: Dict, page: Page) -> str:
+        """Open a planned thread, confirm it is still at the planned level, and send the planned reply."""
+        thread_id = row["thread_id"]
+        with self.wait_budget.email(thread_id):
+            try:
+                if not await self._open_email_thread(row, page, open_directly=True):
+                    return STATUS_FAILED
+                level, followups_sent, _ = await self.detect_followup_level(thread_id, page)
+                if followups_sent >= 3 or level != row["level"]:
+                    print(f"   ⏭ Thread is at level {level} now (planned {row['level']}) - skipping")
+                    return STATUS_STALE
+                success, _, _ = await self._send_planned_reply(row, page)
+                return STATUS_SENT if success else STATUS_FAILED
+            except Exception as e:
+                print(f"   ✗ Error: {str(e)[:50]}")
+                return STATUS_FAILED
+    
+    async def close_browser(self):
+        """Close the browser, or just disconnect when attached to Arc."""
+        if self.shared_browser is not None:
+            # The browser belongs to run_profiles; only close what this profile opened
+            try:
+                if self._owns_context and self.context:
+                    await self.context.close()
+                elif self.page:
+                    await self.page.close()
+            except Exception:
+                pass
+            if self.browser_pool is not None:
+                self.browser_pool.release(self)
+            return
+        # Only close browser/context if we launched it ourselves
+        # Don't close when connected to Arc browser
+        if not self.use_arc:
+            if self.browser:
+                await self.browser.close()
+        else:
+            # When using Arc, just disconnect (don't close the browser)
+            if self.browser:
+                await self.browser.close()
+            print("✓ Disconnected from Arc browser (browser remains open)")
+
+
+def load_profile_names(config_path: Optional[str] = None) -> List[str]:
+    """Return the sender profile names defined in config.yaml."""
+    path = config_path or Path(__file__).parent / "config.yaml"
+    if not yaml or not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        config = yaml.safe_load(f) or {}
+    return list((config.get('profiles') or {}).keys())
+
+
+def profile_account(profile: Optional[str] = None, config_path: Optional[str] = None) -> str:
+    """The Gmail account a profile sends as (its gmail_sender, else the profile name), lowercased.
+
+    Resolves the profile the way GmailFollowUp does (unknown names fall back to
+    default_profile) without building a tool, so callers can tell which
+    requests would sweep the same Sent threads.
+    """
+    path = config_path or Path(__file__).parent / "config.yaml"
+    profile_key = (profile or "default").lower()
+    if not yaml or not os.path.exists(path):
+        return profile_key
+    try:
+        with open(path, 'r') as f:
+            config = yaml.safe_load(f) or {}
+    except Exception:
+        return profile_key
+    profiles = config.get('profiles') or {}
+    default_profile = config.get('default_profile', 'pretti')
+    profile_key = (profile or default_profile).lower()
+    if profile_key not in profiles:
+        profile_key = default_profile
+    return ((profiles.get(profile_key) or {}).get("gmail_sender") or profile_key).lower()
+
+
+async def open_shared_browser(playwright, tool: GmailFollowUp) -> Browser:
+    """Connect to (or launch) the browser a group of profiles will share."""
+    if tool.use_arc:
+        print(f"Connecting to Arc browser on port {tool.arc_debug_port}...")
+        try:
+            browser = await playwright.chromium.connect_over_cdp(f"http://localhost:{tool.arc_debug_port}")
+            print(f"✓ Connected to Arc browser on port {tool.arc_debug_port}")
+            return browser
+        except Exception as e:
+            print(f"✗ Failed to connect to Arc on port {tool.arc_debug_port}: {e}")
+            print("Falling back to regular Chromium...")
+            return await playwright.chromium.launch(headless=tool.headless)
+    return await playwright.chromium.launch(
+        headless=tool.headless,
+        args=["--start-maximized"] if not tool.headless else []
+    )
+
+
+def _session_keys(tool: "GmailFollowUp") -> set:
+    keys = {("sender", (tool.profile_config.get("gmail_sender") or tool.profile_key).lower())}
+    if tool.use_arc:
+        keys.add(("arc", str(tool.arc_debug_port)))
+    return keys
+
+
+def account_groups(tools: List["GmailFollowUp"]) -> List[List["GmailFollowUp"]]:
+    """
+    Split profiles into groups that must not sweep at the same time.
+    
+    Profiles sending as the same gmail_sender, or attached to the same Arc
+    session (one signed-in Gmail), see the same Sent threads, so they share a
+    group. Groups are ordered by their first profile.
+    """
+    groups: List[Tuple[set, List[GmailFollowUp]]] = []
+    for tool in tools:
+        keys = _session_keys(tool)
+        linked = [i for i, (group_keys, _) in enumerate(groups) if group_keys & keys]
+        if not linked:
+            groups.append((keys, [tool]))
+            continue
+        first_keys, first = groups[linked[0]]
+        # This profile can join two groups (same sender as one, same Arc session as another)
+        for i in reversed(linked[1:]):
+            other_keys, other = groups.pop(i)
+            first_keys |= other_keys
+            first.extend(other)
+        first_keys |= keys
+        first.append(tool)
+    return [members for _, members in groups]
+
+
+async def run_profiles(
+    profile_names: List[str],
+    followup_templates: Dict[int, str],
+    dry_run: bool = False,
+    max_emails: Optional[int] = None,
+    workers: int = 0,
+    **tool_kwargs,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Run several sender profiles from one Playwright driver.
+    
+    Profiles that use Arc share one CDP connection per debug port (set
+    arc_debug_port per profile in config.yaml to give a profile its own
+    browser); otherwise one Chromium is launched and each profile gets an
+    isolated context. Profiles on the same Gmail account (see account_groups)
+    run one after another and share a ThreadClaims, so a thread gets at most
+    one follow-up per run; separate accounts run in parallel.
+    
+    Args:
+        profile_names: Profiles from config.yaml to run
+        followup_templates: Templates by follow-up level
+        dry_run: Only list the candidates each profile would process
+        max_emails: Maximum number of emails to scan per profile
+        workers: Worker tabs per profile (0 = one thread at a time)
+        **tool_kwargs: Passed to each GmailFollowUp (headless, use_arc, backend, ...)
+    
+    Returns:
+        Stats per profile (sent, failed, skipped, examined, elapsed_s, wait_s)
+    """
+    tools = [GmailFollowUp(profile=name, **tool_kwargs) for name in profile_names]
+    stdout = sys.stdout
+    sys.stdout = _ProfileLogStream(stdout)
+    playwright = await async_playwright().start()
+    browsers: Dict[Optional[int], Browser] = {}
+    
+    groups = account_groups(tools)
+    for group in groups:
+        claims = ThreadClaims()
+        for tool in group:
+            tool.thread_claims = claims
+        if len(group) > 1:
+            names = " → ".join(tool.profile_key for tool in group)
+            sender = group[0].profile_config.get("gmail_sender") or "one browser session"
+            print(f"Profiles sharing {sender} run one after another: {names}")
+    
+    async def run_one(tool: GmailFollowUp):
+        _log_prefix.set(tool.profile_key)
+        started = time.perf_counter()
+        try:
+            if workers > 0:
+                await tool.run_workers(followup_templates, workers=workers, dry_run=dry_run, max_emails=max_emails)
             else:
-                # When using Arc, just disconnect (don't close the browser)
-                if self.browser:
-                    await self.browser.close()
-                print("✓ Disconnected from Arc browser (browser remains open)")
+                await tool.run(followup_templates, dry_run=dry_run, max_emails=max_emails)
+        finally:
+            tool.stats["elapsed_s"] = round(time.perf_counter() - started, 1)
+            tool.stats["wait_s"] = tool.wait_budget.summary()["total_wait_s"]
+    
+    async def run_group(group: List[GmailFollowUp]):
+        for tool in group:
+            try:
+                await run_one(tool)
+            except Exception as e:
+                tool.error = str(e)
+            if tool.error:
+                print(f"✗ Profile {tool.profile_key} failed: {tool.error}")
+    
+    started = time.perf_counter()
+    try:
+        # An API dry run never opens a browser
+        if not (dry_run and all(tool.backend == "api" for tool in tools)):
+            for tool in tools:
+                key = tool.arc_debug_port if tool.use_arc else None
+                if key not in browsers:
+                    browsers[key] = await open_shared_browser(playwright, tool)
+                tool.shared_browser = browsers[key]
+        
+        await asyncio.gather(*(run_group(group) for group in groups))
+    finally:
+        for browser in browsers.values():
+            try:
+                # Disconnects from Arc without closing it
+                await browser.close()
+            except Exception:
+                pass
+        await playwright.stop()
+        sys.stdout = stdout
+    
+    wall = time.perf_counter() - started
+    stats = {tool.profile_key: tool.stats for tool in tools}
+    total_elapsed = sum(s.get("elapsed_s", 0) for s in stats.values())
+    print(f"\n📊 Profiles summary ({len(tools)} profiles on {len(groups)} account(s) in {wall:.1f}s, {total_elapsed:.1f}s if run one after another)")
+    print(f"   {'profile':<12}{'sent':>6}{'failed':>8}{'skipped':>9}{'examined':>10}{'wait':>9}{'elapsed':>10}")
+    for name, s in stats.items():
+        print(
+            f"   {name:<12}{s.get('sent', 0):>6}{s.get('failed', 0):>8}{s.get('skipped', 0):>9}"
+            f"{s.get('examined', 0):>10}{s.get('wait_s', 0):>8.1f}s{s.get('elapsed_s', 0):>9.1f}s"
+        )
+    return stats
 
 
 async def main():
@@ -2091,11 +3060,59 @@ async def main():
         type=str,
         help="Sender profile to use ('advaith', 'abhay', or 'ethan'). Defaults to profile in config.yaml"
     )
+    parser.add_argument(
+        "--profiles",
+        type=str,
+        help="Run several profiles at once: 'all' or a comma-separated list (e.g. 'abhay,ethan')"
+    )
     parser.add_argument(
         "--config",
         type=str,
         help="Path to config.yaml file (default: config.yaml in script directory)"
     )
+    parser.add_argument(
+        "--backend",
+        choices=["browser", "api"],
+        default="browser",
+        help="How to find candidates: 'browser' scrapes the Sent folder, 'api' uses the Gmail API (needs GMAIL_* env vars)"
+    )
+    parser.add_argument(
+        "--state-db",
+        type=str,
+        help="Path to the thread state database (default: followup_state.sqlite3 in script directory)"
+    )
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        help="Re-check every thread instead of skipping ones the state store marks as unchanged"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Process threads in N parallel tabs of the same browser (default: 0 = one thread at a time)"
+    )
+    parser.add_argument(
+        "--no-query-plan",
+        action="store_true",
+        help="Search with the plain Sent query instead of letting Gmail filter by age/label/final follow-up in date windows"
+    )
+    parser.add_argument(
+        "--plan-out",
+        type=str,
+        help="Don't send: write each thread's level, username and rendered follow-up to this JSONL plan file"
+    )
+    parser.add_argument(
+        "--execute",
+        type=str,
+        help="Send the follow-ups in a plan file written by --plan-out (resumes where a previous run stopped)"
+    )
+    parser.add_argument(
+        "--send-interval",
+        type=float,
+        default=1.0,
+        help="Minimum seconds between two sends from this account (default: 1.0)"
+    )
     
     args = parser.parse_args()
     
@@ -2124,6 +3141,48 @@ also, your audience looks to you for guidance—{app_name} makes that guidance t
 -{from_name} from the {app_name} App ({link_url})
 """
     
+    if not followup_templates:
+        print("✗ Error: No follow-up templates loaded!")
+        sys.exit(1)
+    
+    if args.plan_out and args.execute:
+        print("✗ Error: --plan-out and --execute are separate phases; pass one of them")
+        sys.exit(1)
+    
+    if args.profiles:
+        if args.plan_out or args.execute:
+            print("✗ Error: --plan-out/--execute work on one profile at a time (use --profile)")
+            sys.exit(1)
+        available = load_profile_names(args.config)
+        if args.profiles.strip().lower() == "all":
+            profile_names = available
+        else:
+            profile_names = [name.strip().lower() for name in args.profiles.split(",") if name.strip()]
+            unknown = [name for name in profile_names if name not in available]
+            if unknown:
+                print(f"✗ Error: Unknown profile(s) {unknown}. Available: {available}")
+                sys.exit(1)
+        if not profile_names:
+            print("✗ Error: No profiles found in config.yaml")
+            sys.exit(1)
+        await run_profiles(
+            profile_names,
+            followup_templates,
+            dry_run=args.dry_run,
+            max_emails=args.max_emails,
+            workers=args.workers,
+            followup_days=args.days,
+            headless=args.headless,
+            use_arc=args.arc,
+            config_path=args.config,
+            backend=args.backend,
+            state_path=args.state_db,
+            full_scan=args.full_scan,
+            send_interval=args.send_interval,
+            plan_queries=not args.no_query_plan,
+        )
+        return
+    
     # Initialize and run
     profile_name = args.profile
     
@@ -2133,13 +3192,21 @@ also, your audience looks to you for guidance—{app_name} makes that guidance t
         use_arc=args.arc,
         profile=profile_name,
         config_path=args.config,
+        backend=args.backend,
+        state_path=args.state_db,
+        full_scan=args.full_scan,
+        send_interval=args.send_interval,
+        plan_queries=not args.no_query_plan,
     )
     
-    if not followup_templates:
-        print("✗ Error: No follow-up templates loaded!")
-        sys.exit(1)
-    
-    await tool.run(followup_templates, dry_run=args.dry_run, max_emails=args.max_emails)
+    if args.plan_out:
+        await tool.plan_followups(followup_templates, args.plan_out, workers=max(1, args.workers), max_emails=args.max_emails)
+    elif args.execute:
+        await tool.execute_plan(args.execute, workers=max(1, args.workers))
+    elif args.workers > 0:
+        await tool.run_workers(followup_templates, workers=args.workers, dry_run=args.dry_run, max_emails=args.max_emails)
+    else:
+        await tool.run(followup_templates, dry_run=args.dry_run, max_emails=args.max_emails)
 
 
 if __name__ == "__main__":
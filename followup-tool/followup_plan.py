@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Follow-up Plan Files
+A plan is a JSONL file with one line per candidate thread: its computed
+follow-up level, username and the fully rendered message. It is written by
+`--plan-out` (nothing is sent) and applied later by `--execute`, which records
+per-row progress in a sidecar checkpoint file so a crashed run can resume.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+# Row statuses in the checkpoint file; rows in a final state are never retried
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_STALE = "stale"
+STATUS_FAILED = "failed"
+FINAL_STATUSES = (STATUS_SENT, STATUS_STALE)
+
+
+def write_plan(path: str, rows: Iterable[Dict]) -> int:
+    """Write plan rows as JSONL (atomically, via a temp file). Returns the row count."""
+    tmp_path = f"{path}.tmp"
+    count = 0
+    with open(tmp_path, "w") as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def read_plan(path: str) -> List[Dict]:
+    """Read plan rows, skipping blank lines."""
+    rows = []
+    with open(path, "r") as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_num}: invalid plan row ({e})")
+    return rows
+
+
+class PlanCheckpoint:
+    """
+    Append-only progress log for executing a plan (<plan>.progress).
+    Each line is {"thread_id", "status", "at"}; the last status per thread wins.
+    A row is marked "sending" before its reply goes out, so after a crash the
+    executor knows which threads to re-check before sending again.
+    """
+
+    def __init__(self, plan_path: str):
+        self.path = f"{plan_path}.progress"
+        self.statuses: Dict[str, str] = {}
+        ends_mid_line = False
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                for line in f:
+                    ends_mid_line = not line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut short by the crash we are resuming from
+                        continue
+                    self.statuses[entry["thread_id"]] = entry["status"]
+        self._file = open(self.path, "a")
+        if ends_mid_line:
+            # Finish the cut-off line so our first entry doesn't get glued onto it
+            self._file.write("\n")
+
+    def status(self, thread_id: str) -> str:
+        return self.statuses.get(thread_id, "")
+
+    def is_done(self, thread_id: str) -> bool:
+        return self.status(thread_id) in FINAL_STATUSES
+
+    def mark(self, thread_id: str, status: str):
+        self.statuses[thread_id] = status
+        entry = {"thread_id": thread_id, "status": status, "at": datetime.now().isoformat(timespec="seconds")}
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Gmail API backend for the follow-up tool.
+Lists sent threads with users.threads.list and fetches their bodies with
+batched users.threads.get calls instead of paging through the Sent folder UI.
+"""
+
+import base64
+import html
+import json
+import os
+import re
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_API_BASE_URL = "https://gmail.googleapis.com"
+DEFAULT_TOKEN_URL = "https://oauth2.googleapis.com/token"
+
+# Gmail accepts up to 100 calls per batch but recommends staying at or below 50
+BATCH_SIZE = 50
+LIST_PAGE_SIZE = 500
+
+QUOTE_HEADER_RE = re.compile(r"^\s*On .+wrote:\s*$", re.IGNORECASE)
+HTML_QUOTE_RE = re.compile(r'<div[^>]*class="gmail_quote.*', re.IGNORECASE | re.DOTALL)
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+HTML_BREAK_RE = re.compile(r"<\s*(br|/p|/div)\s*/?>", re.IGNORECASE)
+
+
+class GmailApiError(Exception):
+    """Raised when the Gmail API returns an error response."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Gmail API error {status}: {message}")
+        self.status = status
+
+
+class GmailApiBackend:
+    def __init__(
+        self,
+        access_token: Optional[str] = None,
+        refresh_token: Optional[str] = None,
+        client_id: Optional[str] = None,
+        client_secret: Optional[str] = None,
+        base_url: Optional[str] = None,
+        token_url: Optional[str] = None,
+        user_id: str = "me",
+        timeout: float = 30.0,
+    ):
+        """
+        Initialize the Gmail API backend.
+
+        Args:
+            access_token: OAuth access token (used as-is, never refreshed)
+            refresh_token: OAuth refresh token used to mint access tokens
+            client_id: OAuth client id (required with refresh_token)
+            client_secret: OAuth client secret (required with refresh_token)
+            base_url: API root, override to point at a local fake Gmail server
+            token_url: OAuth token endpoint
+            user_id: Gmail user id for API paths (default: "me")
+            timeout: Per-request timeout in seconds
+        """
+        self.base_url = (base_url or DEFAULT_API_BASE_URL).rstrip("/")
+        self.token_url = token_url or DEFAULT_TOKEN_URL
+        self.user_id = user_id
+        self.timeout = timeout
+        self._access_token = access_token
+        self._refresh_token = refresh_token
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._token_expiry = float("inf") if access_token else 0.0
+        self._label_names: Optional[Dict[str, str]] = None
+
+    @classmethod
+    def from_env(cls) -> "GmailApiBackend":
+        """Build a backend from GMAIL_* environment variables."""
+        return cls(
+            access_token=os.environ.get("GMAIL_ACCESS_TOKEN") or None,
+            refresh_token=os.environ.get("GMAIL_REFRESH_TOKEN") or None,
+            client_id=os.environ.get("GMAIL_CLIENT_ID") or None,
+            client_secret=os.environ.get("GMAIL_CLIENT_SECRET") or None,
+            base_url=os.environ.get("GMAIL_API_BASE_URL") or None,
+            token_url=os.environ.get("GMAIL_TOKEN_URL") or None,
+        )
+
+    def _get_access_token(self) -> str:
+        """Return a valid access token, refreshing it when it is about to expire."""
+        if self._access_token and time.time() < self._token_expiry - 60:
+            return self._access_token
+        if not (self._refresh_token and self._client_id and self._client_secret):
+            raise GmailApiError(401, "Set GMAIL_ACCESS_TOKEN or GMAIL_REFRESH_TOKEN/GMAIL_CLIENT_ID/GMAIL_CLIENT_SECRET")
+
+        body = urllib.parse.urlencode({
+            "grant_type": "refresh_token",
+            "refresh_token": self._refresh_token,
+            "client_id": self._client_id,
+            "client_secret": self._client_secret,
+        }).encode("utf-8")
+        request = urllib.request.Request(self.token_url, data=body, method="POST")
+        request.add_header("Content-Type", "application/x-www-form-urlencoded")
+        payload = self._send(request)
+        self._access_token = payload["access_token"]
+        self._token_expiry = time.time() + int(payload.get("expires_in", 3600))
+        return self._access_token
+
+    def _send(self, request: urllib.request.Request) -> Dict:
+        """Send a JSON request and decode the response."""
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                raw = response.read()
+        except urllib.error.HTTPError as e:
+            detail = e.read().decode("utf-8", errors="replace")[:200]
+            raise GmailApiError(e.code, detail) from e
+        return json.loads(raw.decode("utf-8")) if raw else {}
+
+    def _get(self, path: str, params: Optional[Dict[str, str]] = None) -> Dict:
+        url = f"{self.base_url}/gmail/v1/users/{self.user_id}/{path}"
+        if params:
+            url += "?" + urllib.parse.urlencode(params)
+        request = urllib.request.Request(url, method="GET")
+        request.add_header("Authorization", f"Bearer {self._get_access_token()}")
+        return self._send(request)
+
+    def list_label_names(self) -> Dict[str, str]:
+        """
+        Map user label ids to display names (cached for the lifetime of the backend).
+        System labels (SENT, INBOX, ...) are left out to match the chips Gmail shows on rows.
+        """
+        if self._label_names is None:
+            payload = self._get("labels")
+            self._label_names = {
+                label["id"]: label.get("name", label["id"])
+                for label in payload.get("labels", [])
+                if label.get("type", "user") == "user"
+            }
+        return self._label_names
+
+    def list_thread_ids(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """
+        List threads matching a Gmail search query.
+
+        Returns:
+            List of {"id", "historyId", "snippet"} dicts, newest first
+        """
+        threads: List[Dict] = []
+        page_token: Optional[str] = None
+        while True:
+            params = {"q": query, "maxResults": str(LIST_PAGE_SIZE)}
+            if page_token:
+                params["pageToken"] = page_token
+            payload = self._get("threads", params)
+            threads.extend(payload.get("threads", []))
+            if limit and len(threads) >= limit:
+                return threads[:limit]
+            page_token = payload.get("nextPageToken")
+            if not page_token:
+                return threads
+
+    def get_threads(self, thread_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch full thread payloads using batched threads.get calls."""
+        threads: Dict[str, Dict] = {}
+        for start in range(0, len(thread_ids), BATCH_SIZE):
+            chunk = thread_ids[start:start + BATCH_SIZE]
+            threads.update(self._batch_get_threads(chunk))
+        return threads
+
+    def _batch_get_threads(self, thread_ids: List[str]) -> Dict[str, Dict]:
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for i, thread_id in enumerate(thread_ids):
+            parts.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <item{i}>\r\n\r\n"
+                f"GET /gmail/v1/users/{self.user_id}/threads/{urllib.parse.quote(thread_id)}?format=full\r\n\r\n"
+            )
+        parts.append(f"--{boundary}--\r\n")
+        body = "".join(parts).encode("utf-8")
+
+        request = urllib.request.Request(f"{self.base_url}/batch/gmail/v1", data=body, method="POST")
+        request.add_header("Authorization", f"Bearer {self._get_access_token()}")
+        request.add_header("Content-Type", f"multipart/mixed; boundary={boundary}")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                content_type = response.headers.get("Content-Type", "")
+                raw = response.read()
+        except urllib.error.HTTPError as e:
+            detail = e.read().decode("utf-8", errors="replace")[:200]
+            raise GmailApiError(e.code, detail) from e
+
+        threads: Dict[str, Dict] = {}
+        for status, payload in _parse_batch_response(content_type, raw):
+            if status == 200 and payload.get("id"):
+                threads[payload["id"]] = payload
+            else:
+                error = payload.get("error", {}) if isinstance(payload, dict) else {}
+                print(f"   ⚠ threads.get failed ({status}): {str(error.get('message', ''))[:50]}")
+        return threads
+
+
+def _parse_batch_response(content_type: str, raw: bytes) -> List[Tuple[int, Dict]]:
+    """Split a multipart/mixed batch response into (status, json payload) pairs."""
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    if not match:
+        raise GmailApiError(500, f"Batch response missing boundary: {content_type}")
+    boundary = match.group(1)
+    text = raw.decode("utf-8", errors="replace")
+
+    results: List[Tuple[int, Dict]] = []
+    for part in text.split(f"--{boundary}"):
+        part = part.strip()
+        if not part or part == "--":
+            continue
+        # Outer part headers, then the embedded HTTP response (status line + headers, body)
+        sections = re.split(r"\r?\n\r?\n", part, maxsplit=2)
+        if len(sections) < 2:
+            continue
+        head = sections[1]
+        body = sections[2] if len(sections) > 2 else ""
+        status_match = re.match(r"HTTP/\d(?:\.\d)?\s+(\d{3})", head)
+        status = int(status_match.group(1)) if status_match else 500
+        try:
+            payload = json.loads(body) if body.strip() else {}
+        except ValueError:
+            payload = {}
+        results.append((status, payload))
+    return results
+
+
+def message_header(message: Dict, name: str) -> str:
+    """Return the value of a message header (case-insensitive), or an empty string."""
+    for header in message.get("payload", {}).get("headers", []):
+        if header.get("name", "").lower() == name.lower():
+            return header.get("value", "")
+    return ""
+
+
+def _decode_body(data: str) -> str:
+    padded = data + "=" * (-len(data) % 4)
+    return base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8", errors="replace")
+
+
+def _find_part(payload: Dict, mime_type: str) -> Optional[str]:
+    if payload.get("mimeType") == mime_type and payload.get("body", {}).get("data"):
+        return _decode_body(payload["body"]["data"])
+    for part in payload.get("parts", []) or []:
+        found = _find_part(part, mime_type)
+        if found:
+            return found
+    return None
+
+
+def message_text(message: Dict) -> str:
+    """Return a message's body text with quoted history removed (mirrors the DOM stripQuotes)."""
+    payload = message.get("payload", {})
+    text = _find_part(payload, "text/plain")
+    if text is None:
+        html_body = _find_part(payload, "text/html")
+        if html_body is None:
+            return message.get("snippet", "")
+        html_body = HTML_QUOTE_RE.sub("", html_body)
+        html_body = HTML_BREAK_RE.sub("\n", html_body)
+        text = html.unescape(HTML_TAG_RE.sub("", html_body))
+
+    kept = []
+    for line in text.splitlines():
+        if QUOTE_HEADER_RE.match(line):
+            break
+        if line.lstrip().startswith(">"):
+            continue
+        kept.append(line)
+    return "\n".join(kept).strip()
+
+
+def thread_messages(thread: Dict, sender_email: str, sender_name: str) -> List[Dict]:
+    """
+    Convert a threads.get payload into the [{"fromMe", "text"}] shape that
+    GmailFollowUp.detect_followup_level builds from the DOM.
+    """
+    messages = []
+    for message in thread.get("messages", []):
+        from_header = message_header(message, "From").lower()
+        from_me = "SENT" in (message.get("labelIds") or [])
+        if not from_me and sender_email:
+            from_me = sender_email in from_header
+        if not from_me and sender_name:
+            from_me = sender_name in from_header
+        messages.append({"fromMe": from_me, "text": message_text(message)})
+    return messages
@@ -0,0 +1,237 @@
+// Gmail Sent-list row extractor for the follow-up tool.
+//
+// Injected once per page with page.add_init_script (see
+// GmailFollowUp._extract_page_rows) and called with
+// window.__followupRows.extract(options). Bump VERSION whenever the row
+// layout below changes so pages holding an older copy get re-injected.
+//
+// Each kept row is a compact array:
+//   [index, threadId, epochMs|null, dateText, recipient, usernameHint, flags, subject, displayName, labels]
+// Rows tagged with the skip label, newer than followupDays, or whose snippet
+// shows our final follow-up are dropped here and only counted.
+(() => {
+    const VERSION = 1;
+    if (window.__followupRows && window.__followupRows.version >= VERSION) return;
+
+    const FLAG_HAS_LABELS = 1;
+    const FLAG_UNDATED = 2;
+
+    const MONTHS = { jan: 0, feb: 1, mar: 2, apr: 3, may: 4, jun: 5, jul: 6, aug: 7, sep: 8, oct: 9, nov: 10, dec: 11 };
+    const DAY_MS = 24 * 60 * 60 * 1000;
+
+    // Mirrors USERNAME_REGEXES in followup_gmail.py
+    const USERNAME_REGEXES = [
+        /(?:hey|hi|hello|heyyy|hiya|yo|sup)\s+@?([a-z0-9_.'’-]{2,})/i,
+        /\bhiya\s+@?([a-z0-9_.'’-]{2,})/i,
+        /(?:^|[\s,;])@([a-z0-9_.'’-]{2,})/i,
+        /^([a-z0-9_.'’-]{2,})\s*[,–—-]/i,
+    ];
+    const STRIP_CHARS = ",.!?;:\"'()[]{}<>";
+    const DOMAIN_TLDS = ['.com', '.net', '.org', '.io', '.so', '.co', '.app', '.dev', '.ai', '.me'];
+
+    // Mirrors GmailFollowUp._sanitize_username
+    function sanitizeUsername(username, genericNames) {
+        if (!username) return '';
+        let cleaned = username.trim();
+        let start = 0;
+        let end = cleaned.length;
+        while (start < end && STRIP_CHARS.includes(cleaned[start])) start++;
+        while (end > start && STRIP_CHARS.includes(cleaned[end - 1])) end--;
+        cleaned = cleaned.slice(start, end).replace(/`/g, "'");
+        cleaned = cleaned.replace(/\s+/g, '').replace(/[^A-Za-z0-9_.'-]/g, '');
+        if (!cleaned || cleaned.includes('@')) return '';
+        const lower = cleaned.toLowerCase();
+        if (genericNames.has(lower)) return '';
+        if (cleaned.includes('.')) {
+            if (DOMAIN_TLDS.some(tld => lower.endsWith(tld))) return '';
+            if (cleaned.length <= 10) return '';
+        }
+        if (/^[a-z0-9]+\.(com|net|org|io|so|co|app|dev|ai|me)$/.test(lower)) return '';
+        if (cleaned.length < 2 || cleaned.length > 30) return '';
+        return cleaned;
+    }
+
+    function usernameFromText(text, genericNames) {
+        if (!text) return '';
+        for (const regex of USERNAME_REGEXES) {
+            const match = text.match(regex);
+            if (match) {
+                const candidate = sanitizeUsername(match[1], genericNames);
+                if (candidate) return candidate;
+            }
+        }
+        return '';
+    }
+
+    // Gmail shows "6:27 PM" for today, "Nov 8" for this year, "11/8/24" for older mail,
+    // and the full date ("Sat, Nov 8, 2025, 6:27 PM") in the cell's title attribute.
+    function parseDate(text, now) {
+        if (!text) return null;
+        const lower = text.trim().toLowerCase();
+        if (/minute|hour|just now/.test(lower)) return now;
+        let m = lower.match(/(\d+)\s*(day|week|month)s?/);
+        if (m) {
+            const n = parseInt(m[1], 10);
+            const days = m[2] === 'day' ? n : m[2] === 'week' ? n * 7 : n * 30;
+            return now - days * DAY_MS;
+        }
+        if (lower.includes('yesterday')) return now - DAY_MS;
+        if (lower.includes('today')) return now;
+
+        const today = new Date(now);
+        m = lower.match(/^(\d{1,2}):(\d{2})\s*(am|pm)?$/);
+        if (m) {
+            let hours = parseInt(m[1], 10) % 12;
+            if (m[3] === 'pm') hours += 12;
+            return new Date(today.getFullYear(), today.getMonth(), today.getDate(), hours, parseInt(m[2], 10)).getTime();
+        }
+        m = lower.match(/\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(\d{1,2})(?:,?\s+(\d{4}))?(?:,?\s+(\d{1,2}):(\d{2})\s*(am|pm))?/);
+        if (m) {
+            let year = m[3] ? parseInt(m[3], 10) : today.getFullYear();
+            let hours = m[4] ? parseInt(m[4], 10) % 12 + (m[6] === 'pm' ? 12 : 0) : 0;
+            let date = new Date(year, MONTHS[m[1]], parseInt(m[2], 10), hours, m[5] ? parseInt(m[5], 10) : 0);
+            // "Dec 30" seen in January belongs to last year
+            if (!m[3] && date.getTime() > now + DAY_MS) date.setFullYear(year - 1);
+            return date.getTime();
+        }
+        m = lower.match(/^(\d{1,2})\/(\d{1,2})\/(\d{2,4})$/);
+        if (m) {
+            let year = parseInt(m[3], 10);
+            if (year < 100) year += 2000;
+            return new Date(year, parseInt(m[1], 10) - 1, parseInt(m[2], 10)).getTime();
+        }
+        m = lower.match(/^(\d{4})-(\d{2})-(\d{2})$/);
+        if (m) return new Date(parseInt(m[1], 10), parseInt(m[2], 10) - 1, parseInt(m[3], 10)).getTime();
+        return null;
+    }
+
+    function rowSubject(cells) {
+        let subject = '';
+        let maxLength = 0;
+        for (const cell of cells) {
+            const cellText = cell.innerText || '';
+            if (cellText.length > maxLength &&
+                !/^\d+[:]\d+\s*(AM|PM)$/i.test(cellText) &&
+                !/^\s*[★☆✓]\s*$/.test(cellText)) {
+                subject = cellText.trim();
+                maxLength = cellText.length;
+            }
+        }
+        if (!subject || subject.length < 5) {
+            for (const cell of cells) {
+                const cellText = (cell.innerText || '').trim();
+                if (cellText.length > subject.length) subject = cellText;
+            }
+        }
+        return subject;
+    }
+
+    function rowDate(row, cells) {
+        const titled = row.querySelector('td.xW span[title], td span[title]');
+        let dateText = '';
+        for (const cell of Array.from(cells).reverse()) {
+            const cellText = cell.innerText || '';
+            if (/\d+[:]\d+|\d+\/\d+\/\d+|AM|PM|ago|day|week|month|Nov|Dec|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct/i.test(cellText)) {
+                dateText = cellText.trim();
+                break;
+            }
+        }
+        return { dateText, fullDate: titled ? titled.getAttribute('title') : '' };
+    }
+
+    function rowDisplayName(row) {
+        for (const sel of ['.yW span[email]', '.yW span', 'span[email]', '.bA4 span', '.y2']) {
+            const el = row.querySelector(sel);
+            if (el && el.innerText && el.innerText.trim().length > 0) return el.innerText.trim();
+        }
+        return '';
+    }
+
+    function rowLabels(row, text) {
+        const labels = [];
+        const selectors = ['.ar', '.at', '.aZ', 'span[aria-label*="Label:"]', 'div[aria-label*="Label:"]', '.aZo', '[data-label-name]'];
+        for (const sel of selectors) {
+            row.querySelectorAll(sel).forEach(el => {
+                const labelText = el.innerText || el.textContent || el.getAttribute('aria-label') || el.getAttribute('data-label-name') || '';
+                const clean = labelText.trim().replace(/^Label:\s*/i, '');
+                if (clean && !labels.includes(clean)) labels.push(clean);
+            });
+        }
+        const labelPattern = /\[([^\]]+)\]/g;
+        let match;
+        while ((match = labelPattern.exec(text)) !== null) {
+            const labelText = match[1].trim();
+            if (labelText && !labels.includes(labelText)) labels.push(labelText);
+        }
+        return labels;
+    }
+
+    /**
+     * options: {limit, followupDays, skipLabel, finalMarkers[], genericNames[], filter}
+     * returns: {version, rows, total, dropped: {tagged, recent, final}, tagged: [[threadId, dateText, epochMs]]}
+     */
+    function extract(options) {
+        const opts = options || {};
+        const limit = opts.limit || 999999;
+        const filter = opts.filter !== false;
+        const skipLabel = (opts.skipLabel || '').toLowerCase();
+        const finalMarkers = (opts.finalMarkers || []).map(marker => marker.toLowerCase());
+        const genericNames = new Set((opts.genericNames || []).map(name => name.toLowerCase()));
+        const now = Date.now();
+        const cutoff = now - (opts.followupDays || 0) * DAY_MS;
+
+        const mainArea = document.querySelector('div[role="main"]') || document.body;
+        const rows = mainArea.querySelectorAll('tbody tr[role="row"], tr[role="row"]:has(td[role="gridcell"])');
+        const result = { version: VERSION, rows: [], total: 0, dropped: { tagged: 0, recent: 0, final: 0 }, tagged: [] };
+
+        for (let i = 0; i < rows.length && result.rows.length < limit; i++) {
+            const row = rows[i];
+            const cells = row.querySelectorAll('td');
+            const text = row.innerText || row.textContent || '';
+            if (cells.length < 2 || text.trim().length < 10) continue;
+            result.total++;
+
+            const threadId = row.getAttribute('data-legacy-thread-id') || row.dataset?.legacyThreadId || '';
+            const { dateText, fullDate } = rowDate(row, cells);
+            const epoch = parseDate(fullDate, now) ?? parseDate(dateText, now);
+            const labels = rowLabels(row, text);
+
+            if (filter) {
+                if (skipLabel && labels.some(label => label.toLowerCase() === skipLabel)) {
+                    result.dropped.tagged++;
+                    result.tagged.push([threadId, dateText, epoch]);
+                    continue;
+                }
+                if (epoch !== null && epoch > cutoff) {
+                    result.dropped.recent++;
+                    continue;
+                }
+                const lowerText = text.toLowerCase();
+                if (finalMarkers.some(marker => lowerText.includes(marker))) {
+                    result.dropped.final++;
+                    continue;
+                }
+            }
+
+            const subject = rowSubject(cells);
+            const recipientMatch = text.match(/[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}/);
+            const recipient = recipientMatch ? recipientMatch[0] : '';
+            const displayName = rowDisplayName(row);
+            let usernameHint = usernameFromText(text.substring(0, 300), genericNames)
+                || usernameFromText(subject, genericNames)
+                || usernameFromText(displayName, genericNames);
+            if (!usernameHint && recipient) usernameHint = sanitizeUsername(recipient.split('@')[0], genericNames);
+
+            let flags = 0;
+            if (labels.length) flags |= FLAG_HAS_LABELS;
+            if (epoch === null) flags |= FLAG_UNDATED;
+            result.rows.push([
+                i, threadId, epoch, dateText, recipient, usernameHint, flags,
+                subject.substring(0, 150), displayName, labels.length ? labels : 0,
+            ]);
+        }
+        return result;
+    }
+
+    window.__followupRows = { version: VERSION, extract };
+})();
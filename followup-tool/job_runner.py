@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Follow-up Job Runner
+Runs follow-up jobs on one background event loop so the API can answer right
+away, and keeps a pool of warm browsers/contexts that jobs reuse instead of
+cold-launching Chromium for every request.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from playwright.async_api import async_playwright, Browser, BrowserContext
+
+from followup_gmail import GmailFollowUp, ThreadClaims, open_shared_browser, profile_account
+
+MAX_LOG_LINES = 2000
+MAX_FINISHED_JOBS = 100
+
+# Job whose coroutine is currently printing; its output is captured into the job log
+_current_job: ContextVar[Optional["FollowupJob"]] = ContextVar("current_job", default=None)
+
+
+class FollowupJob:
+    def __init__(self, params: Dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.profile = (params.get("profile") or "default").lower()
+        # Gmail account the job sweeps; jobs on one account run one after another
+        self.account = profile_account(params.get("profile"), params.get("config_path"))
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.progress: Dict[str, int] = {}
+        self.stats: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.done = threading.Event()
+        self._log: deque = deque(maxlen=MAX_LOG_LINES)
+        self._log_dropped = 0
+        self._partial = ""
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def write(self, text: str):
+        with self._lock:
+            self._partial += text
+            *lines, self._partial = self._partial.split("\n")
+            for line in lines:
+                if len(self._log) == self._log.maxlen:
+                    self._log_dropped += 1
+                self._log.append(line)
+
+    def log_since(self, index: int = 0) -> Tuple[List[str], int]:
+        """Log lines from absolute line number `index` on, plus the next index to ask for."""
+        with self._lock:
+            start = max(index - self._log_dropped, 0)
+            lines = list(self._log)[start:]
+            return lines, self._log_dropped + len(self._log)
+
+    def to_dict(self, log_since: Optional[int] = None) -> Dict:
+        data = {
+            "id": self.id,
+            "profile": self.profile,
+            "account": self.account,
+            "status": self.status,
+            "dry_run": bool(self.params.get("dry_run")),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_s": round((self.finished_at or time.time()) - (self.started_at or self.created_at), 1),
+            "progress": dict(self.progress),
+            "stats": dict(self.stats),
+            "error": self.error,
+        }
+        if log_since is not None:
+            data["log"], data["next_log_index"] = self.log_since(log_since)
+        return data
+
+
+class _JobLogStream:
+    """Stdout wrapper that copies each job's output into its job log."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text: str) -> int:
+        job = _current_job.get()
+        if job is not None:
+            job.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class BrowserPool:
+    """
+    Pre-launched browsers and logged-in contexts, reused across jobs.
+    Lives on the runner's event loop. Contexts are kept per profile, so the
+    Gmail session a job logged into is still there for the next job.
+    """
+
+    def __init__(self):
+        self._playwright = None
+        self._browsers: Dict[Optional[int], Browser] = {}
+        self._idle: Dict[str, List[BrowserContext]] = defaultdict(list)
+        self.stats = {"browser_launches": 0, "contexts_created": 0, "context_reuses": 0}
+
+    async def _browser_for(self, tool: GmailFollowUp) -> Browser:
+        key = tool.arc_debug_port if tool.use_arc else None
+        browser = self._browsers.get(key)
+        if browser is not None and browser.is_connected():
+            return browser
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        browser = await open_shared_browser(self._playwright, tool)
+        self._browsers[key] = browser
+        self.stats["browser_launches"] += 1
+        if key is None:
+            # Contexts from a browser that went away can't be reused
+            self._idle.clear()
+        return browser
+
+    async def acquire(self, tool: GmailFollowUp):
+        """Attach a warm browser (and an idle context for the profile, if any) to a tool starting its browser."""
+        tool.shared_browser = await self._browser_for(tool)
+        if tool.use_arc:
+            # Arc keeps its own logged-in context; the tool opens a tab in it
+            return
+        idle = self._idle[tool.profile_key]
+        if idle:
+            tool.shared_context = idle.pop()
+            self.stats["context_reuses"] += 1
+        else:
+            tool.shared_context = await tool.create_context(tool.shared_browser)
+            self.stats["contexts_created"] += 1
+
+    def release(self, tool: GmailFollowUp):
+        """Return the tool's context to the pool when the tool closes its browser."""
+        context = tool.shared_context
+        tool.shared_context = None
+        if context is not None and tool.shared_browser is not None and tool.shared_browser.is_connected():
+            self._idle[tool.profile_key].append(context)
+
+    async def warm(self, tool: GmailFollowUp):
+        """Launch the browser and log a context into Gmail ahead of the first job for a profile."""
+        await self.acquire(tool)
+        try:
+            if tool.shared_context is not None:
+                page = await tool.shared_context.new_page()
+                try:
+                    await page.goto("https://mail.google.com/mail/u/0/#inbox", wait_until="domcontentloaded", timeout=30000)
+                finally:
+                    await page.close()
+        finally:
+            self.release(tool)
+
+    async def close(self):
+        for browser in self._browsers.values():
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._browsers.clear()
+        self._idle.clear()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+class JobRunner:
+    def __init__(self, make_tool: Callable[[Dict], GmailFollowUp], execute: Callable[[GmailFollowUp, Dict], Awaitable[None]]):
+        """
+        Args:
+            make_tool: Builds a GmailFollowUp from the job's request parameters
+            execute: Runs the tool for a job (run / run_workers with the job's options)
+        """
+        self.make_tool = make_tool
+        self.execute = execute
+        self.pool = BrowserPool()
+        self.jobs: Dict[str, FollowupJob] = {}
+        # Per account, used only on the job loop: one job sweeps at a time, and the
+        # jobs queued together share thread claims (as run_profiles does for a group)
+        self._account_locks: Dict[str, asyncio.Lock] = {}
+        self._account_claims: Dict[str, ThreadClaims] = {}
+        self._account_jobs: Dict[str, int] = defaultdict(int)
+        self.loop = asyncio.new_event_loop()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run_loop, name="followup-jobs", daemon=True)
+        self._thread.start()
+        if not isinstance(sys.stdout, _JobLogStream):
+            sys.stdout = _JobLogStream(sys.stdout)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, params: Dict) -> Tuple[FollowupJob, bool]:
+        """
+        Queue a follow-up job.
+
+        A job for another profile on the same Gmail account waits for the ones
+        already queued or running on that account, since they all see the same
+        Sent threads.
+
+        Returns:
+            (job, created) - created is False when a job for the same profile is
+            still queued or running, in which case that job is returned instead
+        """
+        with self._lock:
+            profile = (params.get("profile") or "default").lower()
+            for job in self.jobs.values():
+                if job.profile == profile and not job.finished:
+                    return job, False
+            job = FollowupJob(params)
+            waiting_on = [other for other in self.jobs.values() if other.account == job.account and not other.finished]
+            self.jobs[job.id] = job
+            self._prune()
+        if waiting_on:
+            names = ", ".join(other.profile for other in waiting_on)
+            job.write(f"⏳ Queued behind {names} (same account {job.account})\n")
+        asyncio.run_coroutine_threadsafe(self._run_job(job), self.loop)
+        return job, True
+
+    def get(self, job_id: str) -> Optional[FollowupJob]:
+        return self.jobs.get(job_id)
+
+    def warm(self, params_list: List[Dict]):
+        """Pre-launch browsers/contexts for these profiles in the background."""
+        async def warm_all():
+            for params in params_list:
+                tool = None
+                try:
+                    tool = self.make_tool(params)
+                    await self.pool.warm(tool)
+                except Exception as e:
+                    print(f"⚠ Could not warm browser for {params.get('profile') or 'default'}: {e}")
+                finally:
+                    if tool is not None and tool.state_store:
+                        tool.state_store.close()
+        asyncio.run_coroutine_threadsafe(warm_all(), self.loop)
+
+    def _prune(self):
+        finished = [job for job in self.jobs.values() if job.finished]
+        for job in sorted(finished, key=lambda j: j.created_at)[:-MAX_FINISHED_JOBS]:
+            del self.jobs[job.id]
+
+    async def _run_job(self, job: FollowupJob):
+        account = job.account
+        lock = self._account_locks.setdefault(account, asyncio.Lock())
+        self._account_jobs[account] += 1
+        try:
+            async with lock:
+                await self._run_locked(job, self._account_claims.setdefault(account, ThreadClaims()))
+        finally:
+            self._account_jobs[account] -= 1
+            if not self._account_jobs[account]:
+                # Nothing else queued on the account: the next sweep starts fresh
+                del self._account_jobs[account]
+                self._account_claims.pop(account, None)
+
+    async def _run_locked(self, job: FollowupJob, claims: ThreadClaims):
+        _current_job.set(job)
+        job.status = "running"
+        job.started_at = time.time()
+        tool: Optional[GmailFollowUp] = None
+        try:
+            tool = self.make_tool(job.params)
+            tool.thread_claims = claims
+            job.progress = tool.progress
+            # The tool takes a warm browser from the pool only if it needs one (not for API dry runs)
+            tool.browser_pool = self.pool
+            await self.execute(tool, job.params)
+            job.stats = dict(tool.stats)
+            job.stats["wait_s"] = tool.wait_budget.summary()["total_wait_s"]
+            # The tool reports a crashed sweep instead of raising
+            if tool.error:
+                raise RuntimeError(tool.error)
+            job.status = "completed"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+            print(f"✗ Job {job.id} failed: {e}")
+        finally:
+            if tool is not None and tool.state_store:
+                tool.state_store.close()
+            job.finished_at = time.time()
+            job.done.set()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Gmail Search Query Planner
+Builds the Gmail search used to find follow-up candidates so Gmail filters
+server-side (age, "pretti responses" label, final follow-up already sent),
+and splits result sets that don't fit on one page into date windows.
+"""
+
+from datetime import date, timedelta
+from typing import List, Optional
+
+# Conversations per page in Gmail's default list settings
+GMAIL_PAGE_SIZE = 50
+# How far back the first split reaches; older mail stays in one open-ended window
+DEFAULT_LOOKBACK_DAYS = 180
+
+
+class DateWindow:
+    """A [after, before) date range; None means unbounded on that side."""
+
+    def __init__(self, after: Optional[date] = None, before: Optional[date] = None):
+        self.after = after
+        self.before = before
+
+    def terms(self) -> str:
+        """Gmail search terms for this window (after: is inclusive, before: exclusive)."""
+        terms = []
+        if self.after:
+            terms.append(f"after:{self.after:%Y/%m/%d}")
+        if self.before:
+            terms.append(f"before:{self.before:%Y/%m/%d}")
+        return " ".join(terms)
+
+    def __repr__(self) -> str:
+        return f"DateWindow({self.after}, {self.before})"
+
+
+class QueryPlanner:
+    def __init__(
+        self,
+        sent_query: str,
+        followup_days: int,
+        exclude_phrases: Optional[List[str]] = None,
+        lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+        page_size: int = GMAIL_PAGE_SIZE,
+        today: Optional[date] = None,
+    ):
+        """
+        Args:
+            sent_query: Base Sent search (e.g. 'in:sent PAID PROMO ... -label:"pretti responses"')
+            followup_days: Only threads older than this many days are due
+            exclude_phrases: Phrases whose threads are finished (e.g. the final follow-up)
+            lookback_days: Age at which the first split separates recent from old mail
+            page_size: Results Gmail shows per page
+            today: Reference date (default: today)
+        """
+        self.sent_query = sent_query
+        self.followup_days = followup_days
+        self.exclude_phrases = exclude_phrases or []
+        self.lookback_days = lookback_days
+        self.page_size = page_size
+        self.today = today or date.today()
+
+    def base_query(self) -> str:
+        """Sent search with the age and finished-thread filters pushed into Gmail."""
+        parts = [self.sent_query]
+        if 'label:"pretti responses"' not in self.sent_query:
+            parts.append('-label:"pretti responses"')
+        parts.append(f"older_than:{self.followup_days}d")
+        parts.extend(f'-"{phrase}"' for phrase in self.exclude_phrases)
+        return " ".join(parts)
+
+    def query_for(self, window: DateWindow) -> str:
+        terms = window.terms()
+        return f"{self.base_query()} {terms}" if terms else self.base_query()
+
+    def initial_windows(self) -> List[DateWindow]:
+        """Start with one unbounded search; it is only split if it overflows a page."""
+        return [DateWindow()]
+
+    def split(self, window: DateWindow) -> List[DateWindow]:
+        """
+        Split a window whose results don't fit on one page.
+
+        Returns:
+            [older, newer] halves, or [] if the window is a single day and can't be split
+        """
+        if window.after is None:
+            # Unbounded on the old side: carve off a bounded recent block, reaching back
+            # twice as far each time the remaining old window overflows again
+            if window.before is None:
+                pivot = self.today - timedelta(days=self.lookback_days)
+            else:
+                reach = max((self.today - window.before).days, self.lookback_days)
+                pivot = window.before - timedelta(days=reach)
+            return [DateWindow(None, pivot), DateWindow(pivot, window.before)]
+        # older_than: already caps the newest side
+        before = window.before or self.today - timedelta(days=self.followup_days - 1)
+        days = (before - window.after).days
+        if days <= 1:
+            return []
+        pivot = window.after + timedelta(days=days // 2)
+        return [DateWindow(window.after, pivot), DateWindow(pivot, window.before)]
+
+    def overflows(self, total: Optional[int], rows_on_page: int) -> bool:
+        """Whether a search's results spill past the first page."""
+        if total is not None:
+            return total > self.page_size
+        return rows_on_page >= self.page_size
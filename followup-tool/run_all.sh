@@ -0,0 +1,8 @@
+#!/bin/bash
+set -euo pipefail
+
+cd /Users/adzter/internal-tools/followup-tool
+
+./launch_arc_debug.sh
+
+python3 followup_gmail.py --profiles all --arc
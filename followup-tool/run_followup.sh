@@ -65,13 +65,30 @@ fi
 
 # Parse and display response
 OK=$(echo "$RESPONSE" | grep -o '"ok":[^,]*' | cut -d: -f2)
-if [ "$OK" = "true" ]; then
-    MESSAGE=$(echo "$RESPONSE" | grep -o '"message":"[^"]*"' | cut -d'"' -f4)
-    echo "✅ Success!"
-    echo "   $MESSAGE"
-else
+if [ "$OK" != "true" ]; then
     ERROR=$(echo "$RESPONSE" | grep -o '"error":"[^"]*"' | cut -d'"' -f4)
     echo "❌ Error: $ERROR"
     exit 1
 fi
 
+JOB_ID=$(echo "$RESPONSE" | grep -o '"job_id":"[^"]*"' | cut -d'"' -f4)
+echo "⏳ Job $JOB_ID queued, waiting for it to finish..."
+
+# Poll the job until it completes
+while true; do
+    sleep 5
+    STATUS_RESPONSE=$(curl -s "http://localhost:8001/followup/$JOB_ID")
+    STATUS=$(echo "$STATUS_RESPONSE" | grep -o '"status":"[^"]*"' | cut -d'"' -f4)
+    SENT=$(echo "$STATUS_RESPONSE" | grep -o '"sent":[0-9]*' | head -1 | cut -d: -f2)
+    echo "   Status: $STATUS (sent so far: ${SENT:-0})"
+    if [ "$STATUS" = "completed" ]; then
+        echo "✅ Success!"
+        echo "   Follow-up process completed (dry_run=$DRY_RUN)"
+        break
+    fi
+    if [ "$STATUS" = "failed" ]; then
+        ERROR=$(echo "$STATUS_RESPONSE" | grep -o '"error":"[^"]*"' | cut -d'"' -f4)
+        echo "❌ Error: $ERROR"
+        exit 1
+    fi
+done
@@ -0,0 +1,8 @@
+"""
+Pytest configuration for the follow-up tool tests.
+"""
+import os
+import sys
+
+# The tool's modules live at the top of followup-tool/
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
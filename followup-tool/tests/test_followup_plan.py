@@ -0,0 +1,117 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from followup_gmail import GmailFollowUp
+from followup_plan import (
+    STATUS_FAILED,
+    STATUS_SENDING,
+    STATUS_SENT,
+    STATUS_STALE,
+    PlanCheckpoint,
+    read_plan,
+    write_plan,
+)
+
+
+def _row(thread_id, action="send", profile="abhay"):
+    return {
+        "thread_id": thread_id,
+        "profile": profile,
+        "action": action,
+        "level": 1,
+        "username": "creator",
+        "subject": f"Subject {thread_id}",
+        "message": "Hi again",
+    }
+
+
+@pytest.fixture
+def plan_path(tmp_path):
+    path = str(tmp_path / "plan.jsonl")
+    write_plan(path, [_row("t1"), _row("t2"), _row("t3"), _row("t4"), _row("t5", action="skip")])
+    return path
+
+
+def _execute(plan_path, outcomes):
+    """Run execute_plan with the browser stubbed out; outcomes maps thread id -> status. Returns the ids sent to."""
+    tool = GmailFollowUp(profile="abhay", use_state=False)
+    attempted = []
+
+    async def execute_row(row, page):
+        attempted.append(row["thread_id"])
+        return outcomes.get(row["thread_id"], STATUS_SENT)
+
+    tool.context = MagicMock()
+    tool.context.new_page = AsyncMock()
+    with patch.object(tool, "start_browser", AsyncMock()), \
+            patch.object(tool, "navigate_to_gmail", AsyncMock()), \
+            patch.object(tool, "close_browser", AsyncMock()), \
+            patch.object(tool, "_execute_plan_row", side_effect=execute_row):
+        asyncio.run(tool.execute_plan(plan_path))
+    assert tool.error is None
+    return attempted, tool.stats
+
+
+def test_resumed_plan_only_runs_unfinished_rows(plan_path):
+    first, stats = _execute(plan_path, {"t2": STATUS_FAILED, "t3": STATUS_STALE})
+    assert first == ["t1", "t2", "t3", "t4"]
+    assert stats["sent"] == 2 and stats["failed"] == 1
+
+    # A crash after t4's "sending" mark but before its result was recorded
+    checkpoint = PlanCheckpoint(plan_path)
+    checkpoint.mark("t4", STATUS_SENDING)
+    checkpoint.close()
+
+    second, stats = _execute(plan_path, {})
+    # Sent and stale rows are final; the failed row and the interrupted one are retried
+    assert second == ["t2", "t4"]
+    assert stats["sent"] == 2 and stats["skipped"] == 2
+
+    third, _ = _execute(plan_path, {})
+    assert third == []
+
+
+def test_checkpoint_keeps_the_last_status_per_thread(plan_path):
+    checkpoint = PlanCheckpoint(plan_path)
+    checkpoint.mark("t1", STATUS_SENDING)
+    checkpoint.mark("t1", STATUS_SENT)
+    checkpoint.mark("t2", STATUS_SENDING)
+    checkpoint.mark("t2", STATUS_FAILED)
+    checkpoint.close()
+
+    reopened = PlanCheckpoint(plan_path)
+    try:
+        assert reopened.statuses == {"t1": STATUS_SENT, "t2": STATUS_FAILED}
+        assert reopened.is_done("t1") and not reopened.is_done("t2") and not reopened.is_done("t3")
+    finally:
+        reopened.close()
+
+
+def test_truncated_last_line_is_ignored_and_not_glued_to_the_next(plan_path):
+    checkpoint = PlanCheckpoint(plan_path)
+    checkpoint.mark("t1", STATUS_SENT)
+    checkpoint.close()
+    with open(checkpoint.path, "a") as f:
+        f.write(json.dumps({"thread_id": "t2", "status": STATUS_SENT})[:20])
+
+    resumed = PlanCheckpoint(plan_path)
+    assert resumed.statuses == {"t1": STATUS_SENT}
+    resumed.mark("t2", STATUS_SENT)
+    resumed.close()
+
+    reopened = PlanCheckpoint(plan_path)
+    try:
+        assert reopened.statuses == {"t1": STATUS_SENT, "t2": STATUS_SENT}
+    finally:
+        reopened.close()
+
+
+def test_read_plan_reports_the_bad_line(plan_path):
+    assert [row["thread_id"] for row in read_plan(plan_path)] == ["t1", "t2", "t3", "t4", "t5"]
+    with open(plan_path, "a") as f:
+        f.write('{"thread_id": "t6"\n')
+    with pytest.raises(ValueError, match=r"plan\.jsonl:6: invalid plan row"):
+        read_plan(plan_path)
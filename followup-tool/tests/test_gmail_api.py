@@ -0,0 +1,207 @@
+import asyncio
+import json
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+import gmail_api
+from followup_gmail import GmailFollowUp
+from gmail_api import GmailApiBackend, _parse_batch_response
+
+
+class FakeGmail:
+    """In-process Gmail API: threads.list (paged), labels.list and the batch endpoint for threads.get."""
+
+    def __init__(self, threads):
+        self.threads = threads  # id -> threads.get payload, newest first
+        self.requests = []
+        handler = self._handler()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body, content_type="application/json"):
+                data = body if isinstance(body, bytes) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                params = dict(urllib.parse.parse_qsl(url.query))
+                fake.requests.append(("GET", url.path, params))
+                if url.path == "/gmail/v1/users/me/labels":
+                    return self._reply(200, {"labels": [
+                        {"id": "Label_1", "name": "pretti responses", "type": "user"},
+                        {"id": "SENT", "name": "SENT", "type": "system"},
+                    ]})
+                if url.path != "/gmail/v1/users/me/threads":
+                    return self._reply(404, {"error": {"code": 404, "message": "Not Found"}})
+                ids = list(fake.threads)
+                start = int(params.get("pageToken") or 0)
+                end = start + int(params["maxResults"])
+                page = {"threads": [
+                    {"id": thread_id, "historyId": fake.threads[thread_id].get("historyId", "1"), "snippet": ""}
+                    for thread_id in ids[start:end]
+                ]}
+                if end < len(ids):
+                    page["nextPageToken"] = str(end)
+                self._reply(200, page)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+                fake.requests.append(("POST", self.path, None))
+                boundary = re.search(r"boundary=(\S+)", self.headers["Content-Type"]).group(1)
+                thread_ids = re.findall(r"GET /gmail/v1/users/me/threads/([^?\s]+)\?format=full", body)
+                assert body.count(f"--{boundary}") == len(thread_ids) + 1
+                parts = []
+                for i, thread_id in enumerate(thread_ids):
+                    thread_id = urllib.parse.unquote(thread_id)
+                    if thread_id in fake.threads:
+                        status, payload = "200 OK", fake.threads[thread_id]
+                    else:
+                        status, payload = "404 Not Found", {"error": {"code": 404, "message": "Requested entity was not found."}}
+                    parts.append(
+                        "--batch_reply\r\n"
+                        "Content-Type: application/http\r\n"
+                        f"Content-ID: <response-item{i}>\r\n\r\n"
+                        f"HTTP/1.1 {status}\r\n"
+                        "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                        f"{json.dumps(payload, indent=2)}\r\n"
+                    )
+                parts.append("--batch_reply--\r\n")
+                self._reply(200, "".join(parts).encode(), 'multipart/mixed; boundary="batch_reply"')
+
+        return Handler
+
+
+def _thread(thread_id, days_old=10, subject="PAID PROMO OPPORTUNITY - Pretti App"):
+    sent_at = int((time.time() - days_old * 86400) * 1000)
+    return {
+        "id": thread_id,
+        "historyId": "7",
+        "messages": [{
+            "id": f"{thread_id}-m1",
+            "labelIds": ["SENT"],
+            "internalDate": str(sent_at),
+            "snippet": "hey!",
+            "payload": {"headers": [
+                {"name": "Subject", "value": subject},
+                {"name": "To", "value": f"Creator <{thread_id}@example.com>"},
+                {"name": "From", "value": "Abhay <abhay@a17.so>"},
+            ]},
+        }],
+    }
+
+
+@pytest.fixture
+def fake_gmail():
+    servers = []
+
+    def start(threads):
+        server = FakeGmail(threads)
+        servers.append(server)
+        return server, GmailApiBackend(access_token="test-token", base_url=server.url)
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def test_list_thread_ids_follows_page_tokens(fake_gmail):
+    server, backend = fake_gmail({f"t{i}": _thread(f"t{i}") for i in range(5)})
+    with patch("gmail_api.LIST_PAGE_SIZE", 2):
+        threads = backend.list_thread_ids("in:sent")
+        limited = backend.list_thread_ids("in:sent", limit=3)
+
+    assert [t["id"] for t in threads] == ["t0", "t1", "t2", "t3", "t4"]
+    assert [t["id"] for t in limited] == ["t0", "t1", "t2"]
+    list_calls = [params for method, path, params in server.requests if path.endswith("/threads")]
+    # Three pages for the full listing, then two for the limited one
+    assert [params.get("pageToken") for params in list_calls] == [None, "2", "4", None, "2"]
+    assert {params["q"] for params in list_calls} == {"in:sent"}
+
+
+def test_get_threads_batches_and_skips_failed_parts(fake_gmail, capsys):
+    server, backend = fake_gmail({"t1": _thread("t1"), "t2": _thread("t2"), "t/3": _thread("t/3")})
+    with patch("gmail_api.BATCH_SIZE", 2):
+        threads = backend.get_threads(["t1", "gone", "t2", "t/3"])
+
+    assert sorted(threads) == ["t/3", "t1", "t2"]
+    assert threads["t1"]["messages"][0]["id"] == "t1-m1"
+    assert [path for method, path, _ in server.requests if method == "POST"] == ["/batch/gmail/v1"] * 2
+    assert "threads.get failed (404)" in capsys.readouterr().out
+
+
+def test_parse_batch_response_reads_each_part_status():
+    raw = (
+        "--resp_abc\r\n"
+        "Content-Type: application/http\r\n"
+        "Content-ID: <response-item0>\r\n\r\n"
+        "HTTP/1.1 200 OK\r\n"
+        "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+        '{\n  "id": "t1",\n  "messages": []\n}\r\n'
+        "--resp_abc\r\n"
+        "Content-Type: application/http\r\n"
+        "Content-ID: <response-item1>\r\n\r\n"
+        "HTTP/1.1 429 Too Many Requests\r\n"
+        "Content-Type: application/json; charset=UTF-8\r\n\r\n"
+        '{"error": {"code": 429, "message": "Rate limit exceeded"}}\r\n'
+        "--resp_abc\r\n"
+        "Content-Type: application/http\r\n\r\n"
+        "HTTP/1.1 204 No Content\r\n\r\n"
+        "--resp_abc--\r\n"
+    ).encode()
+
+    parts = _parse_batch_response('multipart/mixed; boundary="resp_abc"', raw)
+
+    assert parts == [
+        (200, {"id": "t1", "messages": []}),
+        (429, {"error": {"code": 429, "message": "Rate limit exceeded"}}),
+        (204, {}),
+    ]
+
+
+def test_parse_batch_response_without_boundary_is_an_error():
+    with pytest.raises(gmail_api.GmailApiError):
+        _parse_batch_response("application/json", b"{}")
+
+
+def test_unreadable_threads_are_logged_and_counted(fake_gmail, capsys):
+    server, backend = fake_gmail({
+        "good": _thread("good"),
+        "broken": {"id": "broken", "historyId": "3", "messages": ["not a message"]},
+    })
+    tool = GmailFollowUp(profile="abhay", backend="api", api_backend=backend, use_state=False)
+
+    emails = asyncio.run(tool.get_sent_emails_api())
+
+    assert [email["thread_id"] for email in emails] == ["good"]
+    assert tool.unreadable_threads == ["broken"]
+    out = capsys.readouterr().out
+    assert "Could not read thread broken from its API payload: AttributeError" in out
+    assert "1 threads could not be read" in out
+
+    asyncio.run(tool.run_api({}, dry_run=True))
+
+    assert tool.error is None
+    assert tool.stats["unreadable"] == 1
+    assert "Unreadable (API payload could not be converted): 1 threads" in capsys.readouterr().out
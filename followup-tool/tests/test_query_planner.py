@@ -0,0 +1,111 @@
+from datetime import date, timedelta
+
+import pytest
+
+from query_planner import DateWindow, QueryPlanner
+
+TODAY = date(2024, 6, 15)
+SENT = 'in:sent "PAID PROMO"'
+
+
+def _planner(**kwargs):
+    kwargs.setdefault("followup_days", 3)
+    kwargs.setdefault("lookback_days", 30)
+    return QueryPlanner(SENT, today=TODAY, **kwargs)
+
+
+def _split_all(planner, window, old_side_splits):
+    """Split a window down to single days, splitting the open-ended old side old_side_splits times."""
+    if window.after is None:
+        if old_side_splits == 0:
+            return [window]
+        older, newer = planner.split(window)
+        return _split_all(planner, older, old_side_splits - 1) + _split_all(planner, newer, 0)
+    halves = planner.split(window)
+    if not halves:
+        return [window]
+    return [leaf for half in halves for leaf in _split_all(planner, half, 0)]
+
+
+def _assert_contiguous(windows):
+    assert windows[0].after is None and windows[-1].before is None
+    for older, newer in zip(windows, windows[1:]):
+        assert older.before == newer.after
+        assert older.after is None or older.after < older.before
+
+
+def test_base_query_pushes_filters_into_gmail():
+    planner = _planner(exclude_phrases=["last follow-up", "final note"])
+    assert planner.base_query() == (
+        'in:sent "PAID PROMO" -label:"pretti responses" older_than:3d -"last follow-up" -"final note"'
+    )
+
+
+def test_base_query_keeps_an_existing_label_filter():
+    planner = QueryPlanner('in:sent -label:"pretti responses"', followup_days=7, today=TODAY)
+    assert planner.base_query() == 'in:sent -label:"pretti responses" older_than:7d'
+
+
+@pytest.mark.parametrize("window, terms", [
+    (DateWindow(), ""),
+    (DateWindow(None, date(2024, 5, 1)), "before:2024/05/01"),
+    (DateWindow(date(2024, 5, 1), None), "after:2024/05/01"),
+    (DateWindow(date(2024, 5, 1), date(2024, 5, 9)), "after:2024/05/01 before:2024/05/09"),
+])
+def test_query_for_appends_window_terms(window, terms):
+    planner = _planner()
+    expected = f"{planner.base_query()} {terms}" if terms else planner.base_query()
+    assert planner.query_for(window) == expected
+
+
+def test_first_split_carves_off_the_lookback():
+    older, newer = _planner().split(DateWindow())
+    pivot = TODAY - timedelta(days=30)
+    assert (older.after, older.before) == (None, pivot)
+    assert (newer.after, newer.before) == (pivot, None)
+
+
+def test_old_side_reaches_back_twice_as_far_each_split():
+    planner = _planner()
+    window = DateWindow()
+    pivots = []
+    for _ in range(3):
+        window, _newer = planner.split(window)
+        pivots.append(window.before)
+    assert [(TODAY - pivot).days for pivot in pivots] == [30, 60, 120]
+
+
+@pytest.mark.parametrize("old_side_splits", [1, 2, 3])
+def test_split_windows_have_no_gaps_or_overlaps(old_side_splits):
+    planner = _planner()
+    leaves = _split_all(planner, DateWindow(), old_side_splits)
+    _assert_contiguous(leaves)
+
+    # Every day from the oldest bounded window up to the newest due day lands in exactly one window
+    newest_due = TODAY - timedelta(days=planner.followup_days)
+    day = leaves[1].after - timedelta(days=5)
+    while day <= newest_due:
+        containing = [
+            w for w in leaves
+            if (w.after is None or w.after <= day) and (w.before is None or day < w.before)
+        ]
+        assert len(containing) == 1, day
+        day += timedelta(days=1)
+
+
+def test_bounded_windows_split_down_to_single_days():
+    planner = _planner()
+    leaves = _split_all(planner, DateWindow(date(2024, 5, 1), date(2024, 5, 12)), 0)
+    assert [(w.after, w.before) for w in leaves] == [
+        (date(2024, 5, d), date(2024, 5, d + 1)) for d in range(1, 12)
+    ]
+    assert planner.split(DateWindow(date(2024, 5, 1), date(2024, 5, 2))) == []
+
+
+def test_newest_window_stops_at_the_older_than_cutoff():
+    planner = _planner()
+    # older_than:3d on June 15 can still match part of June 12, and nothing newer
+    assert planner.split(DateWindow(TODAY - timedelta(days=3), None)) == []
+    older, newer = planner.split(DateWindow(TODAY - timedelta(days=4), None))
+    assert (older.after, older.before) == (date(2024, 6, 11), date(2024, 6, 12))
+    assert (newer.after, newer.before) == (date(2024, 6, 12), None)
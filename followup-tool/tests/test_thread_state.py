@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from thread_state import ThreadStateStore
+
+FOLLOWUP_DAYS = 3
+
+
+def _days_ago(days):
+    return datetime.now() - timedelta(days=days)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ThreadStateStore(tmp_path / "state.sqlite3", account="Me@Example.com")
+    yield store
+    store.close()
+
+
+# (setup applied to thread "t1", historyId seen this sweep, expected reason prefix or None)
+CASES = {
+    "never seen": (
+        lambda s: None,
+        "h1", None,
+    ),
+    "unchanged and not due": (
+        lambda s: s.record_seen("t1", "h1", level_sent=1, last_activity_at=_days_ago(1)),
+        "h1", "not due until",
+    ),
+    "new historyId": (
+        lambda s: s.record_seen("t1", "h1", level_sent=1, last_activity_at=_days_ago(1)),
+        "h2", None,
+    ),
+    "due again after followup_days": (
+        lambda s: s.record_seen("t1", "h1", level_sent=1, last_activity_at=_days_ago(FOLLOWUP_DAYS + 1)),
+        "h1", None,
+    ),
+    "level 3 sent": (
+        lambda s: s.record_sent("t1", 3),
+        "h9", "final follow-up already sent",
+    ),
+    "level 3 seen long ago": (
+        lambda s: s.record_seen("t1", "h1", level_sent=3, last_activity_at=_days_ago(30)),
+        "h1", "final follow-up already sent",
+    ),
+    "tagged as responded": (
+        lambda s: s.record_seen("t1", "h1", responded=True, last_activity_at=_days_ago(30)),
+        "h1", "tagged 'pretti responses'",
+    ),
+    "just sent level 1": (
+        lambda s: s.record_sent("t1", 1),
+        "h9", "not due until",
+    ),
+}
+
+
+@pytest.mark.parametrize("setup, marker, expected", CASES.values(), ids=list(CASES))
+def test_skip_reason(store, setup, marker, expected):
+    setup(store)
+    reason = store.skip_reason("t1", marker, FOLLOWUP_DAYS)
+    if expected is None:
+        assert reason is None
+    else:
+        assert reason is not None and reason.startswith(expected)
+
+
+def test_marker_after_send_becomes_the_baseline(store):
+    store.record_sent("t1", 3)
+    assert store.get("t1")["last_seen"] is None
+
+    # The sweep after a send adopts whatever marker the thread now has...
+    assert store.skip_reason("t1", "h5", FOLLOWUP_DAYS) == "final follow-up already sent"
+    assert store.get("t1")["last_seen"] == "h5"
+    # ...so a reply after that changes the marker and forces a rescan
+    assert store.skip_reason("t1", "h6", FOLLOWUP_DAYS) is None
+
+
+def test_state_persists_per_account(tmp_path):
+    path = tmp_path / "state.sqlite3"
+    first = ThreadStateStore(path, account="Me@Example.com")
+    first.record_seen("t1", "h1", level_sent=2, username="alice", message_count=4, last_activity_at=_days_ago(1))
+    first.close()
+
+    reopened = ThreadStateStore(path, account="me@example.com")
+    other = ThreadStateStore(path, account="someone@example.com")
+    try:
+        state = reopened.get("t1")
+        assert state["last_level_sent"] == 2 and state["username"] == "alice" and state["message_count"] == 4
+        assert reopened.skip_reason("t1", "h1", FOLLOWUP_DAYS).startswith("not due until")
+        assert other.get("t1") is None
+        assert other.skip_reason("t1", "h1", FOLLOWUP_DAYS) is None
+    finally:
+        reopened.close()
+        other.close()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Thread State Store
+Remembers what the follow-up tool has already seen and sent per Gmail thread,
+so each sweep only has to look at threads that changed or became due.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_STATE_PATH = Path(__file__).parent / "followup_state.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS thread_state (
+    account TEXT NOT NULL,
+    thread_id TEXT NOT NULL,
+    last_level_sent INTEGER NOT NULL DEFAULT 0,
+    last_seen TEXT,
+    message_count INTEGER,
+    last_activity_at TEXT,
+    username TEXT,
+    responded INTEGER NOT NULL DEFAULT 0,
+    last_sent_at TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (account, thread_id)
+)
+"""
+
+
+class ThreadStateStore:
+    def __init__(self, path: Optional[str] = None, account: str = ""):
+        """
+        Open (or create) the thread state database.
+
+        Args:
+            path: SQLite file path (default: followup_state.sqlite3 next to this script)
+            account: Gmail address the thread ids belong to
+        """
+        self.path = str(path or DEFAULT_STATE_PATH)
+        self.account = (account or "").lower()
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+
+    def get(self, thread_id: str) -> Optional[Dict]:
+        row = self.conn.execute(
+            "SELECT * FROM thread_state WHERE account = ? AND thread_id = ?",
+            (self.account, thread_id),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def skip_reason(self, thread_id: str, seen_marker: str, followup_days: int) -> Optional[str]:
+        """
+        Decide whether a thread can be skipped without opening it.
+
+        A thread is skipped only when it is unchanged since the last sweep (same
+        seen_marker - Gmail historyId or the row's date text) and it is either
+        settled (level 3 sent / tagged as responded) or not due yet.
+
+        Returns:
+            Human-readable reason to skip, or None if the thread needs a look
+        """
+        if not thread_id:
+            return None
+        state = self.get(thread_id)
+        if not state:
+            return None
+
+        if state["last_seen"] is None:
+            # We sent the last message ourselves; adopt the new marker as the baseline
+            self._update(thread_id, last_seen=seen_marker)
+        elif state["last_seen"] != seen_marker:
+            return None
+
+        if state["last_level_sent"] >= 3:
+            return "final follow-up already sent"
+        if state["responded"]:
+            return "tagged 'pretti responses'"
+        if state["last_activity_at"]:
+            due_at = datetime.fromisoformat(state["last_activity_at"]) + timedelta(days=followup_days)
+            if datetime.now() < due_at:
+                return f"not due until {due_at:%b %d}"
+        return None
+
+    def record_seen(
+        self,
+        thread_id: str,
+        seen_marker: str,
+        level_sent: Optional[int] = None,
+        username: Optional[str] = None,
+        responded: bool = False,
+        message_count: Optional[int] = None,
+        last_activity_at: Optional[datetime] = None,
+    ):
+        """Store what a sweep observed about a thread without sending anything."""
+        if not thread_id:
+            return
+        fields = {"last_seen": seen_marker, "responded": int(responded)}
+        if level_sent is not None:
+            fields["last_level_sent"] = level_sent
+        if username:
+            fields["username"] = username
+        if message_count is not None:
+            fields["message_count"] = message_count
+        if last_activity_at is not None:
+            fields["last_activity_at"] = last_activity_at.isoformat(timespec="seconds")
+        self._update(thread_id, **fields)
+
+    def record_sent(self, thread_id: str, level: int, username: Optional[str] = None):
+        """Store a follow-up we just sent. The thread's marker changes, so it is re-baselined next sweep."""
+        if not thread_id:
+            return
+        now = datetime.now().isoformat(timespec="seconds")
+        fields = {
+            "last_level_sent": level,
+            "last_seen": None,
+            "last_sent_at": now,
+            "last_activity_at": now,
+        }
+        if username:
+            fields["username"] = username
+        self._update(thread_id, **fields)
+
+    def _update(self, thread_id: str, **fields):
+        fields["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        columns = ", ".join(["account", "thread_id"] + list(fields))
+        placeholders = ", ".join("?" for _ in range(len(fields) + 2))
+        updates = ", ".join(f"{name} = excluded.{name}" for name in fields)
+        self.conn.execute(
+            f"INSERT INTO thread_state ({columns}) VALUES ({placeholders}) "
+            f"ON CONFLICT(account, thread_id) DO UPDATE SET {updates}",
+            (self.account, thread_id, *fields.values()),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
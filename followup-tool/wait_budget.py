@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Wait Budget
+Records how long the follow-up tool spends waiting in each step, per email,
+and prints a summary at the end of a run so the slowest waits are easy to spot.
+"""
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+NAVIGATION_KEY = "(navigation)"
+
+# Per-task so concurrent worker tabs each attribute waits to their own email
+_current_email: ContextVar[str] = ContextVar("current_email", default=NAVIGATION_KEY)
+
+
+class WaitBudget:
+    def __init__(self):
+        self.steps: Dict[str, List[float]] = defaultdict(list)
+        self.per_email: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.email_totals: Dict[str, float] = {}
+        self.timeouts: Dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def step(self, name: str):
+        """Time a wait step and charge it to the email currently being processed."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        self.steps[name].append(seconds)
+        self.per_email[_current_email.get()][name] += seconds
+
+    def record_timeout(self, name: str):
+        self.timeouts[name] += 1
+
+    @contextmanager
+    def email(self, key: str):
+        """Attribute all waits inside this block to one email and time the email end to end."""
+        token = _current_email.set(key or "(unknown)")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.email_totals[_current_email.get()] = time.perf_counter() - start
+            _current_email.reset(token)
+
+    def summary(self) -> Dict:
+        """Wait totals per step (slowest first) plus per-email totals."""
+        steps = []
+        for name, durations in self.steps.items():
+            steps.append({
+                "step": name,
+                "count": len(durations),
+                "total_s": round(sum(durations), 3),
+                "avg_s": round(sum(durations) / len(durations), 3),
+                "max_s": round(max(durations), 3),
+                "timeouts": self.timeouts.get(name, 0),
+            })
+        steps.sort(key=lambda s: s["total_s"], reverse=True)
+        return {
+            "total_wait_s": round(sum(s["total_s"] for s in steps), 3),
+            "emails": len(self.email_totals),
+            "email_total_s": round(sum(self.email_totals.values()), 3),
+            "steps": steps,
+        }
+
+    def print_summary(self, top_emails: int = 5):
+        data = self.summary()
+        if not data["steps"]:
+            return
+        total_wait = data["total_wait_s"] or 1e-9
+        print(f"\n⏱  Wait budget ({data['emails']} emails, {data['total_wait_s']:.1f}s spent waiting)")
+        print(f"   {'step':<22}{'count':>7}{'total':>10}{'avg':>9}{'max':>9}{'t/o':>6}{'share':>8}")
+        for s in data["steps"]:
+            share = s["total_s"] / total_wait * 100
+            print(
+                f"   {s['step']:<22}{s['count']:>7}{s['total_s']:>9.1f}s{s['avg_s']:>8.2f}s"
+                f"{s['max_s']:>8.2f}s{s['timeouts']:>6}{share:>7.0f}%"
+            )
+        if self.email_totals:
+            slowest = sorted(self.email_totals.items(), key=lambda item: item[1], reverse=True)[:top_emails]
+            print("   Slowest emails:")
+            for key, seconds in slowest:
+                waits = self.per_email.get(key, {})
+                worst: Optional[str] = max(waits, key=waits.get) if waits else None
+                worst_str = f" (mostly {worst}: {waits[worst]:.1f}s)" if worst else ""
+                print(f"      {key[:40]:<40} {seconds:>6.1f}s{worst_str}")
@@ -0,0 +1,43 @@
+"""ASGI entry point for the outreach API (the gunicorn/WSGI entry point is main:app).
+
+    uvicorn --app-dir api --host 0.0.0.0 --port 8080 asgi:app
+
+This is a thread-pool variant, not an async rewrite. The Flask views and their
+SearchAPI and Sheets I/O stay blocking; a2wsgi runs each request's view on a
+pool of ASGI_WORKER_THREADS threads (default 200). That pool, not the gunicorn
+worker's 8 threads, bounds how many requests can wait on upstreams at once.
+/healthz is the one route answered on the event loop, so it never queues
+behind slow requests. Google clients are still built per thread around shared
+credentials, and the Sheets quota buckets and SearchAPI cache are
+process-wide, exactly as under gunicorn.
+"""
+
+import os
+from typing import Any, Awaitable, Callable, Dict
+
+from a2wsgi import WSGIMiddleware
+
+_WORKER_THREADS = int(os.environ.get("ASGI_WORKER_THREADS", "200"))
+# /scrape runs its profile scrape on main's prefetch pool; size it to the view
+# pool so scrapes don't queue behind the gunicorn-sized default of 16
+os.environ.setdefault("SCRAPE_PREFETCH_WORKERS", str(_WORKER_THREADS))
+
+from main import app as wsgi_app  # noqa: E402
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Same bytes and headers as main.healthz (flask_cors adds the CORS header there)
+_HEALTHZ_BODY = b'{"ok":true}\n'
+_HEALTHZ_HEADERS = [(b"content-type", b"application/json"), (b"access-control-allow-origin", b"*")]
+
+_wsgi = WSGIMiddleware(wsgi_app, workers=_WORKER_THREADS)
+
+
+async def app(scope: Scope, receive: Receive, send: Send):
+    if scope["type"] == "http" and scope["path"] == "/healthz" and scope["method"] == "GET":
+        await send({"type": "http.response.start", "status": 200, "headers": _HEALTHZ_HEADERS})
+        await send({"type": "http.response.body", "body": _HEALTHZ_BODY})
+        return
+    await _wsgi(scope, receive, send)
@@ -2,6 +2,7 @@
 
 import os
 import json
+import time
 from typing import Dict, Any, Optional
 
 try:
@@ -10,6 +11,7 @@ except ImportError:
     yaml = None
 
 from utils import _log
+from metrics import record_startup
 
 
 # Category to sheet name mapping
@@ -224,6 +226,8 @@ def _resolve_sender_profile(app_cfg: Dict[str, Any], sender_profile_key: str, st
     # Create a new config with overrides applied
     resolved_cfg = dict(app_cfg)
     resolved_cfg.update(profile_overrides)
+    # Identifies the resolved config (e.g. for the template registry) without hashing it
+    resolved_cfg["sender_profile_key"] = sender_profile_key
     
     # Map friendly names to config keys
     if "email" in profile_overrides:
@@ -251,4 +255,6 @@ def _resolve_sender_profile(app_cfg: Dict[str, Any], sender_profile_key: str, st
 
 
 # Load configuration on module import
+_config_started = time.perf_counter()
 _OUTREACH_APPS: Dict[str, Dict[str, str]] = _load_outreach_apps_config()
+record_startup("init.config", time.perf_counter() - _config_started)
@@ -4,20 +4,114 @@ import os
 import json
 import shutil
 import subprocess
-from typing import List, Optional, Tuple, Any
-
-try:
-    from google.oauth2 import service_account
-    from google.oauth2.credentials import Credentials as UserCredentials
-    from googleapiclient.discovery import build
-    import google.auth
-except Exception:
-    service_account = None
-    UserCredentials = None
-    build = None
-    google = None
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, Any
 
 from utils import _log
+from metrics import span, record_startup
+from sheets_scheduler import ScheduledHttp
+
+# The Google client libraries take hundreds of milliseconds to import, so they
+# are loaded on first use (see _import_google) instead of at module import.
+service_account = None
+UserCredentials = None
+build = None
+build_from_document = None
+google = None
+google_auth_httplib2 = None
+httplib2 = None
+
+# Local stand-ins (loadtest/): send Sheets calls to SHEETS_API_ENDPOINT and,
+# with GOOGLE_API_ANONYMOUS=1, use unauthenticated credentials
+_SHEETS_API_ENDPOINT = os.environ.get("SHEETS_API_ENDPOINT", "").strip()
+_ANONYMOUS_CREDENTIALS = os.environ.get("GOOGLE_API_ANONYMOUS", "").strip().lower() in ("1", "true", "yes")
+
+_GOOGLE_IMPORT_LOCK = threading.Lock()
+_GOOGLE_IMPORTED = False
+
+# Sheets/Gmail discovery documents serialized at image build time
+# (scripts/build_discovery_docs.py); the library's bundled copy is the fallback
+_DISCOVERY_DIR = os.environ.get("GOOGLE_DISCOVERY_DIR", "").strip() or os.path.join(os.path.dirname(__file__), "discovery")
+_DISCOVERY_APIS = (("sheets", "v4"), ("gmail", "v1"))
+_DISCOVERY_DOCS: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+_DISCOVERY_LOCK = threading.Lock()
+
+
+def _import_google():
+    """Import the Google client libraries once; names a test already patched are left alone."""
+    global _GOOGLE_IMPORTED, service_account, UserCredentials, build, build_from_document, google, google_auth_httplib2, httplib2
+    if _GOOGLE_IMPORTED:
+        return
+    with _GOOGLE_IMPORT_LOCK:
+        if _GOOGLE_IMPORTED:
+            return
+        started = time.perf_counter()
+        patched_google = google  # the import below rebinds the global name
+        try:
+            from google.oauth2 import service_account as _service_account
+            from google.oauth2.credentials import Credentials as _UserCredentials
+            from googleapiclient.discovery import build as _build, build_from_document as _build_from_document
+            import google.auth  # noqa: F401  (populates sys.modules["google"].auth)
+            import google_auth_httplib2 as _google_auth_httplib2
+            import httplib2 as _httplib2
+        except Exception as e:
+            _log("google.import_error", error=str(e))
+        else:
+            service_account = service_account or _service_account
+            UserCredentials = UserCredentials or _UserCredentials
+            build = build or _build
+            build_from_document = build_from_document or _build_from_document
+            google = patched_google or sys.modules["google"]
+            google_auth_httplib2 = google_auth_httplib2 or _google_auth_httplib2
+            httplib2 = httplib2 or _httplib2
+        _GOOGLE_IMPORTED = True
+        record_startup("import.google", time.perf_counter() - started)
+
+
+def _discovery_document(api: str, version: str) -> Optional[Dict[str, Any]]:
+    """Parsed discovery document for api/version, read once per process (None if unavailable)."""
+    key = (api, version)
+    with _DISCOVERY_LOCK:
+        if key in _DISCOVERY_DOCS:
+            return _DISCOVERY_DOCS[key]
+        doc = None
+        path = os.path.join(_DISCOVERY_DIR, f"{api}.{version}.json")
+        try:
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    doc = json.load(f)
+            else:
+                from googleapiclient.discovery_cache import get_static_doc
+                content = get_static_doc(api, version)
+                doc = json.loads(content) if content else None
+        except Exception as e:
+            _log("google.discovery.load_error", api=api, version=version, error=str(e))
+            doc = None
+        _DISCOVERY_DOCS[key] = doc
+        return doc
+
+
+def write_discovery_documents(out_dir: str = _DISCOVERY_DIR) -> List[str]:
+    """Serialize the Sheets and Gmail discovery documents into out_dir (run at image build).
+
+    Returns:
+        Paths written
+    """
+    from googleapiclient.discovery_cache import get_static_doc
+
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for api, version in _DISCOVERY_APIS:
+        content = get_static_doc(api, version)
+        if not content:
+            raise RuntimeError(f"No bundled discovery document for {api} {version}")
+        path = os.path.join(out_dir, f"{api}.{version}.json")
+        with open(path, "w") as f:
+            json.dump(json.loads(content), f, separators=(",", ":"))
+        written.append(path)
+    return written
 
 
 def _load_service_account_credentials(scopes: List[str], delegated_user: Optional[str] = None):
@@ -31,6 +125,7 @@ def _load_service_account_credentials(scopes: List[str], delegated_user: Optiona
     If delegated_user is provided, returns a delegated credentials object
     (requires domain-wide delegation to be configured in Google Admin).
     """
+    _import_google()
     if service_account is None or build is None:
         _log("google.credentials.no_library")
         return None
@@ -85,8 +180,20 @@ def _load_service_account_credentials(scopes: List[str], delegated_user: Optiona
 
 
 
+def _load_anonymous_credentials():
+    """Unauthenticated credentials for local fakes (GOOGLE_API_ANONYMOUS=1)."""
+    try:
+        from google.auth.credentials import AnonymousCredentials
+    except Exception as e:
+        _log("google.credentials.anonymous_error", error=str(e))
+        return None
+    _log("google.credentials.anonymous")
+    return AnonymousCredentials()
+
+
 def _load_default_credentials(scopes: List[str]):
     """Load Application Default Credentials."""
+    _import_google()
     if google is None:
         _log("google.credentials.adc.no_library")
         return None
@@ -105,6 +212,7 @@ def _load_gcloud_cli_credentials():
     This fallback supports local dev when no service account key/ADC file exists,
     but the developer is already authenticated via `gcloud auth login`.
     """
+    _import_google()
     if UserCredentials is None:
         _log("google.credentials.gcloud.no_library")
         return None
@@ -166,53 +274,271 @@ def _load_gcloud_cli_credentials():
     return creds
 
 
+# Tokens from `gcloud auth print-access-token` carry no expiry or refresh token;
+# they last an hour, so cached ones are reloaded before that
+_UNREFRESHABLE_CREDENTIALS_TTL_S = 45 * 60
+_HTTP_TIMEOUT_S = 60
+
+
+def _google_stage(uri: str, method: str) -> str:
+    """Span name for one Google HTTP round trip."""
+    if "sheets.googleapis.com" in uri:
+        return "sheets.read" if method.upper() == "GET" else "sheets.write"
+    if "gmail.googleapis.com" in uri:
+        return "gmail"
+    if "oauth2.googleapis.com" in uri or "accounts.google.com" in uri:
+        return "google.auth_refresh"
+    return "google.api"
+
+
+class _TimedHttp:
+    """httplib2.Http wrapper that records a span per request (see metrics)."""
+
+    def __init__(self, http: Any):
+        self._http = http
+
+    def request(self, uri, method="GET", *args, **kwargs):
+        with span(_google_stage(uri, method)):
+            return self._http.request(uri, method, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._http, name)
+
+
+def _memoize_resources(resource: Any) -> Any:
+    """Make collection accessors (service.spreadsheets(), .values(), ...) return one cached child.
+
+    googleapiclient builds a fresh Resource on every accessor call, re-creating
+    each method and rendering its docstring from the discovery schema; that was
+    most of the API's CPU time per request. Pooled services are per thread, so
+    their children are too.
+
+    Reads Resource._resourceDesc, which is private to googleapiclient; checked
+    against google-api-python-client==2.133.0 (pinned in requirements.txt).
+    If a later release drops it, services are returned unchanged.
+    """
+    desc = getattr(resource, "_resourceDesc", None)
+    if not isinstance(desc, dict):
+        return resource
+    for name in desc.get("resources", {}):
+        accessor = getattr(resource, name, None)
+        if accessor is not None:
+            setattr(resource, name, _cached_accessor(accessor))
+    return resource
+
+
+def _cached_accessor(accessor: Any) -> Any:
+    child: List[Any] = []
+
+    def cached():
+        if not child:
+            child.append(_memoize_resources(accessor()))
+        return child[0]
+
+    return cached
+
+
+class _ClientPool:
+    """Process-wide cache of Google API clients keyed by (api, version, scopes, delegated user).
+
+    Credentials are loaded once per (scopes, delegated user) and shared by every
+    thread; service-account credentials refresh their own access tokens. Built
+    services are kept per thread, because httplib2 connections are not
+    thread-safe: each gunicorn thread gets one keep-alive httplib2.Http that all
+    of its clients share, and builds each client once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._credentials: Dict[Tuple, Tuple[Any, float]] = {}
+        self._local = threading.local()
+        self._stats = {"hits": 0, "misses": 0, "credential_loads": 0, "build_ms_total": 0.0}
+        self._generation = 0
+
+    def _thread_state(self) -> Dict[str, Any]:
+        _import_google()
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            local.generation = self._generation
+            local.services = {}
+            local.http = _TimedHttp(httplib2.Http(timeout=_HTTP_TIMEOUT_S)) if httplib2 is not None else None
+        return local.__dict__
+
+    def credentials(self, scopes: Tuple[str, ...], delegated_user: Optional[str], loader) -> Any:
+        """Cached credentials for (scopes, delegated user), loading them with loader() on a miss."""
+        key = (scopes, delegated_user or "")
+        with self._lock:
+            cached = self._credentials.get(key)
+        if cached is not None:
+            creds, loaded_at = cached
+            if not self._credentials_stale(creds, loaded_at):
+                return creds
+        with span("google.credentials_load"):
+            creds = loader()
+        if creds is not None:
+            with self._lock:
+                self._credentials[key] = (creds, time.time())
+                self._stats["credential_loads"] += 1
+        return creds
+
+    def _credentials_stale(self, creds: Any, loaded_at: float) -> bool:
+        if getattr(creds, "refresh_token", None) or (service_account is not None and isinstance(creds, service_account.Credentials)):
+            return False
+        if getattr(creds, "expiry", None) is not None:
+            return bool(getattr(creds, "expired", False))
+        return time.time() - loaded_at > _UNREFRESHABLE_CREDENTIALS_TTL_S
+
+    def service(self, api: str, version: str, scopes: Tuple[str, ...], delegated_user: Optional[str], creds: Any) -> Any:
+        """This thread's client for the key, built on first use (or when the credentials were reloaded)."""
+        state = self._thread_state()
+        key = (api, version, scopes, delegated_user or "")
+        cached = state["services"].get(key)
+        if cached is not None and cached[1] is creds:
+            with self._lock:
+                self._stats["hits"] += 1
+            return cached[0]
+
+        started = time.perf_counter()
+        with span("google.client_build"):
+            doc = _discovery_document(api, version) if build_from_document is not None else None
+            extra: Dict[str, Any] = {}
+            if api == "sheets" and _SHEETS_API_ENDPOINT:
+                extra["client_options"] = {"api_endpoint": _SHEETS_API_ENDPOINT}
+            if google_auth_httplib2 is not None and state["http"] is not None:
+                authed_http = google_auth_httplib2.AuthorizedHttp(creds, http=state["http"])
+                if api == "sheets":
+                    # Quota buckets, retries and read coalescing (see sheets_scheduler)
+                    authed_http = ScheduledHttp(authed_http, delegated_user)
+                if doc is not None:
+                    service = build_from_document(doc, http=authed_http, **extra)
+                else:
+                    service = build(api, version, http=authed_http, cache_discovery=False, **extra)
+            elif doc is not None:
+                service = build_from_document(doc, credentials=creds, **extra)
+            else:
+                service = build(api, version, credentials=creds, cache_discovery=False, **extra)
+            service = _memoize_resources(service)
+        build_ms = (time.perf_counter() - started) * 1000
+        state["services"][key] = (service, creds)
+        with self._lock:
+            self._stats["misses"] += 1
+            self._stats["build_ms_total"] += build_ms
+        _log("google.client_pool.built", api=api, user=delegated_user or None, build_ms=round(build_ms, 1))
+        return service
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached_credentials"] = len(self._credentials)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else None
+        stats["build_ms_avg"] = round(stats["build_ms_total"] / stats["misses"], 1) if stats["misses"] else None
+        stats["build_ms_total"] = round(stats["build_ms_total"], 1)
+        return stats
+
+    def clear(self):
+        """Drop all cached credentials and clients (every thread rebuilds on next use)."""
+        with self._lock:
+            self._credentials.clear()
+            self._generation += 1
+            self._stats = {"hits": 0, "misses": 0, "credential_loads": 0, "build_ms_total": 0.0}
+
+
+_CLIENT_POOL = _ClientPool()
+
+
+def client_pool_stats() -> Dict[str, Any]:
+    """Hit/miss/build-time counters for the Google API client pool."""
+    return _CLIENT_POOL.stats()
+
+
 def _sheets_client(delegated_user: Optional[str] = None):
-    """Get Google Sheets API client."""
-    scopes = ["https://www.googleapis.com/auth/spreadsheets"]
-    creds = _load_service_account_credentials(scopes, delegated_user=delegated_user)
-    if creds is None:
-        creds = _load_default_credentials(scopes)
-    if creds is None:
-        creds = _load_gcloud_cli_credentials()
+    """Get Google Sheets API client (pooled; see _ClientPool)."""
+    scopes = ("https://www.googleapis.com/auth/spreadsheets",)
+
+    def load():
+        if _ANONYMOUS_CREDENTIALS:
+            return _load_anonymous_credentials()
+        creds = _load_service_account_credentials(list(scopes), delegated_user=delegated_user)
+        if creds is None:
+            creds = _load_default_credentials(list(scopes))
+        if creds is None:
+            creds = _load_gcloud_cli_credentials()
+        return creds
+
+    creds = _CLIENT_POOL.credentials(scopes, delegated_user, load)
     if creds is None:
         _log("sheets.client.no_credentials")
         return None
     try:
-        service = build("sheets", "v4", credentials=creds, cache_discovery=False)
-        _log("sheets.client.created")
-        return service
+        return _CLIENT_POOL.service("sheets", "v4", scopes, delegated_user, creds)
     except Exception as e:
         _log("sheets.client.error", error=str(e))
         return None
 
 
 def _gmail_client(delegated_user_override: Optional[str] = None) -> Optional[Tuple[Any, str]]:
-    """Get Gmail API client.
+    """Get Gmail API client (pooled; see _ClientPool).
     
     Returns:
         Tuple of (gmail_service, user_id) or None
     """
-    scopes = ["https://www.googleapis.com/auth/gmail.send"]
+    scopes = ("https://www.googleapis.com/auth/gmail.send",)
     delegated_user = delegated_user_override or os.environ.get("GOOGLE_DELEGATED_USER", "").strip()
-    
-    creds = _load_service_account_credentials(scopes, delegated_user=delegated_user)
-    if creds is None:
-        creds = _load_default_credentials(scopes)
-        if creds is not None and delegated_user:
-            _log("gmail.client.delegation_skipped_for_adc", user=delegated_user)
-    if creds is None:
-        creds = _load_gcloud_cli_credentials()
-        if creds is not None and delegated_user:
-            _log("gmail.client.delegation_skipped_for_gcloud", user=delegated_user)
+
+    def load():
+        if _ANONYMOUS_CREDENTIALS:
+            return _load_anonymous_credentials()
+        creds = _load_service_account_credentials(list(scopes), delegated_user=delegated_user)
+        if creds is None:
+            creds = _load_default_credentials(list(scopes))
+            if creds is not None and delegated_user:
+                _log("gmail.client.delegation_skipped_for_adc", user=delegated_user)
+        if creds is None:
+            creds = _load_gcloud_cli_credentials()
+            if creds is not None and delegated_user:
+                _log("gmail.client.delegation_skipped_for_gcloud", user=delegated_user)
+        return creds
+
+    creds = _CLIENT_POOL.credentials(scopes, delegated_user, load)
     if creds is None:
         _log("gmail.client.no_credentials")
         return None
     
     try:
-        service = build("gmail", "v1", credentials=creds, cache_discovery=False)
+        service = _CLIENT_POOL.service("gmail", "v1", scopes, delegated_user, creds)
         user_id = delegated_user if delegated_user else "me"
-        _log("gmail.client.created", user_id=user_id)
         return (service, user_id)
     except Exception as e:
         _log("gmail.client.error", error=str(e))
         return None
+
+
+def prewarm_clients(sheets_users: List[Optional[str]], gmail_users: List[Optional[str]]) -> Dict[str, Any]:
+    """Load credentials, fetch access tokens and parse discovery documents ahead of traffic.
+
+    Credentials (and their tokens) are shared by every thread, so the first real
+    request skips the credential load and token round trip; its thread still
+    builds its own client, from the already-parsed discovery document.
+
+    Returns:
+        {"sheets": int, "gmail": int, "errors": [{"api", "user", "error"}]}
+    """
+    warmed = {"sheets": 0, "gmail": 0, "errors": []}
+    for api, users, factory in (("sheets", sheets_users, _sheets_client), ("gmail", gmail_users, _gmail_client)):
+        for user in dict.fromkeys(users):
+            try:
+                client = factory(user or None)
+                if client is None:
+                    warmed["errors"].append({"api": api, "user": user, "error": "no client"})
+                    continue
+                service = client[0] if isinstance(client, tuple) else client
+                creds = getattr(getattr(service, "_http", None), "credentials", None)
+                if creds is not None and not getattr(creds, "valid", True) and google_auth_httplib2 is not None:
+                    with span("google.auth_refresh"):
+                        creds.refresh(google_auth_httplib2.Request(httplib2.Http(timeout=_HTTP_TIMEOUT_S)))
+                warmed[api] += 1
+            except Exception as e:
+                warmed["errors"].append({"api": api, "user": user, "error": str(e)})
+    _log("google.client_pool.prewarmed", sheets=warmed["sheets"], gmail=warmed["gmail"], errors=len(warmed["errors"]))
+    return warmed
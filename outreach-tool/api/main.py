@@ -1,22 +1,32 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 import os
 import sys
 import re
 import asyncio
-from typing import Dict, Any, List, Optional
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import quote
 
-from flask import Flask, request, jsonify, g
+from flask import Flask, Response, request, jsonify, g
 from flask_cors import CORS
-import time
 from datetime import datetime
 
 # Import from new modules
 from utils import _log, _normalize_category, _normalize_creator_tier, _clean_url, _markdown_to_text
-from config import CATEGORY_TO_SHEET, _load_outreach_apps_config, _get_app_config, _validate_app_config, _resolve_sender_profile
-from google_services import _sheets_client, _gmail_client
-from sheets_operations import _hyperlink_formula, _check_creator_exists, _check_creator_exists_across_all_sheets, _check_creator_exists_in_raw_leads, _get_email_from_existing_row, _update_sheet_row, _append_url_to_raw_leads_column, _append_url_to_subsheet, _append_peptide_vendor_row, _append_x_creator_row, _append_to_sheet, _update_creator_contact_info
+from config import CATEGORY_TO_SHEET, _OUTREACH_APPS, _get_app_config, _validate_app_config, _resolve_sender_profile
+from google_services import _sheets_client, _gmail_client, client_pool_stats, prewarm_clients
+from searchapi_cache import searchapi_cache_stats
+from sheets_scheduler import sheets_scheduler_stats
+from sheet_write_queue import write_behind_enabled, get_sheet_write_queue, existing_sheet_write_queue, sheet_write_queue_stats
+from metrics import start_trace, finish_trace, metrics_snapshot, render_prometheus, record_startup, startup_span, startup_timings
+from sheets_operations import _prewarm_handle_index, _hyperlink_formula, _check_creator_exists, _check_creator_exists_across_all_sheets, _check_creators_exist_across_all_sheets, _check_creator_exists_in_raw_leads, _get_email_from_existing_row, _update_sheet_row, _append_url_to_raw_leads_column, _append_url_to_subsheet, _append_peptide_vendor_row, _append_x_creator_row, _append_to_sheet, _append_rows_to_sheets, _update_creator_contact_info, _update_creators_contact_info
 from email_operations import _send_email
-from template_generation import _get_display_name, _get_templates_for_app, _build_email_and_dm
+from template_generation import _get_display_name, _get_templates_for_app, _build_email_and_dm, preload_templates, template_registry_stats
 
 # Ensure we can import the scraper from outreach-tool/scrape_profile.py
 _LOCAL_DIR = os.path.dirname(__file__)
@@ -50,8 +60,87 @@ except Exception:
     pass
 
 
-# Load multi-app configuration on startup
-_OUTREACH_APPS: Dict[str, Dict[str, str]] = _load_outreach_apps_config()
+# Multi-app configuration is parsed once, when config is imported (above)
+record_startup("import", time.perf_counter() - _IMPORT_STARTED)
+
+# Resume draining rows a previous process journaled but never wrote
+if write_behind_enabled():
+    with startup_span("init.sheet_write_queue"):
+        _queue = get_sheet_write_queue()
+        if _queue is not None:
+            _queue.start()
+
+
+_WARMUP_LOCK = threading.Lock()
+_WARMUP_RESULT: Optional[Dict[str, Any]] = None
+
+
+def _warm_up(force: bool = False) -> Dict[str, Any]:
+    """Compile templates, pre-build Google clients and load handle indexes.
+
+    Runs once per process (in a background thread at boot unless WARMUP_ON_START=0,
+    and from /warmup); concurrent callers wait for the run in progress and share
+    its result.
+    """
+    global _WARMUP_RESULT
+    with _WARMUP_LOCK:
+        if _WARMUP_RESULT is not None and not force:
+            return _WARMUP_RESULT
+        started = time.perf_counter()
+        result: Dict[str, Any] = {}
+
+        # Compile every app's templates so a broken script is reported at boot
+        with startup_span("warmup.templates"):
+            try:
+                preloaded = preload_templates(_OUTREACH_APPS)
+                result["templates"] = {"sets": preloaded["sets"], "errors": len(preloaded["errors"])}
+            except Exception as e:
+                _log("main.template_preload_error", error=str(e))
+                result["templates"] = {"error": str(e)}
+
+        # Same user the routes pass to the Sheets helpers (delegated_user, else
+        # gmail_sender), for each app and each of its sender profiles. /health
+        # builds both clients for the default user; no route sends mail, so that
+        # is the only Gmail client worth warming.
+        sheets_users: List[Optional[str]] = [None]
+        gmail_users: List[Optional[str]] = [None]
+        spreadsheets: Dict[str, Optional[str]] = {}
+        for app_key in _OUTREACH_APPS:
+            app_cfg = _get_app_config(app_key)
+            sender_profiles = app_cfg.get("sender_profiles")
+            configs = [app_cfg] + [
+                _resolve_sender_profile(app_cfg, profile_key, strict=False)
+                for profile_key in (sender_profiles if isinstance(sender_profiles, dict) else {})
+            ]
+            for cfg in configs:
+                delegated_user = cfg.get("delegated_user") or cfg.get("gmail_sender") or None
+                sheets_users.append(delegated_user)
+                spreadsheet_id = cfg.get("sheets_spreadsheet_id") or ""
+                if spreadsheet_id:
+                    spreadsheets.setdefault(spreadsheet_id, delegated_user)
+        with startup_span("warmup.clients"):
+            result["clients"] = prewarm_clients(sheets_users, gmail_users)
+
+        with startup_span("warmup.handle_indexes"):
+            result["handle_indexes"] = {
+                spreadsheet_id[:20] + "...": _prewarm_handle_index(spreadsheet_id, delegated_user)
+                for spreadsheet_id, delegated_user in spreadsheets.items()
+            }
+
+        record_startup("warmup", time.perf_counter() - started)
+        _WARMUP_RESULT = result
+        return result
+
+
+def _warm_up_in_background():
+    try:
+        _warm_up()
+    except Exception as e:
+        _log("main.warmup_error", error=str(e))
+
+
+if os.environ.get("WARMUP_ON_START", "1").strip().lower() not in ("0", "false", "no"):
+    threading.Thread(target=_warm_up_in_background, name="outreach-warmup", daemon=True).start()
 
 
 # All business logic functions have been moved to separate modules:
@@ -175,6 +264,13 @@ def health_check():
     # Since we removed Playwright, this is just a static check now
     health["checks"]["scraper"] = {"status": "healthy"}
     
+    health["google_client_pool"] = client_pool_stats()
+    health["searchapi_cache"] = searchapi_cache_stats()
+    health["template_registry"] = template_registry_stats()
+    health["sheet_write_queue"] = sheet_write_queue_stats()
+    health["sheets_scheduler"] = sheets_scheduler_stats()
+    health["startup_ms"] = startup_timings()
+    
     status_code = 200 if health["status"] == "healthy" else (503 if health["status"] == "unhealthy" else 200)
     return jsonify(health), status_code
 
@@ -319,9 +415,12 @@ def validate_request():
 
 
 
+@app.before_request
 def _http_request_logger_start():
     try:
         g._req_start_time = time.perf_counter()
+        # Route pattern (not the raw path) keeps metric labels bounded
+        g._trace_token = start_trace(request.url_rule.rule if request.url_rule is not None else request.path)
         _log(
             "http.request",
             method=request.method,
@@ -340,11 +439,13 @@ def _http_request_logger_end(response):
     try:
         start = getattr(g, "_req_start_time", None)
         dur_ms = int((time.perf_counter() - start) * 1000) if start else None
+        trace = finish_trace(getattr(g, "_trace_token", None))
         _log(
             "http.response",
             path=request.path,
             status=response.status_code,
             duration_ms=dur_ms,
+            spans=trace.summary() if trace is not None else None,
             resp_length=response.calculate_content_length() if hasattr(response, "calculate_content_length") else None,
         )
     except Exception:
@@ -352,10 +453,139 @@ def _http_request_logger_end(response):
     return response
 
 
+@app.get("/debug/metrics")
+def debug_metrics():
+    """Per-endpoint, per-stage latency quantiles (Prometheus text; ?format=json for JSON)."""
+    if (request.args.get("format") or "").lower() == "json":
+        return jsonify(metrics_snapshot())
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
 @app.get("/warmup")
 def warmup():
-    """No-op warmup since Playwright is removed."""
-    return jsonify({"ok": True, "persistent": False})
+    """Finish (or wait for) the process warm-up; ?force=1 runs it again."""
+    force = (request.args.get("force") or "").strip().lower() in ("1", "true", "yes")
+    result = _warm_up(force=force)
+    return jsonify({"ok": True, "warmup": result, "startup_ms": startup_timings()})
+
+
+def _handles_from_url(url: str) -> Tuple[str, str]:
+    """(ig_handle, tt_handle) taken from a TikTok or Instagram profile URL, without scraping."""
+    ig_handle = ""
+    tt_handle = ""
+    try:
+        # Extract handle from TikTok URL
+        if "tiktok.com" in url.lower():
+            tt_match = re.search(r'tiktok\.com/@([A-Za-z0-9_.]+)', url)
+            if tt_match:
+                tt_handle = tt_match.group(1)
+        # Extract handle from Instagram URL
+        elif "instagram.com" in url.lower():
+            ig_match = re.search(r'instagram\.com/([A-Za-z0-9_.]+)', url)
+            if ig_match:
+                ig_handle = ig_match.group(1)
+    except Exception:
+        pass
+    return ig_handle, tt_handle
+
+
+def _prepare_outreach(category: str, profile: Dict[str, Any], app_cfg: Dict[str, Any], is_theme_pages: bool) -> Dict[str, Any]:
+    """Build the DM/email scripts for a scraped profile plus the client-side compose data.
+
+    Returns comms, recipient_email, has_valid_recipient, plain_text, mailto_url and the
+    Status value to record for the creator's sheet row.
+    """
+    comms = _build_email_and_dm(
+        category,
+        profile,
+        link_url=app_cfg.get("link_url"),
+        app_key=app_cfg.get("app_key"),
+        is_followup=False,
+        followup_number=1,
+        app_config=app_cfg,
+    )
+    _log(
+        "scrape.comms_built",
+        subject=comms.get("subject"),
+        dm_len=len(comms.get("dm_md") or ""),
+        has_email=bool(profile.get("email")),
+    )
+
+    recipient_email_raw = str(profile.get("email") or "").strip()
+    has_valid_recipient = bool(recipient_email_raw)
+    recipient_email = recipient_email_raw if has_valid_recipient else ""
+    # Always prepare the plain-text body, even if no email found,
+    # so manual email entry in Shortcuts works correctly
+    try:
+        plain_text = _markdown_to_text(comms["email_md"]) or ""
+    except Exception:
+        plain_text = comms.get("email_md") or ""
+
+    mailto_url: Optional[str] = None
+    if has_valid_recipient and not is_theme_pages:
+        # Build mailto URL; let device handle sending
+        subj_enc = quote(comms.get("subject") or "")
+        body_enc = quote(plain_text)
+        mailto_url = f"mailto:{recipient_email}?subject={subj_enc}&body={body_enc}"
+        _log("email.compose.prepared", to=recipient_email, has_mailto=bool(mailto_url))
+
+    # Status rules (emails are composed on device, never sent from here):
+    # - Theme Pages: leave blank (tracking DM only)
+    # - If no valid recipient email: "No Email"
+    # - Else (prepared compose but not sent on device): leave blank
+    if is_theme_pages:
+        status_val = ""
+    elif not has_valid_recipient:
+        status_val = "No Email"
+    else:
+        status_val = ""
+
+    return {
+        "comms": comms,
+        "recipient_email": recipient_email,
+        "has_valid_recipient": has_valid_recipient,
+        "plain_text": plain_text,
+        "mailto_url": mailto_url,
+        "status": status_val,
+    }
+
+
+def _creator_sheet_row(profile: Dict[str, Any], sheet_name: str, status_val: str, is_theme_pages: bool, app_cfg: Dict[str, Any]) -> List[Any]:
+    """A:K tracking row for a scraped creator."""
+    name = _get_display_name(profile)
+    ig_handle = profile.get("ig") or ""
+    tt_handle = profile.get("tt") or ""
+    email_addr = "" if is_theme_pages else (profile.get("email") or "")
+
+    if sheet_name == "Raw Leads":
+        # For Raw Leads, use plain text URLs, no HYPERLINK formula
+        ig_link = profile.get("igProfileUrl") or (f"https://www.instagram.com/{ig_handle}" if ig_handle else "")
+        tt_link = profile.get("ttProfileUrl") or (f"https://www.tiktok.com/@{tt_handle}" if tt_handle else "")
+    else:
+        # For other sheets, use HYPERLINK formula with handle text
+        ig_link = _hyperlink_formula(profile.get("igProfileUrl") or (f"https://www.instagram.com/{ig_handle}" if ig_handle else ""), f"@{ig_handle}" if ig_handle else "")
+        tt_link = _hyperlink_formula(profile.get("ttProfileUrl") or (f"https://www.tiktok.com/@{tt_handle}" if tt_handle else ""), f"@{tt_handle}" if tt_handle else "")
+
+    # Column order: Name, Instagram @, TikTok @, Email, Average Views (Instagram), Average Views (TikTok), Status, Sent from Email, Sent from IG @, Sent from TT @, Initial Outreach Date
+    return [
+        name,                                          # A: Name
+        ig_link,                                       # B: Instagram @
+        tt_link,                                       # C: TikTok @
+        email_addr,                                    # D: Email
+        int(profile.get("igAvgViews") or 0),           # E: Average Views (Instagram)
+        int(profile.get("ttAvgViews") or 0),           # F: Average Views (TikTok)
+        status_val,                                    # G: Status
+        app_cfg.get("gmail_sender") or "",             # H: Sent from Email
+        app_cfg.get("instagram_account") or "",        # I: Sent from IG @
+        app_cfg.get("tiktok_account") or "",           # J: Sent from TT @
+        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),  # K: Initial Outreach Date
+    ]
+
+
+# /scrape starts the profile scrape alongside its duplicate checks (SCRAPE_OVERLAP_DEDUPE=0 runs them in turn,
+# which spends no SearchAPI call on duplicates)
+_SCRAPE_OVERLAP_DEDUPE = os.environ.get("SCRAPE_OVERLAP_DEDUPE", "1").strip().lower() not in ("0", "false", "no")
+_SCRAPE_PREFETCH_POOL = ThreadPoolExecutor(max_workers=int(os.environ.get("SCRAPE_PREFETCH_WORKERS", "16")), thread_name_prefix="scrape-prefetch")
 
 
 @app.post("/scrape")
@@ -434,21 +664,7 @@ def scrape_endpoint():
     sheet_name = CATEGORY_TO_SHEET.get(cat_key_normalized)
     
     # Try to extract handles from URL without scraping
-    ig_handle_from_url = ""
-    tt_handle_from_url = ""
-    try:
-        # Extract handle from TikTok URL
-        if "tiktok.com" in url.lower():
-            tt_match = re.search(r'tiktok\.com/@([A-Za-z0-9_.]+)', url)
-            if tt_match:
-                tt_handle_from_url = tt_match.group(1)
-        # Extract handle from Instagram URL
-        elif "instagram.com" in url.lower():
-            ig_match = re.search(r'instagram\.com/([A-Za-z0-9_.]+)', url)
-            if ig_match:
-                ig_handle_from_url = ig_match.group(1)
-    except Exception:
-        pass
+    ig_handle_from_url, tt_handle_from_url = _handles_from_url(url)
     
     
     def _handle_peptide_vendor_lead() -> Any:
@@ -756,6 +972,13 @@ def scrape_endpoint():
     # OTHER CATEGORIES: Use existing row-based approach with scraping
     existing_data = {"exists": False}
 
+    # Start the scrape now so it runs while the duplicate checks below do;
+    # a duplicate just leaves its result unused
+    t_scrape = time.perf_counter()
+    scrape_future = None
+    if scrape_profile_sync is not None and _SCRAPE_OVERLAP_DEDUPE:
+        scrape_future = _SCRAPE_PREFETCH_POOL.submit(contextvars.copy_context().run, scrape_profile_sync, url, timeout_seconds=45.0)
+
     if spreadsheet_id and (ig_handle_from_url or tt_handle_from_url):
         # Check across all sheets
         existing_data = _check_creator_exists_across_all_sheets(
@@ -766,6 +989,8 @@ def scrape_endpoint():
         )
 
         if existing_data.get("exists", False):
+            if scrape_future is not None:
+                scrape_future.cancel()
             _log(
                 "scrape.already_contacted",
                 ig=ig_handle_from_url,
@@ -784,12 +1009,33 @@ def scrape_endpoint():
                 "status": existing_data.get("status"),
             }), 409
 
-    
-    # 2) Scrape the profile
+    # Rows still waiting in the write-behind queue aren't in the sheet yet, whatever
+    # this request's mode (another request may have queued the creator)
+    pending_queue = existing_sheet_write_queue()
+    if pending_queue is not None and spreadsheet_id and (ig_handle_from_url or tt_handle_from_url):
+        queued = pending_queue.find_unwritten(spreadsheet_id, ig_handle_from_url, tt_handle_from_url)
+        if queued:
+            if scrape_future is not None:
+                scrape_future.cancel()
+            _log("scrape.already_queued", ig=ig_handle_from_url, tt=tt_handle_from_url, write_id=queued["write_id"])
+            return jsonify({
+                "error": "Creator already contacted",
+                "message": f"This creator has already been reached out to (pending write to '{queued['sheet_name']}' sheet)",
+                "ig_handle": ig_handle_from_url,
+                "tt_handle": tt_handle_from_url,
+                "sheet_name": queued["sheet_name"],
+                "row_index": None,
+                "status": None,
+                "sheet_write_id": queued["write_id"],
+            }), 409
+    write_queue = get_sheet_write_queue() if write_behind_enabled(payload.get("write_behind")) else None
+
+    # 2) Scrape the profile (or collect the scrape started above)
     profile = {}
     try:
-        t_scrape = time.perf_counter()
-        if scrape_profile_sync is not None:
+        if scrape_future is not None:
+            profile = scrape_future.result()
+        elif scrape_profile_sync is not None:
             profile = scrape_profile_sync(url, timeout_seconds=45.0)
         else:
             raise Exception("Scraper not available")
@@ -798,112 +1044,41 @@ def scrape_endpoint():
         _log("scrape.error", error=str(e))
         return jsonify({"error": f"scrape failed: {e}"}), 500
 
-    # 3) Build comms (email + DM)
-    comms = _build_email_and_dm(
-        category,
-        profile,
-        link_url=app_cfg.get("link_url"),
-        app_key=app_cfg.get("app_key"),
-        is_followup=False,
-        followup_number=1,
-        app_config=app_cfg,
-    )
-    _log(
-        "scrape.comms_built",
-        subject=comms.get("subject"),
-        dm_len=len(comms.get("dm_md") or ""),
-        has_email=bool(profile.get("email")),
-    )
-
-    # 4) Prepare client-side email compose data (no backend sending)
-    email_send_result = {"ok": False, "error": "Skipped (no recipient)"}
-    recipient_email_raw = str(profile.get("email") or "").strip()
-    has_valid_recipient = bool(recipient_email_raw)
-    recipient_email = recipient_email_raw if has_valid_recipient else ""
-    plain_text = ""
-    mailto_url: Optional[str] = None
-
-    if has_valid_recipient and not is_theme_pages:
-        # Build mailto URL and plain-text body; let device handle sending
-        try:
-            # Prefer plain text for mailto body
-            plain_text = _markdown_to_text(comms["email_md"]) or ""
-        except Exception:
-            plain_text = comms.get("email_md") or ""
-        # Encode subject/body for URL
-        subj_enc = quote(comms.get("subject") or "")
-        body_enc = quote(plain_text)
-        mailto_url = f"mailto:{recipient_email}?subject={subj_enc}&body={body_enc}"
-        email_send_result = {"ok": False, "error": "Skipped (compose on device)", "mailto_url": mailto_url, "to": recipient_email}
-        _log("email.compose.prepared", to=recipient_email, has_mailto=bool(mailto_url))
+    # 3) Build comms (email + DM) and 4) client-side email compose data (no backend sending)
+    outreach = _prepare_outreach(category, profile, app_cfg, is_theme_pages)
+    comms = outreach["comms"]
+    recipient_email = outreach["recipient_email"]
+    has_valid_recipient = outreach["has_valid_recipient"]
+    plain_text = outreach["plain_text"]
+    mailto_url = outreach["mailto_url"]
 
     # 5) Write to Google Sheets or update existing row
     sheet_status = {"ok": False, "error": "No spreadsheet id configured"}
     # Always append/update a row for tracking when a spreadsheet is configured,
     # even if there is no valid recipient email (email column will be blank).
     if spreadsheet_id and sheet_name:
-        name = _get_display_name(profile)
-        ig_handle = profile.get("ig") or ""
-        tt_handle = profile.get("tt") or ""
-        email_addr = "" if is_theme_pages else (profile.get("email") or "")
-        
-        # Status rules:
-        # - Theme Pages: leave blank (tracking DM only)
-        # - If email sent OK: "Sent"
-        # - If no valid recipient email: "No Email"
-        # - Else (prepared compose but not sent on device): leave blank
-        if is_theme_pages:
-            status_val = ""
-        elif email_send_result.get("ok"):
-            status_val = "Sent"
-        elif not has_valid_recipient:
-            status_val = "No Email"
-        else:
-            status_val = ""
+        row = _creator_sheet_row(profile, sheet_name, outreach["status"], is_theme_pages, app_cfg)
 
-        if sheet_name == "Raw Leads":
-            # For Raw Leads, use plain text URLs, no HYPERLINK formula
-            ig_link = profile.get("igProfileUrl") or (f"https://www.instagram.com/{ig_handle}" if ig_handle else "")
-            tt_link = profile.get("ttProfileUrl") or (f"https://www.tiktok.com/@{tt_handle}" if tt_handle else "")
+        # Append new row (or journal it for the write-behind worker and return now)
+        _log("sheets.append.row_preview", sheet=sheet_name, row_sample=row[:3], avg_ig_views=row[4], avg_tt_views=row[5])
+        if write_queue is not None:
+            sheet_write_id = write_queue.enqueue(
+                spreadsheet_id,
+                sheet_name,
+                row,
+                delegated_user=app_cfg.get("delegated_user") or app_cfg.get("gmail_sender") or None,
+                ig_handle=profile.get("ig") or "",
+                tt_handle=profile.get("tt") or "",
+            )
+            sheet_status = {"ok": True, "queued": True, "write_id": sheet_write_id}
         else:
-            # For other sheets, use HYPERLINK formula with handle text
-            ig_link = _hyperlink_formula(profile.get("igProfileUrl") or (f"https://www.instagram.com/{ig_handle}" if ig_handle else ""), f"@{ig_handle}" if ig_handle else "")
-            tt_link = _hyperlink_formula(profile.get("ttProfileUrl") or (f"https://www.tiktok.com/@{tt_handle}" if tt_handle else ""), f"@{tt_handle}" if tt_handle else "")
-        avg_ig_views = int(profile.get("igAvgViews") or 0)
-        avg_tt_views = int(profile.get("ttAvgViews") or 0)
-        
-        # Get sender information from app config
-        sent_from_email = app_cfg.get("gmail_sender") or ""
-        sent_from_tiktok = app_cfg.get("tiktok_account") or ""
-        sent_from_ig = app_cfg.get("instagram_account") or ""
-        
-        # Set current date for new outreaches
-        initial_outreach_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Column order: Name, Instagram @, TikTok @, Email, Average Views (Instagram), Average Views (TikTok), Status, Sent from Email, Sent from IG @, Sent from TT @, Initial Outreach Date
-        row = [
-            name,                    # A: Name
-            ig_link,                 # B: Instagram @
-            tt_link,                 # C: TikTok @
-            email_addr,              # D: Email
-            avg_ig_views,            # E: Average Views (Instagram)
-            avg_tt_views,            # F: Average Views (TikTok)
-            status_val,              # G: Status
-            sent_from_email,         # H: Sent from Email
-            sent_from_ig,            # I: Sent from IG @
-            sent_from_tiktok,        # J: Sent from TT @
-            initial_outreach_date,   # K: Initial Outreach Date
-        ]
-        
-        # Append new row
-        _log("sheets.append.row_preview", sheet=sheet_name, row_sample=row[:3], avg_ig_views=avg_ig_views, avg_tt_views=avg_tt_views)
-        sheet_status = _append_to_sheet(
-            spreadsheet_id,
-            sheet_name,
-            row,
-            delegated_user=app_cfg.get("delegated_user") or app_cfg.get("gmail_sender") or None,
-        )
-        _log("sheets.append.result", ok=sheet_status.get("ok"), error=sheet_status.get("error"), sheet_name=sheet_name)
+            sheet_status = _append_to_sheet(
+                spreadsheet_id,
+                sheet_name,
+                row,
+                delegated_user=app_cfg.get("delegated_user") or app_cfg.get("gmail_sender") or None,
+            )
+        _log("sheets.append.result", ok=sheet_status.get("ok"), error=sheet_status.get("error"), sheet_name=sheet_name, queued=bool(sheet_status.get("queued")))
     else:
         _log("sheets.append.skipped_no_spreadsheet")
 
@@ -922,14 +1097,6 @@ def scrape_endpoint():
     include_extras_val = (request.args.get("include_extras") if request else None) or (payload.get("include_extras") if isinstance(payload, dict) else None)
     include_extras = str(include_extras_val).strip().lower() in {"1", "true", "yes", "y"}
 
-    # Always prepare email subject and body, even if no email found
-    # This allows manual email entry in Shortcuts to work correctly
-    if not plain_text:
-        try:
-            plain_text = _markdown_to_text(comms["email_md"]) or ""
-        except Exception:
-            plain_text = comms.get("email_md") or ""
-    
     # tt_handle for the frontend (used as lookup key for sheet updates)
     tt_handle_resp = (profile.get("tt") or "").strip().lstrip("@").lower() or None
 
@@ -944,6 +1111,10 @@ def scrape_endpoint():
         "sent_from_tiktok": app_cfg.get("tiktok_account"),
         "sent_from_ig": app_cfg.get("instagram_account"),
     }
+    if sheet_status.get("queued"):
+        # Poll GET /sheet_writes/<id> for confirmation
+        resp["sheet_write_id"] = sheet_status.get("write_id")
+        resp["sheet_write_status"] = "pending"
 
     if include_extras:
         resp.update({
@@ -973,6 +1144,228 @@ def scrape_endpoint():
     return jsonify(resp)
 
 
+# /scrape_batch limits: items per request and concurrent profile scrapes
+_SCRAPE_BATCH_MAX_ITEMS = int(os.environ.get("SCRAPE_BATCH_MAX_ITEMS", "300"))
+_SCRAPE_BATCH_WORKERS = int(os.environ.get("SCRAPE_BATCH_WORKERS", "8"))
+# Categories that go through the scrape -> scripts -> A:K row pipeline of /scrape
+_SCRAPE_BATCH_CATEGORIES = {"macro", "micro", "submicro", "ambassador", "themepage", "ai_influencer"}
+
+
+@app.post("/scrape_batch")
+def scrape_batch_endpoint():
+    """Add many creators in one call (e.g. a research list).
+
+    Body: {"app", "sender_profile", "category" (default for items without one),
+           "items": [{"url", "category"}, ...] or "urls": ["...", ...]}
+
+    Every item is checked against one snapshot of the creator handle index (and
+    against earlier items of the same batch), new creators are scraped
+    concurrently, and all rows are written with one values.append per tab plus a
+    single Status data-validation batchUpdate. Each item gets its own result:
+    "added", "duplicate", "invalid", "scrape_failed" or "write_failed".
+    """
+    app_key_from_query = (request.args.get("app") or request.args.get("app_name") or "").strip()
+    payload = request.get_json(silent=True) or {}
+    app_key = (payload.get("app") or payload.get("app_name") or app_key_from_query or "").strip()
+    app_cfg = _get_app_config(app_key)
+
+    sender_profile_key = (payload.get("sender_profile") or payload.get("sender") or payload.get("profile") or "").strip().lower()
+    if sender_profile_key:
+        try:
+            app_cfg = _resolve_sender_profile(app_cfg, sender_profile_key, strict=False)
+        except ValueError as e:
+            _log("scrape_batch.sender_profile_error", error=str(e), sender_profile_key=sender_profile_key)
+            return jsonify({
+                "error": "Invalid sender profile",
+                "detail": str(e),
+                "sender_profile": sender_profile_key,
+                "available_profiles": list(app_cfg.get("sender_profiles", {}).keys())
+            }), 400
+
+    raw_items = payload.get("items")
+    if raw_items is None:
+        raw_items = payload.get("urls")
+    if not isinstance(raw_items, list) or not raw_items:
+        return jsonify({"error": "Missing items", "message": "Provide items: [{url, category}] or urls: [...]"}), 400
+    if len(raw_items) > _SCRAPE_BATCH_MAX_ITEMS:
+        return jsonify({
+            "error": "Too many items",
+            "message": f"A batch can hold at most {_SCRAPE_BATCH_MAX_ITEMS} items (got {len(raw_items)})",
+        }), 400
+
+    spreadsheet_id = app_cfg.get("sheets_spreadsheet_id") or ""
+    if not spreadsheet_id:
+        return jsonify({"error": "No spreadsheet configured"}), 500
+    delegated_user = app_cfg.get("delegated_user") or app_cfg.get("gmail_sender") or None
+    default_category = payload.get("category") or ""
+    t_batch = time.perf_counter()
+
+    results: List[Dict[str, Any]] = [{} for _ in raw_items]
+    candidates: List[Dict[str, Any]] = []
+    for i, item in enumerate(raw_items):
+        if isinstance(item, str):
+            item = {"url": item}
+        if not isinstance(item, dict):
+            results[i] = {"status": "invalid", "error": "Item must be an object or a URL string"}
+            continue
+        url_raw = str(item.get("url") or item.get("tiktok_url") or "")
+        url = _clean_url(url_raw)
+        category = item.get("category") or default_category
+        cat_key = _normalize_category(category)
+        results[i] = {"url": url or url_raw, "category": category}
+        if not url:
+            results[i].update({"status": "invalid", "error": "Missing url"})
+        elif cat_key not in _SCRAPE_BATCH_CATEGORIES:
+            results[i].update({
+                "status": "invalid",
+                "error": "Invalid category",
+                "message": "Batch category must be one of: Macro, Micro, Submicro, Ambassador, Themepage, AI Influencer",
+            })
+        else:
+            ig_from_url, tt_from_url = _handles_from_url(url)
+            candidates.append({
+                "i": i,
+                "url": url,
+                "category": category,
+                "sheet_name": CATEGORY_TO_SHEET.get(cat_key),
+                "is_theme_pages": cat_key == "themepage",
+                "ig": ig_from_url,
+                "tt": tt_from_url,
+            })
+
+    _log("scrape_batch.request", app_key=app_cfg.get("app_key"), items=len(raw_items), valid=len(candidates))
+
+    # 1) Dedupe: one handle index snapshot for the whole batch, rows still in the
+    #    write-behind queue, then within the batch
+    existing = _check_creators_exist_across_all_sheets(
+        spreadsheet_id,
+        [(c["ig"], c["tt"]) for c in candidates],
+        delegated_user=delegated_user,
+    )
+    pending_queue = existing_sheet_write_queue()
+    seen: Dict[str, int] = {}
+    to_scrape: List[Dict[str, Any]] = []
+    for c, found in zip(candidates, existing):
+        result = results[c["i"]]
+        if found.get("exists", False):
+            result.update({
+                "status": "duplicate",
+                "error": "Creator already contacted",
+                "message": f"This creator has already been reached out to (found in '{found.get('sheet_name')}' sheet)",
+                "ig_handle": c["ig"],
+                "tt_handle": c["tt"],
+                "sheet_name": found.get("sheet_name"),
+                "row_index": found.get("row_index"),
+                "sheet_status": found.get("status"),
+            })
+            continue
+        queued = pending_queue.find_unwritten(spreadsheet_id, c["ig"], c["tt"]) if pending_queue is not None else None
+        if queued:
+            result.update({
+                "status": "duplicate",
+                "error": "Creator already contacted",
+                "message": f"This creator has already been reached out to (pending write to '{queued['sheet_name']}' sheet)",
+                "ig_handle": c["ig"],
+                "tt_handle": c["tt"],
+                "sheet_name": queued["sheet_name"],
+                "row_index": None,
+                "sheet_status": None,
+                "sheet_write_id": queued["write_id"],
+            })
+            continue
+        keys = [f"url:{c['url'].lower()}"]
+        keys += [f"ig:{c['ig'].lower()}"] if c["ig"] else []
+        keys += [f"tt:{c['tt'].lower()}"] if c["tt"] else []
+        earlier = next((seen[k] for k in keys if k in seen), None)
+        if earlier is not None:
+            result.update({"status": "duplicate", "error": "Duplicate in batch", "duplicate_of": earlier})
+            continue
+        for k in keys:
+            seen[k] = c["i"]
+        to_scrape.append(c)
+
+    # 2) Scrape new creators with a bounded pool
+    scraped: List[Dict[str, Any]] = []
+    if to_scrape:
+        t_scrape = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(_SCRAPE_BATCH_WORKERS, len(to_scrape)))) as pool:
+            # Each scrape runs in a copy of this request's context so its spans land in the request trace
+            futures = {
+                pool.submit(contextvars.copy_context().run, scrape_profile_sync, c["url"], timeout_seconds=45.0): c
+                for c in to_scrape
+            }
+            for future in as_completed(futures):
+                c = futures[future]
+                try:
+                    c["profile"] = future.result() or {}
+                    scraped.append(c)
+                except Exception as e:
+                    _log("scrape_batch.scrape_error", url=c["url"], error=str(e))
+                    results[c["i"]].update({"status": "scrape_failed", "error": f"scrape failed: {e}"})
+        _log("scrape_batch.scraped", count=len(to_scrape), failed=len(to_scrape) - len(scraped),
+             duration_ms=int((time.perf_counter() - t_scrape) * 1000))
+    scraped.sort(key=lambda c: c["i"])
+
+    # 3) Build scripts and rows, grouped by tab
+    rows_by_sheet: Dict[str, List[List[Any]]] = {}
+    for c in scraped:
+        profile = c["profile"]
+        outreach = _prepare_outreach(c["category"], profile, app_cfg, c["is_theme_pages"])
+        sheet_rows = rows_by_sheet.setdefault(c["sheet_name"], [])
+        c["slot"] = len(sheet_rows)
+        sheet_rows.append(_creator_sheet_row(profile, c["sheet_name"], outreach["status"], c["is_theme_pages"], app_cfg))
+        comms = outreach["comms"]
+        results[c["i"]].update({
+            "ig_handle": (profile.get("ig") or "").strip().lstrip("@").lower() or None,
+            "tt_handle": (profile.get("tt") or "").strip().lstrip("@").lower() or None,
+            "dm_text": comms.get("dm_md") or "",
+            "email_to": (outreach["recipient_email"] if (outreach["has_valid_recipient"] and not c["is_theme_pages"]) else None),
+            "email_subject": comms.get("subject"),
+            "email_body_text": outreach["plain_text"],
+            "mailto_url": outreach["mailto_url"],
+            "sheet_name": c["sheet_name"],
+        })
+
+    # 4) Write every row at once
+    write_result: Dict[str, Any] = {"ok": True, "sheets": {}}
+    if rows_by_sheet:
+        write_result = _append_rows_to_sheets(spreadsheet_id, rows_by_sheet, delegated_user=delegated_user)
+    for c in scraped:
+        result = results[c["i"]]
+        sheet_result = (write_result.get("sheets") or {}).get(c["sheet_name"])
+        if sheet_result is None or not sheet_result.get("ok"):
+            error = (sheet_result or {}).get("error") or write_result.get("error") or "Sheet write failed"
+            result.update({"status": "write_failed", "error": error})
+            continue
+        rows = sheet_result.get("rows") or []
+        result.update({"status": "added", "row_added": rows[c["slot"]] if c["slot"] < len(rows) else None})
+
+    summary: Dict[str, int] = {}
+    for result in results:
+        status = result.get("status", "invalid")
+        summary[status] = summary.get(status, 0) + 1
+    _log("scrape_batch.done", summary=summary, duration_ms=int((time.perf_counter() - t_batch) * 1000))
+    return jsonify({
+        "ok": True,
+        "count": len(results),
+        "summary": summary,
+        "results": results,
+        "sent_from_email": app_cfg.get("gmail_sender"),
+        "sent_from_tiktok": app_cfg.get("tiktok_account"),
+        "sent_from_ig": app_cfg.get("instagram_account"),
+    })
+
+
+@app.get("/sheet_writes/<int:write_id>")
+def sheet_write_status_endpoint(write_id: int):
+    """Confirmation for a row queued by write-behind mode (status: pending, writing, done or failed)."""
+    queue = get_sheet_write_queue()
+    status = queue.status(write_id) if queue is not None else None
+    if status is None:
+        return jsonify({"error": "Unknown write id", "write_id": write_id}), 404
+    return jsonify(status)
+
+
 @app.post("/scrape_themepage")
 def scrape_themepage_endpoint():
     """
@@ -1187,6 +1580,19 @@ def scrape_themepage_endpoint():
     return jsonify(resp)
 
 
+_CONTACT_UPDATE_MAX_ITEMS = int(os.environ.get("CONTACT_UPDATE_MAX_ITEMS", "500"))
+
+
+def _contact_update_fields(item: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    """(ig_handle, tt_handle, new_email, new_ig) from one update_creator_contact item."""
+    return (
+        str(item.get("ig_handle") or "").strip().lstrip("@"),
+        str(item.get("tt_handle") or "").strip().lstrip("@"),
+        str(item.get("new_email") or "").strip(),
+        str(item.get("new_ig") or "").strip().lstrip("@"),
+    )
+
+
 @app.patch("/update_creator_contact")
 def update_creator_contact_endpoint():
     """
@@ -1206,49 +1612,92 @@ def update_creator_contact_endpoint():
 
     Response:
         { "ok": true, "updated": ["email", "ig"] }
+
+    Bulk form (e.g. after an email-finding pass): {"app", "updates": [{...}, ...]}
+    with items shaped like the single body. All rows are looked up in one handle
+    index snapshot and written with one values.batchUpdate. Response:
+        { "ok": bool, "updated_rows": n, "results": [{"ok", "updated", "sheet_name", "row_index"} | {"ok": false, "error"}, ...] }
     """
     payload = request.get_json(silent=True) or {}
     app_key = (payload.get("app") or "").strip()
-    ig_handle_lookup = (payload.get("ig_handle") or "").strip().lstrip("@")
-    tt_handle_lookup = (payload.get("tt_handle") or "").strip().lstrip("@")
-    new_email = (payload.get("new_email") or "").strip()
-    new_ig = (payload.get("new_ig") or "").strip().lstrip("@")
+    bulk = payload.get("updates")
 
     if not app_key:
         return jsonify({"ok": False, "error": "Missing app"}), 400
-    if not new_email and not new_ig:
-        return jsonify({"ok": False, "error": "Nothing to update"}), 400
+    if bulk is not None:
+        if not isinstance(bulk, list) or not bulk:
+            return jsonify({"ok": False, "error": "updates must be a non-empty list"}), 400
+        if len(bulk) > _CONTACT_UPDATE_MAX_ITEMS:
+            return jsonify({"ok": False, "error": f"At most {_CONTACT_UPDATE_MAX_ITEMS} updates per call (got {len(bulk)})"}), 400
+        items = [_contact_update_fields(item if isinstance(item, dict) else {}) for item in bulk]
+    else:
+        items = [_contact_update_fields(payload)]
+        if not items[0][2] and not items[0][3]:
+            return jsonify({"ok": False, "error": "Nothing to update"}), 400
 
     app_cfg = _get_app_config(app_key)
-    spreadsheet_id = app_cfg.get("spreadsheet_id") or app_cfg.get("sheet_id")
+    spreadsheet_id = app_cfg.get("sheets_spreadsheet_id") or app_cfg.get("spreadsheet_id") or app_cfg.get("sheet_id")
     if not spreadsheet_id:
         return jsonify({"ok": False, "error": "No spreadsheet configured for this app"}), 400
 
     delegated_user = app_cfg.get("delegated_user") or app_cfg.get("gmail_sender") or None
 
-    # Find the existing row in any sheet tab
-    existing = _check_creator_exists_across_all_sheets(
-        spreadsheet_id, ig_handle_lookup, tt_handle_lookup, delegated_user=delegated_user
-    )
+    if bulk is None:
+        ig_handle_lookup, tt_handle_lookup, new_email, new_ig = items[0]
+        # Find the existing row in any sheet tab
+        existing = _check_creator_exists_across_all_sheets(
+            spreadsheet_id, ig_handle_lookup, tt_handle_lookup, delegated_user=delegated_user
+        )
 
-    if not existing.get("exists"):
-        _log("update_creator_contact.not_found", ig=ig_handle_lookup, tt=tt_handle_lookup)
-        return jsonify({"ok": False, "error": "Creator not found in sheet"}), 404
+        if not existing.get("exists"):
+            _log("update_creator_contact.not_found", ig=ig_handle_lookup, tt=tt_handle_lookup)
+            return jsonify({"ok": False, "error": "Creator not found in sheet"}), 404
 
-    sheet_name = existing["sheet_name"]
-    row_index = existing["row_index"]
-    _log("update_creator_contact.found", sheet=sheet_name, row=row_index)
+        sheet_name = existing["sheet_name"]
+        row_index = existing["row_index"]
+        _log("update_creator_contact.found", sheet=sheet_name, row=row_index)
 
-    result = _update_creator_contact_info(
-        spreadsheet_id,
-        sheet_name,
-        row_index,
-        email=new_email or None,
-        ig_handle=new_ig or None,
-        delegated_user=delegated_user,
-    )
+        result = _update_creator_contact_info(
+            spreadsheet_id,
+            sheet_name,
+            row_index,
+            email=new_email or None,
+            ig_handle=new_ig or None,
+            delegated_user=delegated_user,
+        )
+
+        return jsonify(result)
 
-    return jsonify(result)
+    results: List[Dict[str, Any]] = [{} for _ in items]
+    lookups = [(i, (ig, tt)) for i, (ig, tt, new_email, new_ig) in enumerate(items) if (ig or tt) and (new_email or new_ig)]
+    for i, (ig, tt, new_email, new_ig) in enumerate(items):
+        if not (ig or tt):
+            results[i] = {"ok": False, "error": "Missing ig_handle or tt_handle"}
+        elif not (new_email or new_ig):
+            results[i] = {"ok": False, "error": "Nothing to update"}
+
+    found = _check_creators_exist_across_all_sheets(spreadsheet_id, [handles for _, handles in lookups], delegated_user=delegated_user)
+    writes: List[Tuple[int, Dict[str, Any]]] = []
+    for (i, _), existing in zip(lookups, found):
+        if not existing.get("exists"):
+            results[i] = {"ok": False, "error": "Creator not found in sheet"}
+            continue
+        _, _, new_email, new_ig = items[i]
+        writes.append((i, {
+            "sheet_name": existing["sheet_name"],
+            "row_index": existing["row_index"],
+            "email": new_email or None,
+            "ig_handle": new_ig or None,
+        }))
+
+    if writes:
+        written = _update_creators_contact_info(spreadsheet_id, [update for _, update in writes], delegated_user=delegated_user)
+        for (i, update), result in zip(writes, written):
+            results[i] = {**result, "sheet_name": update["sheet_name"], "row_index": update["row_index"]}
+
+    updated_rows = sum(1 for r in results if r.get("ok"))
+    _log("update_creator_contact.bulk", items=len(items), updated_rows=updated_rows)
+    return jsonify({"ok": updated_rows == len(items), "updated_rows": updated_rows, "results": results})
 
 
 # Entrypoint for local dev: `python api/main.py`
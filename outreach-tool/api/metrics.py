@@ -0,0 +1,190 @@
+"""Per-request span timing and in-process latency summaries.
+
+Stages are timed with `with span("sheets.read"):`. Each span is added to the
+current request's trace (logged with the http.response event) and to a rolling
+latency series per (endpoint, stage), which /debug/metrics renders in the
+Prometheus text format with p50/p95/p99 over the most recent samples.
+
+Spans outside a request (background workers) are filed under the
+"background" endpoint. Cold-start costs (module imports, config load, warm-up
+steps) are recorded with record_startup() under the "startup" endpoint and are
+also kept as a flat {stage: ms} map for /health and /warmup.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Samples kept per (endpoint, stage) for the quantiles
+_WINDOW = int(os.environ.get("METRICS_WINDOW", "2048"))
+_QUANTILES = (0.5, 0.95, 0.99)
+_BACKGROUND = "background"
+_STARTUP = "startup"
+
+
+class _Trace:
+    """Spans recorded while handling one request (possibly from several threads)."""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans: List[Tuple[str, float]] = []
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.spans.append((stage, seconds))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """{stage: {"count", "ms"}} with durations summed per stage."""
+        out: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for stage, seconds in spans:
+            entry = out.setdefault(stage, {"count": 0, "ms": 0.0})
+            entry["count"] += 1
+            entry["ms"] += seconds * 1000
+        for entry in out.values():
+            entry["ms"] = round(entry["ms"], 1)
+        return out
+
+
+_CURRENT_TRACE: "contextvars.ContextVar[Optional[_Trace]]" = contextvars.ContextVar("outreach_trace", default=None)
+
+
+class _LatencySeries:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.recent: deque = deque(maxlen=_WINDOW)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.recent.append(seconds)
+
+    def quantiles(self) -> Dict[float, float]:
+        samples = sorted(self.recent)
+        if not samples:
+            return {q: 0.0 for q in _QUANTILES}
+        return {q: samples[min(len(samples) - 1, int(q * len(samples)))] for q in _QUANTILES}
+
+
+class _Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], _LatencySeries] = {}
+
+    def observe(self, endpoint: str, stage: str, seconds: float):
+        with self._lock:
+            series = self._series.get((endpoint, stage))
+            if series is None:
+                series = self._series[(endpoint, stage)] = _LatencySeries()
+            series.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-friendly view: {endpoint: {stage: {count, p50_ms, p95_ms, p99_ms}}}."""
+        with self._lock:
+            items = [(key, series.count, series.quantiles()) for key, series in self._series.items()]
+        out: Dict[str, Dict[str, Any]] = {}
+        for (endpoint, stage), count, quantiles in sorted(items):
+            out.setdefault(endpoint, {})[stage] = {
+                "count": count,
+                **{f"p{int(q * 100)}_ms": round(v * 1000, 1) for q, v in quantiles.items()},
+            }
+        return out
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            series = [(key, s.count, s.total, s.quantiles()) for key, s in sorted(self._series.items())]
+        lines = [
+            "# HELP outreach_stage_duration_seconds Time spent per request stage (quantiles over recent samples).",
+            "# TYPE outreach_stage_duration_seconds summary",
+        ]
+        for (endpoint, stage), count, total, quantiles in series:
+            labels = f'endpoint="{_escape(endpoint)}",stage="{_escape(stage)}"'
+            for q, value in quantiles.items():
+                lines.append(f'outreach_stage_duration_seconds{{{labels},quantile="{q}"}} {value:.6f}')
+            lines.append(f"outreach_stage_duration_seconds_sum{{{labels}}} {total:.6f}")
+            lines.append(f"outreach_stage_duration_seconds_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_METRICS = _Metrics()
+_STARTUP_TIMINGS: Dict[str, float] = {}
+
+
+def start_trace(endpoint: str) -> contextvars.Token:
+    """Begin the trace for the current request; pass the token to finish_trace."""
+    return _CURRENT_TRACE.set(_Trace(endpoint))
+
+
+def finish_trace(token: Optional[contextvars.Token] = None) -> Optional[_Trace]:
+    """End the current request's trace, recording its total duration."""
+    trace = _CURRENT_TRACE.get()
+    if trace is not None:
+        _METRICS.observe(trace.endpoint, "total", time.perf_counter() - trace.started)
+    if token is not None:
+        try:
+            _CURRENT_TRACE.reset(token)
+        except ValueError:
+            _CURRENT_TRACE.set(None)
+    return trace
+
+
+def record_span(stage: str, seconds: float):
+    trace = _CURRENT_TRACE.get()
+    if trace is not None:
+        trace.add(stage, seconds)
+    _METRICS.observe(trace.endpoint if trace is not None else _BACKGROUND, stage, seconds)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the enclosed block as one span of the current request."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(stage, time.perf_counter() - started)
+
+
+def metrics_snapshot() -> Dict[str, Any]:
+    return _METRICS.snapshot()
+
+
+def render_prometheus() -> str:
+    return _METRICS.render_prometheus()
+
+
+def record_startup(stage: str, seconds: float):
+    """Record one cold-start step (an import, config load or warm-up step)."""
+    _STARTUP_TIMINGS[stage] = round(seconds * 1000, 1)
+    _METRICS.observe(_STARTUP, stage, seconds)
+
+
+@contextmanager
+def startup_span(stage: str) -> Iterator[None]:
+    """Time the enclosed block as a cold-start step."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_startup(stage, time.perf_counter() - started)
+
+
+def startup_timings() -> Dict[str, float]:
+    """{stage: ms} for every cold-start step recorded so far."""
+    return dict(_STARTUP_TIMINGS)
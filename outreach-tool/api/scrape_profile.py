@@ -10,6 +10,21 @@ try:
     import requests
 except ImportError:
     requests = None
+try:
+    from searchapi_cache import get_searchapi_cache
+except ImportError:
+    get_searchapi_cache = None
+try:
+    from metrics import span
+except ImportError:
+    from contextlib import nullcontext
+
+    def span(stage: str):
+        return nullcontext()
+
+
+# Overridable so the load-test harness can point at a local fake (loadtest/)
+_SEARCHAPI_URL = os.environ.get("SEARCHAPI_BASE_URL", "").strip() or "https://www.searchapi.io/api/v1/search"
 
 
 def _extract_site(value: str) -> str:
@@ -134,8 +149,16 @@ def _log(event: str, **kwargs) -> None:
         pass
 
 
+def _cached_searchapi(engine: str, key: str, fetch) -> dict:
+    """Serve a SearchAPI lookup from the on-disk cache when available (see searchapi_cache)."""
+    cache = get_searchapi_cache() if get_searchapi_cache is not None else None
+    if cache is None:
+        return fetch()
+    return cache.get_or_fetch(engine, key, fetch)
+
+
 def scrape_tiktok_with_searchapi(username: str) -> dict:
-    """Scrape TikTok profile using SearchAPI.io API.
+    """Scrape TikTok profile using SearchAPI.io API (cached per username).
     
     Args:
         username: TikTok username (with or without @)
@@ -143,6 +166,14 @@ def scrape_tiktok_with_searchapi(username: str) -> dict:
     Returns:
         dict with profile data or error information
     """
+    clean_username = (username or "").strip().lstrip("@")
+    if not clean_username:
+        return {"error": "Invalid username"}
+    return _cached_searchapi("tiktok_profile", clean_username, lambda: _fetch_tiktok_with_searchapi(clean_username))
+
+
+def _fetch_tiktok_with_searchapi(username: str) -> dict:
+    """Uncached SearchAPI.io tiktok_profile lookup behind scrape_tiktok_with_searchapi."""
     if requests is None:
         _log("searchapi.requests_not_available")
         return {"error": "requests library not available"}
@@ -163,18 +194,22 @@ def scrape_tiktok_with_searchapi(username: str) -> dict:
         _log("searchapi.request_start", username=clean_username)
         
         # Make API request
-        url = "https://www.searchapi.io/api/v1/search"
+        url = _SEARCHAPI_URL
         params = {
             "engine": "tiktok_profile",
             "username": clean_username,
             "api_key": api_key
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        with span("searchapi.tiktok_profile"):
+            response = requests.get(url, params=params, timeout=10)
         # Check for 401/403 specifically to fail fast on bad key
         if response.status_code in [401, 403]:
              _log("searchapi.auth_error", status=response.status_code)
              return {"error": "Invalid SEARCHAPI_KEY"}
+        if response.status_code == 404:
+            _log("searchapi.not_found", username=clean_username)
+            return {"error": "Profile not found", "not_found": True}
              
         response.raise_for_status()
         
@@ -185,7 +220,7 @@ def scrape_tiktok_with_searchapi(username: str) -> dict:
         profile = result.get("profile", {})
         if not profile:
             _log("searchapi.no_profile_data", username=clean_username)
-            return {"error": "No profile data in API response"}
+            return {"error": "No profile data in API response", "not_found": True}
         
         # Parse bio for email and Instagram handle
         bio = profile.get("bio", "") or ""
@@ -261,7 +296,7 @@ def scrape_tiktok_with_searchapi(username: str) -> dict:
 
 
 def scrape_youtube_with_searchapi(channel_id: str) -> dict:
-    """Scrape YouTube channel info using SearchAPI.io youtube_channel engine.
+    """Scrape YouTube channel info using SearchAPI.io youtube_channel engine (cached per handle).
 
     Args:
         channel_id: YouTube channel handle, e.g. '@KyanStone'
@@ -270,6 +305,16 @@ def scrape_youtube_with_searchapi(channel_id: str) -> dict:
         dict with profile data or error information, including ig_handle, tt_handle, and email
         extracted from the channel's about description and links.
     """
+    clean_channel_id = (channel_id or "").strip()
+    if not clean_channel_id:
+        return {"error": "Invalid channel_id"}
+    if not clean_channel_id.startswith("@"):
+        clean_channel_id = "@" + clean_channel_id
+    return _cached_searchapi("youtube_channel", clean_channel_id, lambda: _fetch_youtube_with_searchapi(clean_channel_id))
+
+
+def _fetch_youtube_with_searchapi(channel_id: str) -> dict:
+    """Uncached SearchAPI.io youtube_channel lookup behind scrape_youtube_with_searchapi."""
     if requests is None:
         _log("searchapi.youtube.requests_not_available")
         return {"error": "requests library not available"}
@@ -289,16 +334,20 @@ def scrape_youtube_with_searchapi(channel_id: str) -> dict:
     try:
         _log("searchapi.youtube.request_start", channel_id=clean_channel_id)
 
-        url = "https://www.searchapi.io/api/v1/search"
+        url = _SEARCHAPI_URL
         params = {
             "engine": "youtube_channel",
             "channel_id": clean_channel_id,
             "api_key": api_key,
         }
-        response = requests.get(url, params=params, timeout=15)
+        with span("searchapi.youtube_channel"):
+            response = requests.get(url, params=params, timeout=15)
         if response.status_code in [401, 403]:
             _log("searchapi.youtube.auth_error", status=response.status_code)
             return {"error": "Invalid SEARCHAPI_KEY"}
+        if response.status_code == 404:
+            _log("searchapi.youtube.not_found", channel_id=clean_channel_id)
+            return {"error": "Channel not found", "not_found": True}
 
         response.raise_for_status()
         result = response.json()
@@ -0,0 +1,19 @@
+"""Serialize the Sheets and Gmail discovery documents for fast client builds.
+
+Run at image build time (see Dockerfile); writes api/discovery/<api>.<version>.json,
+which google_services reads once per process instead of the library's bundled copy.
+"""
+
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))  # api/scripts
+api_dir = os.path.dirname(script_dir)  # api
+sys.path.insert(0, api_dir)
+
+from google_services import write_discovery_documents  # noqa: E402
+
+if __name__ == "__main__":
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(api_dir, "discovery")
+    for path in write_discovery_documents(out_dir):
+        print(path)
@@ -0,0 +1,177 @@
+"""On-disk cache for SearchAPI.io profile lookups.
+
+Results are stored in SQLite keyed by (engine, handle):
+- found profiles for SEARCHAPI_CACHE_TTL_SECONDS (default 1 day)
+- "not found" answers for SEARCHAPI_CACHE_NEGATIVE_TTL_SECONDS (default 1 hour)
+- other errors (timeouts, bad key, ...) are never cached
+
+Concurrent lookups of the same key share one in-flight request, so two people
+pasting the same creator at once cost one paid API call.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils import _log
+
+_DEFAULT_TTL_S = 24 * 60 * 60
+_DEFAULT_NEGATIVE_TTL_S = 60 * 60
+# How long a coalesced caller waits for the in-flight request before fetching itself
+_INFLIGHT_WAIT_S = 60
+_PURGE_EVERY_STORES = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS searchapi_cache (
+    engine TEXT NOT NULL,
+    cache_key TEXT NOT NULL,
+    response TEXT NOT NULL,
+    negative INTEGER NOT NULL DEFAULT 0,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (engine, cache_key)
+)
+"""
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+
+
+class SearchApiCache:
+    def __init__(self, path: str, ttl_s: float = _DEFAULT_TTL_S, negative_ttl_s: float = _DEFAULT_NEGATIVE_TTL_S):
+        """
+        Args:
+            path: SQLite file (shared by every thread of the process)
+            ttl_s: How long found profiles are reused (0 disables the cache)
+            negative_ttl_s: How long "not found" answers are reused
+        """
+        self.path = path
+        self.ttl_s = ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self._db_lock = threading.Lock()
+        self._inflight_lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, str], _InFlight] = {}
+        self._stores = 0
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "coalesced": 0, "stored": 0}
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def from_env(cls) -> "SearchApiCache":
+        path = os.environ.get("SEARCHAPI_CACHE_PATH", "").strip() or os.path.join(tempfile.gettempdir(), "searchapi_cache.sqlite3")
+        return cls(
+            path,
+            ttl_s=float(os.environ.get("SEARCHAPI_CACHE_TTL_SECONDS", _DEFAULT_TTL_S)),
+            negative_ttl_s=float(os.environ.get("SEARCHAPI_CACHE_NEGATIVE_TTL_SECONDS", _DEFAULT_NEGATIVE_TTL_S)),
+        )
+
+    def get_or_fetch(self, engine: str, key: str, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Cached response for (engine, key), calling fetch() at most once across concurrent callers."""
+        if self.ttl_s <= 0:
+            return fetch()
+        cache_key = (engine, key.strip().lower())
+
+        cached = self._load(cache_key)
+        if cached is not None:
+            return cached
+
+        with self._inflight_lock:
+            flight = self._inflight.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[cache_key] = _InFlight()
+        if not leader:
+            self.stats["coalesced"] += 1
+            _log("searchapi.cache.coalesced", engine=engine, key=cache_key[1])
+            if flight.done.wait(_INFLIGHT_WAIT_S) and flight.result is not None:
+                return json.loads(json.dumps(flight.result))
+            return fetch()
+
+        self.stats["misses"] += 1
+        result: Dict[str, Any] = {"error": "SearchAPI lookup failed"}
+        try:
+            result = fetch()
+            self._store(cache_key, result)
+            return result
+        finally:
+            flight.result = result
+            flight.done.set()
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+
+    def _load(self, cache_key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT response, negative FROM searchapi_cache WHERE engine = ? AND cache_key = ? AND expires_at > ?",
+                (cache_key[0], cache_key[1], time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        response, negative = row
+        self.stats["negative_hits" if negative else "hits"] += 1
+        _log("searchapi.cache.hit", engine=cache_key[0], key=cache_key[1], negative=bool(negative))
+        return json.loads(response)
+
+    def _store(self, cache_key: Tuple[str, str], result: Dict[str, Any]):
+        if not isinstance(result, dict):
+            return
+        if "error" not in result:
+            ttl, negative = self.ttl_s, False
+        elif result.get("not_found"):
+            ttl, negative = self.negative_ttl_s, True
+        else:
+            return
+        if ttl <= 0:
+            return
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searchapi_cache (engine, cache_key, response, negative, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key[0], cache_key[1], json.dumps(result), int(negative), now, now + ttl),
+            )
+            self._stores += 1
+            if self._stores % _PURGE_EVERY_STORES == 0:
+                self._conn.execute("DELETE FROM searchapi_cache WHERE expires_at <= ?", (now,))
+            self._conn.commit()
+        self.stats["stored"] += 1
+
+    def invalidate(self, engine: str, key: str):
+        with self._db_lock:
+            self._conn.execute(
+                "DELETE FROM searchapi_cache WHERE engine = ? AND cache_key = ?",
+                (engine, key.strip().lower()),
+            )
+            self._conn.commit()
+
+
+_CACHE: Optional[SearchApiCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_searchapi_cache() -> Optional[SearchApiCache]:
+    """Process-wide cache built from the SEARCHAPI_CACHE_* env vars (None if it can't be opened)."""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                try:
+                    _CACHE = SearchApiCache.from_env()
+                except Exception as e:
+                    _log("searchapi.cache.open_error", error=str(e))
+                    return None
+    return _CACHE
+
+
+def searchapi_cache_stats() -> Dict[str, Any]:
+    cache = _CACHE
+    return dict(cache.stats) if cache is not None else {}
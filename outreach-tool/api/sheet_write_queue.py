@@ -0,0 +1,293 @@
+"""Write-behind queue for creator row appends (optional, SHEETS_WRITE_BEHIND=1).
+
+/scrape journals the row to a local SQLite file and returns the scripts right
+away; a background thread drains the journal, coalescing everything queued for
+the same spreadsheet into one _append_rows_to_sheets call (one values.append
+per tab plus one Status data-validation batchUpdate).
+
+Writes are at-least-once: a row that was being written when the process died
+goes back to pending on restart. On Cloud Run the journal only survives as long
+as the instance, so point SHEETS_WRITE_QUEUE_PATH at a mounted volume and keep
+CPU allocated outside requests if the worker must drain between calls.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from utils import _log
+from sheets_operations import _append_rows_to_sheets
+
+STATUS_PENDING = "pending"
+STATUS_WRITING = "writing"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# Wait this long after the first queued row so concurrent requests share a flush
+_FLUSH_DELAY_S = float(os.environ.get("SHEETS_WRITE_BEHIND_FLUSH_MS", "500")) / 1000.0
+_MAX_ATTEMPTS = 5
+_MAX_BATCH_ROWS = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheet_writes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    spreadsheet_id TEXT NOT NULL,
+    sheet_name TEXT NOT NULL,
+    delegated_user TEXT NOT NULL DEFAULT '',
+    row_json TEXT NOT NULL,
+    ig_handle TEXT NOT NULL DEFAULT '',
+    tt_handle TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    row_added INTEGER,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+def _journal_path() -> str:
+    return os.environ.get("SHEETS_WRITE_QUEUE_PATH", "").strip() or os.path.join(tempfile.gettempdir(), "sheet_write_queue.sqlite3")
+
+
+def write_behind_enabled(override: Any = None) -> bool:
+    """SHEETS_WRITE_BEHIND env default, optionally overridden per request."""
+    value = override if override is not None else os.environ.get("SHEETS_WRITE_BEHIND", "")
+    return str(value).strip().lower() in {"1", "true", "yes", "y"}
+
+
+class SheetWriteQueue:
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite journal file (created if missing)
+        """
+        self.path = path
+        self._db_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self.stats = {"enqueued": 0, "flushes": 0, "rows_written": 0, "retries": 0, "failed": 0}
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sheet_writes_status ON sheet_writes (status, next_attempt_at)")
+        # Rows a previous process was writing when it stopped go back to the queue
+        self._conn.execute(
+            "UPDATE sheet_writes SET status = ?, updated_at = ? WHERE status = ?",
+            (STATUS_PENDING, time.time(), STATUS_WRITING),
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_env(cls) -> "SheetWriteQueue":
+        return cls(_journal_path())
+
+    def enqueue(self, spreadsheet_id: str, sheet_name: str, row_values: List[Any], delegated_user: Optional[str] = None, ig_handle: str = "", tt_handle: str = "") -> int:
+        """Journal one row append and wake the worker. Returns the write id."""
+        now = time.time()
+        with self._db_lock:
+            cur = self._conn.execute(
+                "INSERT INTO sheet_writes (spreadsheet_id, sheet_name, delegated_user, row_json, ig_handle, tt_handle, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    spreadsheet_id,
+                    sheet_name,
+                    delegated_user or "",
+                    json.dumps(row_values),
+                    (ig_handle or "").strip().lstrip("@").lower(),
+                    (tt_handle or "").strip().lstrip("@").lower(),
+                    STATUS_PENDING,
+                    now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+            write_id = int(cur.lastrowid)
+        self.stats["enqueued"] += 1
+        _log("sheets.write_behind.enqueued", write_id=write_id, sheet_name=sheet_name)
+        self.start()
+        self._wake.set()
+        return write_id
+
+    def status(self, write_id: int) -> Optional[Dict[str, Any]]:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT id, sheet_name, status, attempts, row_added, error, created_at, updated_at FROM sheet_writes WHERE id = ?",
+                (write_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("write_id", "sheet_name", "status", "attempts", "row_added", "error", "created_at", "updated_at")
+        return dict(zip(keys, row))
+
+    def find_unwritten(self, spreadsheet_id: str, ig_handle: str, tt_handle: str) -> Optional[Dict[str, Any]]:
+        """A queued (not yet written) row for this creator, so dedupe sees it before the sheet does."""
+        ig_normalized = (ig_handle or "").strip().lstrip("@").lower()
+        tt_normalized = (tt_handle or "").strip().lstrip("@").lower()
+        if not ig_normalized and not tt_normalized:
+            return None
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT id, sheet_name FROM sheet_writes WHERE spreadsheet_id = ? AND status IN (?, ?) "
+                "AND ((? != '' AND ig_handle = ?) OR (? != '' AND tt_handle = ?)) ORDER BY id LIMIT 1",
+                (spreadsheet_id, STATUS_PENDING, STATUS_WRITING, ig_normalized, ig_normalized, tt_normalized, tt_normalized),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"write_id": row[0], "sheet_name": row[1]}
+
+    def start(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="sheet-write-behind", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(timeout=5)
+            self._wake.clear()
+            try:
+                while self.flush(delay_s=_FLUSH_DELAY_S):
+                    pass
+            except Exception as e:
+                _log("sheets.write_behind.worker_error", error=str(e))
+                time.sleep(1)
+
+    def flush(self, delay_s: float = 0.0) -> int:
+        """Write every due row, one batched call per (spreadsheet, delegated user). Returns rows claimed."""
+        now = time.time()
+        with self._db_lock:
+            first = self._conn.execute(
+                "SELECT created_at FROM sheet_writes WHERE status = ? AND next_attempt_at <= ? ORDER BY id LIMIT 1",
+                (STATUS_PENDING, now),
+            ).fetchone()
+        if first is None:
+            return 0
+        wait_s = first[0] + delay_s - now
+        if wait_s > 0:
+            time.sleep(wait_s)
+
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT id, spreadsheet_id, sheet_name, delegated_user, row_json, attempts FROM sheet_writes "
+                "WHERE status = ? AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (STATUS_PENDING, time.time(), _MAX_BATCH_ROWS),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE sheet_writes SET status = ?, updated_at = ? WHERE id = ?",
+                [(STATUS_WRITING, time.time(), r[0]) for r in rows],
+            )
+            self._conn.commit()
+
+        groups: Dict[tuple, List[tuple]] = {}
+        for r in rows:
+            groups.setdefault((r[1], r[3]), []).append(r)
+        for (spreadsheet_id, delegated_user), group in groups.items():
+            self._write_group(spreadsheet_id, delegated_user, group)
+        return len(rows)
+
+    def _write_group(self, spreadsheet_id: str, delegated_user: str, group: List[tuple]):
+        rows_by_sheet: Dict[str, List[List[Any]]] = {}
+        slots = []
+        for write_id, _, sheet_name, _, row_json, attempts in group:
+            sheet_rows = rows_by_sheet.setdefault(sheet_name, [])
+            slots.append((write_id, sheet_name, len(sheet_rows), attempts))
+            sheet_rows.append(json.loads(row_json))
+
+        t_write = time.perf_counter()
+        try:
+            result = _append_rows_to_sheets(spreadsheet_id, rows_by_sheet, delegated_user=delegated_user or None)
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+        self.stats["flushes"] += 1
+        _log(
+            "sheets.write_behind.flush",
+            spreadsheet_id=spreadsheet_id,
+            rows=len(group),
+            tabs=len(rows_by_sheet),
+            ok=result.get("ok"),
+            duration_ms=int((time.perf_counter() - t_write) * 1000),
+        )
+
+        now = time.time()
+        updates = []
+        for write_id, sheet_name, slot, attempts in slots:
+            sheet_result = (result.get("sheets") or {}).get(sheet_name)
+            if sheet_result is not None and sheet_result.get("ok"):
+                written = sheet_result.get("rows") or []
+                row_added = written[slot] if slot < len(written) else None
+                updates.append((STATUS_DONE, attempts + 1, 0, row_added, None, now, write_id))
+                self.stats["rows_written"] += 1
+                continue
+            error = (sheet_result or {}).get("error") or result.get("error") or "Sheet write failed"
+            if attempts + 1 >= _MAX_ATTEMPTS:
+                updates.append((STATUS_FAILED, attempts + 1, 0, None, error, now, write_id))
+                self.stats["failed"] += 1
+                _log("sheets.write_behind.failed", write_id=write_id, error=error)
+            else:
+                backoff_s = 2 ** (attempts + 1)
+                updates.append((STATUS_PENDING, attempts + 1, now + backoff_s, None, error, now, write_id))
+                self.stats["retries"] += 1
+        with self._db_lock:
+            self._conn.executemany(
+                "UPDATE sheet_writes SET status = ?, attempts = ?, next_attempt_at = ?, row_added = ?, error = ?, updated_at = ? WHERE id = ?",
+                updates,
+            )
+            self._conn.commit()
+
+    def counts(self) -> Dict[str, int]:
+        with self._db_lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM sheet_writes GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+
+_QUEUE: Optional[SheetWriteQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_sheet_write_queue() -> Optional[SheetWriteQueue]:
+    """Process-wide queue built from SHEETS_WRITE_QUEUE_PATH (None if it can't be opened)."""
+    global _QUEUE
+    if _QUEUE is None:
+        with _QUEUE_LOCK:
+            if _QUEUE is None:
+                try:
+                    _QUEUE = SheetWriteQueue.from_env()
+                except Exception as e:
+                    _log("sheets.write_behind.open_error", error=str(e))
+                    return None
+    return _QUEUE
+
+
+def existing_sheet_write_queue() -> Optional[SheetWriteQueue]:
+    """The queue if this process opened it or an earlier one left a journal; never creates one.
+
+    Dedupe consults this whatever the current request's mode, since rows queued
+    by write-behind requests are not in the sheet until the worker drains them.
+    """
+    if _QUEUE is not None:
+        return _QUEUE
+    if not os.path.exists(_journal_path()):
+        return None
+    return get_sheet_write_queue()
+
+
+def sheet_write_queue_stats() -> Dict[str, Any]:
+    queue = _QUEUE
+    if queue is None:
+        return {}
+    stats: Dict[str, Any] = dict(queue.stats)
+    try:
+        stats["by_status"] = queue.counts()
+    except Exception as e:
+        stats["error"] = str(e)
+    return stats
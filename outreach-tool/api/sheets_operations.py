@@ -1,12 +1,16 @@
 """Google Sheets operations for the outreach tool."""
 
+import os
 import re
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
 from utils import _log
 from google_services import _sheets_client
+from metrics import span
 
 
 # Cache for sheet IDs to avoid repeated API calls
@@ -21,6 +25,18 @@ _SHEET_NAME_ALIASES = {
     "X Creators": ["X Creators", "X Creator", "Twitter Creators", "Twitter Creator"],
 }
 
+# Tabs checked for an existing creator, in the order a match is reported from
+_ALL_CREATOR_SHEETS = [
+    "Macros", "Micros", "Submicros", "Ambassadors",
+    "Theme Pages", "Raw Leads", "Peptide Vendors", "X Creators", "YT Creators", "AI Influencers",
+]
+
+_HANDLE_CELL_RE = re.compile(r'@([A-Za-z0-9_.]+)')
+
+# How long a creator handle index is trusted before it is re-read (picks up edits
+# made outside this service, e.g. by hand in the sheet)
+_HANDLE_INDEX_TTL_S = float(os.environ.get("CREATOR_INDEX_TTL_SECONDS", "120"))
+
 
 def _hyperlink_formula(url: str, label: str) -> str:
     """Create a Google Sheets HYPERLINK formula."""
@@ -110,9 +126,201 @@ def _resolve_sheet_name(service: Any, spreadsheet_id: str, requested_sheet_name:
     return requested_sheet_name
 
 
+class _CreatorHandleIndex:
+    """IG/TT handle -> rows for every creator tab of one spreadsheet.
+
+    Built from one values.batchGet of A:K across all tabs and kept for
+    _HANDLE_INDEX_TTL_S. Rows are parsed exactly like the old per-tab scan
+    (column B = IG, column C = TT, first "@handle" in the cell, rows with fewer
+    than 3 cells ignored), and this service's own appends/updates are applied
+    in place so a creator added a moment ago is found without a re-read.
+    """
+
+    def __init__(self, spreadsheet_id: str):
+        self.spreadsheet_id = spreadsheet_id
+        self.lock = threading.Lock()
+        self.built_at: Optional[float] = None
+        self.rows: Dict[Tuple[str, int], List[Any]] = {}
+        self.ig: Dict[str, List[Tuple[str, int]]] = {}
+        self.tt: Dict[str, List[Tuple[str, int]]] = {}
+
+    def fresh(self) -> bool:
+        return self.built_at is not None and time.time() - self.built_at < _HANDLE_INDEX_TTL_S
+
+    def build(self, service: Any):
+        titles = _get_sheet_titles(service, self.spreadsheet_id)
+        tabs: List[Tuple[str, str]] = []
+        for sheet_name in _ALL_CREATOR_SHEETS:
+            resolved = _resolve_sheet_name(service, self.spreadsheet_id, sheet_name)
+            if resolved in titles:
+                tabs.append((sheet_name, resolved))
+        value_ranges: List[Dict[str, Any]] = []
+        if tabs:
+            result = service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=[f"{resolved}!A:K" for _, resolved in tabs],
+            ).execute()
+            value_ranges = result.get("valueRanges", [])
+        self.rows, self.ig, self.tt = {}, {}, {}
+        for (sheet_name, _), value_range in zip(tabs, value_ranges):
+            # Skip header row (index 0); data starts at row 2
+            for idx, row in enumerate(value_range.get("values", [])[1:], start=2):
+                self.record_row(sheet_name, idx, row)
+        self.built_at = time.time()
+        _log(
+            "sheets.handle_index.built",
+            spreadsheet_id=self.spreadsheet_id,
+            tabs=len(tabs),
+            rows=len(self.rows),
+        )
+
+    @staticmethod
+    def _handles(row: List[Any]) -> Tuple[str, str]:
+        if len(row) < 3:
+            return "", ""
+        ig_match = _HANDLE_CELL_RE.search(str(row[1] or ""))
+        tt_match = _HANDLE_CELL_RE.search(str(row[2] or ""))
+        return (
+            (ig_match.group(1) if ig_match else "").strip().lower(),
+            (tt_match.group(1) if tt_match else "").strip().lower(),
+        )
+
+    @staticmethod
+    def _rank(key: Tuple[str, int]) -> Tuple[int, int]:
+        sheet_name, row_index = key
+        tab_rank = _ALL_CREATOR_SHEETS.index(sheet_name) if sheet_name in _ALL_CREATOR_SHEETS else len(_ALL_CREATOR_SHEETS)
+        return tab_rank, row_index
+
+    def _unlink(self, key: Tuple[str, int]):
+        old = self.rows.get(key)
+        if old is None:
+            return
+        for handle, mapping in zip(self._handles(old), (self.ig, self.tt)):
+            keys = mapping.get(handle)
+            if handle and keys and key in keys:
+                keys.remove(key)
+                if not keys:
+                    del mapping[handle]
+
+    def record_row(self, sheet_name: str, row_index: int, row: List[Any]):
+        """Set the A:K values of a row (replacing what the index knew about it)."""
+        key = (sheet_name, row_index)
+        self._unlink(key)
+        self.rows[key] = list(row[:11])
+        for handle, mapping in zip(self._handles(row), (self.ig, self.tt)):
+            if handle:
+                keys = mapping.setdefault(handle, [])
+                keys.append(key)
+                keys.sort(key=self._rank)
+
+    def update_cells(self, sheet_name: str, row_index: int, cells: Dict[int, Any]):
+        """Merge individual cell writes (0-based column -> value) into a row; columns past K are ignored."""
+        cells = {col: value for col, value in cells.items() if col <= 10}
+        if not cells:
+            return
+        row = list(self.rows.get((sheet_name, row_index), []))
+        for col, value in cells.items():
+            if len(row) <= col:
+                row.extend([""] * (col + 1 - len(row)))
+            row[col] = value
+        self.record_row(sheet_name, row_index, row)
+
+    def lookup(self, ig_handle: str, tt_handle: str, sheet_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """First matching row (in tab order, then row order), optionally within one tab."""
+        ig_normalized = (ig_handle or "").strip().lower().lstrip("@")
+        tt_normalized = (tt_handle or "").strip().lower().lstrip("@")
+        candidates: List[Tuple[str, int]] = []
+        if ig_normalized:
+            candidates.extend(self.ig.get(ig_normalized, []))
+        if tt_normalized:
+            candidates.extend(self.tt.get(tt_normalized, []))
+        if sheet_name is not None:
+            candidates = [key for key in candidates if key[0] == sheet_name]
+        if not candidates:
+            return None
+        found_sheet, row_index = min(candidates, key=self._rank)
+        row = self.rows[(found_sheet, row_index)]
+        status = row[6] if len(row) > 6 else ""  # Status is column G (index 6)
+        sent_from_email = row[7] if len(row) > 7 else ""  # Sent from Email is column H (index 7)
+        initial_outreach_date = row[10] if len(row) > 10 else ""  # Initial Outreach Date is column K (index 10)
+        return {
+            "exists": True,
+            "sheet_name": found_sheet,
+            "row_index": row_index,
+            "email_message_id": None,  # No longer tracking message ID
+            "status": status or None,
+            "initial_outreach_date": initial_outreach_date or None,
+            "sent_from_email": sent_from_email or None,
+        }
+
+
+_HANDLE_INDEXES: Dict[str, _CreatorHandleIndex] = {}
+_HANDLE_INDEXES_LOCK = threading.Lock()
+
+
+def _get_handle_index(service: Any, spreadsheet_id: str) -> _CreatorHandleIndex:
+    """The spreadsheet's handle index, (re)built if missing or older than the TTL."""
+    with _HANDLE_INDEXES_LOCK:
+        index = _HANDLE_INDEXES.get(spreadsheet_id)
+        if index is None:
+            index = _HANDLE_INDEXES[spreadsheet_id] = _CreatorHandleIndex(spreadsheet_id)
+    if not index.fresh():
+        # One build per spreadsheet at a time; concurrent callers wait and reuse it
+        with index.lock:
+            if not index.fresh():
+                index.build(service)
+    return index
+
+
+def _prewarm_handle_index(spreadsheet_id: str, delegated_user: Optional[str] = None) -> Dict[str, Any]:
+    """Build the spreadsheet's handle index ahead of the first duplicate check.
+
+    Returns:
+        {"ok": bool, "rows": int} or {"ok": False, "error": str}
+    """
+    service = _sheets_client(delegated_user=delegated_user)
+    if service is None:
+        return {"ok": False, "error": "Sheets client not available"}
+    try:
+        index = _get_handle_index(service, spreadsheet_id)
+        return {"ok": True, "rows": len(index.rows)}
+    except Exception as e:
+        _log("sheets.handle_index.prewarm_error", spreadsheet_id=spreadsheet_id, error=str(e))
+        return {"ok": False, "error": str(e)}
+
+
+def _note_row_written(spreadsheet_id: str, sheet_name: str, row_index: int, row_values: Optional[List[Any]] = None, cells: Optional[Dict[int, Any]] = None):
+    """Apply this service's own write to the handle index, if one exists.
+
+    An index still being built is not skipped: the build's batchGet may have
+    run before this write landed, so waiting on the lock and applying the write
+    afterwards keeps the new row visible to dedupe.
+    """
+    index = _HANDLE_INDEXES.get(spreadsheet_id)
+    if index is None:
+        return
+    with index.lock:
+        if row_values is not None:
+            index.record_row(sheet_name, row_index, row_values)
+        if cells:
+            index.update_cells(sheet_name, row_index, cells)
+
+
+def _invalidate_handle_index(spreadsheet_id: Optional[str] = None):
+    """Force the next duplicate check to re-read the sheet (all spreadsheets if none given)."""
+    with _HANDLE_INDEXES_LOCK:
+        if spreadsheet_id is None:
+            _HANDLE_INDEXES.clear()
+        else:
+            _HANDLE_INDEXES.pop(spreadsheet_id, None)
+
+
+@span("dedupe")
 def _check_creator_exists(spreadsheet_id: str, sheet_name: str, ig_handle: str, tt_handle: str, delegated_user: Optional[str] = None) -> Dict[str, Any]:
     """Check if a creator already exists in the spreadsheet by IG or TT handle.
     
+    Answered from the spreadsheet's handle index (see _CreatorHandleIndex).
+    
     Returns:
         {
             "exists": bool,
@@ -129,54 +337,14 @@ def _check_creator_exists(spreadsheet_id: str, sheet_name: str, ig_handle: str,
         return {"exists": False, "error": "Sheets client not configured"}
     
     try:
-        resolved_sheet_name = _resolve_sheet_name(service, spreadsheet_id, sheet_name)
-        # Read all data from the sheet (columns A-K)
-        _log("sheets.check_exists.request", spreadsheet_id=spreadsheet_id, sheet_name=resolved_sheet_name, ig=ig_handle, tt=tt_handle)
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"{resolved_sheet_name}!A:K"
-        ).execute()
-        
-        values = result.get("values", [])
-        if not values:
-            return {"exists": False}
-        
-        # Normalize handles for comparison
-        ig_normalized = (ig_handle or "").strip().lower().lstrip("@")
-        tt_normalized = (tt_handle or "").strip().lower().lstrip("@")
-        
-        # Skip header row (index 0), start from row 1
-        for idx, row in enumerate(values[1:], start=2):  # start=2 because row 1 is header, data starts at row 2
-            if len(row) < 3:
-                continue
-            
-            # Column B (index 1) is Instagram @, Column C (index 2) is TikTok @
-            ig_cell = row[1] if len(row) > 1 else ""
-            tt_cell = row[2] if len(row) > 2 else ""
-            
-            # Extract handle from HYPERLINK formula like =HYPERLINK("url", "@handle")
-            ig_match = re.search(r'@([A-Za-z0-9_.]+)', ig_cell)
-            tt_match = re.search(r'@([A-Za-z0-9_.]+)', tt_cell)
-            
-            existing_ig = (ig_match.group(1) if ig_match else "").strip().lower()
-            existing_tt = (tt_match.group(1) if tt_match else "").strip().lower()
-            
-            # Check if either handle matches
-            if (ig_normalized and existing_ig == ig_normalized) or (tt_normalized and existing_tt == tt_normalized):
-                status = row[6] if len(row) > 6 else ""  # Status is column G (index 6)
-                message_id = ""  # No longer tracking message ID
-                sent_from_email = row[7] if len(row) > 7 else ""  # Sent from Email is column H (index 7)
-                initial_outreach_date = row[10] if len(row) > 10 else ""  # Initial Outreach Date is column K (index 10)
-                
-                _log("sheets.check_exists.found", row_index=idx, status=status, sent_from_email=sent_from_email)
-                return {
-                    "exists": True,
-                    "row_index": idx,
-                    "email_message_id": message_id or None,
-                    "status": status or None,
-                    "initial_outreach_date": initial_outreach_date or None,
-                    "sent_from_email": sent_from_email or None,
-                }
+        _log("sheets.check_exists.request", spreadsheet_id=spreadsheet_id, sheet_name=sheet_name, ig=ig_handle, tt=tt_handle)
+        index = _get_handle_index(service, spreadsheet_id)
+        with index.lock:
+            found = index.lookup(ig_handle, tt_handle, sheet_name=sheet_name)
+        if found:
+            found.pop("sheet_name")
+            _log("sheets.check_exists.found", row_index=found["row_index"], status=found["status"], sent_from_email=found["sent_from_email"])
+            return found
         
         _log("sheets.check_exists.not_found")
         return {"exists": False}
@@ -186,9 +354,12 @@ def _check_creator_exists(spreadsheet_id: str, sheet_name: str, ig_handle: str,
         return {"exists": False, "error": str(e)}
 
 
+@span("dedupe")
 def _check_creator_exists_across_all_sheets(spreadsheet_id: str, ig_handle: str, tt_handle: str, delegated_user: Optional[str] = None) -> Dict[str, Any]:
     """Check if a creator already exists in ANY of the subtabs.
     
+    One handle index lookup (see _CreatorHandleIndex) instead of reading every tab.
+    
     Returns:
         {
             "exists": bool,
@@ -201,23 +372,51 @@ def _check_creator_exists_across_all_sheets(spreadsheet_id: str, ig_handle: str,
     if not spreadsheet_id:
         return {"exists": False, "error": "No spreadsheet ID provided"}
     
-    # Check all subtabs
-    all_sheets = [
-        "Macros", "Micros", "Submicros", "Ambassadors",
-        "Theme Pages", "Raw Leads", "Peptide Vendors", "X Creators", "YT Creators", "AI Influencers",
-    ]
+    service = _sheets_client(delegated_user=delegated_user)
+    if not service:
+        _log("sheets.check_all_sheets.no_client")
+        return {"exists": False}
     
-    for sheet_name in all_sheets:
-        result = _check_creator_exists(spreadsheet_id, sheet_name, ig_handle, tt_handle, delegated_user)
-        if result.get("exists", False):
-            result["sheet_name"] = sheet_name
-            _log("sheets.check_all_sheets.found", sheet_name=sheet_name, status=result.get("status"))
-            return result
+    try:
+        index = _get_handle_index(service, spreadsheet_id)
+        with index.lock:
+            found = index.lookup(ig_handle, tt_handle)
+    except Exception as e:
+        _log("sheets.check_all_sheets.error", error=str(e))
+        return {"exists": False}
+    if found:
+        _log("sheets.check_all_sheets.found", sheet_name=found["sheet_name"], status=found["status"])
+        return found
     
     _log("sheets.check_all_sheets.not_found")
     return {"exists": False}
 
 
+@span("dedupe")
+def _check_creators_exist_across_all_sheets(spreadsheet_id: str, handles: List[Tuple[str, str]], delegated_user: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Batch form of _check_creator_exists_across_all_sheets: one index snapshot for many (ig, tt) pairs.
+
+    Returns one result per pair, in order, shaped like the single-creator check.
+    """
+    if not spreadsheet_id or not handles:
+        return [{"exists": False} for _ in handles]
+
+    service = _sheets_client(delegated_user=delegated_user)
+    if not service:
+        _log("sheets.check_all_sheets_batch.no_client")
+        return [{"exists": False} for _ in handles]
+
+    try:
+        index = _get_handle_index(service, spreadsheet_id)
+        with index.lock:
+            found = [index.lookup(ig, tt) if (ig or tt) else None for ig, tt in handles]
+    except Exception as e:
+        _log("sheets.check_all_sheets_batch.error", error=str(e))
+        return [{"exists": False} for _ in handles]
+    _log("sheets.check_all_sheets_batch.done", checked=len(handles), found=sum(1 for f in found if f))
+    return [f or {"exists": False} for f in found]
+
+
 def _check_creator_exists_in_raw_leads(spreadsheet_id: str, ig_handle: str, tt_handle: str, delegated_user: Optional[str] = None) -> Dict[str, Any]:
     """Fast duplicate check ONLY in Raw Leads sheet for performance.
     
@@ -284,12 +483,136 @@ def _update_sheet_row(spreadsheet_id: str, sheet_name: str, row_index: int, row_
             body=body,
         ).execute()
         _log("sheets.update.success", updated_cells=resp.get("updatedCells", 0))
+        _note_row_written(spreadsheet_id, sheet_name, row_index, row_values=row_values)
         return {"ok": True, "result": resp}
     except Exception as e:
         _log("sheets.update.error", error=str(e))
         return {"ok": False, "error": str(e)}
 
 
+class _RawLeadsColumnIndex:
+    """Header -> column index and per-column URL sets for one spreadsheet's Raw Leads matrix.
+
+    The header row is read lazily and trusted for _HANDLE_INDEX_TTL_S; each
+    daily URL column is read the first time it is appended to. Rows are placed
+    by values.append, not tracked here, so the common append is a single write
+    and the duplicate check is a dict lookup.
+    """
+
+    def __init__(self, spreadsheet_id: str):
+        self.spreadsheet_id = spreadsheet_id
+        self.lock = threading.Lock()
+        self.loaded_at: Optional[float] = None
+        self.headers: List[str] = []
+        # column index -> {url: row}; row is None while our append is in flight
+        self.columns: Dict[int, Dict[str, Optional[int]]] = {}
+
+    def fresh(self) -> bool:
+        return self.loaded_at is not None and time.time() - self.loaded_at < _HANDLE_INDEX_TTL_S
+
+    def ensure_headers(self, service: Any):
+        if self.fresh():
+            return
+        result = service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range="Raw Leads!1:1"
+        ).execute()
+        self.headers = list(result.get("values", [[]])[0]) if result.get("values") else []
+        self.columns = {}
+        self.loaded_at = time.time()
+
+    def column(self, service: Any, col_index: int) -> Dict[str, Optional[int]]:
+        cached = self.columns.get(col_index)
+        if cached is not None:
+            return cached
+        col_letter = col_num_to_letter(col_index)
+        result = service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"Raw Leads!{col_letter}:{col_letter}"
+        ).execute()
+        column_values = result.get("values", [])
+        urls: Dict[str, Optional[int]] = {}
+        for idx, row in enumerate(column_values[1:], start=2):
+            cell_value = (row[0] if row else "").strip()
+            if cell_value and cell_value not in urls:
+                urls[cell_value] = idx
+        self.columns[col_index] = urls
+        return urls
+
+    def invalidate(self):
+        self.loaded_at = None
+        self.columns = {}
+
+
+def _updated_row(append_response: Dict[str, Any]) -> int:
+    """First row number of a values.append response's updatedRange ("'Raw Leads'!B7:C7" -> 7)."""
+    updated_range = append_response["updates"]["updatedRange"]
+    match = re.search(r"![A-Z]+(\d+)", updated_range)
+    if not match:
+        raise ValueError(f"Unexpected updatedRange: {updated_range}")
+    return int(match.group(1))
+
+
+_RAW_LEADS_INDEXES: Dict[str, _RawLeadsColumnIndex] = {}
+_RAW_LEADS_INDEXES_LOCK = threading.Lock()
+
+
+def _get_raw_leads_index(spreadsheet_id: str) -> _RawLeadsColumnIndex:
+    with _RAW_LEADS_INDEXES_LOCK:
+        index = _RAW_LEADS_INDEXES.get(spreadsheet_id)
+        if index is None:
+            index = _RAW_LEADS_INDEXES[spreadsheet_id] = _RawLeadsColumnIndex(spreadsheet_id)
+        return index
+
+
+def _add_raw_leads_headers(service: Any, spreadsheet_id: str, pending_writes: List[Dict[str, Any]]):
+    """Write new daily header cells and bold them."""
+    service.spreadsheets().values().batchUpdate(
+        spreadsheetId=spreadsheet_id,
+        body={"valueInputOption": "USER_ENTERED", "data": pending_writes},
+    ).execute()
+    sheet_id = _get_sheet_id(service, spreadsheet_id, "Raw Leads")
+    if sheet_id is None:
+        return
+    header_requests: List[Dict[str, Any]] = []
+    for write in pending_writes:
+        a1 = write.get("range", "")
+        m = re.search(r"Raw Leads!([A-Z]+)1", a1)
+        if not m:
+            continue
+        col_letters = m.group(1)
+        col_index = 0
+        for ch in col_letters:
+            col_index = col_index * 26 + (ord(ch) - ord("A") + 1)
+        col_index -= 1
+        header_requests.append(
+            {
+                "repeatCell": {
+                    "range": {
+                        "sheetId": sheet_id,
+                        "startRowIndex": 0,
+                        "endRowIndex": 1,
+                        "startColumnIndex": col_index,
+                        "endColumnIndex": col_index + 1,
+                    },
+                    "cell": {
+                        "userEnteredFormat": {
+                            "textFormat": {
+                                "bold": True
+                            }
+                        }
+                    },
+                    "fields": "userEnteredFormat.textFormat.bold",
+                }
+            }
+        )
+    if header_requests:
+        service.spreadsheets().batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={"requests": header_requests},
+        ).execute()
+
+
 def _append_url_to_raw_leads_column(
     spreadsheet_id: str,
     url: str,
@@ -301,6 +624,9 @@ def _append_url_to_raw_leads_column(
 
     URL header format remains the same as before: "Feb 27 (Abhay)".
     Creator tier is stored in a paired column: "Feb 27 (Abhay) Tier".
+    Headers and URL sets come from _RawLeadsColumnIndex. The pair is written
+    with values.append over the two columns, so Sheets picks the row and
+    updatedRange reports it.
     """
     service = _sheets_client(delegated_user=delegated_user)
     if not service:
@@ -313,116 +639,102 @@ def _append_url_to_raw_leads_column(
     url_header = f"{date_str} ({first_name})"
     tier_header = f"{url_header} Tier"
 
+    index = _get_raw_leads_index(spreadsheet_id)
     try:
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range="Raw Leads!1:1"
-        ).execute()
-        headers = result.get("values", [[]])[0] if result.get("values") else []
-
-        url_col_index: int | None = None
-        tier_col_index: int | None = None
-        for idx, header in enumerate(headers):
-            if header == url_header:
-                url_col_index = idx
-            if header == tier_header:
-                tier_col_index = idx
-
-        pending_writes: List[Dict[str, Any]] = []
-        if url_col_index is None:
-            url_col_index = len(headers)
-            pending_writes.append(
-                {
-                    "range": f"Raw Leads!{col_num_to_letter(url_col_index)}1",
-                    "values": [[url_header]],
-                }
-            )
-            headers.append(url_header)
-
-        if tier_col_index is None:
-            tier_col_index = len(headers)
-            pending_writes.append(
-                {
-                    "range": f"Raw Leads!{col_num_to_letter(tier_col_index)}1",
-                    "values": [[tier_header]],
-                }
-            )
-            headers.append(tier_header)
-
-        if pending_writes:
-            service.spreadsheets().values().batchUpdate(
-                spreadsheetId=spreadsheet_id,
-                body={"valueInputOption": "USER_ENTERED", "data": pending_writes},
-            ).execute()
-            sheet_id = _get_sheet_id(service, spreadsheet_id, "Raw Leads")
-            if sheet_id is not None:
-                header_requests: List[Dict[str, Any]] = []
-                for write in pending_writes:
-                    a1 = write.get("range", "")
-                    m = re.search(r"Raw Leads!([A-Z]+)1", a1)
-                    if not m:
-                        continue
-                    col_letters = m.group(1)
-                    col_index = 0
-                    for ch in col_letters:
-                        col_index = col_index * 26 + (ord(ch) - ord("A") + 1)
-                    col_index -= 1
-                    header_requests.append(
-                        {
-                            "repeatCell": {
-                                "range": {
-                                    "sheetId": sheet_id,
-                                    "startRowIndex": 0,
-                                    "endRowIndex": 1,
-                                    "startColumnIndex": col_index,
-                                    "endColumnIndex": col_index + 1,
-                                },
-                                "cell": {
-                                    "userEnteredFormat": {
-                                        "textFormat": {
-                                            "bold": True
-                                        }
-                                    }
-                                },
-                                "fields": "userEnteredFormat.textFormat.bold",
-                            }
-                        }
-                    )
-                if header_requests:
-                    service.spreadsheets().batchUpdate(
-                        spreadsheetId=spreadsheet_id,
-                        body={"requests": header_requests},
-                    ).execute()
+        with index.lock:
+            index.ensure_headers(service)
+            headers = index.headers
+
+            url_col_index: int | None = None
+            tier_col_index: int | None = None
+            for idx, header in enumerate(headers):
+                if header == url_header:
+                    url_col_index = idx
+                if header == tier_header:
+                    tier_col_index = idx
+
+            pending_writes: List[Dict[str, Any]] = []
+            new_url_column = url_col_index is None
+            if url_col_index is None:
+                url_col_index = len(headers)
+                pending_writes.append(
+                    {
+                        "range": f"Raw Leads!{col_num_to_letter(url_col_index)}1",
+                        "values": [[url_header]],
+                    }
+                )
 
-        url_col_letter = col_num_to_letter(url_col_index)
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"Raw Leads!{url_col_letter}:{url_col_letter}"
-        ).execute()
+            if tier_col_index is None:
+                tier_col_index = len(headers) + len(pending_writes)
+                pending_writes.append(
+                    {
+                        "range": f"Raw Leads!{col_num_to_letter(tier_col_index)}1",
+                        "values": [[tier_header]],
+                    }
+                )
 
-        column_values = result.get("values", [])
-        next_row = len(column_values) + 1
-        for idx, row in enumerate(column_values[1:], start=2):
-            cell_value = (row[0] if row else "").strip()
-            if cell_value == url:
-                _log("rawleads.matrix.duplicate_found", url=url, row=idx, header=url_header)
+            if pending_writes:
+                try:
+                    _add_raw_leads_headers(service, spreadsheet_id, pending_writes)
+                except Exception:
+                    index.invalidate()
+                    raise
+                headers.extend(write["values"][0][0] for write in pending_writes)
+                if new_url_column:
+                    # A fresh column holds only its header
+                    index.columns[url_col_index] = {}
+
+            urls = index.column(service, url_col_index)
+            if url in urls:
+                duplicate_row = urls[url]
+                _log("rawleads.matrix.duplicate_found", url=url, row=duplicate_row, header=url_header)
+                where = f" at row {duplicate_row}" if duplicate_row is not None else ""
                 return {
                     "ok": False,
                     "error": "Duplicate URL",
-                    "message": f"URL already exists in column '{url_header}' at row {idx}",
-                    "duplicate_row": idx
+                    "message": f"URL already exists in column '{url_header}'{where}",
+                    "duplicate_row": duplicate_row
                 }
+            # Claim the URL so a concurrent append of the same one is rejected
+            urls[url] = None
 
-        url_cell = f"Raw Leads!{col_num_to_letter(url_col_index)}{next_row}"
-        tier_cell = f"Raw Leads!{col_num_to_letter(tier_col_index)}{next_row}"
-        writes = [
-            {"range": url_cell, "values": [[url]]},
-            {"range": tier_cell, "values": [[creator_tier]]},
-        ]
-        service.spreadsheets().values().batchUpdate(
-            spreadsheetId=spreadsheet_id,
-            body={"valueInputOption": "USER_ENTERED", "data": writes},
-        ).execute()
+        url_col = col_num_to_letter(url_col_index)
+        tier_col = col_num_to_letter(tier_col_index)
+        try:
+            if tier_col_index == url_col_index + 1:
+                resp = service.spreadsheets().values().append(
+                    spreadsheetId=spreadsheet_id,
+                    range=f"Raw Leads!{url_col}:{tier_col}",
+                    valueInputOption="USER_ENTERED",
+                    insertDataOption="OVERWRITE",
+                    body={"values": [[url, creator_tier]]},
+                ).execute()
+                next_row = _updated_row(resp)
+            else:
+                # Older days can have their tier column away from the URL column
+                resp = service.spreadsheets().values().append(
+                    spreadsheetId=spreadsheet_id,
+                    range=f"Raw Leads!{url_col}:{url_col}",
+                    valueInputOption="USER_ENTERED",
+                    insertDataOption="OVERWRITE",
+                    body={"values": [[url]]},
+                ).execute()
+                next_row = _updated_row(resp)
+                service.spreadsheets().values().update(
+                    spreadsheetId=spreadsheet_id,
+                    range=f"Raw Leads!{tier_col}{next_row}",
+                    valueInputOption="USER_ENTERED",
+                    body={"values": [[creator_tier]]},
+                ).execute()
+        except Exception:
+            # The append may or may not have landed; re-read next time
+            with index.lock:
+                index.invalidate()
+            raise
+        with index.lock:
+            if index.columns.get(url_col_index) is urls:
+                urls[url] = next_row
+        _note_row_written(spreadsheet_id, "Raw Leads", next_row, cells={url_col_index: url, tier_col_index: creator_tier})
 
         _log(
             "rawleads.matrix.success",
@@ -538,6 +850,7 @@ def _append_url_to_subsheet(
             spreadsheetId=spreadsheet_id,
             body={"valueInputOption": "USER_ENTERED", "data": writes},
         ).execute()
+        _note_row_written(spreadsheet_id, sheet_name, next_row, cells={0: date_str, 1: url, 2: first_name})
 
         _log(
             "subsheet.append.success",
@@ -632,6 +945,7 @@ def _append_peptide_vendor_row(
             valueInputOption="USER_ENTERED",
             body={"values": row_values},
         ).execute()
+        _note_row_written(spreadsheet_id, sheet_name, next_row, row_values=row_values[0])
 
         _log(
             "peptide_vendor.append.success",
@@ -726,6 +1040,7 @@ def _append_x_creator_row(
             valueInputOption="USER_ENTERED",
             body={"values": row_values},
         ).execute()
+        _note_row_written(spreadsheet_id, sheet_name, next_row, row_values=row_values[0])
 
         _log("x_creator.append.success", sheet_name=resolved_sheet_name, row=next_row, handle=clean_twitter)
         return {
@@ -740,6 +1055,41 @@ def _append_x_creator_row(
         return {"ok": False, "error": str(e)}
 
 
+# Status (column G) dropdown applied to every appended creator row
+_STATUS_VALIDATION_VALUES = [
+    "Sent",
+    "Followup Sent",
+    "Second Followup Sent",
+    "Third Followup Sent",
+    "Closed",
+    "Not Interested",
+    "No Email",
+]
+
+
+def _status_validation_request(sheet_id: int, start_row_index: int, end_row_index: int) -> Dict[str, Any]:
+    """setDataValidation request for the Status column over [start_row_index, end_row_index) (0-based)."""
+    return {
+        "setDataValidation": {
+            "range": {
+                "sheetId": sheet_id,
+                "startRowIndex": start_row_index,
+                "endRowIndex": end_row_index,
+                "startColumnIndex": 6,
+                "endColumnIndex": 7,
+            },
+            "rule": {
+                "condition": {
+                    "type": "ONE_OF_LIST",
+                    "values": [{"userEnteredValue": v} for v in _STATUS_VALIDATION_VALUES],
+                },
+                "strict": True,
+                "showCustomUi": True,
+            },
+        }
+    }
+
+
 def _append_to_sheet(spreadsheet_id: str, sheet_name: str, row_values: List[Any], delegated_user: Optional[str] = None) -> Dict[str, Any]:
     """Append a new row to a Google Sheet with data validation for Status column."""
     service = _sheets_client(delegated_user=delegated_user)
@@ -775,6 +1125,7 @@ def _append_to_sheet(spreadsheet_id: str, sheet_name: str, row_values: List[Any]
             if m:
                 appended_row_one_based = int(m.group(1))
                 row_index_zero_based = appended_row_one_based - 1
+                _note_row_written(spreadsheet_id, sheet_name, appended_row_one_based, row_values=row_values)
 
                 # Lookup sheetId (cached)
                 cache_key = f"{spreadsheet_id}:{resolved_sheet_name}"
@@ -791,38 +1142,7 @@ def _append_to_sheet(spreadsheet_id: str, sheet_name: str, row_values: List[Any]
                             _SHEET_ID_CACHE[cache_key] = sheet_id
                             break
                 if sheet_id is not None:
-                    # Build setDataValidation request for G column (index 6) - Status
-                    request_body = {
-                        "requests": [
-                            {
-                                "setDataValidation": {
-                                    "range": {
-                                        "sheetId": sheet_id,
-                                        "startRowIndex": row_index_zero_based,
-                                        "endRowIndex": row_index_zero_based + 1,
-                                        "startColumnIndex": 6,
-                                        "endColumnIndex": 7,
-                                    },
-                                    "rule": {
-                                        "condition": {
-                                            "type": "ONE_OF_LIST",
-                                        "values": [
-                                            {"userEnteredValue": "Sent"},
-                                            {"userEnteredValue": "Followup Sent"},
-                                            {"userEnteredValue": "Second Followup Sent"},
-                                            {"userEnteredValue": "Third Followup Sent"},
-                                            {"userEnteredValue": "Closed"},
-                                            {"userEnteredValue": "Not Interested"},
-                                            {"userEnteredValue": "No Email"},
-                                        ],
-                                        },
-                                        "strict": True,
-                                        "showCustomUi": True,
-                                    },
-                                }
-                            }
-                        ]
-                    }
+                    request_body = {"requests": [_status_validation_request(sheet_id, row_index_zero_based, row_index_zero_based + 1)]}
                     _log("sheets.dv.set.request", sheetId=sheet_id, row=row_index_zero_based)
                     dv_resp = service.spreadsheets().batchUpdate(
                         spreadsheetId=spreadsheet_id,
@@ -838,6 +1158,70 @@ def _append_to_sheet(spreadsheet_id: str, sheet_name: str, row_values: List[Any]
         return {"ok": False, "error": str(e)}
 
 
+def _append_rows_to_sheets(spreadsheet_id: str, rows_by_sheet: Dict[str, List[List[Any]]], delegated_user: Optional[str] = None) -> Dict[str, Any]:
+    """Append many rows at once: one values.append per tab plus a single batchUpdate
+    setting the Status dropdown on every appended range (see _append_to_sheet).
+
+    Returns:
+        {"ok": bool, "sheets": {sheet_name: {"ok": bool, "rows": [1-based row numbers], "error": str}}}
+    """
+    service = _sheets_client(delegated_user=delegated_user)
+    if not service:
+        _log("sheets.append_batch.no_client")
+        return {"ok": False, "error": "Sheets client not configured"}
+
+    results: Dict[str, Dict[str, Any]] = {}
+    dv_requests: List[Dict[str, Any]] = []
+    for sheet_name, rows in rows_by_sheet.items():
+        if not rows:
+            continue
+        try:
+            resolved_sheet_name = _resolve_sheet_name(service, spreadsheet_id, sheet_name)
+            _log("sheets.append_batch.request", sheet_name=resolved_sheet_name, rows=len(rows))
+            resp = service.spreadsheets().values().append(
+                spreadsheetId=spreadsheet_id,
+                range=f"{resolved_sheet_name}!A:K",
+                valueInputOption="USER_ENTERED",
+                insertDataOption="INSERT_ROWS",
+                body={"values": rows},
+            ).execute()
+        except Exception as e:
+            _log("sheets.append_batch.error", sheet_name=sheet_name, error=str(e))
+            results[sheet_name] = {"ok": False, "error": str(e), "rows": []}
+            continue
+
+        updated_range = ((resp or {}).get("updates") or {}).get("updatedRange") or ""
+        m = re.search(r"![A-Z]+(\d+)", updated_range)
+        if not m:
+            results[sheet_name] = {"ok": True, "rows": []}
+            continue
+        first_row = int(m.group(1))
+        row_numbers = list(range(first_row, first_row + len(rows)))
+        for row_number, row_values in zip(row_numbers, rows):
+            _note_row_written(spreadsheet_id, sheet_name, row_number, row_values=row_values)
+        results[sheet_name] = {"ok": True, "rows": row_numbers}
+
+        try:
+            sheet_id = _get_sheet_id(service, spreadsheet_id, resolved_sheet_name)
+        except Exception as e:
+            _log("sheets.append_batch.sheet_id_error", sheet_name=resolved_sheet_name, error=str(e))
+            sheet_id = None
+        if sheet_id is not None:
+            dv_requests.append(_status_validation_request(sheet_id, first_row - 1, first_row - 1 + len(rows)))
+
+    if dv_requests:
+        try:
+            service.spreadsheets().batchUpdate(
+                spreadsheetId=spreadsheet_id,
+                body={"requests": dv_requests},
+            ).execute()
+            _log("sheets.append_batch.dv_set", ranges=len(dv_requests))
+        except Exception as e:
+            _log("sheets.dv.set.error", error=str(e))
+
+    return {"ok": all(r.get("ok") for r in results.values()), "sheets": results}
+
+
 def _update_creator_contact_info(
     spreadsheet_id: str,
     sheet_name: str,
@@ -849,45 +1233,81 @@ def _update_creator_contact_info(
     """Update only the email (col D) and/or IG handle (col B) for an existing row.
 
     This is a targeted update — it only touches the specified cells and leaves
-    all other columns unchanged.
+    all other columns unchanged. Both cells go out in one values.batchUpdate.
     """
-    service = _sheets_client(delegated_user=delegated_user)
-    if not service:
-        _log("sheets.update_contact.no_client")
-        return {"ok": False, "error": "Sheets client not configured"}
-
     if not email and not ig_handle:
         return {"ok": False, "error": "Nothing to update"}
+    return _update_creators_contact_info(
+        spreadsheet_id,
+        [{"sheet_name": sheet_name, "row_index": row_index, "email": email, "ig_handle": ig_handle}],
+        delegated_user=delegated_user,
+    )[0]
 
-    try:
-        updates_made = []
 
-        if email:
-            _log("sheets.update_contact.email", row=row_index, email=email)
-            service.spreadsheets().values().update(
-                spreadsheetId=spreadsheet_id,
-                range=f"{sheet_name}!D{row_index}",
-                valueInputOption="USER_ENTERED",
-                body={"values": [[email]]},
-            ).execute()
-            updates_made.append("email")
+# (column index, column letter, field name) of the cells a contact update can touch
+_CONTACT_COLUMNS = ((3, "D", "email"), (1, "B", "ig"))
 
-        if ig_handle:
-            handle_clean = ig_handle.strip().lstrip("@")
-            ig_url = f"https://www.instagram.com/{handle_clean}"
-            ig_formula = _hyperlink_formula(ig_url, f"@{handle_clean}")
-            _log("sheets.update_contact.ig", row=row_index, ig=handle_clean)
-            service.spreadsheets().values().update(
-                spreadsheetId=spreadsheet_id,
-                range=f"{sheet_name}!B{row_index}",
-                valueInputOption="USER_ENTERED",
-                body={"values": [[ig_formula]]},
-            ).execute()
-            updates_made.append("ig")
 
-        _log("sheets.update_contact.success", updates=updates_made)
-        return {"ok": True, "updated": updates_made}
+def _contact_cells(email: Optional[str], ig_handle: Optional[str]) -> Dict[int, Any]:
+    """Column index -> new value for a contact update: D = email, B = IG link."""
+    cells: Dict[int, Any] = {}
+    if email:
+        cells[3] = email
+    handle_clean = (ig_handle or "").strip().lstrip("@")
+    if handle_clean:
+        cells[1] = _hyperlink_formula(f"https://www.instagram.com/{handle_clean}", f"@{handle_clean}")
+    return cells
 
+
+def _update_creators_contact_info(
+    spreadsheet_id: str,
+    updates: List[Dict[str, Any]],
+    delegated_user: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Bulk form of _update_creator_contact_info: every row's cells in one values.batchUpdate.
+
+    Each update is {"sheet_name", "row_index", "email", "ig_handle"}. Returns one
+    result per update, in order: {"ok": True, "updated": ["email", "ig"]} or
+    {"ok": False, "error": str}.
+    """
+    results: List[Dict[str, Any]] = [{} for _ in updates]
+    data: List[Dict[str, Any]] = []
+    written: List[Tuple[int, Dict[int, Any]]] = []
+    for i, update in enumerate(updates):
+        cells = _contact_cells(update.get("email"), update.get("ig_handle"))
+        if not cells:
+            results[i] = {"ok": False, "error": "Nothing to update"}
+            continue
+        sheet_name, row_index = update["sheet_name"], update["row_index"]
+        for col, letter, _ in _CONTACT_COLUMNS:
+            if col in cells:
+                data.append({"range": f"{sheet_name}!{letter}{row_index}", "values": [[cells[col]]]})
+        written.append((i, cells))
+    if not data:
+        return results
+
+    service = _sheets_client(delegated_user=delegated_user)
+    if not service:
+        _log("sheets.update_contact.no_client")
+        for i, _ in written:
+            results[i] = {"ok": False, "error": "Sheets client not configured"}
+        return results
+
+    try:
+        _log("sheets.update_contact.request", rows=len(written), cells=len(data))
+        service.spreadsheets().values().batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={"valueInputOption": "USER_ENTERED", "data": data},
+        ).execute()
     except Exception as e:
         _log("sheets.update_contact.error", error=str(e))
-        return {"ok": False, "error": str(e)}
+        for i, _ in written:
+            results[i] = {"ok": False, "error": str(e)}
+        return results
+
+    for i, cells in written:
+        update = updates[i]
+        _note_row_written(spreadsheet_id, update["sheet_name"], update["row_index"], cells=cells)
+        results[i] = {"ok": True, "updated": [field for col, _, field in _CONTACT_COLUMNS if col in cells]}
+    _log("sheets.update_contact.success", rows=len(written), cells=len(data))
+    return results
@@ -0,0 +1,231 @@
+"""Quota-aware scheduling for every Sheets API call.
+
+Pooled Sheets clients send their HTTP requests through a ScheduledHttp (see
+google_services._ClientPool), so all callers share:
+- a token bucket per (spreadsheet, delegated user, read|write), refilled at
+  SHEETS_READS_PER_MINUTE / SHEETS_WRITES_PER_MINUTE (default 60, the per-user
+  Sheets quota) with SHEETS_BUCKET_BURST tokens of burst. Tokens are reserved
+  in arrival order, so a burst queues at the quota ceiling instead of failing.
+- jittered exponential retry on 429 and 5xx (Retry-After is honored). A 429
+  also empties the bucket so every thread backs off, not just the one that was
+  rejected. values.append is not retried on 5xx: the row may have been written.
+- coalescing of identical concurrent reads: a GET that is already in flight for
+  the same user and URL is shared instead of sent again.
+
+Counters are reported by sheets_scheduler_stats() (/health).
+"""
+
+import os
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from utils import _log
+from metrics import span
+
+_READS_PER_MINUTE = float(os.environ.get("SHEETS_READS_PER_MINUTE", "60"))
+_WRITES_PER_MINUTE = float(os.environ.get("SHEETS_WRITES_PER_MINUTE", "60"))
+_BUCKET_BURST = float(os.environ.get("SHEETS_BUCKET_BURST", "20"))
+_MAX_RETRIES = int(os.environ.get("SHEETS_MAX_RETRIES", "5"))
+_RETRY_BASE_S = float(os.environ.get("SHEETS_RETRY_BASE_SECONDS", "1"))
+_RETRY_CAP_S = float(os.environ.get("SHEETS_RETRY_CAP_SECONDS", "32"))
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_SPREADSHEET_ID_RE = re.compile(r"/spreadsheets/([A-Za-z0-9_-]+)")
+
+
+class _TokenBucket:
+    """Reservation token bucket: take() returns how long the caller must wait for its token."""
+
+    def __init__(self, per_minute: float, burst: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self) -> float:
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def drain(self, seconds: float):
+        """Hold back every caller for at least `seconds` (after a 429)."""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Tuple[Any, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class SheetsCallScheduler:
+    def __init__(
+        self,
+        reads_per_minute: float = _READS_PER_MINUTE,
+        writes_per_minute: float = _WRITES_PER_MINUTE,
+        burst: float = _BUCKET_BURST,
+        max_retries: int = _MAX_RETRIES,
+        retry_base_s: float = _RETRY_BASE_S,
+        retry_cap_s: float = _RETRY_CAP_S,
+        sleep=time.sleep,
+    ):
+        self.rates = {"read": reads_per_minute, "write": writes_per_minute}
+        self.burst = burst
+        self.max_retries = max_retries
+        self.retry_base_s = retry_base_s
+        self.retry_cap_s = retry_cap_s
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, str, str], _TokenBucket] = {}
+        self._inflight: Dict[Tuple[str, str], _InFlight] = {}
+        self.stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {
+            "calls": 0,
+            "throttle_waits": 0,
+            "throttle_wait_ms_total": 0.0,
+            "retries": 0,
+            "retries_by_status": {},
+            "gave_up": 0,
+            "coalesced": 0,
+        }
+
+    def _bucket(self, spreadsheet_id: str, delegated_user: str, kind: str) -> _TokenBucket:
+        key = (spreadsheet_id, delegated_user, kind)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _TokenBucket(self.rates[kind], self.burst)
+            return bucket
+
+    def _count(self, name: str, amount: float = 1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def request(self, http: Any, delegated_user: str, uri: str, method: str = "GET", *args, **kwargs) -> Tuple[Any, Any]:
+        """Send one Sheets HTTP request through the user's bucket, with retries and read coalescing."""
+        if method.upper() != "GET":
+            return self._send(http, delegated_user, uri, method, *args, **kwargs)
+
+        key = (delegated_user, uri)
+        with self._lock:
+            inflight = self._inflight.get(key)
+            leader = inflight is None
+            if leader:
+                inflight = self._inflight[key] = _InFlight()
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            inflight.done.wait()
+            if inflight.error is not None:
+                raise inflight.error
+            return inflight.result
+        try:
+            inflight.result = self._send(http, delegated_user, uri, method, *args, **kwargs)
+            return inflight.result
+        except BaseException as e:
+            inflight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            inflight.done.set()
+
+    def _send(self, http: Any, delegated_user: str, uri: str, method: str, *args, **kwargs) -> Tuple[Any, Any]:
+        match = _SPREADSHEET_ID_RE.search(uri)
+        kind = "read" if method.upper() == "GET" else "write"
+        bucket = self._bucket(match.group(1) if match else "", delegated_user, kind)
+        retry_5xx = kind == "read" or ":append" not in uri
+        attempt = 0
+        while True:
+            wait_s = bucket.take()
+            if wait_s > 0:
+                with self._lock:
+                    self.stats["throttle_waits"] += 1
+                    self.stats["throttle_wait_ms_total"] += wait_s * 1000
+                with span("sheets.throttle_wait"):
+                    self._sleep(wait_s)
+            self._count("calls")
+            resp, content = http.request(uri, method, *args, **kwargs)
+            status = int(getattr(resp, "status", 200) or 200)
+            if status not in _RETRY_STATUSES or (status != 429 and not retry_5xx):
+                return resp, content
+            if attempt >= self.max_retries:
+                self._count("gave_up")
+                _log("sheets.scheduler.gave_up", status=status, method=method, attempts=attempt + 1)
+                return resp, content
+
+            backoff_s = random.uniform(0, min(self.retry_cap_s, self.retry_base_s * (2 ** attempt)))
+            retry_after = _retry_after_seconds(resp)
+            if retry_after is not None:
+                backoff_s = max(backoff_s, retry_after)
+            if status == 429:
+                bucket.drain(backoff_s)
+            with self._lock:
+                self.stats["retries"] += 1
+                self.stats["retries_by_status"][str(status)] = self.stats["retries_by_status"].get(str(status), 0) + 1
+            _log("sheets.scheduler.retry", status=status, method=method, attempt=attempt + 1, backoff_ms=int(backoff_s * 1000))
+            # After a 429 the drained bucket supplies the wait on the next take()
+            if status != 429:
+                with span("sheets.retry_backoff"):
+                    self._sleep(backoff_s)
+            attempt += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["retries_by_status"] = dict(stats["retries_by_status"])
+            stats["buckets"] = len(self._buckets)
+            stats["inflight_reads"] = len(self._inflight)
+        stats["throttle_wait_ms_total"] = round(stats["throttle_wait_ms_total"], 1)
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+            self.stats = self._empty_stats()
+
+
+def _retry_after_seconds(resp: Any) -> Optional[float]:
+    try:
+        value = resp.get("retry-after") if hasattr(resp, "get") else None
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class ScheduledHttp:
+    """Http wrapper that routes one delegated user's Sheets requests through the scheduler."""
+
+    def __init__(self, http: Any, delegated_user: Optional[str], scheduler: Optional[SheetsCallScheduler] = None):
+        self._http = http
+        self._delegated_user = delegated_user or ""
+        self._scheduler = scheduler or _SCHEDULER
+
+    def request(self, uri, method="GET", *args, **kwargs):
+        return self._scheduler.request(self._http, self._delegated_user, uri, method, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._http, name)
+
+
+_SCHEDULER = SheetsCallScheduler()
+
+
+def sheets_scheduler_stats() -> Dict[str, Any]:
+    """Call, throttle-wait, retry and coalescing counters for Sheets requests."""
+    return _SCHEDULER.snapshot()
@@ -1,12 +1,15 @@
 """Template and script generation for the outreach tool."""
 
 import os
+import string
+import threading
 import importlib
 import importlib.util
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from utils import _log, _normalize_category
-from config import _get_app_config
+from config import _get_app_config, _resolve_sender_profile
+from metrics import span
 
 
 def _get_display_name(profile: Dict[str, Any]) -> str:
@@ -31,10 +34,49 @@ def _get_display_name(profile: Dict[str, Any]) -> str:
 
 
 
+# Loaded api/scripts/<app>.py modules: key -> (file mtime, module)
+_SCRIPT_MODULES: Dict[str, Tuple[Optional[float], Any]] = {}
+_SCRIPT_MODULES_LOCK = threading.Lock()
+
+
+def _script_path(key: str) -> str:
+    return os.path.join(os.path.dirname(__file__), "scripts", f"{key}.py")
+
+
+def _script_mtime(key: str) -> Optional[float]:
+    try:
+        return os.stat(_script_path(key)).st_mtime
+    except OSError:
+        return None
+
+
+def _load_script_module(key: str) -> Any:
+    """Load api/scripts/<key>.py, re-executing it only when the file's mtime changes."""
+    mtime = _script_mtime(key)
+    with _SCRIPT_MODULES_LOCK:
+        cached = _SCRIPT_MODULES.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        if mtime is None:
+            # Not next to this file (e.g. installed as a package): plain import
+            mod = importlib.import_module(f"scripts.{key}")
+        else:
+            # Load from file path to avoid conflicts with scripts.py module
+            spec = importlib.util.spec_from_file_location(f"scripts_{key}", _script_path(key))
+            if not spec or not spec.loader:
+                raise ImportError(f"Cannot load {_script_path(key)}")
+            mod = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(mod)  # type: ignore[attr-defined]
+        _SCRIPT_MODULES[key] = (mtime, mod)
+        _log("template.module.loaded", app_key=key, reloaded=cached is not None)
+        return mod
+
+
 def _get_templates_for_app(app_key: Optional[str], followup: bool = False, followup_number: int = 1, app_config: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, str]]:
     """Dynamically load templates from api/scripts/<app_key>.py using the new dynamic functions.
 
     Falls back to generic templates from api/scripts.py if per-app not found.
+    Returns the raw template dict; requests go through _TEMPLATE_REGISTRY instead.
     
     Args:
         app_key: The app key (e.g., 'lifemaxx', 'pretti')
@@ -51,9 +93,8 @@ def _get_templates_for_app(app_key: Optional[str], followup: bool = False, follo
     
     _log("template.lookup.start", app_key=key, followup=followup, followup_number=followup_number, app_config_keys=list(app_config.keys()))
     
-    # Try app-specific module (package import)
     try:
-        mod = importlib.import_module(f"scripts.{key}")
+        mod = _load_script_module(key)
         
         # Use the new dynamic template functions
         if followup:
@@ -76,38 +117,6 @@ def _get_templates_for_app(app_key: Optional[str], followup: bool = False, follo
     except Exception as e:
         _log("template.lookup.error.module", app_key=key, error=str(e))
     
-    # Try loading from file path to avoid conflicts with scripts.py module
-    # ... (rest of function remains same but needs consistent app_config usage)
-    try:
-        api_dir = os.path.dirname(__file__)
-        candidate = os.path.join(api_dir, "scripts", f"{key}.py")
-        if os.path.exists(candidate):
-            spec = importlib.util.spec_from_file_location(f"scripts_{key}", candidate)
-            if spec and spec.loader:
-                mod = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(mod)  # type: ignore[attr-defined]
-                
-                # Use the new dynamic template functions
-                if followup:
-                    if followup_number == 1:
-                        template_func = getattr(mod, "get_followup_templates", None)
-                    elif followup_number == 2:
-                        template_func = getattr(mod, "get_second_followup_templates", None)
-                    elif followup_number == 3:
-                        template_func = getattr(mod, "get_third_followup_templates", None)
-                    else:
-                        template_func = getattr(mod, "get_followup_templates", None)  # fallback to first followup
-                else:
-                    template_func = getattr(mod, "get_templates", None)
-                
-                if template_func and callable(template_func):
-                    t = template_func(app_name=key, app_config=app_config)
-                    if isinstance(t, dict):
-                        _log("template.lookup.success.file", app_key=key, found_keys=list(t.keys()))
-                        return t
-    except Exception as e:
-        _log("template.lookup.error.file", app_key=key, error=str(e))
-    
     # Fallback to generic scripts.TEMPLATES
     if not followup:
         try:
@@ -122,6 +131,186 @@ def _get_templates_for_app(app_key: Optional[str], followup: bool = False, follo
     return {}
 
 
+# Placeholders each template part may use (matches what _build_email_and_dm supplies)
+_EMAIL_FIELDS = ("name", "link_url", "link_text")
+_DM_FIELDS = ("name",)
+
+_DEFAULT_EMAIL_MD = "Hi {name}\n\nBest,\nAbhay\n\n*abhay@a17.so*"
+_DEFAULT_DM_MD = "Hey {name}!"
+_DEFAULT_SUBJECT = "PAID PARTNERSHIP OPPORTUNITY - Pretti App"
+
+
+def _parse_template(text: str, allowed: Tuple[str, ...]) -> List[Tuple[str, Optional[str], str, Optional[str]]]:
+    """Split a str.format template into (literal, field, spec, conversion) pieces.
+
+    Raises ValueError for malformed braces or placeholders we never fill in,
+    which str.format would otherwise only hit mid-request.
+    """
+    pieces = []
+    for literal, field, spec, conversion in string.Formatter().parse(text):
+        if field is not None:
+            if field not in allowed:
+                raise ValueError(f"unknown placeholder {{{field}}} (allowed: {', '.join(allowed)})")
+            if spec and "{" in spec:
+                raise ValueError(f"nested placeholder in format spec of {{{field}}}")
+        pieces.append((literal, field, spec or "", conversion))
+    return pieces
+
+
+def _render_template(pieces: List[Tuple[str, Optional[str], str, Optional[str]]], values: Dict[str, Any]) -> str:
+    out = []
+    for literal, field, spec, conversion in pieces:
+        out.append(literal)
+        if field is None:
+            continue
+        value = values[field]
+        if conversion == "r":
+            value = repr(value)
+        elif conversion == "a":
+            value = ascii(value)
+        elif conversion == "s":
+            value = str(value)
+        out.append(format(value, spec))
+    return "".join(out)
+
+
+class _CompiledTemplate:
+    """One category's subject, email and DM with placeholders pre-parsed."""
+
+    def __init__(self, tmpl: Dict[str, Any]):
+        self.subject = tmpl.get("subject") or _DEFAULT_SUBJECT
+        self.email = _parse_template(tmpl.get("email_md") or _DEFAULT_EMAIL_MD, _EMAIL_FIELDS)
+        self.dm = _parse_template(tmpl.get("dm_md") or _DEFAULT_DM_MD, _DM_FIELDS)
+
+    def render(self, name: str, link_url: str, link_text: str) -> Tuple[str, str, str]:
+        """(subject, email_md, dm_md) for one creator."""
+        return (
+            self.subject,
+            _render_template(self.email, {"name": name, "link_url": link_url, "link_text": link_text}),
+            _render_template(self.dm, {"name": name}),
+        )
+
+
+_DEFAULT_COMPILED_TEMPLATE = _CompiledTemplate({})
+
+
+class _TemplateSet:
+    """Compiled templates of one (app, sender profile, followup number), by category.
+
+    A category whose template doesn't compile keeps its error, which is logged
+    when the set is built and raised only if that category is requested.
+    """
+
+    def __init__(self, raw: Dict[str, Any], mtime: Optional[float]):
+        self.mtime = mtime
+        self.templates: Dict[str, _CompiledTemplate] = {}
+        self.errors: Dict[str, str] = {}
+        for category, tmpl in (raw or {}).items():
+            if not isinstance(tmpl, dict):
+                continue
+            try:
+                self.templates[category] = _CompiledTemplate(tmpl)
+            except ValueError as e:
+                self.errors[category] = str(e)
+
+    def get(self, category: str) -> Optional[_CompiledTemplate]:
+        if category in self.errors:
+            raise ValueError(f"Template '{category}' failed to compile: {self.errors[category]}")
+        return self.templates.get(category)
+
+
+class _TemplateRegistry:
+    """Compiled template sets keyed by (app, sender profile, followup number; 0 = initial outreach).
+
+    A set is compiled on first use (or by preload) and reused until its
+    api/scripts/<app>.py changes on disk. App configs are loaded once per
+    process, so the sender profile _resolve_sender_profile recorded (none for
+    the base config) stands in for the config's values.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sets: Dict[Tuple[str, str, int], _TemplateSet] = {}
+        self.stats = {"hits": 0, "compiles": 0, "invalidations": 0}
+
+    def get(self, app_key: Optional[str], followup_number: int, app_config: Optional[Dict[str, Any]]) -> _TemplateSet:
+        key = (app_key or "").strip().lower() or "default"
+        if not app_config:
+            app_config = _get_app_config(app_key)
+        cache_key = (key, app_config.get("sender_profile_key") or "", followup_number)
+        mtime = _script_mtime(key)
+
+        with self._lock:
+            template_set = self._sets.get(cache_key)
+            if template_set is not None and template_set.mtime == mtime:
+                self.stats["hits"] += 1
+                return template_set
+            if template_set is not None:
+                self.stats["invalidations"] += 1
+            raw = _get_templates_for_app(
+                app_key,
+                followup=followup_number > 0,
+                followup_number=followup_number or 1,
+                app_config=app_config,
+            )
+            template_set = _TemplateSet(raw, mtime)
+            self._sets[cache_key] = template_set
+            self.stats["compiles"] += 1
+        for category, error in template_set.errors.items():
+            _log("template.compile.error", app_key=key, followup_number=followup_number, category=category, error=error)
+        _log("template.compile.done", app_key=key, followup_number=followup_number, categories=len(template_set.templates))
+        return template_set
+
+    def clear(self):
+        with self._lock:
+            self._sets.clear()
+
+
+_TEMPLATE_REGISTRY = _TemplateRegistry()
+
+
+def preload_templates(apps: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Compile every app x sender profile x followup template set.
+
+    Args:
+        apps: The OUTREACH_APPS mapping (app key -> config with sender_profiles)
+
+    Returns:
+        {"sets": int, "errors": [{"app_key", "sender_profile", "followup_number", "category", "error"}]}
+    """
+    sets = 0
+    errors: List[Dict[str, Any]] = []
+    for app_key, base in (apps or {}).items():
+        app_cfg = dict(base)
+        app_cfg["app_key"] = app_key
+        sender_profiles = app_cfg.get("sender_profiles")
+        profile_keys: List[Optional[str]] = [None]
+        if isinstance(sender_profiles, dict):
+            profile_keys += list(sender_profiles.keys())
+        for profile_key in profile_keys:
+            cfg = _resolve_sender_profile(app_cfg, profile_key, strict=False) if profile_key else app_cfg
+            for followup_number in range(4):
+                template_set = _TEMPLATE_REGISTRY.get(app_key, followup_number, cfg)
+                sets += 1
+                for category, error in template_set.errors.items():
+                    errors.append({
+                        "app_key": app_key,
+                        "sender_profile": profile_key,
+                        "followup_number": followup_number,
+                        "category": category,
+                        "error": error,
+                    })
+    _log("template.preload.done", sets=sets, errors=len(errors))
+    return {"sets": sets, "errors": errors}
+
+
+def template_registry_stats() -> Dict[str, Any]:
+    stats = dict(_TEMPLATE_REGISTRY.stats)
+    stats["sets"] = len(_TEMPLATE_REGISTRY._sets)
+    return stats
+
+
+@span("template.build")
 def _build_email_and_dm(category: str, profile: Dict[str, Any], link_url: Optional[str] = None, app_key: Optional[str] = None, is_followup: bool = False, followup_number: int = 1, app_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Build email and DM scripts from templates.
     
@@ -144,38 +333,21 @@ def _build_email_and_dm(category: str, profile: Dict[str, Any], link_url: Option
     """
     name = _get_display_name(profile)
     ig_handle = profile.get("ig") or ""
-    tt_handle = profile.get("tt") or ""
 
-    # Load markdown templates (use followup templates if this is a followup)
-    templates_for_app = _get_templates_for_app(app_key, followup=is_followup, followup_number=followup_number, app_config=app_config)
+    # Compiled templates (use followup templates if this is a followup)
     key = _normalize_category(category)
-    tmpl = templates_for_app.get(key) or {}
+    tmpl = _TEMPLATE_REGISTRY.get(app_key, max(1, followup_number) if is_followup else 0, app_config).get(key)
     
     # If followup templates not found, fall back to regular templates
-    if is_followup and not tmpl:
-        templates_for_app = _get_templates_for_app(app_key, followup=False)
-        tmpl = templates_for_app.get(key) or {}
+    if is_followup and tmpl is None:
+        tmpl = _TEMPLATE_REGISTRY.get(app_key, 0, app_config).get(key)
     
-    link_url = link_url or "https://a17.so/brief"
-    link_text = "View brief"
-
-    # Prepare Markdown strings
-    email_md = tmpl.get("email_md") or (
-        "Hi {name}\n\nBest,\nAbhay\n\n*abhay@a17.so*"
-    )
-    dm_md = tmpl.get("dm_md") or (
-        "Hey {name}!"
+    subject, email_md, dm_md = (tmpl or _DEFAULT_COMPILED_TEMPLATE).render(
+        name,
+        link_url or "https://a17.so/brief",
+        "View brief",
     )
 
-    email_md = email_md.format(
-        name=name,
-        link_url=link_url,
-        link_text=link_text,
-    )
-    dm_md = dm_md.format(name=name)
-
-    subject = tmpl.get("subject") or f"PAID PARTNERSHIP OPPORTUNITY - Pretti App"
-
     return {
         "subject": subject,
         "email_md": email_md,
@@ -2,18 +2,22 @@
 """
 Script to clean tracking parameters from 'Raw Leads' sheet.
 
+Reads the sheet in row chunks and writes back only the cells whose URL changed,
+in batchUpdate calls of at most --batch-cells ranges.
+
 Usage:
-    python3 api/clean_tracking_links.py --app pretti --sheet "Raw Leads" --dry-run
-    python3 api/clean_tracking_links.py --app pretti --sheet "Raw Leads" --apply
+    python3 excel/clean_tracking_links.py --app pretti --sheet "Raw Leads" --dry-run
+    python3 excel/clean_tracking_links.py --app pretti --sheet "Raw Leads" --apply
 """
 
 import os
 import sys
 import json
 import argparse
+import re
 import time
 from typing import Any, Dict, List, Optional
-from urllib.parse import urlparse
+from urllib.parse import uses_params
 
 # Add parent directory to path to allow importing from api if needed
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,41 +27,40 @@ try:
 except ImportError:
     yaml = None
 
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-
 def _log(event: str, **fields: Any) -> None:
     print(json.dumps({"event": event, **fields}))
 
+# Precompiled pieces of urllib.parse.urlparse: the platform check, then
+# scheme / netloc / path (query, fragment and ;params are dropped)
+_PLATFORM_RE = re.compile(r"tiktok\.com|instagram\.com", re.I)
+_URL_STRIP_CHARS = str.maketrans("", "", "\t\r\n")
+_URL_PARTS_RE = re.compile(r"^(?:(?P<scheme>[A-Za-z][A-Za-z0-9+.-]*):)?(?://(?P<netloc>[^/?#]*))?(?P<path>[^?#]*)")
+
+
 def _clean_url(url: str) -> str:
     """Remove tracking parameters from TikTok/Instagram URLs."""
     if not url:
         return ""
-    
-    try:
-        # Basic cleanup
-        cleaned = url.strip()
-        
-        # Check if it's a known platform
-        lower_url = cleaned.lower()
-        if "tiktok.com" in lower_url or "instagram.com" in lower_url:
-            # Parse URL
-            parsed = urlparse(cleaned)
-            
-            # Reconstruct without query strings for these platforms
-            path = parsed.path
-            scheme = parsed.scheme or "https"
-            netloc = parsed.netloc
-            
-            if not netloc and "tiktok.com" in path:
-                 pass 
-            
-            new_url = f"{scheme}://{netloc}{path}"
-            return new_url
-            
+
+    cleaned = url.strip()
+    if not _PLATFORM_RE.search(cleaned):
         return cleaned
-    except Exception:
+
+    match = _URL_PARTS_RE.match(cleaned.translate(_URL_STRIP_CHARS))
+    netloc = match.group("netloc") or ""
+    if "[" in netloc or "]" in netloc:
+        # urlparse rejects these (IPv6 literals); leave the cell alone
         return url
+    path = match.group("path")
+    scheme = (match.group("scheme") or "").lower()
+    if scheme in uses_params:
+        last_slash = path.rfind("/")
+        params_at = path.find(";", last_slash if last_slash >= 0 else 0)
+        if params_at >= 0:
+            path = path[:params_at]
+    scheme = scheme or "https"
+    return f"{scheme}://{netloc}{path}"
+
 
 # --- Configuration & Auth Parsing ---
 
@@ -91,6 +94,9 @@ def _get_app_config(app_key: str):
     return cfg
 
 def _get_sheets_client(app_config):
+    from google.oauth2 import service_account
+    from googleapiclient.discovery import build
+
     scopes = ["https://www.googleapis.com/auth/spreadsheets"]
     
     # 1. Try GOOGLE_SERVICE_ACCOUNT_JSON env var
@@ -120,12 +126,125 @@ def _get_sheets_client(app_config):
         
     return build("sheets", "v4", credentials=creds, cache_discovery=False)
 
+def _col_letter(index: int) -> str:
+    """0-based column index -> A1 column letters."""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _a1_sheet(sheet_name: str) -> str:
+    return "'" + sheet_name.replace("'", "''") + "'"
+
+
+def _sheet_row_count(service, spreadsheet_id: str, sheet_name: str) -> Optional[int]:
+    meta = service.spreadsheets().get(
+        spreadsheetId=spreadsheet_id,
+        fields="sheets(properties(title,gridProperties(rowCount)))",
+    ).execute()
+    for sheet in meta.get("sheets", []):
+        props = sheet.get("properties", {})
+        if props.get("title") == sheet_name:
+            return int(props.get("gridProperties", {}).get("rowCount", 0))
+    return None
+
+
+def _iter_row_chunks(service, spreadsheet_id: str, sheet_name: str, row_count: int, chunk_rows: int, last_column: str):
+    """Yield (first_row_number, rows) for each chunk_rows-row slice of the sheet.
+
+    Cells are read as formulas so =HYPERLINK(...) cells are seen as formulas
+    rather than as their display text.
+    """
+    for first in range(1, row_count + 1, chunk_rows):
+        last = min(row_count, first + chunk_rows - 1)
+        result = service.spreadsheets().values().get(
+            spreadsheetId=spreadsheet_id,
+            range=f"{_a1_sheet(sheet_name)}!A{first}:{last_column}{last}",
+            valueRenderOption="FORMULA",
+        ).execute()
+        yield first, result.get("values", [])
+
+
+def _write_cells(service, spreadsheet_id: str, data: List[Dict[str, Any]]) -> None:
+    service.spreadsheets().values().batchUpdate(
+        spreadsheetId=spreadsheet_id,
+        body={"valueInputOption": "USER_ENTERED", "data": data},
+    ).execute()
+
+
+def clean_sheet(
+    service,
+    spreadsheet_id: str,
+    sheet_name: str,
+    apply: bool = False,
+    chunk_rows: int = 5000,
+    batch_cells: int = 1000,
+    last_column: str = "Z",
+    verbose: bool = True,
+) -> Dict[str, Any]:
+    """Stream the sheet in row chunks and rewrite only the cells whose URL changed.
+
+    Changed cells are written with values.batchUpdate, at most batch_cells
+    ranges per call, as the scan goes (apply=True only).
+
+    Returns:
+        {"rows", "links_checked", "cells_changed", "cells_written", "write_calls", "read_calls", "seconds", "rows_per_second"}
+    """
+    started = time.perf_counter()
+    row_count = _sheet_row_count(service, spreadsheet_id, sheet_name)
+    if row_count is None:
+        raise ValueError(f"Sheet not found: {sheet_name}")
+
+    stats = {"rows": 0, "links_checked": 0, "cells_changed": 0, "cells_written": 0, "write_calls": 0, "read_calls": 0}
+    pending: List[Dict[str, Any]] = []
+
+    def flush():
+        if pending:
+            batch = list(pending)
+            pending.clear()
+            _write_cells(service, spreadsheet_id, batch)
+            stats["write_calls"] += 1
+            stats["cells_written"] += len(batch)
+
+    for first_row, rows in _iter_row_chunks(service, spreadsheet_id, sheet_name, row_count, chunk_rows, last_column):
+        stats["read_calls"] += 1
+        stats["rows"] += len(rows)
+        for offset, row in enumerate(rows):
+            for c_idx, cell in enumerate(row):
+                # Formula cells (=HYPERLINK(...)) are left as they are
+                if not isinstance(cell, str) or cell.startswith("=") or not _PLATFORM_RE.search(cell):
+                    continue
+                stats["links_checked"] += 1
+                cleaned = _clean_url(cell)
+                if cleaned == cell:
+                    continue
+                stats["cells_changed"] += 1
+                if verbose:
+                    print(f"[Row {first_row + offset}] Cleaning: {cell} -> {cleaned}")
+                if apply:
+                    pending.append({"range": f"{_a1_sheet(sheet_name)}!{_col_letter(c_idx)}{first_row + offset}", "values": [[cleaned]]})
+                    if len(pending) >= batch_cells:
+                        flush()
+    if apply:
+        flush()
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    stats["rows_per_second"] = round(stats["rows"] / stats["seconds"], 1) if stats["seconds"] > 0 else None
+    return stats
+
+
 def main():
     parser = argparse.ArgumentParser(description="Clean tracking links in Raw Leads")
     parser.add_argument("--app", required=True, help="App key (e.g. pretti)")
     parser.add_argument("--sheet", default="Raw Leads", help="Sheet name")
     parser.add_argument("--apply", action="store_true", help="Apply changes (default is dry-run)")
     parser.add_argument("--dry-run", action="store_true", help="Explicit dry-run")
+    parser.add_argument("--chunk-rows", type=int, default=5000, help="Rows read per request")
+    parser.add_argument("--batch-cells", type=int, default=1000, help="Max changed cells per batchUpdate")
+    parser.add_argument("--quiet", action="store_true", help="Don't print every cleaned cell")
     
     args = parser.parse_args()
     
@@ -150,73 +269,32 @@ def main():
     if not service:
         sys.exit(1)
         
-    print(f"Reading sheet: {args.sheet}")
+    print(f"Reading sheet: {args.sheet} ({args.chunk_rows} rows per read)")
     try:
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range=f"{args.sheet}!A:Z"
-        ).execute()
-        rows = result.get("values", [])
+        stats = clean_sheet(
+            service,
+            spreadsheet_id,
+            args.sheet,
+            apply=not is_dry_run,
+            chunk_rows=max(1, args.chunk_rows),
+            batch_cells=max(1, args.batch_cells),
+            verbose=not args.quiet,
+        )
     except Exception as e:
-        print(f"Error reading sheet: {e}")
+        print(f"Error cleaning sheet: {e}")
         sys.exit(1)
-        
-    print(f"Found {len(rows)} rows.")
-    
-    updates = []
-    clean_count = 0
-    total_links_checked = 0
-    
-    # Iterate rows and cells
-    for r_idx, row in enumerate(rows):
-        row_changed = False
-        new_row = list(row)
-        
-        for c_idx, cell in enumerate(row):
-            cell_str = str(cell)
-            if "tiktok.com" in cell_str or "instagram.com" in cell_str:
-                total_links_checked += 1
-                cleaned = _clean_url(cell_str)
-                if cleaned != cell_str:
-                    print(f"[Row {r_idx+1}] Cleaning: {cell_str} -> {cleaned}")
-                    new_row[c_idx] = cleaned
-                    row_changed = True
-                    clean_count += 1
-        
-        if row_changed:
-            updates.append({
-                "range": f"{args.sheet}!A{r_idx+1}",
-                "values": [new_row]
-            })
-
-    print(f"\nChecked {total_links_checked} links.")
-    print(f"Found {clean_count} links to clean.")
+
+    print(f"\nScanned {stats['rows']} rows in {stats['seconds']}s ({stats['rows_per_second']} rows/s, {stats['read_calls']} reads).")
+    print(f"Checked {stats['links_checked']} links.")
+    print(f"Found {stats['cells_changed']} links to clean.")
     
     if is_dry_run:
         print("Dry run finished. No changes made. Run with --apply to execute.")
+    elif stats["cells_written"]:
+        print(f"Updated {stats['cells_written']} cells in {stats['write_calls']} batchUpdate calls.")
     else:
-        if updates:
-            print(f"Applying {len(updates)} row updates...")
-            
-            data = []
-            for u in updates:
-                data.append(u)
-                
-            body = {
-                "valueInputOption": "USER_ENTERED",
-                "data": data
-            }
-            
-            try:
-                resp = service.spreadsheets().values().batchUpdate(
-                    spreadsheetId=spreadsheet_id,
-                    body=body
-                ).execute()
-                print("Updates applied successfully!")
-            except Exception as e:
-                print(f"Error applying updates: {e}")
-        else:
-            print("No updates needed.")
+        print("No updates needed.")
+    _log("clean_tracking_links.done", dry_run=is_dry_run, **stats)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,322 @@
+"""In-memory stand-ins for Google Sheets v4 and SearchAPI.io, for load tests.
+
+FakeSheets implements the slice of the Sheets v4 REST API the outreach API
+uses (spreadsheets.get/batchUpdate and values.get/batchGet/update/append/
+batchUpdate) over per-spreadsheet tabs held in memory. FakeSearchApi answers tiktok_profile / youtube_channel searches with deterministic profiles.
+
+Both servers take a latency range and a 429 rate, and count every call they
+serve (GET /_stats, POST /_reset) so the harness can report upstream calls per
+request. Point the API at them with SHEETS_API_ENDPOINT, GOOGLE_API_ANONYMOUS=1
+and SEARCHAPI_BASE_URL (see run_load.py).
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+_A1_RE = re.compile(r"^([A-Z]*)(\d*)$")
+
+
+def _col_index(letters: str) -> int:
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - 64)
+    return index - 1
+
+
+def _col_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def parse_a1(a1: str) -> Tuple[str, Optional[int], Optional[int], Optional[int], Optional[int]]:
+    """'Sheet'!A1:K5 -> (title, first_row, first_col, last_row, last_col); 0-based, None = unbounded."""
+    if "!" in a1:
+        title, cells = a1.rsplit("!", 1)
+    else:
+        title, cells = a1, ""
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    if not cells:
+        return title, None, None, None, None
+    start, _, end = cells.partition(":")
+    end = end or start
+    bounds = []
+    for part in (start, end):
+        match = _A1_RE.match(part.upper())
+        if not match:
+            raise ValueError(f"Unable to parse range: {a1}")
+        letters, digits = match.groups()
+        bounds.append((int(digits) - 1 if digits else None, _col_index(letters) if letters else None))
+    (r1, c1), (r2, c2) = bounds
+    return title, r1, c1, r2, c2
+
+
+class _Upstream:
+    """Latency, 429 injection and call counters shared by both fakes."""
+
+    def __init__(self, latency_ms: Tuple[float, float] = (0.0, 0.0), error_429_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.error_429_rate = error_429_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+
+    def count(self, name: str):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def delay_and_maybe_throttle(self) -> bool:
+        """Sleep for the configured latency; True if this call should get a 429."""
+        with self._lock:
+            delay_ms = self._random.uniform(*self.latency_ms) if self.latency_ms[1] > 0 else 0.0
+            throttled = self._random.random() < self.error_429_rate
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+        return throttled
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+    def reset(self):
+        with self._lock:
+            self.counts.clear()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    upstream: Any = None
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+    def _dispatch(self, method: str):
+        parts = urlsplit(self.path)
+        if parts.path == "/_stats":
+            return self._send_json(200, self.upstream.stats())
+        if parts.path == "/_reset":
+            self.upstream.reset()
+            return self._send_json(200, {"ok": True})
+        try:
+            status, payload = self.upstream.handle(method, parts.path, parse_qs(parts.query), self._body() if method in ("POST", "PUT") else {})
+        except ValueError as e:
+            status, payload = 400, {"error": {"code": 400, "message": str(e), "status": "INVALID_ARGUMENT"}}
+        self._send_json(status, payload, {"Retry-After": "1"} if status == 429 else None)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+
+class _Server:
+    def __init__(self, upstream: Any, port: int = 0):
+        handler = type("Handler", (_Handler,), {"upstream": upstream})
+        self.upstream = upstream
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self) -> "_Server":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakeSheets(_Upstream):
+    """Spreadsheets held as {spreadsheet_id: {title: {"sheetId", "rows"}}}."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.spreadsheets: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._data_lock = threading.Lock()
+
+    def add_tab(self, spreadsheet_id: str, title: str, rows: Optional[List[List[Any]]] = None):
+        tabs = self.spreadsheets.setdefault(spreadsheet_id, {})
+        tabs[title] = {"sheetId": len(tabs), "rows": [list(r) for r in (rows or [])]}
+
+    def _tab(self, spreadsheet_id: str, title: str) -> Dict[str, Any]:
+        tab = self.spreadsheets.get(spreadsheet_id, {}).get(title)
+        if tab is None:
+            raise ValueError(f"Unable to parse range: {title}")
+        return tab
+
+    def _read(self, spreadsheet_id: str, a1: str) -> Dict[str, Any]:
+        title, r1, c1, r2, c2 = parse_a1(a1)
+        rows = self._tab(spreadsheet_id, title)["rows"]
+        r1 = r1 or 0
+        r2 = len(rows) - 1 if r2 is None else r2
+        c1 = c1 or 0
+        values = []
+        for row in rows[r1:r2 + 1]:
+            cells = row[c1:None if c2 is None else c2 + 1]
+            while cells and cells[-1] in ("", None):
+                cells = cells[:-1]
+            values.append(cells)
+        while values and not values[-1]:
+            values.pop()
+        out = {"range": a1, "majorDimension": "ROWS"}
+        if values:
+            out["values"] = values
+        return out
+
+    def _write(self, spreadsheet_id: str, a1: str, values: List[List[Any]]) -> Dict[str, Any]:
+        title, r1, c1, _, _ = parse_a1(a1)
+        rows = self._tab(spreadsheet_id, title)["rows"]
+        r1, c1 = r1 or 0, c1 or 0
+        for offset, new_row in enumerate(values):
+            while len(rows) <= r1 + offset:
+                rows.append([])
+            row = rows[r1 + offset]
+            if len(row) < c1 + len(new_row):
+                row.extend([""] * (c1 + len(new_row) - len(row)))
+            row[c1:c1 + len(new_row)] = new_row
+        cells = sum(len(v) for v in values)
+        last_col = c1 + max((len(v) for v in values), default=1) - 1
+        return {
+            "spreadsheetId": spreadsheet_id,
+            "updatedRange": f"{title}!{_col_letter(c1)}{r1 + 1}:{_col_letter(last_col)}{r1 + len(values)}",
+            "updatedRows": len(values),
+            "updatedCells": cells,
+        }
+
+    def _append(self, spreadsheet_id: str, a1: str, values: List[List[Any]]) -> Dict[str, Any]:
+        title, _, c1, _, c2 = parse_a1(a1)
+        rows = self._tab(spreadsheet_id, title)["rows"]
+        c1 = c1 or 0
+        # Like Sheets, append after the last row with data inside the range's columns
+        last = len(rows)
+        while last and not any(cell not in ("", None) for cell in rows[last - 1][c1:None if c2 is None else c2 + 1]):
+            last -= 1
+        start = f"{title}!{_col_letter(c1)}{last + 1}"
+        return {"spreadsheetId": spreadsheet_id, "tableRange": a1, "updates": self._write(spreadsheet_id, start, values)}
+
+    def _batch_update(self, spreadsheet_id: str, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        replies = []
+        for req in requests:
+            if "addSheet" in req:
+                title = req["addSheet"].get("properties", {}).get("title", f"Sheet{len(self.spreadsheets.get(spreadsheet_id, {})) + 1}")
+                self.add_tab(spreadsheet_id, title)
+                replies.append({"addSheet": {"properties": {"sheetId": self._tab(spreadsheet_id, title)["sheetId"], "title": title}}})
+            else:
+                # Formatting and validation requests don't change values
+                replies.append({})
+        return {"spreadsheetId": spreadsheet_id, "replies": replies}
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], body: Dict[str, Any]) -> Tuple[int, Any]:
+        segments = path.strip("/").split("/")
+        if len(segments) < 3 or segments[:2] != ["v4", "spreadsheets"]:
+            return 404, {"error": {"code": 404, "message": f"Unknown path {path}"}}
+        spreadsheet_id, _, method_suffix = segments[2].partition(":")
+        kind = "read" if method == "GET" else "write"
+        self.count(f"sheets.{kind}")
+        if self.delay_and_maybe_throttle():
+            self.count("sheets.429")
+            return 429, {"error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}}
+        if spreadsheet_id not in self.spreadsheets:
+            return 404, {"error": {"code": 404, "message": "Requested entity was not found.", "status": "NOT_FOUND"}}
+
+        with self._data_lock:
+            if len(segments) == 3:
+                if method_suffix == "batchUpdate":
+                    return 200, self._batch_update(spreadsheet_id, body.get("requests", []))
+                return 200, {
+                    "spreadsheetId": spreadsheet_id,
+                    "sheets": [
+                        {"properties": {"sheetId": tab["sheetId"], "title": title, "gridProperties": {"rowCount": max(1000, len(tab["rows"])), "columnCount": 26}}}
+                        for title, tab in self.spreadsheets[spreadsheet_id].items()
+                    ],
+                }
+            if segments[3] == "values:batchGet":
+                return 200, {"spreadsheetId": spreadsheet_id, "valueRanges": [self._read(spreadsheet_id, r) for r in query.get("ranges", [])]}
+            if segments[3] == "values:batchUpdate":
+                responses = [self._write(spreadsheet_id, d["range"], d.get("values", [])) for d in body.get("data", [])]
+                return 200, {"spreadsheetId": spreadsheet_id, "totalUpdatedCells": sum(r["updatedCells"] for r in responses), "responses": responses}
+            if segments[3] == "values" and len(segments) >= 5:
+                raw_range, _, action = "/".join(segments[4:]).rpartition(":")
+                if action not in ("append", "clear"):
+                    raw_range, action = "/".join(segments[4:]), ""
+                a1 = unquote(raw_range)
+                if action == "append":
+                    return 200, self._append(spreadsheet_id, a1, body.get("values", []))
+                if method == "PUT":
+                    return 200, self._write(spreadsheet_id, a1, body.get("values", []))
+                return 200, self._read(spreadsheet_id, a1)
+        return 404, {"error": {"code": 404, "message": f"Unknown path {path}"}}
+
+
+class FakeSearchApi(_Upstream):
+    """SearchAPI.io /api/v1/search with made-up but stable profiles per handle.
+
+    Handles starting with "missing" are not found; every `email_every`-th
+    handle (by hash) has an email in its bio.
+    """
+
+    def __init__(self, email_every: int = 2, **kwargs):
+        super().__init__(**kwargs)
+        self.email_every = max(1, email_every)
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], body: Dict[str, Any]) -> Tuple[int, Any]:
+        engine = (query.get("engine") or [""])[0]
+        self.count(f"searchapi.{engine or 'unknown'}")
+        if self.delay_and_maybe_throttle():
+            self.count("searchapi.429")
+            return 429, {"error": "Too many requests"}
+        if engine == "tiktok_profile":
+            username = (query.get("username") or [""])[0]
+            if username.startswith("missing"):
+                return 404, {"error": "Profile not found"}
+            bio = f"creator | ig: {username}_ig"
+            if sum(map(ord, username)) % self.email_every == 0:
+                bio += f" | {username}@example.com"
+            return 200, {
+                "search_metadata": {"status": "Success"},
+                "profile": {"username": username, "name": username.title(), "bio": bio, "followers": 1000 + len(username) * 37},
+            }
+        if engine == "youtube_channel":
+            channel_id = (query.get("channel_id") or [""])[0]
+            return 200, {"search_metadata": {"status": "Success"}, "channel": {"name": channel_id.lstrip("@")}, "about": {"description": ""}}
+        return 400, {"error": f"Unsupported engine {engine}"}
+
+
+def start_fake_sheets(port: int = 0, **kwargs) -> _Server:
+    return _Server(FakeSheets(**kwargs), port).start()
+
+
+def start_fake_searchapi(port: int = 0, **kwargs) -> _Server:
+    return _Server(FakeSearchApi(**kwargs), port).start()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Offline load test for the outreach API.
+
+Starts the fake Sheets and SearchAPI servers (fake_upstreams.py), seeds a
+spreadsheet with existing creators, launches the API under gunicorn pointed at
+the fakes, and replays a weighted traffic mix with a fixed number of concurrent
+clients. Reports throughput, p50/p95/p99 latency per request kind, upstream
+calls per request (counted by the fakes), and the API's own per-stage counts
+from /debug/metrics.
+
+Usage:
+    python3 loadtest/run_load.py --requests 500 --concurrency 16
+    python3 loadtest/run_load.py --mix scrape_new=1 --searchapi-latency-ms 800,1500 --searchapi-429-rate 0.05
+    python3 loadtest/run_load.py --server asgi --concurrency 64
+    python3 loadtest/run_load.py --server-cmd "gunicorn --bind 127.0.0.1:{port} --workers 2 --threads 8 --chdir {api_dir} main:app"
+
+The API inherits this process's environment, so the per-spreadsheet Sheets
+quota buckets apply as in production (60 writes/minute by default). Raise them
+to measure the API rather than the quota, e.g.:
+    SHEETS_WRITES_PER_MINUTE=6000 SHEETS_READS_PER_MINUTE=6000 python3 loadtest/run_load.py
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_upstreams import start_fake_searchapi, start_fake_sheets  # noqa: E402
+
+_OUTREACH_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_API_DIR = os.path.join(_OUTREACH_DIR, "api")
+
+SPREADSHEET_ID = "loadtest-sheet"
+APP_KEY = "loadtest"
+CREATOR_TABS = ["Macros", "Micros", "Submicros", "Ambassadors", "Theme Pages", "AI Influencers"]
+HEADER = ["Name", "Instagram @", "TikTok @", "Email", "IG Views", "TT Views", "Status", "Sent from Email", "Sent IG", "Sent TT", "Initial Outreach Date"]
+
+DEFAULT_MIX = "scrape_new=50,scrape_duplicate=20,add_raw_leads=20,update_contact=10"
+SERVER_CMDS = {
+    "wsgi": "gunicorn --bind 127.0.0.1:{port} --workers {workers} --threads {threads} --timeout 60 --chdir {api_dir} main:app",
+    "asgi": "uvicorn --app-dir {api_dir} --host 127.0.0.1 --port {port} --workers {workers} --no-access-log asgi:app",
+}
+_QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _log(event: str, **fields: Any) -> None:
+    print(json.dumps({"event": event, **fields}))
+
+
+def _parse_range(value: str) -> Tuple[float, float]:
+    low, _, high = value.partition(",")
+    return float(low), float(high or low)
+
+
+def _parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in _REQUEST_KINDS:
+            raise SystemExit(f"Unknown request kind in --mix: {name} (choose from {', '.join(_REQUEST_KINDS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def _quantile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def seed_spreadsheet(sheets, seed_rows: int) -> List[str]:
+    """Fill the creator tabs with seed_rows existing creators; returns their TikTok handles."""
+    handles = [f"seed{n}" for n in range(seed_rows)]
+    rows_by_tab: Dict[str, List[List[Any]]] = {tab: [HEADER] for tab in CREATOR_TABS}
+    for n, handle in enumerate(handles):
+        tab = CREATOR_TABS[n % 4]
+        rows_by_tab[tab].append([
+            handle.title(),
+            "",
+            f'=HYPERLINK("https://www.tiktok.com/@{handle}","@{handle}")',
+            "",
+            0,
+            1000,
+            "",
+            "sender@example.com",
+            "",
+            "",
+            "2026-01-01",
+        ])
+    for tab, rows in rows_by_tab.items():
+        sheets.add_tab(SPREADSHEET_ID, tab, rows)
+    sheets.add_tab(SPREADSHEET_ID, "Raw Leads", [])
+    return handles
+
+
+class _Traffic:
+    """Picks the next request from the mix; new handles are unique per run."""
+
+    def __init__(self, mix: Dict[str, float], seeded: List[str], seed: int):
+        self.kinds = list(mix)
+        self.weights = [mix[k] for k in self.kinds]
+        self.seeded = seeded
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counter = 0
+
+    def next(self) -> Tuple[str, str, str, Dict[str, Any]]:
+        with self._lock:
+            kind = self._random.choices(self.kinds, self.weights)[0]
+            self._counter += 1
+            n = self._counter
+            existing = self._random.choice(self.seeded) if self.seeded else "seed0"
+        return (kind,) + _REQUEST_KINDS[kind](n, existing)
+
+
+_REQUEST_KINDS = {
+    "scrape_new": lambda n, existing: ("POST", "/scrape", {
+        "app": APP_KEY, "url": f"https://www.tiktok.com/@load{n}", "category": ["Macro", "Micro", "Submicro"][n % 3],
+    }),
+    "scrape_duplicate": lambda n, existing: ("POST", "/scrape", {
+        "app": APP_KEY, "url": f"https://www.tiktok.com/@{existing}", "category": "Micro",
+    }),
+    "add_raw_leads": lambda n, existing: ("POST", "/add_raw_leads", {
+        "app": APP_KEY, "url": f"https://www.tiktok.com/@lead{n}", "category": "rawlead", "creator_tier": "Micro",
+    }),
+    "update_contact": lambda n, existing: ("PATCH", "/update_creator_contact", {
+        "app": APP_KEY, "tt_handle": existing, "new_email": f"{existing}+{n}@example.com",
+    }),
+    "healthz": lambda n, existing: ("GET", "/healthz", None),
+}
+
+
+_LOAD_ENDPOINTS = {"/scrape", "/add_raw_leads", "/update_creator_contact", "/healthz"}
+
+
+def _wait_for_app(port: int, proc: subprocess.Popen, timeout_s: float = 60) -> float:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout_s:
+        if proc.poll() is not None:
+            raise SystemExit(f"API process exited with {proc.returncode} before it was ready")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/healthz")
+            if conn.getresponse().status == 200:
+                return time.perf_counter() - started
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit("API did not become ready")
+
+
+def _get_json(url: str, path: str) -> Any:
+    host, _, port = url.replace("http://", "").partition(":")
+    conn = http.client.HTTPConnection(host, int(port), timeout=10)
+    conn.request("GET", path)
+    return json.loads(conn.getresponse().read() or b"null")
+
+
+def run_load(port: int, traffic: _Traffic, total: int, concurrency: int, duration_s: Optional[float]) -> Tuple[List[Dict[str, Any]], float]:
+    """Closed-loop load: `concurrency` clients each send their next request as soon as one returns."""
+    results: List[Dict[str, Any]] = []
+    results_lock = threading.Lock()
+    remaining = [total]
+    deadline = time.perf_counter() + duration_s if duration_s else None
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        while True:
+            with results_lock:
+                if remaining[0] <= 0 or (deadline and time.perf_counter() >= deadline):
+                    return
+                remaining[0] -= 1
+            kind, method, path, body = traffic.next()
+            payload = json.dumps(body).encode() if body is not None else None
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body=payload, headers={"Content-Type": "application/json"} if payload else {})
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+                status = f"error:{type(e).__name__}"
+            with results_lock:
+                results.append({"kind": kind, "status": status, "seconds": time.perf_counter() - started})
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(client)
+    return results, time.perf_counter() - started
+
+
+def summarize(results: List[Dict[str, Any]], elapsed_s: float, upstream: Dict[str, int], app_metrics: Dict[str, Any]) -> Dict[str, Any]:
+    by_kind: Dict[str, List[Dict[str, Any]]] = {}
+    for r in results:
+        by_kind.setdefault(r["kind"], []).append(r)
+    requests_done = len(results)
+    report: Dict[str, Any] = {
+        "requests": requests_done,
+        "seconds": round(elapsed_s, 2),
+        "throughput_rps": round(requests_done / elapsed_s, 2) if elapsed_s else None,
+        "kinds": {},
+        "upstream": upstream,
+        "upstream_per_request": {name: round(count / requests_done, 2) for name, count in upstream.items()} if requests_done else {},
+        "app_stage_counts_per_request": {},
+    }
+    for kind, rows in sorted(by_kind.items()):
+        latencies = [r["seconds"] for r in rows]
+        statuses: Dict[str, int] = {}
+        for r in rows:
+            statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+        report["kinds"][kind] = {
+            "count": len(rows),
+            "statuses": statuses,
+            **{f"p{int(q * 100)}_ms": round(_quantile(latencies, q) * 1000, 1) for q in _QUANTILES},
+        }
+    # The API's own spans say which upstream calls each endpoint made
+    for endpoint, stages in (app_metrics or {}).items():
+        total = (stages.get("total") or {}).get("count") or 0
+        if not total or endpoint not in _LOAD_ENDPOINTS:
+            continue
+        report["app_stage_counts_per_request"][endpoint] = {
+            stage: round(stats["count"] / total, 2)
+            for stage, stats in sorted(stages.items())
+            if stage.startswith(("sheets.", "searchapi.", "google."))
+        }
+    return report
+
+
+def _print_report(report: Dict[str, Any]):
+    print(f"\n{report['requests']} requests in {report['seconds']}s = {report['throughput_rps']} req/s")
+    print(f"{'kind':<18}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  statuses")
+    for kind, stats in report["kinds"].items():
+        print(f"{kind:<18}{stats['count']:>7}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}  {stats['statuses']}")
+    print("\nUpstream calls (per request):")
+    for name, count in sorted(report["upstream"].items()):
+        print(f"  {name:<28}{count:>8}  ({report['upstream_per_request'].get(name)})")
+    if report["app_stage_counts_per_request"]:
+        print("\nAPI spans per request, by endpoint:")
+        for endpoint, stages in report["app_stage_counts_per_request"].items():
+            print(f"  {endpoint}: {stages}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test for the outreach API")
+    parser.add_argument("--requests", type=int, default=500, help="Total requests to send")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds (whichever comes first)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted request kinds ({', '.join(_REQUEST_KINDS)})")
+    parser.add_argument("--seed-rows", type=int, default=2000, help="Existing creators in the fake spreadsheet")
+    parser.add_argument("--sheets-latency-ms", default="40,120", help="min,max added latency per Sheets call")
+    parser.add_argument("--sheets-429-rate", type=float, default=0.0, help="Fraction of Sheets calls answered with 429")
+    parser.add_argument("--searchapi-latency-ms", default="300,900", help="min,max added latency per SearchAPI call")
+    parser.add_argument("--searchapi-429-rate", type=float, default=0.0, help="Fraction of SearchAPI calls answered with 429")
+    parser.add_argument("--workers", type=int, default=1, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+    parser.add_argument("--server", choices=sorted(SERVER_CMDS), default="wsgi", help="Entry point: gunicorn main:app or uvicorn asgi:app")
+    parser.add_argument("--server-cmd", default=None, help="Command that serves the API ({port}, {workers}, {threads}, {api_dir}); overrides --server")
+    parser.add_argument("--port", type=int, default=18080, help="Port for the API under test")
+    parser.add_argument("--seed", type=int, default=17, help="Random seed for the traffic mix and fakes")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the report to this file")
+    parser.add_argument("--app-log", default=None, help="File for the API's stdout/stderr (default: discarded)")
+    args = parser.parse_args()
+
+    sheets_server = start_fake_sheets(latency_ms=_parse_range(args.sheets_latency_ms), error_429_rate=args.sheets_429_rate, seed=args.seed)
+    searchapi_server = start_fake_searchapi(latency_ms=_parse_range(args.searchapi_latency_ms), error_429_rate=args.searchapi_429_rate, seed=args.seed + 1)
+    seeded = seed_spreadsheet(sheets_server.upstream, args.seed_rows)
+
+    app_config = {
+        APP_KEY: {
+            "sheets_spreadsheet_id": SPREADSHEET_ID,
+            "spreadsheet_id": SPREADSHEET_ID,
+            "gmail_sender": "sender@example.com",
+            "from_name": "Load Test",
+            "link_url": "https://example.com/brief",
+        }
+    }
+    scratch = tempfile.mkdtemp(prefix="outreach-loadtest-")
+    env = dict(os.environ)
+    env.update({
+        "OUTREACH_APPS_JSON": json.dumps(app_config),
+        "SHEETS_API_ENDPOINT": sheets_server.url + "/",
+        "GOOGLE_API_ANONYMOUS": "1",
+        "SEARCHAPI_BASE_URL": searchapi_server.url + "/api/v1/search",
+        "SEARCHAPI_KEY": "loadtest",
+        "SEARCHAPI_CACHE_PATH": os.path.join(scratch, "searchapi_cache.sqlite3"),
+        "SHEETS_WRITE_QUEUE_PATH": os.path.join(scratch, "sheet_writes.sqlite3"),
+        "GOOGLE_DELEGATED_USER": "",
+        "PYTHONPATH": os.pathsep.join([_API_DIR, _OUTREACH_DIR, env.get("PYTHONPATH", "")]),
+    })
+    env.pop("GOOGLE_SERVICE_ACCOUNT_JSON", None)
+    env.pop("GOOGLE_APPLICATION_CREDENTIALS", None)
+
+    cmd = (args.server_cmd or SERVER_CMDS[args.server]).format(port=args.port, workers=args.workers, threads=args.threads, api_dir=_API_DIR)
+    app_log = open(args.app_log, "w") if args.app_log else subprocess.DEVNULL
+    print(f"Starting API: {cmd}")
+    proc = subprocess.Popen(shlex.split(cmd), cwd=_API_DIR, env=env, stdout=app_log, stderr=subprocess.STDOUT)
+    try:
+        ready_s = _wait_for_app(args.port, proc)
+        print(f"API ready after {ready_s:.2f}s; sending {args.requests} requests with {args.concurrency} clients")
+        # Count only the load, not startup/warm-up calls
+        _get_json(f"http://127.0.0.1:{args.port}", "/warmup")
+        sheets_server.upstream.reset()
+        searchapi_server.upstream.reset()
+
+        traffic = _Traffic(_parse_mix(args.mix), seeded, args.seed)
+        results, elapsed_s = run_load(args.port, traffic, args.requests, args.concurrency, args.duration)
+
+        upstream = {**sheets_server.upstream.stats(), **searchapi_server.upstream.stats()}
+        try:
+            app_metrics = _get_json(f"http://127.0.0.1:{args.port}", "/debug/metrics?format=json")
+        except (OSError, ValueError):
+            app_metrics = {}
+        report = summarize(results, elapsed_s, upstream, app_metrics)
+        report["config"] = {k: v for k, v in vars(args).items() if k not in ("json_path", "app_log")}
+        report["ready_seconds"] = round(ready_s, 2)
+        _print_report(report)
+        if args.json_path:
+            with open(args.json_path, "w") as f:
+                json.dump(report, f, indent=2)
+        _log("loadtest.done", requests=report["requests"], throughput_rps=report["throughput_rps"])
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        sheets_server.stop()
+        searchapi_server.stop()
+
+
+if __name__ == "__main__":
+    main()
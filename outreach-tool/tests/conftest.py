@@ -2,13 +2,111 @@
 Pytest configuration and fixtures for outreach tool tests.
 """
 import os
+import re
 import sys
+import tempfile
+from unittest.mock import MagicMock
+
 import pytest
 
 # Add the api directory to the path so we can import modules
 API_DIR = os.path.join(os.path.dirname(__file__), "..", "api")
 sys.path.insert(0, API_DIR)
 
+# /warmup is exercised explicitly; don't also warm up in a thread at import
+os.environ.setdefault("WARMUP_ON_START", "0")
+# Keep the write-behind journal out of a developer's real temp dir
+os.environ.setdefault("SHEETS_WRITE_QUEUE_PATH", os.path.join(tempfile.mkdtemp(prefix="outreach-tests-"), "sheet_write_queue.sqlite3"))
+
+# Tracking-tab header row (columns A:K)
+HEADER = ["Name", "Instagram @", "TikTok @", "Email", "IG Views", "TT Views", "Status", "Sent from Email", "Sent IG", "Sent TT", "Date"]
+
+
+def _col_index(letters):
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - ord("A") + 1
+    return n - 1
+
+
+def _split_range(a1):
+    sheet, cells = a1.split("!")
+    return sheet.strip("'"), cells
+
+
+def fake_sheets_service(tabs):
+    """
+    Sheets service mock over {tab title: rows}, rows being lists of cell values
+    (row 1 is rows[0]). Serves spreadsheets.get titles and values.get/batchGet,
+    and applies values.append/update/batchUpdate to the rows in place. append
+    returns an updatedRange the way Sheets does, after the last non-blank row
+    of the appended columns.
+    """
+    service = MagicMock()
+    service.spreadsheets().get.return_value.execute.return_value = {
+        "sheets": [{"properties": {"title": title, "sheetId": n}} for n, title in enumerate(tabs)]
+    }
+
+    def cell(rows, row, col):
+        return rows[row][col] if row < len(rows) and col < len(rows[row]) else ""
+
+    def write(rows, row, col, value):
+        while len(rows) <= row:
+            rows.append([])
+        rows[row].extend([""] * (col + 1 - len(rows[row])))
+        rows[row][col] = value
+
+    def response(payload):
+        request = MagicMock()
+        request.execute.return_value = payload
+        return request
+
+    def get(**kwargs):
+        sheet, cells = _split_range(kwargs["range"])
+        rows = tabs[sheet]
+        if cells == "1:1":
+            return response({"values": [list(rows[0])]} if rows and rows[0] else {})
+        col = _col_index(cells.split(":")[0])
+        height = max([r + 1 for r in range(len(rows)) if cell(rows, r, col) != ""], default=0)
+        return response({"values": [[cell(rows, r, col)] for r in range(height)]})
+
+    def batch_get(spreadsheetId, ranges):
+        return response({"valueRanges": [{"values": [list(row) for row in tabs[_split_range(r)[0]]]} for r in ranges]})
+
+    def batch_update(spreadsheetId, body):
+        for data in body["data"]:
+            sheet, cells = _split_range(data["range"])
+            match = re.match(r"([A-Z]+)(\d+)", cells)
+            first_col, first_row = _col_index(match.group(1)), int(match.group(2)) - 1
+            for r, values in enumerate(data["values"]):
+                for c, value in enumerate(values):
+                    write(tabs[sheet], first_row + r, first_col + c, value)
+        return response({})
+
+    def update(**kwargs):
+        return batch_update(kwargs["spreadsheetId"], {"data": [{"range": kwargs["range"], "values": kwargs["body"]["values"]}]})
+
+    def append(**kwargs):
+        sheet, cells = _split_range(kwargs["range"])
+        body = kwargs["body"]
+        first_letter, last_letter = cells.split(":")
+        first_col, last_col = _col_index(first_letter), _col_index(last_letter)
+        rows = tabs[sheet]
+        start = max([r + 1 for r in range(len(rows)) if any(cell(rows, r, c) != "" for c in range(first_col, last_col + 1))], default=0)
+        for r, values in enumerate(body["values"]):
+            for c, value in enumerate(values):
+                write(rows, start + r, first_col + c, value)
+        last = start + len(body["values"])
+        return response({"updates": {"updatedRange": f"'{sheet}'!{first_letter}{start + 1}:{last_letter}{last}"}})
+
+    service.spreadsheets().values().get.side_effect = get
+    service.spreadsheets().values().batchGet.side_effect = batch_get
+    service.spreadsheets().values().batchUpdate.side_effect = batch_update
+    service.spreadsheets().values().update.side_effect = update
+    service.spreadsheets().values().append.side_effect = append
+    return service
+
+
 @pytest.fixture(scope="session")
 def test_app():
     """Create a test Flask app instance."""
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import asgi
+
+APP_CONFIG = {
+    "app_key": "regen",
+    "sheets_spreadsheet_id": "asgi_sheet",
+    "gmail_sender": "test@example.com",
+    "from_name": "Tester",
+}
+
+
+async def _call(method, path, body=None, query=b""):
+    payload = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "scheme": "http",
+        "root_path": "",
+        "method": method,
+        "path": path,
+        "query_string": query,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+        "client": ("127.0.0.1", 5000),
+        "server": ("testserver", 80),
+    }
+    messages = [{"type": "http.request", "body": payload, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi.app(scope, receive, send)
+    start = sent[0]
+    body = b"".join(message.get("body", b"") for message in sent[1:])
+    return start["status"], dict(start["headers"]), body
+
+
+def _request(method, path, body=None):
+    return asyncio.run(_call(method, path, body))
+
+
+def test_healthz_is_answered_on_the_event_loop(client):
+    with patch.object(asgi, "_wsgi") as wsgi:
+        status, headers, body = _request("GET", "/healthz")
+
+    assert wsgi.call_count == 0
+    flask_response = client.get("/healthz")
+    assert status == flask_response.status_code
+    assert body == flask_response.data
+    assert headers[b"content-type"] == b"application/json"
+
+
+@patch("main._check_creator_exists_across_all_sheets", return_value={
+    "exists": True, "sheet_name": "Macros", "row_index": 7, "status": "Sent",
+})
+@patch("main.scrape_profile_sync", return_value={"tt": "alpha"})
+@patch("main._get_app_config", return_value=dict(APP_CONFIG))
+def test_routes_return_the_same_payload_as_the_wsgi_app(mock_config, mock_scrape, mock_check, client):
+    request = {"app": "regen", "url": "https://www.tiktok.com/@alpha", "category": "Macro"}
+
+    status, headers, body = _request("POST", "/scrape", request)
+    flask_response = client.post("/scrape", json=request)
+
+    assert status == flask_response.status_code == 409
+    assert json.loads(body) == flask_response.get_json()
+    assert headers[b"content-type"] == b"application/json"
+
+    status, _, body = _request("POST", "/scrape", {"app": "regen"})
+    assert status == 400
+    assert json.loads(body) == {"error": "Missing tiktok_url or url"}
+
+
+def _slow_check(spreadsheet_id, ig_handle, tt_handle, delegated_user=None):
+    time.sleep(0.3)
+    return {"exists": True, "sheet_name": "Macros", "row_index": 7, "status": "Sent"}
+
+
+@patch("main._check_creator_exists_across_all_sheets", side_effect=_slow_check)
+@patch("main.scrape_profile_sync", return_value={"tt": "alpha"})
+@patch("main._get_app_config", return_value=dict(APP_CONFIG))
+def test_blocking_requests_wait_concurrently(mock_config, mock_scrape, mock_check):
+    request = {"app": "regen", "url": "https://www.tiktok.com/@alpha", "category": "Macro"}
+
+    async def burst():
+        return await asyncio.gather(*(_call("POST", "/scrape", request) for _ in range(40)))
+
+    started = time.perf_counter()
+    results = asyncio.run(burst())
+    elapsed = time.perf_counter() - started
+
+    assert [status for status, _, _ in results] == [409] * 40
+    # gunicorn's 8 threads would need 5 rounds of 0.3s
+    assert elapsed < 1.0
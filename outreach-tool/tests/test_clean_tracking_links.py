@@ -0,0 +1,60 @@
+import os
+import re
+import sys
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "excel"))
+
+import clean_tracking_links
+
+
+def _fake_service(rows):
+    service = MagicMock()
+    service.spreadsheets().get.return_value.execute.return_value = {
+        "sheets": [{"properties": {"title": "Raw Leads", "gridProperties": {"rowCount": len(rows) + 5}}}]
+    }
+
+    def get(spreadsheetId, range, valueRenderOption):
+        first, last = map(int, re.search(r"!A(\d+):Z(\d+)$", range).groups())
+        request = MagicMock()
+        chunk = rows[first - 1:last]
+        request.execute.return_value = {"values": chunk} if chunk else {}
+        return request
+
+    service.spreadsheets().values().get.side_effect = get
+    return service
+
+
+def test_clean_url_drops_query_and_fragment():
+    assert clean_tracking_links._clean_url(" https://www.tiktok.com/@a?_t=8x&_r=1 ") == "https://www.tiktok.com/@a"
+    assert clean_tracking_links._clean_url("www.instagram.com/p/xyz/?igsh=abc#f") == "https://www.instagram.com/p/xyz/"
+    assert clean_tracking_links._clean_url("https://youtube.com/@a?x=1") == "https://youtube.com/@a?x=1"
+
+
+def test_only_changed_cells_are_written_in_bounded_batches():
+    rows = [["Date"]]
+    for n in range(1, 12):
+        rows.append([f"https://www.tiktok.com/@u{n}?_t=1" if n % 2 else f"https://www.tiktok.com/@u{n}", "note"])
+    rows.append(['=HYPERLINK("https://www.tiktok.com/@f?_t=1","f")'])
+    service = _fake_service(rows)
+
+    stats = clean_tracking_links.clean_sheet(service, "sheet", "Raw Leads", apply=True, chunk_rows=5, batch_cells=4, verbose=False)
+
+    assert stats["rows"] == len(rows)
+    assert stats["links_checked"] == 11
+    assert stats["cells_changed"] == stats["cells_written"] == 6
+    assert stats["read_calls"] == 4
+    calls = service.spreadsheets().values().batchUpdate.call_args_list
+    assert [len(c.kwargs["body"]["data"]) for c in calls] == [4, 2]
+    first = calls[0].kwargs["body"]["data"][0]
+    assert first == {"range": "'Raw Leads'!A2", "values": [["https://www.tiktok.com/@u1"]]}
+
+
+def test_dry_run_writes_nothing():
+    service = _fake_service([["https://www.tiktok.com/@a?_t=1"]])
+
+    stats = clean_tracking_links.clean_sheet(service, "sheet", "Raw Leads", verbose=False)
+
+    assert stats["cells_changed"] == 1
+    assert stats["cells_written"] == 0
+    assert service.spreadsheets().values().batchUpdate.call_count == 0
@@ -0,0 +1,131 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import google_services
+
+
+def setup_function(_):
+    google_services._CLIENT_POOL.clear()
+
+
+@patch("google_services._discovery_document", return_value=None)
+@patch("google_services.build")
+@patch("google_services._load_service_account_credentials")
+def test_sheets_client_is_built_once_per_user(mock_load, mock_build, mock_doc):
+    mock_load.side_effect = lambda scopes, delegated_user=None: MagicMock(name=f"creds-{delegated_user}")
+    mock_build.side_effect = lambda *args, **kwargs: MagicMock()
+
+    first = google_services._sheets_client(delegated_user="a@example.com")
+    second = google_services._sheets_client(delegated_user="a@example.com")
+    other = google_services._sheets_client(delegated_user="b@example.com")
+
+    assert first is second
+    assert other is not first
+    assert mock_load.call_count == 2
+    assert mock_build.call_count == 2
+    stats = google_services.client_pool_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["credential_loads"] == 2
+
+
+@patch("google_services._discovery_document", return_value=None)
+@patch("google_services.build")
+@patch("google_services._load_service_account_credentials")
+def test_clients_are_per_thread_but_credentials_are_shared(mock_load, mock_build, mock_doc):
+    mock_load.return_value = MagicMock(name="creds")
+    mock_build.side_effect = lambda *args, **kwargs: MagicMock()
+
+    main_client = google_services._sheets_client()
+    results = {}
+    worker = threading.Thread(target=lambda: results.setdefault("client", google_services._sheets_client()))
+    worker.start()
+    worker.join()
+
+    # httplib2 transports aren't thread-safe, so each thread gets its own client
+    assert results["client"] is not main_client
+    assert mock_load.call_count == 1
+    assert mock_build.call_count == 2
+
+
+@patch("google_services.build")
+@patch("google_services._load_gcloud_cli_credentials")
+@patch("google_services._load_default_credentials", return_value=None)
+@patch("google_services._load_service_account_credentials", return_value=None)
+def test_unrefreshable_credentials_are_reloaded_after_ttl(mock_sa, mock_adc, mock_gcloud, mock_build):
+    tokens = [MagicMock(name="token-1", refresh_token=None, expiry=None), MagicMock(name="token-2", refresh_token=None, expiry=None)]
+    mock_gcloud.side_effect = tokens
+    mock_build.side_effect = lambda *args, **kwargs: MagicMock()
+
+    first = google_services._sheets_client()
+    with patch("google_services.time.time", return_value=google_services.time.time() + 3600):
+        second = google_services._sheets_client()
+
+    assert mock_gcloud.call_count == 2
+    assert second is not first
+
+
+@patch("google_services._load_gcloud_cli_credentials", return_value=None)
+@patch("google_services._load_default_credentials", return_value=None)
+@patch("google_services._load_service_account_credentials", return_value=None)
+def test_missing_credentials_are_not_cached(mock_sa, mock_adc, mock_gcloud):
+    assert google_services._gmail_client() is None
+    assert google_services._gmail_client() is None
+    assert mock_sa.call_count == 2
+
+
+@patch("google_services.build")
+@patch("google_services.build_from_document")
+@patch("google_services._load_service_account_credentials")
+def test_clients_are_built_from_the_serialized_discovery_document(mock_load, mock_from_doc, mock_build, tmp_path, monkeypatch):
+    (tmp_path / "sheets.v4.json").write_text('{"name": "sheets", "version": "v4"}')
+    monkeypatch.setattr(google_services, "_DISCOVERY_DIR", str(tmp_path))
+    monkeypatch.setattr(google_services, "_DISCOVERY_DOCS", {})
+    mock_load.return_value = MagicMock(name="creds")
+    mock_from_doc.side_effect = lambda *args, **kwargs: MagicMock()
+
+    google_services._sheets_client(delegated_user="a@example.com")
+    google_services._sheets_client(delegated_user="b@example.com")
+
+    assert mock_build.call_count == 0
+    assert mock_from_doc.call_count == 2
+    assert mock_from_doc.call_args[0][0] == {"name": "sheets", "version": "v4"}
+    # Parsed once per process, not once per client build
+    assert list(google_services._DISCOVERY_DOCS) == [("sheets", "v4")]
+
+
+@patch("google_services._load_service_account_credentials")
+def test_pooled_clients_reuse_their_child_resources(mock_load):
+    from google.auth.credentials import AnonymousCredentials
+
+    mock_load.return_value = AnonymousCredentials()
+
+    service = google_services._sheets_client()
+    values = service.spreadsheets().values()
+
+    assert service.spreadsheets() is service.spreadsheets()
+    assert service.spreadsheets().values() is values
+    request = values.get(spreadsheetId="abc123", range="Macros!A:K")
+    assert "/spreadsheets/abc123/values/" in request.uri
+
+
+def test_warm_up_uses_the_routes_sheets_user_and_only_the_health_gmail_client():
+    import main
+
+    apps = {"regen": {
+        "app_key": "regen",
+        "sheets_spreadsheet_id": "warm_sheet",
+        "gmail_sender": "sender@example.com",
+        "sender_profiles": {"abhay": {"email": "abhay@example.com"}},
+    }}
+    with patch("main._OUTREACH_APPS", apps), \
+            patch("main._get_app_config", side_effect=lambda key: dict(apps[key])), \
+            patch("main.preload_templates", return_value={"sets": 0, "errors": []}), \
+            patch("main._prewarm_handle_index", return_value={"ok": True}) as mock_index, \
+            patch("main.prewarm_clients", return_value={}) as mock_prewarm:
+        main._warm_up(force=True)
+
+    sheets_users, gmail_users = mock_prewarm.call_args[0]
+    assert sheets_users == [None, "sender@example.com", "abhay@example.com"]
+    assert gmail_users == [None]
+    mock_index.assert_called_once_with("warm_sheet", "sender@example.com")
@@ -0,0 +1,101 @@
+import threading
+from unittest.mock import patch
+
+import sheets_operations
+from conftest import HEADER, fake_sheets_service
+
+
+def setup_function(_):
+    sheets_operations._invalidate_handle_index()
+    sheets_operations._SHEET_TITLE_CACHE.clear()
+
+
+def test_lookup_across_tabs_uses_one_batch_get():
+    service = fake_sheets_service({
+        "Macros": [HEADER, ["A", '=HYPERLINK("https://www.instagram.com/alpha", "@alpha")', "", "a@x.com", 0, 0, "Sent", "me@x.com", "", "", "2024-01-01"]],
+        "Micros": [HEADER, ["B", "", "@bravo", "", 0, 0, "Followup Sent", "you@x.com", "", "", "2024-02-02"]],
+    })
+    with patch("sheets_operations._sheets_client", return_value=service):
+        found = sheets_operations._check_creator_exists_across_all_sheets("sheet1", "", "Bravo")
+        missing = sheets_operations._check_creator_exists_across_all_sheets("sheet1", "nobody", "nobody")
+        in_tab = sheets_operations._check_creator_exists("sheet1", "Macros", "@alpha", "")
+
+    assert found == {
+        "exists": True,
+        "sheet_name": "Micros",
+        "row_index": 2,
+        "email_message_id": None,
+        "status": "Followup Sent",
+        "initial_outreach_date": "2024-02-02",
+        "sent_from_email": "you@x.com",
+    }
+    assert missing == {"exists": False}
+    assert in_tab["exists"] and in_tab["row_index"] == 2 and "sheet_name" not in in_tab
+    assert service.spreadsheets().values().batchGet.call_count == 1
+
+
+def test_first_tab_in_order_wins():
+    service = fake_sheets_service({
+        "Raw Leads": [HEADER, ["", "@dup", "", ""]],
+        "Macros": [HEADER, ["", "", ""], ["", "@dup", "", "", 0, 0, "Sent"]],
+    })
+    with patch("sheets_operations._sheets_client", return_value=service):
+        found = sheets_operations._check_creator_exists_across_all_sheets("sheet1", "dup", "")
+
+    assert found["sheet_name"] == "Macros"
+    assert found["row_index"] == 3
+
+
+def test_own_writes_update_index_without_rereading():
+    service = fake_sheets_service({"Macros": [HEADER]})
+    with patch("sheets_operations._sheets_client", return_value=service):
+        assert sheets_operations._check_creator_exists_across_all_sheets("sheet1", "new_one", "")["exists"] is False
+        sheets_operations._append_to_sheet("sheet1", "Macros", ["N", "@new_one", "@new_tt", "", 0, 0, "Sent"])
+        found = sheets_operations._check_creator_exists_across_all_sheets("sheet1", "", "new_tt")
+        sheets_operations._update_creator_contact_info("sheet1", "Macros", 2, ig_handle="renamed")
+        renamed = sheets_operations._check_creator_exists_across_all_sheets("sheet1", "renamed", "")
+        old = sheets_operations._check_creator_exists_across_all_sheets("sheet1", "new_one", "")
+
+    assert found["exists"] and found["row_index"] == 2 and found["status"] == "Sent"
+    assert renamed["exists"] and renamed["row_index"] == 2
+    assert old == {"exists": False}
+    assert service.spreadsheets().values().batchGet.call_count == 1
+
+
+def test_index_is_reread_after_ttl():
+    service = fake_sheets_service({"Macros": [HEADER]})
+    with patch("sheets_operations._sheets_client", return_value=service):
+        sheets_operations._check_creator_exists_across_all_sheets("sheet1", "x", "")
+        with patch("sheets_operations.time.time", return_value=sheets_operations.time.time() + sheets_operations._HANDLE_INDEX_TTL_S + 1):
+            sheets_operations._check_creator_exists_across_all_sheets("sheet1", "x", "")
+
+    assert service.spreadsheets().values().batchGet.call_count == 2
+
+
+def test_write_during_first_build_is_not_lost():
+    service = fake_sheets_service({"Macros": [HEADER]})
+    batch_get = service.spreadsheets().values().batchGet.side_effect
+    in_batch_get = threading.Event()
+    release = threading.Event()
+
+    # The build's read happens before the write below lands, so its snapshot lacks the row
+    def slow_batch_get(spreadsheetId, ranges):
+        request = batch_get(spreadsheetId, ranges)
+        in_batch_get.set()
+        release.wait(5)
+        return request
+
+    service.spreadsheets().values().batchGet.side_effect = slow_batch_get
+    with patch("sheets_operations._sheets_client", return_value=service):
+        builder = threading.Thread(target=sheets_operations._check_creator_exists_across_all_sheets, args=("sheet1", "", "x"))
+        builder.start()
+        assert in_batch_get.wait(5)
+        writer = threading.Thread(target=sheets_operations._note_row_written, args=("sheet1", "Macros", 2, ["N", "@late", "", ""]))
+        writer.start()
+        release.set()
+        builder.join(5)
+        writer.join(5)
+        found = sheets_operations._check_creator_exists("sheet1", "Macros", "late", "")
+
+    assert found["exists"] and found["row_index"] == 2
+    assert service.spreadsheets().values().batchGet.call_count == 1
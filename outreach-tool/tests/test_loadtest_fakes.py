@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+import urllib.request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "loadtest"))
+
+from fake_upstreams import parse_a1, start_fake_searchapi, start_fake_sheets
+
+
+def _sheets_client(url):
+    from google.auth.credentials import AnonymousCredentials
+    from googleapiclient.discovery import build_from_document
+    from googleapiclient.discovery_cache import get_static_doc
+
+    return build_from_document(
+        get_static_doc("sheets", "v4"),
+        credentials=AnonymousCredentials(),
+        client_options={"api_endpoint": url + "/"},
+    )
+
+
+def test_parse_a1():
+    assert parse_a1("'Raw Leads'!B2:D") == ("Raw Leads", 1, 1, None, 3)
+    assert parse_a1("Macros!A:K") == ("Macros", None, 0, None, 10)
+    assert parse_a1("Macros") == ("Macros", None, None, None, None)
+
+
+def test_fake_sheets_round_trips_through_the_google_client():
+    server = start_fake_sheets()
+    try:
+        server.upstream.add_tab("sheet1", "Macros", [["Name", "TT"], ["Alpha", "alpha"]])
+        values = _sheets_client(server.url).spreadsheets().values()
+
+        values.append(spreadsheetId="sheet1", range="Macros!A:B", valueInputOption="RAW", body={"values": [["Beta", "beta"]]}).execute()
+        values.batchUpdate(spreadsheetId="sheet1", body={
+            "valueInputOption": "RAW",
+            "data": [{"range": "Macros!C2", "values": [["a@example.com"]]}],
+        }).execute()
+        result = values.get(spreadsheetId="sheet1", range="Macros!A2:C").execute()
+
+        assert result["values"] == [["Alpha", "alpha", "a@example.com"], ["Beta", "beta"]]
+        assert server.upstream.stats() == {"sheets.read": 1, "sheets.write": 2}
+    finally:
+        server.stop()
+
+
+def test_fake_searchapi_profiles_are_stable():
+    server = start_fake_searchapi(email_every=1)
+    try:
+        with urllib.request.urlopen(f"{server.url}/api/v1/search?engine=tiktok_profile&username=alpha") as resp:
+            profile = json.load(resp)["profile"]
+        assert profile["username"] == "alpha"
+        assert "alpha@example.com" in profile["bio"]
+        assert server.upstream.stats() == {"searchapi.tiktok_profile": 1}
+    finally:
+        server.stop()
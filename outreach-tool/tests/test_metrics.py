@@ -0,0 +1,62 @@
+from unittest.mock import MagicMock
+
+import google_services
+import metrics
+
+
+def setup_function(_):
+    metrics._METRICS.clear()
+
+
+def test_spans_go_to_the_request_trace_and_series():
+    token = metrics.start_trace("/scrape")
+    for ms in range(1, 101):
+        metrics.record_span("searchapi.tiktok_profile", ms / 1000)
+    with metrics.span("dedupe"):
+        pass
+    trace = metrics.finish_trace(token)
+
+    assert trace.summary()["searchapi.tiktok_profile"]["count"] == 100
+    assert set(trace.summary()) == {"searchapi.tiktok_profile", "dedupe"}
+    stats = metrics.metrics_snapshot()["/scrape"]["searchapi.tiktok_profile"]
+    assert (stats["p50_ms"], stats["p95_ms"], stats["p99_ms"]) == (51.0, 96.0, 100.0)
+    assert "total" in metrics.metrics_snapshot()["/scrape"]
+    # Outside a request spans are filed as background
+    metrics.record_span("sheets.write", 0.01)
+    assert "background" in metrics.metrics_snapshot()
+
+
+def test_google_http_calls_are_timed_by_stage():
+    inner = MagicMock()
+    inner.request.return_value = ("resp", b"{}")
+    http = google_services._TimedHttp(inner)
+    inner.timeout = 60
+
+    http.request("https://sheets.googleapis.com/v4/spreadsheets/x/values/A:K", "GET")
+    http.request("https://sheets.googleapis.com/v4/spreadsheets/x:batchUpdate", method="POST", body="{}")
+    http.request("https://oauth2.googleapis.com/token", "POST")
+
+    assert set(metrics.metrics_snapshot()["background"]) == {"sheets.read", "sheets.write", "google.auth_refresh"}
+    assert http.timeout == 60
+
+
+def test_debug_metrics_endpoint_renders_prometheus_text(client):
+    client.get("/healthz")
+    response = client.get("/debug/metrics")
+    text = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert "# TYPE outreach_stage_duration_seconds summary" in text
+    assert 'outreach_stage_duration_seconds{endpoint="/healthz",stage="total",quantile="0.99"}' in text
+    assert 'outreach_stage_duration_seconds_count{endpoint="/healthz",stage="total"} 1' in text
+
+
+def test_startup_steps_are_kept_apart_from_requests():
+    with metrics.startup_span("warmup.templates"):
+        pass
+    metrics.record_startup("import", 0.25)
+
+    assert metrics.startup_timings()["import"] == 250.0
+    assert "warmup.templates" in metrics.startup_timings()
+    assert set(metrics.metrics_snapshot()["startup"]) >= {"import", "warmup.templates"}
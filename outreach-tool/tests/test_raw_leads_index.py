@@ -0,0 +1,91 @@
+from unittest.mock import patch
+
+import sheets_operations
+from conftest import fake_sheets_service
+
+
+def setup_function(_):
+    sheets_operations._RAW_LEADS_INDEXES.clear()
+    sheets_operations._SHEET_ID_CACHE.clear()
+
+
+@patch("sheets_operations.datetime")
+def test_appends_after_first_are_one_write_each(mock_datetime):
+    mock_datetime.now.return_value.strftime.return_value = "Feb 27"
+    rows = [["Name"]]
+    service = fake_sheets_service({"Raw Leads": rows})
+    with patch("sheets_operations._sheets_client", return_value=service):
+        first = sheets_operations._append_url_to_raw_leads_column("sheet1", "https://t/@a", "Abhay C", "Macro")
+        reads_after_first = service.spreadsheets().values().get.call_count
+        second = sheets_operations._append_url_to_raw_leads_column("sheet1", "https://t/@b", "Abhay C", "Micro")
+        duplicate = sheets_operations._append_url_to_raw_leads_column("sheet1", "https://t/@a", "Abhay", "Macro")
+
+    assert first["row_added"] == 2 and first["column_header"] == "Feb 27 (Abhay)"
+    assert second["row_added"] == 3
+    assert duplicate == {
+        "ok": False,
+        "error": "Duplicate URL",
+        "message": "URL already exists in column 'Feb 27 (Abhay)' at row 2",
+        "duplicate_row": 2,
+    }
+    assert rows[0][1] == "Feb 27 (Abhay)" and rows[0][2] == "Feb 27 (Abhay) Tier"
+    assert rows[2][1] == "https://t/@b" and rows[2][2] == "Micro"
+    # Header row read once, the brand-new column never read
+    assert reads_after_first == 1
+    assert service.spreadsheets().values().get.call_count == 1
+    # Headers in one batchUpdate, then one append per URL/tier pair
+    assert service.spreadsheets().values().batchUpdate.call_count == 1
+    assert service.spreadsheets().values().append.call_count == 2
+    append_kwargs = service.spreadsheets().values().append.call_args.kwargs
+    assert append_kwargs["range"] == "Raw Leads!B:C"
+    assert append_kwargs["insertDataOption"] == "OVERWRITE"
+
+
+@patch("sheets_operations.datetime")
+def test_existing_column_is_read_once_then_cached(mock_datetime):
+    mock_datetime.now.return_value.strftime.return_value = "Feb 27"
+    rows = [["Feb 27 (Abhay)", "Feb 27 (Abhay) Tier"], [" https://t/@old "], ["https://t/@x"]]
+    service = fake_sheets_service({"Raw Leads": rows})
+    with patch("sheets_operations._sheets_client", return_value=service):
+        dup = sheets_operations._append_url_to_raw_leads_column("sheet1", "https://t/@old", "Abhay", "Macro")
+        added = sheets_operations._append_url_to_raw_leads_column("sheet1", "https://t/@new", "Abhay", "Macro")
+        with patch("sheets_operations.time.time", return_value=sheets_operations.time.time() + sheets_operations._HANDLE_INDEX_TTL_S + 1):
+            after_ttl = sheets_operations._append_url_to_raw_leads_column("sheet1", "https://t/@newer", "Abhay", "Macro")
+
+    assert dup["duplicate_row"] == 2
+    assert added["row_added"] == 4
+    assert after_ttl["row_added"] == 5
+    # Header + column before the TTL, header + column again after it
+    assert service.spreadsheets().values().get.call_count == 4
+
+
+@patch("sheets_operations.datetime")
+def test_row_comes_from_the_append_not_a_cached_count(mock_datetime):
+    mock_datetime.now.return_value.strftime.return_value = "Feb 27"
+    rows = [["Feb 27 (Abhay)", "Feb 27 (Abhay) Tier"], ["https://t/@old"]]
+    service = fake_sheets_service({"Raw Leads": rows})
+    with patch("sheets_operations._sheets_client", return_value=service):
+        first = sheets_operations._append_url_to_raw_leads_column("sheet1", "https://t/@a", "Abhay", "Macro")
+        # Someone adds a row by hand between our appends
+        rows.append(["https://t/@manual"])
+        second = sheets_operations._append_url_to_raw_leads_column("sheet1", "https://t/@b", "Abhay", "Micro")
+        duplicate = sheets_operations._append_url_to_raw_leads_column("sheet1", "https://t/@b", "Abhay", "Micro")
+
+    assert first["row_added"] == 3
+    assert second["row_added"] == 5
+    assert rows[4][0] == "https://t/@b" and rows[4][1] == "Micro"
+    assert duplicate["duplicate_row"] == 5
+
+
+@patch("sheets_operations.datetime")
+def test_split_url_and_tier_columns_append_then_update(mock_datetime):
+    mock_datetime.now.return_value.strftime.return_value = "Feb 27"
+    rows = [["Feb 27 (Abhay)", "Other", "Feb 27 (Abhay) Tier"], ["", "x"], ["", "y"]]
+    service = fake_sheets_service({"Raw Leads": rows})
+    with patch("sheets_operations._sheets_client", return_value=service):
+        added = sheets_operations._append_url_to_raw_leads_column("sheet1", "https://t/@a", "Abhay", "Macro")
+
+    assert added["row_added"] == 2
+    assert service.spreadsheets().values().append.call_args.kwargs["range"] == "Raw Leads!A:A"
+    assert rows[1][0] == "https://t/@a" and rows[1][2] == "Macro"
+
@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+import sheets_operations
+from conftest import HEADER, fake_sheets_service
+
+APP_CONFIG = {
+    "app_key": "regen",
+    "sheets_spreadsheet_id": "batch_sheet",
+    "gmail_sender": "test@example.com",
+    "from_name": "Tester",
+}
+
+
+def _profile(url, timeout_seconds=None):
+    handle = url.rstrip("/").split("@")[-1]
+    return {"tt": handle, "name": handle.title(), "email": f"{handle}@example.com" if handle != "noemail" else ""}
+
+
+def setup_function(_):
+    sheets_operations._invalidate_handle_index()
+    sheets_operations._SHEET_TITLE_CACHE.clear()
+    sheets_operations._SHEET_ID_CACHE.clear()
+
+
+@patch("main._build_email_and_dm", return_value={"dm_md": "DM", "subject": "Subject", "email_md": "Body"})
+@patch("main.scrape_profile_sync", side_effect=_profile)
+@patch("main._get_app_config", return_value=dict(APP_CONFIG))
+def test_batch_writes_all_rows_with_one_append_per_tab(mock_config, mock_scrape, mock_build, client):
+    tabs = {
+        "Macros": [HEADER, ["Old", "", "@known", "", 0, 0, "Sent"]],
+        "Micros": [HEADER],
+    }
+    service = fake_sheets_service(tabs)
+    payload = {
+        "app": "regen",
+        "items": [
+            {"url": "https://www.tiktok.com/@alpha", "category": "Macro"},
+            {"url": "https://www.tiktok.com/@known", "category": "Micro"},
+            {"url": "https://www.tiktok.com/@noemail", "category": "Micro"},
+            {"url": "https://www.tiktok.com/@ALPHA", "category": "Micro"},
+            {"url": "https://www.tiktok.com/@bravo", "category": "Raw Lead"},
+            {"url": "https://www.tiktok.com/@charlie", "category": "Macro"},
+        ],
+    }
+    with patch("sheets_operations._sheets_client", return_value=service):
+        response = client.post("/scrape_batch", json=payload)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    statuses = [r["status"] for r in data["results"]]
+    assert statuses == ["added", "duplicate", "added", "duplicate", "invalid", "added"]
+    assert data["results"][1]["sheet_name"] == "Macros"
+    assert data["results"][3]["duplicate_of"] == 0
+    assert [r.get("row_added") for r in data["results"]] == [3, None, 2, None, None, 4]
+    assert data["results"][0]["email_to"] == "alpha@example.com"
+    assert data["summary"] == {"added": 3, "duplicate": 2, "invalid": 1}
+
+    assert mock_scrape.call_count == 3
+    assert service.spreadsheets().values().batchGet.call_count == 1
+    assert service.spreadsheets().values().append.call_count == 2
+    dv_calls = service.spreadsheets().batchUpdate.call_args_list
+    assert len(dv_calls) == 1
+    ranges = [r["setDataValidation"]["range"] for r in dv_calls[0].kwargs["body"]["requests"]]
+    assert sorted((r["sheetId"], r["startRowIndex"], r["endRowIndex"]) for r in ranges) == [(0, 2, 4), (1, 1, 2)]
+    assert tabs["Micros"][1][6] == "No Email"
+
+
+@patch("main._get_app_config", return_value=dict(APP_CONFIG))
+def test_batch_rejects_oversized_or_empty_requests(mock_config, client):
+    with patch("main._SCRAPE_BATCH_MAX_ITEMS", 2):
+        too_many = client.post("/scrape_batch", json={"urls": ["a", "b", "c"], "category": "Macro"})
+    empty = client.post("/scrape_batch", json={"items": []})
+
+    assert too_many.status_code == 400
+    assert too_many.get_json()["error"] == "Too many items"
+    assert empty.status_code == 400
@@ -0,0 +1,92 @@
+import threading
+from unittest.mock import patch
+
+APP_CONFIG = {
+    "app_key": "regen",
+    "sheets_spreadsheet_id": "overlap_sheet",
+    "gmail_sender": "test@example.com",
+    "from_name": "Tester",
+}
+
+# Long enough never to trip on a slow machine; a timeout means the calls ran one after the other
+_WAIT_S = 5.0
+
+
+def _scrape(url, timeout_seconds=None):
+    return {"tt": "alpha", "name": "Alpha", "email": "alpha@example.com"}
+
+
+@patch("main._append_to_sheet", return_value={"ok": True})
+@patch("main._build_email_and_dm", return_value={"dm_md": "DM", "subject": "Subject", "email_md": "Body"})
+@patch("main._check_creator_exists_across_all_sheets")
+@patch("main.scrape_profile_sync")
+@patch("main._get_app_config", return_value=dict(APP_CONFIG))
+def test_scrape_runs_alongside_the_duplicate_check(mock_config, mock_scrape, mock_check, mock_build, mock_append, client):
+    scrape_started = threading.Event()
+    check_started = threading.Event()
+    overlapped = []
+
+    # Each mock waits for the other to start, so both only return if they run at once
+    def scrape(url, timeout_seconds=None):
+        scrape_started.set()
+        overlapped.append(check_started.wait(_WAIT_S))
+        return {"tt": "alpha", "name": "Alpha", "email": "alpha@example.com"}
+
+    def check(spreadsheet_id, ig_handle, tt_handle, delegated_user=None):
+        check_started.set()
+        overlapped.append(scrape_started.wait(_WAIT_S))
+        return {"exists": False}
+
+    mock_scrape.side_effect = scrape
+    mock_check.side_effect = check
+    response = client.post("/scrape", json={"app": "regen", "url": "https://www.tiktok.com/@alpha", "category": "Macro"})
+
+    assert response.status_code == 200
+    assert response.get_json()["email_to"] == "alpha@example.com"
+    assert mock_scrape.call_count == 1
+    assert mock_append.call_count == 1
+    assert overlapped == [True, True]
+
+
+@patch("main._append_to_sheet")
+@patch("main._check_creator_exists_across_all_sheets", return_value={
+    "exists": True, "sheet_name": "Macros", "row_index": 7, "status": "Sent",
+})
+@patch("main.scrape_profile_sync")
+@patch("main._get_app_config", return_value=dict(APP_CONFIG))
+def test_duplicate_response_does_not_wait_for_the_scrape(mock_config, mock_scrape, mock_check, mock_append, client):
+    responded = threading.Event()
+    scrape_done = threading.Event()
+    waited_for_scrape = []
+
+    # The scrape can't finish until the response is out; if the view waited on
+    # it, the wait times out and says so
+    def scrape(url, timeout_seconds=None):
+        waited_for_scrape.append(not responded.wait(_WAIT_S))
+        scrape_done.set()
+        return {"tt": "alpha"}
+
+    mock_scrape.side_effect = scrape
+    response = client.post("/scrape", json={"app": "regen", "url": "https://www.tiktok.com/@alpha", "category": "Macro"})
+    responded.set()
+    # The scrape may have been cancelled before it started
+    if mock_scrape.call_count:
+        scrape_done.wait(_WAIT_S)
+
+    assert response.status_code == 409
+    data = response.get_json()
+    assert data["error"] == "Creator already contacted"
+    assert (data["sheet_name"], data["row_index"], data["status"]) == ("Macros", 7, "Sent")
+    assert mock_append.call_count == 0
+    assert waited_for_scrape in ([], [False])
+
+
+@patch("main._SCRAPE_OVERLAP_DEDUPE", False)
+@patch("main._check_creator_exists_across_all_sheets", return_value={"exists": True, "sheet_name": "Macros", "row_index": 7})
+@patch("main.scrape_profile_sync", side_effect=_scrape)
+@patch("main._get_app_config", return_value=dict(APP_CONFIG))
+def test_overlap_can_be_disabled(mock_config, mock_scrape, mock_check, client):
+    response = client.post("/scrape", json={"app": "regen", "url": "https://www.tiktok.com/@alpha", "category": "Macro"})
+
+    assert response.status_code == 409
+    assert mock_scrape.call_count == 0
@@ -0,0 +1,88 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import scrape_profile
+from searchapi_cache import SearchApiCache
+
+
+def _cache(tmp_path, **kwargs):
+    return SearchApiCache(str(tmp_path / "cache.sqlite3"), **kwargs)
+
+
+def test_found_profiles_are_served_from_disk(tmp_path):
+    fetch = MagicMock(return_value={"username": "alpha", "followers": 10})
+    cache = _cache(tmp_path)
+
+    first = cache.get_or_fetch("tiktok_profile", "Alpha", fetch)
+    # A new instance on the same file sees the stored row
+    second = _cache(tmp_path).get_or_fetch("tiktok_profile", "alpha", fetch)
+
+    assert first == second == {"username": "alpha", "followers": 10}
+    assert fetch.call_count == 1
+
+
+def test_not_found_is_cached_but_other_errors_are_not(tmp_path):
+    cache = _cache(tmp_path)
+    missing = MagicMock(return_value={"error": "Profile not found", "not_found": True})
+    timeout = MagicMock(return_value={"error": "Request timeout"})
+
+    for _ in range(2):
+        cache.get_or_fetch("tiktok_profile", "ghost", missing)
+        cache.get_or_fetch("tiktok_profile", "slow", timeout)
+
+    assert missing.call_count == 1
+    assert timeout.call_count == 2
+    assert cache.stats["negative_hits"] == 1
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = _cache(tmp_path, ttl_s=60)
+    fetch = MagicMock(return_value={"username": "alpha"})
+
+    cache.get_or_fetch("tiktok_profile", "alpha", fetch)
+    with patch("searchapi_cache.time.time", return_value=time.time() + 61):
+        cache.get_or_fetch("tiktok_profile", "alpha", fetch)
+
+    assert fetch.call_count == 2
+
+
+def test_concurrent_lookups_share_one_request(tmp_path):
+    cache = _cache(tmp_path)
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"username": "alpha"}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_fetch("youtube_channel", "@alpha", slow_fetch)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    while cache.stats["coalesced"] < 3:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"username": "alpha"}] * 4
+
+
+def test_scrapers_normalize_handles_before_caching(tmp_path):
+    cache = _cache(tmp_path)
+    with patch("scrape_profile.get_searchapi_cache", return_value=cache), \
+         patch("scrape_profile._fetch_tiktok_with_searchapi", return_value={"username": "alpha"}) as tiktok, \
+         patch("scrape_profile._fetch_youtube_with_searchapi", return_value={"username": "Alpha"}) as youtube:
+        scrape_profile.scrape_tiktok_with_searchapi("@Alpha")
+        scrape_profile.scrape_tiktok_with_searchapi("alpha ")
+        scrape_profile.scrape_youtube_with_searchapi("Alpha")
+        scrape_profile.scrape_youtube_with_searchapi("@alpha")
+
+    tiktok.assert_called_once_with("Alpha")
+    youtube.assert_called_once_with("@Alpha")
@@ -0,0 +1,115 @@
+from unittest.mock import patch
+
+from sheet_write_queue import SheetWriteQueue, existing_sheet_write_queue
+
+
+def _queue(tmp_path):
+    queue = SheetWriteQueue(str(tmp_path / "writes.sqlite3"))
+    # Tests drive flush() themselves
+    queue.start = lambda: None
+    return queue
+
+
+def test_flush_coalesces_rows_per_spreadsheet(tmp_path):
+    queue = _queue(tmp_path)
+    a = queue.enqueue("sheet1", "Macros", ["A"], delegated_user="me@x.com")
+    b = queue.enqueue("sheet1", "Micros", ["B"], delegated_user="me@x.com")
+    c = queue.enqueue("sheet1", "Macros", ["C"], delegated_user="me@x.com")
+    written = {"ok": True, "sheets": {"Macros": {"ok": True, "rows": [10, 11]}, "Micros": {"ok": True, "rows": [4]}}}
+
+    with patch("sheet_write_queue._append_rows_to_sheets", return_value=written) as append:
+        assert queue.flush() == 3
+
+    append.assert_called_once_with("sheet1", {"Macros": [["A"], ["C"]], "Micros": [["B"]]}, delegated_user="me@x.com")
+    assert [queue.status(i)["row_added"] for i in (a, b, c)] == [10, 4, 11]
+    assert {queue.status(i)["status"] for i in (a, b, c)} == {"done"}
+
+
+def test_failed_write_is_retried_later(tmp_path):
+    queue = _queue(tmp_path)
+    write_id = queue.enqueue("sheet1", "Macros", ["A"])
+
+    with patch("sheet_write_queue._append_rows_to_sheets", return_value={"ok": False, "error": "quota"}):
+        queue.flush()
+        # Backing off: nothing is due yet
+        assert queue.flush() == 0
+
+    status = queue.status(write_id)
+    assert status["status"] == "pending"
+    assert status["attempts"] == 1
+    assert status["error"] == "quota"
+
+
+def test_interrupted_writes_resume_after_restart(tmp_path):
+    queue = _queue(tmp_path)
+    write_id = queue.enqueue("sheet1", "Macros", ["A"], tt_handle="@Alpha")
+    queue._conn.execute("UPDATE sheet_writes SET status = 'writing'")
+    queue._conn.commit()
+
+    reopened = _queue(tmp_path)
+    assert reopened.status(write_id)["status"] == "pending"
+    assert reopened.find_unwritten("sheet1", "", "alpha")["write_id"] == write_id
+
+
+@patch("main._build_email_and_dm", return_value={"dm_md": "DM", "subject": "Subject", "email_md": "Body"})
+@patch("main.scrape_profile_sync", return_value={"tt": "queued_creator", "name": "Q", "email": ""})
+@patch("main._check_creator_exists_across_all_sheets", return_value={"exists": False})
+@patch("main._append_to_sheet")
+@patch("main._get_app_config", return_value={"app_key": "regen", "sheets_spreadsheet_id": "sheet1", "gmail_sender": "me@x.com"})
+def test_scrape_returns_before_the_write_in_write_behind_mode(mock_config, mock_append, mock_exists, mock_scrape, mock_build, client, tmp_path):
+    queue = _queue(tmp_path)
+    payload = {"app": "regen", "url": "https://www.tiktok.com/@queued_creator", "category": "Macro", "write_behind": True}
+    with patch("main.get_sheet_write_queue", return_value=queue), patch("main.existing_sheet_write_queue", return_value=queue):
+        first = client.post("/scrape", json=payload)
+        again = client.post("/scrape", json=payload)
+        status = client.get(f"/sheet_writes/{first.get_json()['sheet_write_id']}")
+
+    assert first.status_code == 200
+    assert first.get_json()["dm_text"] == "DM"
+    assert first.get_json()["sheet_write_status"] == "pending"
+    mock_append.assert_not_called()
+    assert again.status_code == 409
+    assert status.get_json()["status"] == "pending"
+
+
+@patch("main.scrape_profile_sync", return_value={"tt": "queued_creator"})
+@patch("main._check_creator_exists_across_all_sheets", return_value={"exists": False})
+@patch("main._get_app_config", return_value={"app_key": "regen", "sheets_spreadsheet_id": "sheet1", "gmail_sender": "me@x.com"})
+def test_direct_write_requests_still_see_queued_rows(mock_config, mock_exists, mock_scrape, client, tmp_path):
+    queue = _queue(tmp_path)
+    write_id = queue.enqueue("sheet1", "Macros", ["Q"], tt_handle="queued_creator")
+    payload = {"app": "regen", "url": "https://www.tiktok.com/@queued_creator", "category": "Macro", "write_behind": False}
+    with patch("main.existing_sheet_write_queue", return_value=queue):
+        response = client.post("/scrape", json=payload)
+
+    assert response.status_code == 409
+    assert response.get_json()["sheet_write_id"] == write_id
+
+
+@patch("main._append_rows_to_sheets")
+@patch("main.scrape_profile_sync", return_value={"tt": "fresh"})
+@patch("main._check_creators_exist_across_all_sheets", return_value=[{"exists": False}, {"exists": False}])
+@patch("main._get_app_config", return_value={"app_key": "regen", "sheets_spreadsheet_id": "sheet1", "gmail_sender": "me@x.com"})
+def test_batch_dedupe_sees_queued_rows(mock_config, mock_exists, mock_scrape, mock_append, client, tmp_path):
+    queue = _queue(tmp_path)
+    write_id = queue.enqueue("sheet1", "Macros", ["Q"], tt_handle="queued_creator")
+    mock_append.return_value = {"ok": True, "sheets": {"Macros": {"ok": True, "rows": [7]}}}
+    items = [
+        {"url": "https://www.tiktok.com/@queued_creator", "category": "Macro"},
+        {"url": "https://www.tiktok.com/@fresh", "category": "Macro"},
+    ]
+    with patch("main.existing_sheet_write_queue", return_value=queue):
+        response = client.post("/scrape_batch", json={"app": "regen", "items": items})
+
+    results = response.get_json()["results"]
+    assert results[0]["status"] == "duplicate"
+    assert results[0]["sheet_write_id"] == write_id
+    assert results[1]["status"] != "duplicate"
+    assert mock_scrape.call_count == 1
+
+
+def test_existing_queue_is_not_created_on_lookup(tmp_path):
+    path = tmp_path / "absent.sqlite3"
+    with patch.dict("os.environ", {"SHEETS_WRITE_QUEUE_PATH": str(path)}), patch("sheet_write_queue._QUEUE", None):
+        assert existing_sheet_write_queue() is None
+    assert not path.exists()
@@ -0,0 +1,119 @@
+import threading
+import time
+
+from sheets_scheduler import ScheduledHttp, SheetsCallScheduler
+
+_VALUES_URL = "https://sheets.googleapis.com/v4/spreadsheets/abc123/values/Macros!A:K"
+_APPEND_URL = "https://sheets.googleapis.com/v4/spreadsheets/abc123/values/Macros!A:K:append"
+
+
+class _Resp(dict):
+    def __init__(self, status, headers=None):
+        super().__init__(headers or {})
+        self.status = status
+
+
+class _FakeHttp:
+    def __init__(self, statuses=(), delay_s=0.0):
+        self.statuses = list(statuses)
+        self.delay_s = delay_s
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def request(self, uri, method="GET", *args, **kwargs):
+        with self.lock:
+            self.calls.append((uri, method))
+            status = self.statuses.pop(0) if self.statuses else 200
+        time.sleep(self.delay_s)
+        return _Resp(status), b"{}"
+
+
+def _scheduler(**kwargs):
+    sleeps = []
+    kwargs.setdefault("retry_base_s", 0.5)
+    scheduler = SheetsCallScheduler(sleep=sleeps.append, **kwargs)
+    return scheduler, sleeps
+
+
+def test_bursts_past_the_bucket_wait_instead_of_failing():
+    scheduler, sleeps = _scheduler(writes_per_minute=60, burst=2)
+    http = ScheduledHttp(_FakeHttp(), "a@example.com", scheduler)
+
+    for _ in range(4):
+        resp, _ = http.request(_VALUES_URL, "PUT")
+        assert resp.status == 200
+
+    stats = scheduler.snapshot()
+    assert stats["calls"] == 4
+    assert stats["throttle_waits"] == 2
+    # 60/minute = one token per second once the burst of 2 is used up
+    assert sleeps[0] > 0.9 and sleeps[1] > 1.9
+
+
+def test_buckets_are_per_spreadsheet_and_user():
+    scheduler, sleeps = _scheduler(writes_per_minute=60, burst=1)
+    fake = _FakeHttp()
+
+    ScheduledHttp(fake, "a@example.com", scheduler).request(_VALUES_URL, "PUT")
+    ScheduledHttp(fake, "b@example.com", scheduler).request(_VALUES_URL, "PUT")
+    ScheduledHttp(fake, "a@example.com", scheduler).request(_VALUES_URL.replace("abc123", "other"), "PUT")
+
+    assert sleeps == []
+    assert scheduler.snapshot()["buckets"] == 3
+
+
+def test_429_and_5xx_are_retried_with_backoff():
+    scheduler, sleeps = _scheduler()
+    fake = _FakeHttp(statuses=[429, 503, 200])
+
+    resp, _ = ScheduledHttp(fake, "", scheduler).request(_VALUES_URL, "GET")
+
+    assert resp.status == 200
+    assert len(fake.calls) == 3
+    stats = scheduler.snapshot()
+    assert stats["retries"] == 2
+    assert stats["retries_by_status"] == {"429": 1, "503": 1}
+
+
+def test_appends_are_not_retried_on_5xx_but_are_on_429():
+    scheduler, _ = _scheduler()
+
+    failed = _FakeHttp(statuses=[500, 200])
+    resp, _ = ScheduledHttp(failed, "", scheduler).request(_APPEND_URL, "POST")
+    assert resp.status == 500
+    assert len(failed.calls) == 1
+
+    throttled = _FakeHttp(statuses=[429, 200])
+    resp, _ = ScheduledHttp(throttled, "", scheduler).request(_APPEND_URL, "POST")
+    assert resp.status == 200
+    assert len(throttled.calls) == 2
+
+
+def test_retries_stop_after_max_retries():
+    scheduler, _ = _scheduler(max_retries=2)
+    fake = _FakeHttp(statuses=[503] * 5)
+
+    resp, _ = ScheduledHttp(fake, "", scheduler).request(_VALUES_URL, "GET")
+
+    assert resp.status == 503
+    assert len(fake.calls) == 3
+    assert scheduler.snapshot()["gave_up"] == 1
+
+
+def test_identical_concurrent_reads_are_coalesced():
+    scheduler = SheetsCallScheduler()
+    fake = _FakeHttp(delay_s=0.2)
+    results = []
+
+    def read():
+        results.append(ScheduledHttp(fake, "a@example.com", scheduler).request(_VALUES_URL, "GET"))
+
+    threads = [threading.Thread(target=read) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(results) == 5
+    assert len(fake.calls) == 1
+    assert scheduler.snapshot()["coalesced"] == 4
@@ -0,0 +1,83 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+import template_generation
+
+SCRIPT = '''
+def get_templates(app_name="demo", app_config=None):
+    sender = (app_config or {}).get("from_name", "Nobody")
+    return {
+        "macro": {"subject": "Hi from " + sender, "email_md": "hey {name}, see {link_url}", "dm_md": "%s {name}"},
+        "micro": {"subject": "Broken", "email_md": "hey {nam}", "dm_md": "hey {name}"},
+    }
+'''
+
+
+@pytest.fixture
+def demo_script(tmp_path):
+    path = tmp_path / "demo.py"
+    path.write_text(SCRIPT % "yo")
+    template_generation._TEMPLATE_REGISTRY.clear()
+    template_generation._SCRIPT_MODULES.clear()
+    with patch("template_generation._script_path", lambda key: str(tmp_path / f"{key}.py")):
+        yield path
+    template_generation._TEMPLATE_REGISTRY.clear()
+    template_generation._SCRIPT_MODULES.clear()
+
+
+APP = {"app_key": "demo", "from_name": "Ann", "sender_profiles": {"bob": {"name": "Bob"}}}
+
+
+def _build(category, sender_profile=None):
+    app_config = template_generation._resolve_sender_profile(APP, sender_profile) if sender_profile else dict(APP)
+    return template_generation._build_email_and_dm(
+        category, {"tt": "Creator"}, link_url="https://l", app_key="demo", app_config=app_config
+    )
+
+
+def test_templates_compile_once_per_sender(demo_script):
+    hits_before = template_generation.template_registry_stats()["hits"]
+    with patch("template_generation._get_templates_for_app", wraps=template_generation._get_templates_for_app) as loader:
+        first = _build("macro")
+        again = _build("macro")
+        other = _build("macro", sender_profile="bob")
+        other_again = _build("macro", sender_profile="bob")
+
+    assert first == again
+    assert first["subject"] == "Hi from Ann"
+    assert first["email_md"] == "hey creator, see https://l"
+    assert first["dm_md"] == "yo creator"
+    assert other["subject"] == "Hi from Bob"
+    assert other_again == other
+    assert loader.call_count == 2
+    assert template_generation.template_registry_stats()["hits"] - hits_before == 2
+
+
+def test_bad_template_is_reported_at_load(demo_script):
+    template_set = template_generation._TEMPLATE_REGISTRY.get("demo", 0, {"app_key": "demo"})
+
+    assert "unknown placeholder {nam}" in template_set.errors["micro"]
+    with pytest.raises(ValueError):
+        _build("micro")
+    # Other categories of the same app still work
+    assert _build("macro")["dm_md"] == "yo creator"
+
+
+def test_edited_script_is_recompiled(demo_script):
+    assert _build("macro")["dm_md"] == "yo creator"
+    demo_script.write_text(SCRIPT % "sup")
+    stat = os.stat(demo_script)
+    os.utime(demo_script, (stat.st_atime, stat.st_mtime + 5))
+
+    assert _build("macro")["dm_md"] == "sup creator"
+    assert template_generation.template_registry_stats()["invalidations"] == 1
+
+
+def test_preload_covers_every_sender_and_followup(demo_script):
+    apps = {"demo": {"from_name": "Ann", "sender_profiles": {"bob": {"from_name": "Bob"}}}}
+    result = template_generation.preload_templates(apps)
+
+    assert result["sets"] == 8
+    assert {e["category"] for e in result["errors"]} == {"micro"}
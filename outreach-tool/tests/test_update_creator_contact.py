@@ -0,0 +1,81 @@
+from unittest.mock import MagicMock, patch
+
+import sheets_operations
+
+APP_CONFIG = {
+    "app_key": "regen",
+    "sheets_spreadsheet_id": "contact_sheet",
+    "gmail_sender": "test@example.com",
+}
+
+
+def test_email_and_ig_go_out_in_one_batch_update():
+    service = MagicMock()
+    with patch("sheets_operations._sheets_client", return_value=service):
+        result = sheets_operations._update_creator_contact_info("sheet1", "Macros", 5, email="a@x.com", ig_handle="@alpha")
+
+    assert result == {"ok": True, "updated": ["email", "ig"]}
+    assert service.spreadsheets().values().update.call_count == 0
+    assert service.spreadsheets().values().batchUpdate.call_count == 1
+    body = service.spreadsheets().values().batchUpdate.call_args.kwargs["body"]
+    assert body["valueInputOption"] == "USER_ENTERED"
+    assert body["data"] == [
+        {"range": "Macros!D5", "values": [["a@x.com"]]},
+        {"range": "Macros!B5", "values": [['=HYPERLINK("https://www.instagram.com/alpha", "@alpha")']]},
+    ]
+
+
+def test_bulk_update_failure_is_reported_per_row():
+    service = MagicMock()
+    service.spreadsheets().values().batchUpdate.return_value.execute.side_effect = RuntimeError("quota")
+    with patch("sheets_operations._sheets_client", return_value=service):
+        results = sheets_operations._update_creators_contact_info("sheet1", [
+            {"sheet_name": "Macros", "row_index": 2, "email": "a@x.com"},
+            {"sheet_name": "Micros", "row_index": 3},
+        ])
+
+    assert results == [{"ok": False, "error": "quota"}, {"ok": False, "error": "Nothing to update"}]
+
+
+@patch("main._update_creators_contact_info")
+@patch("main._check_creators_exist_across_all_sheets")
+@patch("main._get_app_config", return_value=dict(APP_CONFIG))
+def test_bulk_endpoint_looks_up_and_writes_once(mock_config, mock_check, mock_update, client):
+    mock_check.return_value = [
+        {"exists": True, "sheet_name": "Macros", "row_index": 4},
+        {"exists": False},
+        {"exists": True, "sheet_name": "Micros", "row_index": 9},
+    ]
+    mock_update.side_effect = lambda spreadsheet_id, updates, delegated_user=None: [
+        {"ok": True, "updated": ["email"]} for _ in updates
+    ]
+
+    response = client.patch("/update_creator_contact", json={"app": "regen", "updates": [
+        {"tt_handle": "alpha", "new_email": "alpha@x.com"},
+        {"tt_handle": "ghost", "new_email": "ghost@x.com"},
+        {"tt_handle": "nochange"},
+        {"ig_handle": "@bravo", "new_email": "bravo@x.com"},
+    ]})
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["ok"] is False
+    assert data["updated_rows"] == 2
+    assert data["results"] == [
+        {"ok": True, "updated": ["email"], "sheet_name": "Macros", "row_index": 4},
+        {"ok": False, "error": "Creator not found in sheet"},
+        {"ok": False, "error": "Nothing to update"},
+        {"ok": True, "updated": ["email"], "sheet_name": "Micros", "row_index": 9},
+    ]
+    assert mock_check.call_count == 1
+    assert mock_check.call_args[0][:2] == ("contact_sheet", [("", "alpha"), ("", "ghost"), ("bravo", "")])
+    assert mock_update.call_count == 1
+    assert [u["row_index"] for u in mock_update.call_args[0][1]] == [4, 9]
+
+
+@patch("main._get_app_config", return_value=dict(APP_CONFIG))
+def test_bulk_endpoint_rejects_bad_lists(mock_config, client):
+    assert client.patch("/update_creator_contact", json={"app": "regen", "updates": []}).status_code == 400
+    with patch("main._CONTACT_UPDATE_MAX_ITEMS", 1):
+        response = client.patch("/update_creator_contact", json={"app": "regen", "updates": [{}, {}]})
+    assert response.status_code == 400